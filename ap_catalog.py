@@ -0,0 +1,200 @@
+"""
+AP Catalog - Shared in-memory index of access points
+Keeps every access_points row in memory, indexed by AP ID, store ID and IP
+address, so lookups don't reload (and decrypt) the whole table. Changes are
+picked up incrementally from ap_change_log; PRAGMA data_version tells cheaply
+whether anything (in this or another process) was committed since the last
+lookup.
+"""
+
+import copy
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+
+class APCatalog:
+    """
+    In-memory access point index for one database file.
+
+    Rows are the lazy-decrypting APRow objects from DatabaseManager; lookups
+    return shallow copies, so callers can modify them freely.
+
+        catalog = get_ap_catalog(db)
+        ap = catalog.get('201265')
+        aps = catalog.find_by_store('elkjop_se_lab.lab5')
+    """
+
+    def __init__(self, db_manager):
+        """
+        Initialize the catalog (rows are loaded on first lookup).
+
+        Args:
+            db_manager: DatabaseManager used to read access_points rows
+        """
+        self.db = db_manager
+        self._lock = threading.RLock()
+        # Dedicated connection: data_version only changes for commits made by
+        # *other* connections, which includes all DatabaseManager writes
+        self._conn = sqlite3.connect(str(db_manager.db_file), timeout=30.0, check_same_thread=False)
+        self._data_version = None
+        self._loaded = False
+        self._last_seq = 0
+        self._by_rowid: Dict[int, Dict] = {}
+        self._by_ap_id: Dict[str, Dict] = {}
+        self._by_store: Dict[str, Dict[int, Dict]] = {}
+        self._by_ip: Dict[str, Dict[int, Dict]] = {}
+        self.stats = {'full_loads': 0, 'rows_refreshed': 0}
+
+    # ==================== Lookups ====================
+
+    def get(self, ap_id: str) -> Optional[Dict]:
+        """Access point by AP ID."""
+        with self._lock:
+            self.sync()
+            return self._copy(self._by_ap_id.get(str(ap_id)))
+
+    def find_by_store(self, store_id: str) -> List[Dict]:
+        """All access points of a store (case-insensitive)."""
+        with self._lock:
+            self.sync()
+            rows = self._by_store.get(self._key(store_id), {}).values()
+            return [self._copy(row) for row in sorted(rows, key=lambda row: row['ap_id'])]
+
+    def find_by_ip(self, ip_address: str) -> Optional[Dict]:
+        """First access point with this IP address (case-insensitive)."""
+        with self._lock:
+            self.sync()
+            rows = self._by_ip.get(self._key(ip_address))
+            if not rows:
+                return None
+            return self._copy(rows[min(rows)])
+
+    def all(self) -> List[Dict]:
+        """All access points ordered by store_id, ap_id (like get_all_access_points)."""
+        with self._lock:
+            self.sync()
+            rows = sorted(self._by_rowid.values(),
+                          key=lambda row: (row.get('store_id') or '', row['ap_id']))
+            return [self._copy(row) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            self.sync()
+            return len(self._by_rowid)
+
+    # ==================== Synchronization ====================
+
+    def sync(self) -> bool:
+        """
+        Apply changes committed since the last call.
+
+        Returns:
+            bool: True if anything was reloaded
+        """
+        with self._lock:
+            version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+            if version == self._data_version:
+                return False
+            self._data_version = version
+
+            if not self._loaded:
+                self._load_all()
+                return True
+
+            min_seq, max_seq = self._conn.execute(
+                'SELECT MIN(seq), MAX(seq) FROM ap_change_log').fetchone()
+            if max_seq is None or max_seq <= self._last_seq:
+                return False
+            if min_seq > self._last_seq + 1:
+                # Entries we haven't seen were trimmed - start over
+                self._load_all()
+                return True
+
+            rowids = [row[0] for row in self._conn.execute(
+                'SELECT DISTINCT ap_rowid FROM ap_change_log WHERE seq > ? AND seq <= ?',
+                (self._last_seq, max_seq))]
+            self._last_seq = max_seq
+            self._refresh_rows(rowids)
+            return True
+
+    def invalidate(self):
+        """Drop everything; the next lookup reloads the table."""
+        with self._lock:
+            self._clear()
+            self._data_version = None
+            self._loaded = False
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ==================== Internals ====================
+
+    @staticmethod
+    def _key(value) -> str:
+        return (value or '').strip().lower()
+
+    @staticmethod
+    def _copy(row: Optional[Dict]) -> Optional[Dict]:
+        return copy.copy(row) if row is not None else None
+
+    def _clear(self):
+        self._by_rowid.clear()
+        self._by_ap_id.clear()
+        self._by_store.clear()
+        self._by_ip.clear()
+
+    def _load_all(self):
+        # Read the log position first so changes committed during the load are replayed
+        self._last_seq = self._conn.execute(
+            'SELECT COALESCE(MAX(seq), 0) FROM ap_change_log').fetchone()[0]
+        self._clear()
+        for row in self.db.get_all_access_points():
+            self._add(row)
+        self._loaded = True
+        self.stats['full_loads'] += 1
+
+    def _refresh_rows(self, rowids: List[int]):
+        for rowid in rowids:
+            self._remove(rowid)
+        for row in self.db.get_access_points_by_rowids(rowids):
+            self._add(row)
+        self.stats['rows_refreshed'] += len(rowids)
+
+    def _add(self, row: Dict):
+        rowid = row['id']
+        self._by_rowid[rowid] = row
+        self._by_ap_id[str(row['ap_id'])] = row
+        self._by_store.setdefault(self._key(row.get('store_id')), {})[rowid] = row
+        if row.get('ip_address'):
+            self._by_ip.setdefault(self._key(row['ip_address']), {})[rowid] = row
+
+    def _remove(self, rowid: int):
+        row = self._by_rowid.pop(rowid, None)
+        if row is None:
+            return
+        if self._by_ap_id.get(str(row['ap_id'])) is row:
+            del self._by_ap_id[str(row['ap_id'])]
+        for index, key in ((self._by_store, self._key(row.get('store_id'))),
+                           (self._by_ip, self._key(row.get('ip_address')))):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(rowid, None)
+                if not bucket:
+                    del index[key]
+
+
+_catalogs: Dict[str, APCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_ap_catalog(db_manager) -> APCatalog:
+    """Get the process-wide catalog for db_manager's database file."""
+    key = str(db_manager.db_file)
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = APCatalog(db_manager)
+            _catalogs[key] = catalog
+        return catalog
@@ -0,0 +1,121 @@
+"""
+AP Export - Streaming Excel/CSV writer for access point tables
+Rows are written as they are produced (openpyxl write-only mode or csv), so
+exporting a large fleet never holds the whole table in memory. Passwords are
+only read and decrypted when a password column is exported.
+"""
+
+import csv
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+# (header, access_points column) in export order; also the column map used by import_from_excel
+CREDENTIAL_COLUMNS: List[Tuple[str, str]] = [
+    ('Retail Chain', 'retail_chain'),
+    ('Store ID', 'store_id'),
+    ('Store Alias', 'store_alias'),
+    ('AP ID', 'ap_id'),
+    ('IP Address', 'ip_address'),
+    ('Type', 'type'),
+    ('Username Web UI', 'username_webui'),
+    ('Password Web UI', 'password_webui'),
+    ('Username SSH', 'username_ssh'),
+    ('Password SSH', 'password_ssh'),
+    ('SU Password', 'su_password'),
+    ('Notes', 'notes'),
+]
+
+HEADER_COLOR = "4472C4"
+
+
+def is_csv(filepath) -> bool:
+    return Path(filepath).suffix.lower() == '.csv'
+
+
+def write_table(filepath, headers: Sequence[str], rows: Iterable[Sequence],
+                sheet_title: str = "Sheet1", column_widths: Dict[str, float] = None) -> int:
+    """
+    Write headers and rows to .xlsx (write-only workbook) or .csv, by file extension.
+
+    Args:
+        filepath: Target file; a .csv extension selects CSV
+        headers: Column headers
+        rows: Row sequences, consumed lazily (a generator keeps memory flat)
+        sheet_title: Worksheet name (Excel only)
+        column_widths: Optional {column letter: width} (Excel only)
+
+    Returns:
+        int: Number of data rows written
+
+    Raises:
+        ImportError: If an .xlsx file is requested and openpyxl is not installed
+    """
+    if is_csv(filepath):
+        return _write_csv(filepath, headers, rows)
+    return _write_xlsx(filepath, headers, rows, sheet_title, column_widths)
+
+
+def export_access_points(db_manager, filepath, columns: List[Tuple[str, str]] = None,
+                         chunk_size: int = 500) -> int:
+    """
+    Stream access points from the database into an Excel or CSV file.
+
+    Args:
+        db_manager: DatabaseManager to read from
+        filepath: Target .xlsx or .csv file
+        columns: (header, column) pairs (default: CREDENTIAL_COLUMNS); leaving
+            out the password columns skips decryption entirely
+        chunk_size: Rows fetched from SQLite per round trip
+
+    Returns:
+        int: Number of access points exported
+    """
+    columns = columns or CREDENTIAL_COLUMNS
+    rows = db_manager.iter_access_points([column for _, column in columns], chunk_size)
+    rows = ((value if value is not None else '' for value in row) for row in rows)
+    return write_table(filepath, [header for header, _ in columns], rows,
+                       sheet_title="Credentials")
+
+
+def _write_csv(filepath, headers, rows) -> int:
+    count = 0
+    # utf-8-sig so Excel detects the encoding when the file is opened directly
+    with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _write_xlsx(filepath, headers, rows, sheet_title, column_widths) -> int:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    # Write-only sheets need widths before the first row
+    for letter, width in (column_widths or {}).items():
+        ws.column_dimensions[letter].width = width
+
+    fill = PatternFill(start_color=HEADER_COLOR, end_color=HEADER_COLOR, fill_type="solid")
+    font = Font(bold=True, color="FFFFFF")
+    alignment = Alignment(horizontal="center", vertical="center")
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.fill = fill
+        cell.font = font
+        cell.alignment = alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    count = 0
+    for row in rows:
+        ws.append(list(row))
+        count += 1
+    wb.save(filepath)
+    return count
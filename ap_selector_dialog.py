@@ -2,7 +2,7 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from credential_manager_v2 import CredentialManager
+from services import get_credential_manager
 
 
 class APSelectorDialog:
@@ -10,7 +10,7 @@ class APSelectorDialog:
     
     def __init__(self, parent):
         self.result = []  # Will store selected AP credentials
-        self.credential_manager = CredentialManager()
+        self.credential_manager = get_credential_manager()
         self.all_aps = self.credential_manager.get_all()
         self.filtered_aps = self.all_aps.copy()
         
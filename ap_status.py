@@ -0,0 +1,175 @@
+"""
+AP Status - Typed record for an access point's /service/status.xml page
+Parses the status page once into an APStatusRecord instead of running one
+regex per field over the page source. Handles both the table Chrome renders
+through the AP's XSL and the raw XML document returned over plain HTTP.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+
+# <th>Label:</th><td>value</td> rows of the status table (one pass over the page).
+# The label is captured raw; _normalize() drops the colon and whitespace.
+_ROW_PATTERN = re.compile(r'<th[^>]*>([^<]*)</th>\s*<td[^>]*>([^<]*)</td>', re.IGNORECASE)
+_NON_ALNUM = re.compile(r'[^a-z0-9]')
+
+
+@lru_cache(maxsize=256)
+def _normalize(label: str) -> str:
+    """'Serial Number:' / 'serialNumber' / 'serial_number' -> 'serialnumber'"""
+    return _NON_ALNUM.sub('', label.lower())
+
+
+@dataclass
+class APStatusRecord:
+    """Fields of an AP status page, named after the access_points columns."""
+
+    ap_id: Optional[str] = None
+    type: Optional[str] = None
+    store_id: Optional[str] = None
+    ip_address: Optional[str] = None
+    serial_number: Optional[str] = None
+    software_version: Optional[str] = None
+    firmware_version: Optional[str] = None
+    hardware_revision: Optional[str] = None
+    build: Optional[str] = None
+    configuration_mode: Optional[str] = None
+    service_status: Optional[str] = None
+    uptime: Optional[str] = None
+    communication_daemon_status: Optional[str] = None
+    mac_address: Optional[str] = None
+    connectivity_internet: Optional[str] = None
+    connectivity_provisioning: Optional[str] = None
+    connectivity_ntp_server: Optional[str] = None
+    connectivity_apc_address: Optional[str] = None
+
+    # Page label for each single-valued column (service/daemon status share the
+    # label "Status" and are told apart by order)
+    LABELS = {
+        'ap_id': 'AP ID',
+        'type': 'Transmitter',
+        'store_id': 'Store ID',
+        'ip_address': 'IP Address',
+        'serial_number': 'Serial Number',
+        'software_version': 'Software Version',
+        'firmware_version': 'Firmware Version',
+        'hardware_revision': 'Hardware Revision',
+        'build': 'Build',
+        'configuration_mode': 'Configuration mode',
+        'uptime': 'Uptime',
+        'mac_address': 'MAC Address',
+        'connectivity_internet': 'Internet',
+        'connectivity_provisioning': 'Provisioning',
+        'connectivity_ntp_server': 'NTP Server',
+        'connectivity_apc_address': 'APC Address',
+    }
+
+    @classmethod
+    def from_values(cls, values: Dict[str, List[str]]) -> 'APStatusRecord':
+        """Build a record from normalized label -> list of values (in page order)."""
+        record = cls()
+        for column, label in cls.LABELS.items():
+            found = values.get(_normalize(label))
+            if found and found[0]:
+                setattr(record, column, found[0])
+        statuses = values.get('status', [])
+        if len(statuses) >= 1 and statuses[0]:
+            record.service_status = statuses[0]
+        if len(statuses) >= 2 and statuses[1]:
+            record.communication_daemon_status = statuses[1]
+        return record
+
+    @classmethod
+    def from_elements(cls, values: Dict[str, List[str]]) -> 'APStatusRecord':
+        """
+        Build a record from the leaf elements of a raw status.xml document.
+
+        Keys named after a column ('apid', 'servicestatus', 'connectivityinternet')
+        win over the page labels and the order of the "status" elements.
+        """
+        record = cls.from_values(values)
+        for f in fields(cls):
+            found = values.get(_normalize(f.name))
+            if found and found[0]:
+                setattr(record, f.name, found[0])
+        return record
+
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def changes_from(self, existing: Dict) -> Dict[str, str]:
+        """Fields with a value that differs from an existing access_points row."""
+        return {name: value for name, value in self.to_dict().items()
+                if value and name != 'ap_id' and existing.get(name) != value}
+
+
+def parse_status_values(text: str) -> Dict[str, List[str]]:
+    """
+    Collect every label/value pair of a rendered status page.
+
+    Reads the XHTML table Chrome renders from status.xml through the AP's
+    XSL (<th>Label:</th><td>value</td>). The untransformed XML document has
+    no such rows and yields nothing.
+
+    Returns:
+        dict: normalized label -> values in page order
+    """
+    values: Dict[str, List[str]] = {}
+    for label, value in _ROW_PATTERN.findall(text):
+        values.setdefault(_normalize(label), []).append(value.strip())
+    return values
+
+
+def parse_status_page(text: str) -> APStatusRecord:
+    """Parse a rendered status.xml page into an APStatusRecord."""
+    return APStatusRecord.from_values(parse_status_values(text))
+
+
+def parse_status_xml_values(text: str) -> Dict[str, List[str]]:
+    """
+    Collect the leaf elements of a raw status.xml document.
+
+    Each value is stored under its normalized element name and under its
+    section + element name, so <service><status> is also 'servicestatus'.
+
+    Returns:
+        dict: normalized element name -> values in document order
+    """
+    values: Dict[str, List[str]] = {}
+    try:
+        root = ET.fromstring(text.encode('utf-8') if isinstance(text, str) else text)
+    except ET.ParseError:
+        return values
+
+    def walk(element, section):
+        for child in element:
+            tag = child.tag.rsplit('}', 1)[-1] if isinstance(child.tag, str) else ''
+            if not tag:
+                continue
+            if len(child):
+                walk(child, tag)
+            elif child.text and child.text.strip():
+                value = child.text.strip()
+                values.setdefault(_normalize(tag), []).append(value)
+                if section:
+                    values.setdefault(_normalize(section + tag), []).append(value)
+
+    walk(root, '')
+    return values
+
+
+def parse_status_xml(text: str) -> APStatusRecord:
+    """Parse a raw (untransformed) status.xml document into an APStatusRecord."""
+    return APStatusRecord.from_elements(parse_status_xml_values(text))
+
+
+def parse_status_document(text: str) -> APStatusRecord:
+    """Parse status.xml as either the rendered table or the raw XML document."""
+    record = parse_status_page(text)
+    if record.ap_id or '<th' in text:
+        return record
+    return parse_status_xml(text)
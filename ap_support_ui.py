@@ -7,6 +7,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 from datetime import datetime
 from database_manager import DatabaseManager
+from ap_status import parse_status_page
 from typing import Dict, List, Optional
 import io
 import base64
@@ -444,8 +445,8 @@ class APSearchDialog:
                     continue
                 
                 # Check if API key is configured for this country
-                from vusion_api_config import VusionAPIConfig
-                config = VusionAPIConfig()
+                from vusion_api_config import get_vusion_config
+                config = get_vusion_config()
                 api_key = config.get_api_key(country, 'vusion_pro')
                 
                 if not api_key:
@@ -529,8 +530,8 @@ class APSearchDialog:
                 return ("", None)
             
             # Check if API key is configured for this country
-            from vusion_api_config import VusionAPIConfig
-            config = VusionAPIConfig()
+            from vusion_api_config import get_vusion_config
+            config = get_vusion_config()
             api_key = config.get_api_key(country, 'vusion_pro')
             
             if not api_key:
@@ -660,17 +661,20 @@ class APSearchDialog:
             has_open_tickets=has_open_tickets
         )
         
+        # Count open tickets for all results in one query
+        try:
+            open_tickets = self.db.count_open_tickets([ap['ap_id'] for ap in aps])
+        except Exception:
+            open_tickets = {}
+        
         # Populate results (without Vusion status initially)
         for ap in aps:
-            # Count open tickets
-            open_tickets = self._count_open_tickets(ap['ap_id'])
-            
             self.tree.insert("", "end", values=(
                 ap.get('ap_id', ''),
                 ap.get('store_id', ''),
                 ap.get('ip_address', ''),
                 '...',  # Placeholder while loading
-                str(open_tickets) if open_tickets > 0 else '0'
+                str(open_tickets.get(ap['ap_id'], 0))
             ), tags=(ap['ap_id'],))
         
         self.count_label.config(text=f"{len(aps)} AP(s) found")
@@ -685,15 +689,6 @@ class APSearchDialog:
             self.sort_column = "ap_id"
             self.sort_reverse = False
     
-    def _count_open_tickets(self, ap_id: str) -> int:
-        """Count open Jira tickets for an AP."""
-        try:
-            # Get tickets from database
-            tickets = self.db.get_tickets_for_ap(ap_id)
-            return sum(1 for t in tickets if t.get('status') not in ('Closed', 'Resolved', 'Done'))
-        except:
-            return 0
-    
     def _on_double_click(self, event):
         """Handle double-click on tree item."""
         self._on_open()
@@ -1781,60 +1776,28 @@ class APSupportWindow:
         try:
             self._log_activity("Extracting AP information...")
             
-            ap_id = self._extract_xml_value(page_source, "AP ID")
-            transmitter = self._extract_xml_value(page_source, "Transmitter")
-            store_id = self._extract_xml_value(page_source, "Store ID")
-            ip_address = self._extract_xml_value(page_source, "IP Address") or ip
-            
-            serial_number = self._extract_xml_value(page_source, "Serial Number")
-            software_version = self._extract_xml_value(page_source, "Software Version")
-            firmware_version = self._extract_xml_value(page_source, "Firmware Version")
-            hardware_revision = self._extract_xml_value(page_source, "Hardware Revision")
-            build = self._extract_xml_value(page_source, "Build")
-            configuration_mode = self._extract_xml_value(page_source, "Configuration mode")
-            uptime = self._extract_xml_value(page_source, "Uptime")
-            mac_address = self._extract_xml_value(page_source, "MAC Address")
-            
-            service_status = self._extract_status_field(page_source, "service")
-            communication_daemon_status = self._extract_status_field(page_source, "daemon")
-            
-            connectivity_internet = self._extract_xml_value(page_source, "Internet")
-            connectivity_provisioning = self._extract_xml_value(page_source, "Provisioning")
-            connectivity_ntp_server = self._extract_xml_value(page_source, "NTP Server")
-            connectivity_apc_address = self._extract_xml_value(page_source, "APC Address")
+            record = parse_status_page(page_source)
+            if not record.ip_address:
+                record.ip_address = ip
+            ap_id = record.ap_id
             
             # Debug: Log extracted values
-            extracted_count = sum(1 for v in [ap_id, transmitter, store_id, serial_number, software_version, 
-                                              firmware_version, hardware_revision, build, uptime, mac_address,
-                                              service_status, communication_daemon_status] if v)
+            extracted_count = sum(1 for v in [ap_id, record.type, record.store_id, record.serial_number,
+                                              record.software_version, record.firmware_version,
+                                              record.hardware_revision, record.build, record.uptime,
+                                              record.mac_address, record.service_status,
+                                              record.communication_daemon_status] if v)
             self._log_activity(f"Extracted {extracted_count} fields from status page")
             
             if not ap_id:
                 self._log_activity("✗ Could not extract AP ID from status page")
                 return False
             
-            self._log_activity(f"✓ AP ID: {ap_id}, SW: {software_version}, Service: {service_status}")
+            self._log_activity(f"✓ AP ID: {ap_id}, SW: {record.software_version}, Service: {record.service_status}")
             
             # Update in database
-            update_data = {
-                "ip_address": ip_address,
-                "store_id": store_id,
-                "type": transmitter,
-                "serial_number": serial_number,
-                "software_version": software_version,
-                "firmware_version": firmware_version,
-                "hardware_revision": hardware_revision,
-                "build": build,
-                "configuration_mode": configuration_mode,
-                "service_status": service_status,
-                "uptime": uptime,
-                "communication_daemon_status": communication_daemon_status,
-                "mac_address": mac_address,
-                "connectivity_internet": connectivity_internet,
-                "connectivity_provisioning": connectivity_provisioning,
-                "connectivity_ntp_server": connectivity_ntp_server,
-                "connectivity_apc_address": connectivity_apc_address
-            }
+            update_data = record.to_dict()
+            del update_data['ap_id']
             
             success, msg = self.db.update_access_point(ap_id, update_data)
             if success:
@@ -1859,32 +1822,6 @@ class APSupportWindow:
             self._log_activity(f"✗ Extraction error: {str(e)}")
             return False
     
-    def _extract_xml_value(self, html_text, field_name):
-        """Extract value from HTML table row."""
-        import re
-        pattern = f"<th>{field_name}:</th>\\s*<td>([^<]*)</td>"
-        match = re.search(pattern, html_text, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        return None
-    
-    def _extract_status_field(self, html_text, context):
-        """Extract Status field based on context (service or daemon)."""
-        import re
-        
-        if context == "service":
-            pattern = r'<th>Status:</th>\s*<td[^>]*>([^<]*)</td>'
-            match = re.search(pattern, html_text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        elif context == "daemon":
-            pattern = r'<th>Status:</th>\s*<td[^>]*>([^<]*)</td>'
-            matches = re.findall(pattern, html_text, re.IGNORECASE)
-            if len(matches) >= 2:
-                return matches[1].strip()
-        
-        return None
-    
     def _work_with_provisioning(self):
         """Work with provisioning settings."""
         if not self.browser_connected:
@@ -2124,19 +2061,11 @@ class APSupportWindow:
             if not self.driver:
                 self._log_activity("Initializing Chrome driver...")
                 try:
-                    from selenium import webdriver
-                    from selenium.webdriver.chrome.service import Service
-                    from webdriver_manager.chrome import ChromeDriverManager
+                    from webdriver_pool import get_webdriver_pool
                     
-                    options = webdriver.ChromeOptions()
-                    options.add_argument('--ignore-certificate-errors')
-                    options.add_argument('--ignore-ssl-errors')
-                    options.add_experimental_option('excludeSwitches', ['enable-logging'])
-                    # Start browser minimized
-                    options.add_argument('--start-minimized')
-                    
-                    service = Service(ChromeDriverManager().install())
-                    self.driver = webdriver.Chrome(service=service, options=options)
+                    # Warm browser from the shared pool (driver path is resolved once per process)
+                    self.driver = get_webdriver_pool().acquire()
+                    self.driver.implicitly_wait(0)
                     # Minimize window after creation
                     try:
                         self.driver.minimize_window()
@@ -2397,7 +2326,6 @@ class APSupportWindow:
     def _ssh_remove_old_logs_thread(self):
         """Background thread to remove old log files."""
         from ssh_helper import SSHManager
-        import time
         
         if self.ssh_window_id not in SSHManager._windows:
             return
@@ -2417,26 +2345,21 @@ class APSupportWindow:
             self.window.after(0, lambda: self._log_activity("✗ Failed to exit service mode"))
             return
         
+        # Each command returns as soon as the shell prompt is back
+        prompt = connection.SHELL_PROMPT
+        
         # Check space before
-        time.sleep(1)
-        connection.send_command("df -h")
-        time.sleep(2)
-        before_output = connection.get_output()
+        _, before_output = connection.send_expect("df -h", prompt, timeout=10)
         self.window.after(0, lambda: self._log_activity(f"Space before cleanup:\n{before_output}"))
         
         # Navigate to log folder
-        time.sleep(0.5)
-        connection.send_command("cd /opt/esl/accesspoint")
-        time.sleep(1)
+        connection.send_expect("cd /opt/esl/accesspoint", prompt, timeout=5)
         
         # Remove old log files
-        connection.send_command("rm -rf *20*log*")
-        time.sleep(2)
+        connection.send_expect("rm -rf *20*log*", prompt, timeout=30)
         
         # Check space after
-        connection.send_command("df -h")
-        time.sleep(2)
-        after_output = connection.get_output()
+        _, after_output = connection.send_expect("df -h", prompt, timeout=10)
         self.window.after(0, lambda: self._log_activity(f"Space after cleanup:\n{after_output}"))
         self.window.after(0, lambda: self._log_activity("✓ Old log files removed"))
     
@@ -2529,17 +2452,15 @@ class APSupportWindow:
     
     def _ssh_exit_service_mode_if_needed(self, connection):
         """Exit service mode if currently in it. Returns True if ready to execute commands."""
-        import time
-        
-        # Peek at recent output to check current prompt
-        time.sleep(1)
-        output = connection.peek_output(500)
+        # Wait for the current shell's prompt to check which mode we're in
+        index, output = connection.expect([connection.SERVICE_MODE_PROMPT, connection.SHELL_PROMPT],
+                                          timeout=5, start=connection.session_start)
         
         # Log what we see for debugging
         self.window.after(0, lambda o=output: self._log_activity(f"Checking prompt. Last output: {repr(o[-100:])}"))
         
         # Check if in service mode (case insensitive)
-        if "servicemode>" in output.lower():
+        if index == 0:
             return self._ssh_exit_service_mode_if_needed_v2(connection)
         
         # Not in service mode, ready to execute
@@ -2548,19 +2469,12 @@ class APSupportWindow:
     
     def _ssh_exit_service_mode_if_needed_v2(self, connection):
         """Actually exit service mode. Returns True if successful."""
-        import time
-        
         self.window.after(0, lambda: self._log_activity("⚠️ Exiting service mode..."))
         
-        # Exit service mode
-        connection.send_command("extended matex2010")
-        time.sleep(2)
-        connection.send_command("enableshell true")
-        time.sleep(2)
-        connection.send_command("exit")
-        time.sleep(2)
-        connection.send_command("exit")
-        time.sleep(3)
+        # Exit service mode - each step waits for the next prompt; the final
+        # exit returns as soon as the AP closes the session
+        for command in ("extended matex2010", "enableshell true", "exit", "exit"):
+            connection.send_expect(command, connection.ANY_PROMPT, timeout=5)
         
         # Reconnect
         self.window.after(0, lambda: self._log_activity("Reconnecting..."))
@@ -2571,8 +2485,7 @@ class APSupportWindow:
             tab.is_reconnecting = True
         
         # Disconnect current connection (preserve buffers)
-        connection.disconnect(preserve_buffers=True)
-        time.sleep(1)
+        connection.disconnect(preserve_buffers=True, relogin=True)
         
         # Reconnect
         success, message = connection.connect()
@@ -2581,7 +2494,8 @@ class APSupportWindow:
             tab.is_reconnecting = False
         
         if success:
-            time.sleep(3)
+            # Ready once the normal shell prompt appears
+            connection.expect(connection.SHELL_PROMPT, timeout=10, start=connection.session_start)
             self.window.after(0, lambda: self._log_activity("✓ Reconnected in normal mode"))
             return True
         else:
@@ -3362,10 +3276,12 @@ class APSupportWindow:
     
     def _on_close(self):
         """Handle window close."""
-        # Close browser if open
+        # Return browser to the shared pool if open
         if self.driver:
             try:
-                self.driver.quit()
+                from webdriver_pool import get_webdriver_pool
+                get_webdriver_pool().release(self.driver)
+                self.driver = None
                 self._log_activity("✓ Browser closed")
             except:
                 pass
@@ -7,6 +7,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 from datetime import datetime
 from database_manager import DatabaseManager
+from ap_status import parse_status_page
 from typing import Dict, List, Optional
 import threading
 
@@ -624,18 +625,11 @@ class APSupportWindowModern:
             if not self.driver:
                 self._log_activity("Initializing Chrome driver...")
                 try:
-                    from selenium import webdriver
-                    from selenium.webdriver.chrome.service import Service
-                    from webdriver_manager.chrome import ChromeDriverManager
+                    from webdriver_pool import get_webdriver_pool
                     
-                    options = webdriver.ChromeOptions()
-                    options.add_argument('--ignore-certificate-errors')
-                    options.add_argument('--ignore-ssl-errors')
-                    options.add_experimental_option('excludeSwitches', ['enable-logging'])
-                    options.add_argument('--start-minimized')
-                    
-                    service = Service(ChromeDriverManager().install())
-                    self.driver = webdriver.Chrome(service=service, options=options)
+                    # Warm browser from the shared pool (driver path is resolved once per process)
+                    self.driver = get_webdriver_pool().acquire()
+                    self.driver.implicitly_wait(0)
                     try:
                         self.driver.minimize_window()
                         self._log_activity("✓ Chrome driver initialized (minimized)")
@@ -734,58 +728,26 @@ class APSupportWindowModern:
         try:
             self._log_activity("Extracting AP information...")
             
-            ap_id = self._extract_xml_value(page_source, "AP ID")
-            transmitter = self._extract_xml_value(page_source, "Transmitter")
-            store_id = self._extract_xml_value(page_source, "Store ID")
-            ip_address = self._extract_xml_value(page_source, "IP Address") or ip
-            
-            serial_number = self._extract_xml_value(page_source, "Serial Number")
-            software_version = self._extract_xml_value(page_source, "Software Version")
-            firmware_version = self._extract_xml_value(page_source, "Firmware Version")
-            hardware_revision = self._extract_xml_value(page_source, "Hardware Revision")
-            build = self._extract_xml_value(page_source, "Build")
-            configuration_mode = self._extract_xml_value(page_source, "Configuration mode")
-            uptime = self._extract_xml_value(page_source, "Uptime")
-            mac_address = self._extract_xml_value(page_source, "MAC Address")
-            
-            service_status = self._extract_status_field(page_source, "service")
-            communication_daemon_status = self._extract_status_field(page_source, "daemon")
-            
-            connectivity_internet = self._extract_xml_value(page_source, "Internet")
-            connectivity_provisioning = self._extract_xml_value(page_source, "Provisioning")
-            connectivity_ntp_server = self._extract_xml_value(page_source, "NTP Server")
-            connectivity_apc_address = self._extract_xml_value(page_source, "APC Address")
+            record = parse_status_page(page_source)
+            if not record.ip_address:
+                record.ip_address = ip
+            ap_id = record.ap_id
             
-            extracted_count = sum(1 for v in [ap_id, transmitter, store_id, serial_number, software_version, 
-                                              firmware_version, hardware_revision, build, uptime, mac_address,
-                                              service_status, communication_daemon_status] if v)
+            extracted_count = sum(1 for v in [ap_id, record.type, record.store_id, record.serial_number,
+                                              record.software_version, record.firmware_version,
+                                              record.hardware_revision, record.build, record.uptime,
+                                              record.mac_address, record.service_status,
+                                              record.communication_daemon_status] if v)
             self._log_activity(f"Extracted {extracted_count} fields from status page")
             
             if not ap_id:
                 self._log_activity("✗ Could not extract AP ID from status page")
                 return False
             
-            self._log_activity(f"✓ AP ID: {ap_id}, SW: {software_version}, Service: {service_status}")
+            self._log_activity(f"✓ AP ID: {ap_id}, SW: {record.software_version}, Service: {record.service_status}")
             
-            update_data = {
-                "ip_address": ip_address,
-                "store_id": store_id,
-                "type": transmitter,
-                "serial_number": serial_number,
-                "software_version": software_version,
-                "firmware_version": firmware_version,
-                "hardware_revision": hardware_revision,
-                "build": build,
-                "configuration_mode": configuration_mode,
-                "service_status": service_status,
-                "uptime": uptime,
-                "communication_daemon_status": communication_daemon_status,
-                "mac_address": mac_address,
-                "connectivity_internet": connectivity_internet,
-                "connectivity_provisioning": connectivity_provisioning,
-                "connectivity_ntp_server": connectivity_ntp_server,
-                "connectivity_apc_address": connectivity_apc_address
-            }
+            update_data = record.to_dict()
+            del update_data['ap_id']
             
             success, msg = self.db.update_access_point(ap_id, update_data)
             if success:
@@ -807,32 +769,6 @@ class APSupportWindowModern:
             self._log_activity(f"✗ Extraction error: {str(e)}")
             return False
     
-    def _extract_xml_value(self, html_text, field_name):
-        """Extract value from HTML table row."""
-        import re
-        pattern = f"<th>{field_name}:</th>\\s*<td>([^<]*)</td>"
-        match = re.search(pattern, html_text, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        return None
-    
-    def _extract_status_field(self, html_text, context):
-        """Extract Status field based on context (service or daemon)."""
-        import re
-        
-        if context == "service":
-            pattern = r'<th>Status:</th>\s*<td[^>]*>([^<]*)</td>'
-            match = re.search(pattern, html_text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        elif context == "daemon":
-            pattern = r'<th>Status:</th>\s*<td[^>]*>([^<]*)</td>'
-            matches = re.findall(pattern, html_text, re.IGNORECASE)
-            if len(matches) >= 2:
-                return matches[1].strip()
-        
-        return None
-    
     def _open_browser(self):
         """Navigate browser to main page."""
         if not self.browser_connected:
@@ -1093,6 +1029,15 @@ class APSupportWindowModern:
         if self.ap_id in APSupportWindowModern._open_windows:
             del APSupportWindowModern._open_windows[self.ap_id]
         
+        # Return browser to the shared pool if open
+        if self.driver:
+            try:
+                from webdriver_pool import get_webdriver_pool
+                get_webdriver_pool().release(self.driver)
+                self.driver = None
+            except:
+                pass
+        
         self.db.log_user_activity(
             username=self.current_user,
             activity_type='ap_support_close',
@@ -5,14 +5,12 @@ Batch Browser Operations Tool - Perform browser operations on multiple APs
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Dict
-import threading
-import time
+import concurrent.futures
 from batch_operations_base import BatchOperationWindow
 from database_manager import DatabaseManager
-from browser_manager import BrowserManager
+from browser_waits import PageWaiter
+from webdriver_pool import get_webdriver_pool
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 
@@ -22,8 +20,6 @@ class BatchBrowserWindow(BatchOperationWindow):
     def __init__(self, parent, current_user, db_manager: DatabaseManager):
         """Initialize batch browser operations window."""
         self.operation_type = tk.StringVar(value="enable_ssh")
-        self.browser_manager = None
-        self.browser_lock = threading.Lock()  # Lock for browser operations
         
         super().__init__(parent, "Batch Browser Operations", current_user, db_manager)
     
@@ -52,18 +48,18 @@ class BatchBrowserWindow(BatchOperationWindow):
         settings_frame = ttk.LabelFrame(self.operation_frame, text="Browser Settings", padding=10)
         settings_frame.pack(fill=tk.X, pady=(0, 10))
         
-        # Max tabs
-        tabs_frame = ttk.Frame(settings_frame)
-        tabs_frame.pack(fill=tk.X, pady=5)
+        # Parallel browsers
+        browsers_frame = ttk.Frame(settings_frame)
+        browsers_frame.pack(fill=tk.X, pady=5)
         
-        ttk.Label(tabs_frame, text="Max Parallel Tabs:").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Label(browsers_frame, text="Max Parallel Browsers:").pack(side=tk.LEFT, padx=(0, 10))
         
-        self.max_tabs_var = tk.IntVar(value=9)
-        tabs_spin = ttk.Spinbox(tabs_frame, from_=1, to=15, width=10,
-                               textvariable=self.max_tabs_var)
-        tabs_spin.pack(side=tk.LEFT)
+        self.parallel_var = tk.IntVar(value=4)
+        parallel_spin = ttk.Spinbox(browsers_frame, from_=1, to=get_webdriver_pool().max_total, width=10,
+                                    textvariable=self.parallel_var)
+        parallel_spin.pack(side=tk.LEFT)
         
-        ttk.Label(tabs_frame, text="(Recommended: 5-9 tabs)", 
+        ttk.Label(browsers_frame, text="(Recommended: 3-5 browsers)", 
                  foreground="gray").pack(side=tk.LEFT, padx=(10, 0))
         
         # Timeout
@@ -82,8 +78,8 @@ class BatchBrowserWindow(BatchOperationWindow):
         # Help text
         help_text = ttk.Label(
             self.operation_frame,
-            text="ℹ Browser will open multiple tabs simultaneously. Each AP will be processed in its own tab. "
-                 "Status updates show progress for each AP.",
+            text="ℹ APs are processed in parallel, each in its own browser from the shared pool "
+                 "(browsers stay open between runs). Status updates show progress for each AP.",
             foreground="gray",
             wraplength=1000,
             font=('Segoe UI', 9)
@@ -108,15 +104,15 @@ class BatchBrowserWindow(BatchOperationWindow):
     def _get_operation_params(self) -> dict:
         """Read tkinter variables in main thread."""
         return {
-            'max_tabs': self.max_tabs_var.get(),
+            'max_parallel': self.parallel_var.get(),
             'timeout': self.timeout_var.get(),
             'operation_type': self.operation_type.get()
         }
     
     def _run_operation(self, operation_params: dict = None):
-        """Run batch browser operation with parallel tabs."""
+        """Run batch browser operation with one pooled browser per parallel worker."""
         # Use parameters passed from main thread
-        max_tabs = operation_params.get('max_tabs', 9)
+        max_parallel = operation_params.get('max_parallel', 4)
         timeout = operation_params.get('timeout', 30)
         operation_type = operation_params.get('operation_type', 'check_status')
         
@@ -124,131 +120,51 @@ class BatchBrowserWindow(BatchOperationWindow):
         self.current_operation = operation_type
         
         try:
-            # Initialize browser
-            self.operation_queue.put(('log', 'Initializing browser...', 'info'))
-            self.browser_manager = BrowserManager(
-                log_callback=lambda msg: self.operation_queue.put(('log', msg, 'info'))
-            )
+            total = len(self.selected_aps)
+            workers = max(1, min(max_parallel, total))
             
-            self.browser_manager.initialize_browser()
-            self.operation_queue.put(('log', 'Browser initialized successfully', 'success'))
+            # Start browsers for the workers while the first ones are leased
+            pool = get_webdriver_pool()
+            pool.warm(workers)
+            self.operation_queue.put(('log', f'Processing {total} APs in {workers} parallel browsers...', 'info'))
             
-            # Process APs in batches of max_tabs
-            total = len(self.selected_aps)
             completed = 0
-            
-            for batch_num, i in enumerate(range(0, total, max_tabs), 1):
-                if not self.operation_running:
-                    break
-                
-                batch = self.selected_aps[i:i + max_tabs]
-                self.operation_queue.put(('log', 
-                    f'Opening batch {batch_num} with {len(batch)} tabs...', 'info'))
-                
-                # Phase 1: Open tabs and navigate all to their URLs (sequentially to avoid issues)
-                tab_handles = {}
-                self.operation_queue.put(('log', f'Phase 1: Opening tabs and navigating to APs...', 'info'))
-                
-                for idx, ap in enumerate(batch):
-                    ap_id = ap['ap_id']
-                    ip = ap.get('ip_address', '')
-                    
-                    try:
-                        # Open new tab (or use first tab for first AP)
-                        if idx > 0:
-                            self.browser_manager.driver.execute_script("window.open('');")
-                            self.browser_manager.driver.switch_to.window(
-                                self.browser_manager.driver.window_handles[-1]
-                            )
-                        
-                        handle = self.browser_manager.driver.current_window_handle
-                        tab_handles[ap_id] = {'handle': handle, 'ap': ap, 'index': idx}
-                        
-                        # Navigate to AP immediately
-                        if ip:
-                            url = f"http://{ip}"
-                            self.operation_queue.put(('status', ap_id, 'Loading', f'Navigating to {ip}', '-'))
-                            self.browser_manager.driver.get(url)
-                        else:
-                            self.operation_queue.put(('status', ap_id, 'Failed', 'No IP address', '-'))
-                        
-                    except Exception as e:
-                        self.operation_queue.put(('status', ap_id, 'Failed', f'Tab error: {str(e)[:30]}', '-'))
-                        self.operation_queue.put(('log', f"{ap_id}: Tab error - {str(e)}", 'error'))
-                
-                # Phase 2: Process all tabs in parallel now that they're loaded
-                self.operation_queue.put(('log', f'Phase 2: Processing all tabs in parallel...', 'info'))
-                
-                threads = []
-                for ap_id, tab_info in tab_handles.items():
-                    if not self.operation_running:
-                        break
-                    
-                    thread = threading.Thread(
-                        target=self._process_ap_in_tab,
-                        args=(tab_info['ap'], tab_info['handle'], tab_info['index']),
-                        daemon=True
-                    )
-                    threads.append((thread, ap_id))
-                    thread.start()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                future_to_ap = {executor.submit(self._process_ap, ap): ap for ap in self.selected_aps}
                 
-                # Wait for all threads to complete
-                for thread, ap_id in threads:
-                    thread.join()
+                for future in concurrent.futures.as_completed(future_to_ap):
                     completed += 1
                     progress = (completed / total) * 100
                     self.operation_queue.put(('progress', progress, f"Processed {completed} of {total}"))
-                
-                # Close all tabs in this batch (except the first one for next batch)
-                try:
-                    current_handles = self.browser_manager.driver.window_handles
-                    if len(current_handles) > 1:
-                        for handle in current_handles[1:]:
-                            try:
-                                self.browser_manager.driver.switch_to.window(handle)
-                                self.browser_manager.driver.close()
-                            except:
-                                pass
-                        # Switch back to first tab
-                        if current_handles:
-                            self.browser_manager.driver.switch_to.window(current_handles[0])
-                except:
-                    pass
+                    
+                    if not self.operation_running:
+                        for pending in future_to_ap:
+                            pending.cancel()
             
         except Exception as e:
             self.operation_queue.put(('log', f'Fatal error: {str(e)}', 'error'))
         
         finally:
-            # Clean up browser
-            if self.browser_manager and self.browser_manager.driver:
-                try:
-                    self.browser_manager.driver.quit()
-                    self.operation_queue.put(('log', 'Browser closed', 'info'))
-                except:
-                    pass
-            
             self.operation_queue.put(('complete', None, None))
     
-    def _process_ap_in_tab(self, ap: Dict, tab_handle: str, tab_index: int):
-        """Process a single AP in its assigned tab (runs in parallel thread)."""
+    def _process_ap(self, ap: Dict):
+        """Process a single AP in a leased browser (runs in a worker thread)."""
         ap_id = ap['ap_id']
         
+        if not self.operation_running:
+            return
+        
+        if not ap.get('ip_address'):
+            self.operation_queue.put(('status', ap_id, 'Failed', 'No IP address', '-'))
+            return
+        
         try:
-            # Switch to this AP's tab (with lock to prevent race conditions during switch)
-            with self.browser_lock:
-                self.browser_manager.driver.switch_to.window(tab_handle)
-                current_handle = self.browser_manager.driver.current_window_handle
-            
-            # Verify we're in the correct tab
-            if current_handle != tab_handle:
-                self.operation_queue.put(('status', ap_id, 'Failed', 'Tab switch failed', '-'))
-                return
-            
-            # Update status
-            self.operation_queue.put(('status', ap_id, 'Running', 'Logging in...', '-'))
+            self.operation_queue.put(('status', ap_id, 'Loading', 'Waiting for browser...', '-'))
             
-            # Execute the operation (page already loaded, just need to login and operate)
-            success, result = self._execute_browser_operation_in_loaded_tab(ap, tab_handle)
+            # Each worker owns its browser for the lease, so no lock is needed
+            with get_webdriver_pool().lease() as driver:
+                waiter = PageWaiter(driver, log_callback=lambda msg: self.operation_queue.put(('log', msg, 'info')))
+                success, result = self._execute_browser_operation(ap, waiter)
             
             # Update final status
             status = 'Success' if success else 'Failed'
@@ -260,9 +176,13 @@ class BatchBrowserWindow(BatchOperationWindow):
             self.operation_queue.put(('status', ap_id, 'Failed', f'Error: {str(e)[:50]}', '-'))
             self.operation_queue.put(('log', f"{ap_id}: Error - {str(e)}", 'error'))
     
-    def _execute_browser_operation_in_loaded_tab(self, ap: Dict, tab_handle: str) -> tuple[bool, str]:
+    def _execute_browser_operation(self, ap: Dict, waiter: PageWaiter) -> tuple[bool, str]:
         """
-        Execute browser operation on a single AP (tab already loaded).
+        Execute browser operation on a single AP.
+        
+        Args:
+            ap: AP dictionary
+            waiter: PageWaiter for the leased browser
         
         Returns:
             tuple: (success, result_message)
@@ -272,6 +192,8 @@ class BatchBrowserWindow(BatchOperationWindow):
         timeout = self.current_timeout
         
         ap_id = ap.get('ap_id', '')
+        ip = ap.get('ip_address', '')
+        driver = waiter.driver
         
         # Get credentials
         username = ap.get('username_webui', 'admin')
@@ -292,77 +214,73 @@ class BatchBrowserWindow(BatchOperationWindow):
         if not password:
             return False, f"No password configured"
         
-        # ALL Selenium operations must be locked since WebDriver is not thread-safe
-        with self.browser_lock:
+        try:
+            self.operation_queue.put(('status', ap_id, 'Loading', f'Navigating to {ip}', '-'))
+            
+            # Wait for page load
+            with waiter.step(f"{ap_id} page load"):
+                waiter.load(f"http://{ip}", timeout=timeout)
+            
+            # Check for Cato Networks warning
             try:
-                # Switch to this tab
-                self.browser_manager.driver.switch_to.window(tab_handle)
-                
-                # Wait for page load
-                time.sleep(2)
-                
-                # Check for Cato Networks warning
-                try:
-                    if "cato" in self.browser_manager.driver.page_source.lower():
-                        continue_btn = WebDriverWait(self.browser_manager.driver, 5).until(
-                            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Continue')]"))
-                        )
-                        continue_btn.click()
-                        time.sleep(1)
-                except:
-                    pass
-                
-                # Login
-                username_field = WebDriverWait(self.browser_manager.driver, 10).until(
-                    EC.presence_of_element_located((By.NAME, "username"))
-                )
-                username_field.clear()
-                username_field.send_keys(username)
-                
-                password_field = self.browser_manager.driver.find_element(By.NAME, "password")
-                password_field.clear()
-                password_field.send_keys(password)
-                
-                login_btn = self.browser_manager.driver.find_element(By.XPATH, "//input[@type='submit']")
-                login_btn.click()
-                
-                time.sleep(3)  # Wait for login to complete
-                
-                # For now, just return success after login
-                return True, "Logged in successfully"
-                
-            except TimeoutException:
-                return False, "Login page timeout"
-            except NoSuchElementException:
-                return False, "Login elements not found"
-            except Exception as e:
-                return False, f"Login error: {str(e)[:50]}"
+                if "cato" in driver.page_source.lower():
+                    continue_btn = waiter.wait_for_element(
+                        By.XPATH, "//button[contains(text(), 'Continue')]", timeout=5, clickable=True
+                    )
+                    waiter.click_and_wait_for_reload(continue_btn, timeout=10)
+            except:
+                pass
+            
+            self.operation_queue.put(('status', ap_id, 'Running', 'Logging in...', '-'))
+            
+            # Login
+            username_field = waiter.wait_for_element(By.NAME, "username", timeout=10)
+            username_field.clear()
+            username_field.send_keys(username)
+            
+            password_field = driver.find_element(By.NAME, "password")
+            password_field.clear()
+            password_field.send_keys(password)
+            
+            login_btn = driver.find_element(By.XPATH, "//input[@type='submit']")
+            
+            # Wait for the page after login instead of a fixed delay
+            with waiter.step(f"{ap_id} login"):
+                waiter.click_and_wait_for_reload(login_btn, timeout=timeout)
+            
+            # For now, just return success after login
+            return True, "Logged in successfully"
+            
+        except TimeoutException:
+            return False, "Login page timeout"
+        except NoSuchElementException:
+            return False, "Login elements not found"
+        except Exception as e:
+            return False, f"Login error: {str(e)[:50]}"
     
-    def _enable_ssh_server(self) -> tuple[bool, str]:
+    def _enable_ssh_server(self, waiter: PageWaiter) -> tuple[bool, str]:
         """Enable SSH server on AP."""
         try:
             # Navigate to SSH settings
             # This is example code - adjust for actual AP interface
-            ssh_link = WebDriverWait(self.browser_manager.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'SSH') or contains(text(), 'Services')]"))
+            ssh_link = waiter.wait_for_element(
+                By.XPATH, "//a[contains(text(), 'SSH') or contains(text(), 'Services')]", timeout=10, clickable=True
             )
-            ssh_link.click()
-            time.sleep(2)
+            waiter.click_and_wait_for_reload(ssh_link, timeout=10)
             
             # Enable SSH checkbox
-            ssh_checkbox = self.browser_manager.driver.find_element(
-                By.XPATH, "//input[@type='checkbox' and contains(@name, 'ssh')]"
+            ssh_checkbox = waiter.wait_for_element(
+                By.XPATH, "//input[@type='checkbox' and contains(@name, 'ssh')]", timeout=10
             )
             
             if not ssh_checkbox.is_selected():
                 ssh_checkbox.click()
                 
                 # Save/Apply
-                apply_btn = self.browser_manager.driver.find_element(
+                apply_btn = waiter.driver.find_element(
                     By.XPATH, "//input[@type='submit' and (@value='Apply' or @value='Save')]"
                 )
-                apply_btn.click()
-                time.sleep(2)
+                waiter.click_and_wait_for_reload(apply_btn, timeout=15)
                 
                 return True, "SSH server enabled"
             else:
@@ -371,30 +289,28 @@ class BatchBrowserWindow(BatchOperationWindow):
         except Exception as e:
             return False, f"Failed to enable SSH: {str(e)[:30]}"
     
-    def _disable_ssh_server(self) -> tuple[bool, str]:
+    def _disable_ssh_server(self, waiter: PageWaiter) -> tuple[bool, str]:
         """Disable SSH server on AP."""
         try:
             # Navigate to SSH settings
-            ssh_link = WebDriverWait(self.browser_manager.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'SSH') or contains(text(), 'Services')]"))
+            ssh_link = waiter.wait_for_element(
+                By.XPATH, "//a[contains(text(), 'SSH') or contains(text(), 'Services')]", timeout=10, clickable=True
             )
-            ssh_link.click()
-            time.sleep(2)
+            waiter.click_and_wait_for_reload(ssh_link, timeout=10)
             
             # Disable SSH checkbox
-            ssh_checkbox = self.browser_manager.driver.find_element(
-                By.XPATH, "//input[@type='checkbox' and contains(@name, 'ssh')]"
+            ssh_checkbox = waiter.wait_for_element(
+                By.XPATH, "//input[@type='checkbox' and contains(@name, 'ssh')]", timeout=10
             )
             
             if ssh_checkbox.is_selected():
                 ssh_checkbox.click()
                 
                 # Save/Apply
-                apply_btn = self.browser_manager.driver.find_element(
+                apply_btn = waiter.driver.find_element(
                     By.XPATH, "//input[@type='submit' and (@value='Apply' or @value='Save')]"
                 )
-                apply_btn.click()
-                time.sleep(2)
+                waiter.click_and_wait_for_reload(apply_btn, timeout=15)
                 
                 return True, "SSH server disabled"
             else:
@@ -403,26 +319,25 @@ class BatchBrowserWindow(BatchOperationWindow):
         except Exception as e:
             return False, f"Failed to disable SSH: {str(e)[:30]}"
     
-    def _reboot_ap(self) -> tuple[bool, str]:
+    def _reboot_ap(self, waiter: PageWaiter) -> tuple[bool, str]:
         """Reboot the AP."""
         try:
             # Navigate to system/reboot page
-            reboot_link = WebDriverWait(self.browser_manager.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Reboot') or contains(text(), 'System')]"))
+            reboot_link = waiter.wait_for_element(
+                By.XPATH, "//a[contains(text(), 'Reboot') or contains(text(), 'System')]", timeout=10, clickable=True
             )
-            reboot_link.click()
-            time.sleep(2)
+            waiter.click_and_wait_for_reload(reboot_link, timeout=10)
             
             # Click reboot button
-            reboot_btn = self.browser_manager.driver.find_element(
-                By.XPATH, "//input[@type='submit' and contains(@value, 'Reboot')]"
+            reboot_btn = waiter.wait_for_element(
+                By.XPATH, "//input[@type='submit' and contains(@value, 'Reboot')]", timeout=10, clickable=True
             )
             reboot_btn.click()
             
             # Confirm if needed
             try:
-                confirm_btn = WebDriverWait(self.browser_manager.driver, 3).until(
-                    EC.element_to_be_clickable((By.XPATH, "//input[@type='submit' and @value='OK']"))
+                confirm_btn = waiter.wait_for_element(
+                    By.XPATH, "//input[@type='submit' and @value='OK']", timeout=3, clickable=True
                 )
                 confirm_btn.click()
             except:
@@ -433,11 +348,11 @@ class BatchBrowserWindow(BatchOperationWindow):
         except Exception as e:
             return False, f"Failed to reboot: {str(e)[:30]}"
     
-    def _check_ap_status(self) -> tuple[bool, str]:
+    def _check_ap_status(self, waiter: PageWaiter) -> tuple[bool, str]:
         """Check AP status."""
         try:
             # Get page title or system info
-            page_source = self.browser_manager.driver.page_source
+            page_source = waiter.driver.page_source
             
             # Extract useful info (example)
             if "Online" in page_source or "Connected" in page_source:
@@ -448,7 +363,7 @@ class BatchBrowserWindow(BatchOperationWindow):
         except Exception as e:
             return False, f"Failed to check status: {str(e)[:30]}"
     
-    def _read_config(self) -> tuple[bool, str]:
+    def _read_config(self, waiter: PageWaiter) -> tuple[bool, str]:
         """Read configuration from AP."""
         try:
             # This is a placeholder - implement based on AP interface
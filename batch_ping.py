@@ -16,6 +16,8 @@ import select
 import os
 from batch_operations_base import BatchOperationWindow
 from database_manager import DatabaseManager
+from icmp_sweep import IcmpSweeper, icmp_checksum
+from metrics_aggregator import PingMetricsAggregator
 
 
 class BatchPingWindow(BatchOperationWindow):
@@ -28,6 +30,9 @@ class BatchPingWindow(BatchOperationWindow):
         self.max_parallel = 20
         
         super().__init__(parent, "Batch Ping Tool", current_user, db_manager)
+        
+        # Daily ping rollups for ap_metrics (flushed at the end of each run)
+        self.metrics = PingMetricsAggregator(self.db)
     
     def _create_operation_controls(self):
         """Create ping-specific controls."""
@@ -88,6 +93,22 @@ class BatchPingWindow(BatchOperationWindow):
         self.timeout = operation_params.get('timeout', 2)
         self.max_parallel = operation_params.get('max_parallel', 20)
         
+        # Prefer the single-socket sweep engine; it needs raw socket access
+        try:
+            sweeper = IcmpSweeper()
+        except (PermissionError, OSError):
+            sweeper = None
+        
+        if sweeper:
+            try:
+                self._run_sweep(sweeper)
+            finally:
+                sweeper.close()
+                self.metrics.flush()
+                self._flush_writes()
+            self.operation_queue.put(('complete', None, None))
+            return
+        
         total = len(self.selected_aps)
         completed = 0
         
@@ -121,6 +142,9 @@ class BatchPingWindow(BatchOperationWindow):
                 progress = (completed / total) * 100
                 self.operation_queue.put(('progress', progress, f"Processed {completed} of {total}"))
         
+        self.metrics.flush()
+        self._flush_writes()
+        
         # Operation complete
         self.operation_queue.put(('complete', None, None))
     
@@ -151,6 +175,7 @@ class BatchPingWindow(BatchOperationWindow):
             ping_start = time.time()
             success, ping_time = self._send_icmp_ping(ip, self.timeout)
             ping_duration = time.time() - ping_start
+            self.metrics.record(ap_id, success, ping_time if success else None)
             
             if success:
                 successful_pings += 1
@@ -171,12 +196,65 @@ class BatchPingWindow(BatchOperationWindow):
                 if delay > 0:
                     time.sleep(delay)
         
-        # Calculate final results
+        self._report_ping_result(ap_id, successful_pings, failed_pings, ping_times)
+    
+    def _flush_writes(self):
+        """Commit queued status/metrics writes and report any the writer had to drop."""
+        if not self.db.flush_writes():
+            error = self.db.get_write_queue_stats().get('last_error') or 'timed out'
+            self.operation_queue.put(('log', f"Some results were not saved to the database: {error}", 'warning'))
+    
+    def _run_sweep(self, sweeper: IcmpSweeper):
+        """Ping all selected APs at once over the sweep engine's single socket."""
+        total = len(self.selected_aps)
+        completed = 0
+        targets = {}
+        
+        for ap in self.selected_aps:
+            ap_id = ap['ap_id']
+            ip = ap.get('ip_address', '')
+            try:
+                targets[ap_id] = socket.gethostbyname(ip) if ip else None
+            except socket.gaierror:
+                targets[ap_id] = None
+            
+            if not targets[ap_id]:
+                del targets[ap_id]
+                reason = 'No IP address' if not ip else 'Cannot resolve host'
+                self.operation_queue.put(('status', ap_id, 'Failed', reason, '0/0'))
+                completed += 1
+        
+        self.operation_queue.put(('log', f"Sweeping {len(targets)} APs over a single ICMP socket", 'info'))
+        
+        def on_echo(stats, success, rtt):
+            self.metrics.record(stats.key, success, rtt if success else None)
+            avg_text = f' ({stats.avg_rtt:.1f}ms avg)' if stats.rtts else ''
+            result_text = 'OK' if success else 'Timeout'
+            self.operation_queue.put(('status', stats.key, 'Running',
+                                      f'Ping {stats.sent}/{self.ping_count} {result_text}{avg_text}',
+                                      f'{stats.sent}/{self.ping_count}'))
+        
+        def on_complete(stats):
+            nonlocal completed
+            self._report_ping_result(stats.key, stats.received, stats.lost, stats.rtts)
+            completed += 1
+            progress = (completed / total) * 100
+            self.operation_queue.put(('progress', progress, f"Processed {completed} of {total}"))
+        
+        sweeper.sweep(targets, count=self.ping_count, timeout=self.timeout,
+                      on_echo=on_echo, on_complete=on_complete,
+                      should_stop=lambda: not self.operation_running)
+        
+        if not self.operation_running:
+            self.operation_queue.put(('log', 'Operation stopped by user', 'warning'))
+    
+    def _report_ping_result(self, ap_id: str, successful_pings: int, failed_pings: int, ping_times: list):
+        """Report the final ping result for an AP and store its status."""
         total_sent = successful_pings + failed_pings
         if successful_pings == 0:
             # All pings failed
             self.operation_queue.put(('status', ap_id, 'Failed', 'All pings failed', f'{total_sent}/{self.ping_count}'))
-            self.db.update_ap_status(ap_id, 'offline')
+            self.db.queue_ap_status(ap_id, 'offline')
         else:
             # At least some pings succeeded
             loss_pct = int((failed_pings / total_sent) * 100) if total_sent > 0 else 0
@@ -196,9 +274,9 @@ class BatchPingWindow(BatchOperationWindow):
             self.operation_queue.put(('log', f"{ap_id}: {result_text}", 'success' if status == 'Success' else 'error'))
             
             if loss_pct < 100:
-                self.db.update_ap_status(ap_id, 'online', avg_time)
+                self.db.queue_ap_status(ap_id, 'online', avg_time)
             else:
-                self.db.update_ap_status(ap_id, 'offline')
+                self.db.queue_ap_status(ap_id, 'offline')
     
     def _ping_single_ap(self, ap: Dict) -> tuple[bool, str, float]:
         """
@@ -359,19 +437,7 @@ class BatchPingWindow(BatchOperationWindow):
     
     def _calculate_checksum(self, data: bytes) -> int:
         """Calculate ICMP checksum."""
-        sum = 0
-        count_to = (len(data) // 2) * 2
-        
-        for i in range(0, count_to, 2):
-            sum += (data[i + 1] << 8) + data[i]
-        
-        if count_to < len(data):
-            sum += data[-1]
-        
-        sum = (sum >> 16) + (sum & 0xFFFF)
-        sum += (sum >> 16)
-        
-        return ~sum & 0xFFFF
+        return icmp_checksum(data)
     
     def _fallback_ping(self, host: str, timeout: float) -> tuple[bool, float]:
         """Fallback to subprocess ping if raw sockets not available."""
@@ -11,6 +11,7 @@ import time
 import concurrent.futures
 from batch_operations_base import BatchOperationWindow
 from database_manager import DatabaseManager
+from ssh_pool import get_ssh_pool
 
 
 class BatchSSHWindow(BatchOperationWindow):
@@ -208,8 +209,8 @@ class BatchSSHWindow(BatchOperationWindow):
             tuple: (success, output/error_message)
         """
         ip = ap.get('ip_address', '')
-        username = ap.get('ssh_username', ap.get('username', 'admin'))
-        password = ap.get('ssh_password', ap.get('password', ''))
+        username = ap.get('username_ssh') or ap.get('ssh_username') or ap.get('username') or 'admin'
+        password = ap.get('password_ssh') or ap.get('ssh_password') or ap.get('password', '')
         port = ap.get('ssh_port', 22)
         
         if not ip:
@@ -218,37 +219,14 @@ class BatchSSHWindow(BatchOperationWindow):
         if not password:
             return False, "No SSH password configured"
         
-        ssh_client = None
-        
         try:
-            # Create SSH client
-            ssh_client = paramiko.SSHClient()
-            ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            # Connect
-            ssh_client.connect(
-                hostname=ip,
+            # Reuse a pooled connection (skips the handshake for repeated runs)
+            exit_status, output, error = get_ssh_pool().exec_command(
+                ip, username, password, self.ssh_command,
                 port=port,
-                username=username,
-                password=password,
-                timeout=self.ssh_timeout,
-                allow_agent=False,
-                look_for_keys=False
-            )
-            
-            # Execute command
-            stdin, stdout, stderr = ssh_client.exec_command(
-                self.ssh_command,
                 timeout=self.ssh_timeout
             )
             
-            # Get output
-            output = stdout.read().decode('utf-8', errors='ignore').strip()
-            error = stderr.read().decode('utf-8', errors='ignore').strip()
-            
-            # Get exit status
-            exit_status = stdout.channel.recv_exit_status()
-            
             if exit_status == 0:
                 if output:
                     return True, output
@@ -271,13 +249,6 @@ class BatchSSHWindow(BatchOperationWindow):
         
         except Exception as e:
             return False, f"Error: {str(e)[:50]}"
-        
-        finally:
-            if ssh_client:
-                try:
-                    ssh_client.close()
-                except:
-                    pass
 
 
 class SSHOutputViewerDialog:
@@ -0,0 +1,81 @@
+"""
+Micro-benchmark for the status.xml parser (ap_status.py).
+Times the old per-field regex extraction (one scan of the page per field)
+against the single-pass parser on the saved pages in test_fixtures/.
+
+Usage:
+    python benchmark_status_parser.py [number_of_runs]
+"""
+
+import os
+import re
+import sys
+import timeit
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ap_status import APStatusRecord, parse_status_page
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_fixtures')
+
+
+def legacy_extract_xml_value(html_text, field_name):
+    """The per-field lookup previously used by ContentPanel/APSupportWindow."""
+    pattern = f"<th>{field_name}:</th>\\s*<td>([^<]*)</td>"
+    match = re.search(pattern, html_text, re.IGNORECASE)
+    if match:
+        return match.group(1).strip()
+    return None
+
+
+def legacy_extract_status_field(html_text, context):
+    """The Status lookup previously used by BrowserManager/APSupportWindow."""
+    pattern = r'<th>Status:</th>\s*<td[^>]*>([^<]*)</td>'
+    if context == "service":
+        match = re.search(pattern, html_text, re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+    elif context == "daemon":
+        matches = re.findall(pattern, html_text, re.IGNORECASE)
+        if len(matches) >= 2:
+            return matches[1].strip()
+    return None
+
+
+def legacy_parse(html_text) -> APStatusRecord:
+    """Old extraction: 16 label searches plus two Status scans."""
+    record = APStatusRecord()
+    for column, label in APStatusRecord.LABELS.items():
+        setattr(record, column, legacy_extract_xml_value(html_text, label))
+    record.service_status = legacy_extract_status_field(html_text, "service")
+    record.communication_daemon_status = legacy_extract_status_field(html_text, "daemon")
+    return record
+
+
+def load_fixtures():
+    """Saved status pages as {file name: page source}."""
+    fixtures = {}
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        if name.startswith('status'):
+            with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+                fixtures[name] = f.read()
+    return fixtures
+
+
+def run(number=2000):
+    for name, page in load_fixtures().items():
+        if legacy_parse(page) != parse_status_page(page):
+            print(f"✗ {name}: parsers disagree")
+            continue
+
+        legacy = min(timeit.repeat(lambda: legacy_parse(page), number=number, repeat=5))
+        single = min(timeit.repeat(lambda: parse_status_page(page), number=number, repeat=5))
+        print(f"{name} ({len(page):,} chars, {number} runs)")
+        print(f"  per-field regex: {legacy / number * 1e6:8.1f} µs/page")
+        print(f"  single pass:     {single / number * 1e6:8.1f} µs/page  ({legacy / single:.1f}x)")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -2,47 +2,35 @@
 Browser Manager - Handles multi-AP browser automation
 """
 import time
-import os
-import sys
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-
-# Suppress all console windows and logging on Windows
-if sys.platform == 'win32':
-    os.environ['WDM_LOG_LEVEL'] = '0'
-    os.environ['WDM_PRINT_FIRST_LINE'] = 'False'
-    os.environ['WDM_PROGRESS_BAR'] = str(False)
-    
-    # Suppress Python logging for webdriver_manager
-    import logging
-    logging.getLogger('WDM').setLevel(logging.NOTSET)
-
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.common.by import By
+from browser_waits import PageWaiter
+from ap_status import parse_status_page
+from webdriver_pool import get_webdriver_pool
 
 
 class BrowserManager:
     """Manages browser automation for multiple APs"""
     
-    def __init__(self, log_callback=None, progress_callback=None, extract_xml_callback=None, 
-                 handle_cato_callback=None):
+    def __init__(self, log_callback=None, progress_callback=None, handle_cato_callback=None):
         """
         Initialize the browser manager
         
         Args:
             log_callback: Function to call for logging messages
             progress_callback: Function to call for progress updates (message, percentage)
-            extract_xml_callback: Function to extract values from XML/HTML
             handle_cato_callback: Function to handle Cato Networks warning
         """
         self.driver = None
+        self.waiter = None  # PageWaiter for self.driver (set by initialize_browser)
         self.ap_tabs = []
         self.log_callback = log_callback or print
         self.progress_callback = progress_callback
-        self.extract_xml_callback = extract_xml_callback
         self.handle_cato_callback = handle_cato_callback
         self.db = None  # Database reference for updates
+        # Phase 4 fetches status.xml over HTTP (status_collector); APs it can't
+        # read are collected in their browser tab. False reads every AP in its tab.
+        self.direct_status_collection = True
     
     def log(self, message):
         """Log a message"""
@@ -55,44 +43,13 @@ class BrowserManager:
             self.progress_callback(message, percentage)
     
     def initialize_browser(self):
-        """Initialize Chrome browser with appropriate options"""
+        """Lease a Chrome browser from the shared WebDriver pool"""
         self.log("Initializing Chrome driver...")
         
-        import os
-        import subprocess
-        import sys
-        
-        chrome_options = Options()
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--ignore-certificate-errors')
-        chrome_options.add_argument('--disable-web-security')
-        chrome_options.add_argument('--ignore-ssl-errors')
-        chrome_options.add_argument('--allow-insecure-localhost')
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        chrome_options.set_capability('acceptInsecureCerts', True)
-        
-        # Suppress all console windows on Windows
-        creation_flags = 0
-        if sys.platform == 'win32':
-            # CREATE_NO_WINDOW flag to prevent console window
-            creation_flags = subprocess.CREATE_NO_WINDOW
-            # Also set environment to suppress webdriver_manager console output
-            os.environ['WDM_LOG_LEVEL'] = '0'
-            os.environ['WDM_PRINT_FIRST_LINE'] = 'False'
-        
-        # Create service with hidden console window
-        service = Service(
-            ChromeDriverManager().install(),
-            creationflags=creation_flags
-        )
-        
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        # Set page load timeout to 60 seconds (increased for slower connections)
-        self.driver.set_page_load_timeout(60)
-        self.driver.implicitly_wait(15)
+        pool = get_webdriver_pool()
+        idle = pool.idle_count()
+        self.driver = pool.acquire()
+        self.waiter = PageWaiter(self.driver, log_callback=self.log)
         
         # Minimize the browser window immediately
         try:
@@ -101,16 +58,20 @@ class BrowserManager:
         except:
             self.log("⚠ Could not minimize browser window")
         
-        self.log("✓ Chrome driver initialized")
+        self.log("✓ Chrome driver initialized" + (" (warm session)" if idle else ""))
     
-    def open_multiple_aps(self, ap_list, status_dialog=None, is_reconnect=False):
+    def open_multiple_aps(self, ap_list, status_dialog=None, is_reconnect=False, load_timeout=30):
         """
         Open browser with multiple AP tabs
         
+        All tabs load in parallel and each phase waits on page conditions rather
+        than fixed sleeps, so the total time is bounded by the slowest AP.
+        
         Args:
             ap_list: List of AP credential dictionaries
             status_dialog: Optional ConnectionStatusDialog for status updates
             is_reconnect: If True, append to existing tabs instead of replacing them
+            load_timeout: Seconds to wait for all tabs to finish loading
             
         Returns:
             dict: Result with status and message
@@ -132,6 +93,7 @@ class BrowserManager:
                     browser_valid = True
                 except:
                     self.log("Browser session is invalid (browser was closed), reinitializing...")
+                    get_webdriver_pool().discard(self.driver)
                     self.driver = None
             
             # Initialize browser if not already open or if session is invalid
@@ -139,6 +101,8 @@ class BrowserManager:
                 self.progress("Initializing browser...", 5)
                 self.initialize_browser()
             
+            waiter = PageWaiter(self.driver, log_callback=self.log)
+            
             # PHASE 1: Open all tabs quickly
             self.log(f"\n=== Phase 1: Opening {total_aps} tabs ===")
             self.progress("Opening browser tabs...", 10)
@@ -203,27 +167,9 @@ class BrowserManager:
                     self.driver.execute_cdp_cmd('Network.setExtraHTTPHeaders', {'headers': {'Authorization': auth_header}})
                     self.log(f"  ✓ CDP authentication headers set")
                     
-                    # Try to navigate with timeout handling
-                    from selenium.common.exceptions import TimeoutException
-                    try:
-                        self.driver.get(url)
-                    except TimeoutException:
-                        self.log(f"⚠ Navigation timeout for {ap_id}, but continuing...")
-                        # Page is still loading, we'll check the result in verification phase
-                    
-                    # Wait for initial page load
-                    time.sleep(3)
-                    
-                    # Check for and handle Cato warning immediately after navigation
-                    if self.handle_cato_callback:
-                        try:
-                            cato_detected = self.handle_cato_callback(self.driver)
-                            if cato_detected:
-                                self.log(f"✓ Cato warning handled for {ap_id}")
-                                # Wait additional time after CATO click for page to reload
-                                time.sleep(4)
-                        except Exception as e:
-                            self.log(f"⚠ Error checking Cato warning for {ap_id}: {str(e)}")
+                    # Start navigation without blocking; all tabs load in parallel
+                    # and are waited for in the verification phase
+                    waiter.start_loading(url)
                     
                     self.ap_tabs.append({
                         'handle': tab_handle,
@@ -253,9 +199,34 @@ class BrowserManager:
             
             self.log(f"✓ All {total_aps} tabs are now loading")
             
-            # Give pages more time to fully load (especially after CATO handling)
-            self.log("Waiting for pages to fully load...")
-            time.sleep(5)
+            # Wait for each tab against one shared deadline - tabs that finished
+            # while we waited for an earlier one return immediately
+            self.log("Waiting for pages to finish loading...")
+            deadline = time.monotonic() + load_timeout
+            for tab_info in self.ap_tabs:
+                if tab_info.get('status') == 'failed':
+                    continue
+                ap_id = tab_info['ap_id']
+                try:
+                    self.driver.switch_to.window(tab_info['handle'])
+                    with waiter.step(f"{ap_id} page load"):
+                        if not waiter.wait_for_ready(timeout=max(1, deadline - time.monotonic())):
+                            self.log(f"⚠ {ap_id} still loading, verifying anyway...")
+                    
+                    # Check for and handle Cato warning once the page is there
+                    if self.handle_cato_callback:
+                        try:
+                            old_document = waiter.current_document()
+                            cato_detected = self.handle_cato_callback(self.driver)
+                            if cato_detected:
+                                self.log(f"✓ Cato warning handled for {ap_id}")
+                                # Wait for the page behind the warning to load
+                                with waiter.step(f"{ap_id} Cato reload"):
+                                    waiter.wait_for_reload(old_document, timeout=10)
+                        except Exception as e:
+                            self.log(f"⚠ Error checking Cato warning for {ap_id}: {str(e)}")
+                except Exception as e:
+                    self.log(f"⚠ Error waiting for {ap_id}: {str(e)}")
             
             # PHASE 3: Verify connections
             self.log(f"\n=== Phase 3: Verifying connections ===")
@@ -363,117 +334,29 @@ class BrowserManager:
             self.log(f"\n=== Phase 4: Collecting AP information ===")
             self.progress("Collecting AP information...", 85)
             
-            from credential_manager_v2 import CredentialManager
-            creds_manager = CredentialManager()
-            updated_count = 0
-            
-            for index, tab_info in enumerate(self.ap_tabs):
-                if tab_info['status'] != 'connected':
-                    continue
-                    
-                ap_id = tab_info['ap_id']
-                tab_handle = tab_info['handle']
-                
-                try:
-                    self.driver.switch_to.window(tab_handle)
-                    
-                    status_url = f"{tab_info['url']}/service/status.xml"
-                    self.log(f"Collecting info from {ap_id}: {status_url}")
-                    
-                    # Navigate to status.xml (same as Quick Connect - no Cato check needed here)
-                    self.driver.get(status_url)
-                    time.sleep(3)
-                    
-                    page_source = self.driver.page_source
-                    
-                    if self.extract_xml_callback:
-                        # Extract basic info
-                        extracted_ap_id = self.extract_xml_callback(page_source, "AP ID")
-                        transmitter = self.extract_xml_callback(page_source, "Transmitter")
-                        store_id = self.extract_xml_callback(page_source, "Store ID")
-                        ip_address = self.extract_xml_callback(page_source, "IP Address") or tab_info['ip_address']
-                        
-                        # Extract hardware/software info
-                        serial_number = self.extract_xml_callback(page_source, "Serial Number")
-                        software_version = self.extract_xml_callback(page_source, "Software Version")
-                        firmware_version = self.extract_xml_callback(page_source, "Firmware Version")
-                        hardware_revision = self.extract_xml_callback(page_source, "Hardware Revision")
-                        build = self.extract_xml_callback(page_source, "Build")
-                        configuration_mode = self.extract_xml_callback(page_source, "Configuration mode")
-                        uptime = self.extract_xml_callback(page_source, "Uptime")
-                        mac_address = self.extract_xml_callback(page_source, "MAC Address")
-                        
-                        # Extract status fields (need special handling for duplicate "Status" fields)
-                        service_status = self._extract_status_field(page_source, "service")
-                        communication_daemon_status = self._extract_status_field(page_source, "daemon")
-                        
-                        # Extract connectivity status
-                        connectivity_internet = self.extract_xml_callback(page_source, "Internet")
-                        connectivity_provisioning = self.extract_xml_callback(page_source, "Provisioning")
-                        connectivity_ntp_server = self.extract_xml_callback(page_source, "NTP Server")
-                        connectivity_apc_address = self.extract_xml_callback(page_source, "APC Address")
-                        
-                        self.log(f"  AP ID: {extracted_ap_id}, Type: {transmitter}, Store: {store_id}")
-                        self.log(f"  Serial: {serial_number}, SW: {software_version}, FW: {firmware_version}")
-                        self.log(f"  Service: {service_status}, Daemon: {communication_daemon_status}")
-                        
-                        if extracted_ap_id:
-                            existing_ap = creds_manager.find_by_ap_id(extracted_ap_id)
-                            
-                            if existing_ap:
-                                # Prepare update data with all fields
-                                update_data = {}
-                                
-                                # Check and update all fields
-                                fields_to_update = [
-                                    ('ip_address', ip_address),
-                                    ('store_id', store_id),
-                                    ('type', transmitter),
-                                    ('serial_number', serial_number),
-                                    ('software_version', software_version),
-                                    ('firmware_version', firmware_version),
-                                    ('hardware_revision', hardware_revision),
-                                    ('build', build),
-                                    ('configuration_mode', configuration_mode),
-                                    ('service_status', service_status),
-                                    ('uptime', uptime),
-                                    ('communication_daemon_status', communication_daemon_status),
-                                    ('mac_address', mac_address),
-                                    ('connectivity_internet', connectivity_internet),
-                                    ('connectivity_provisioning', connectivity_provisioning),
-                                    ('connectivity_ntp_server', connectivity_ntp_server),
-                                    ('connectivity_apc_address', connectivity_apc_address)
-                                ]
-                                
-                                for field_name, new_value in fields_to_update:
-                                    if new_value and existing_ap.get(field_name) != new_value:
-                                        update_data[field_name] = new_value
-                                
-                                if update_data:
-                                    success, msg = creds_manager.update_credential(
-                                        existing_ap.get('store_id', ''), 
-                                        extracted_ap_id, 
-                                        update_data
-                                    )
-                                    if success:
-                                        updated_count += 1
-                                        self.log(f"  ✓ Updated {len(update_data)} fields for AP {extracted_ap_id}")
-                                    else:
-                                        self.log(f"  ✗ Failed to update AP {extracted_ap_id}: {msg}")
-                            else:
-                                self.log(f"  AP {extracted_ap_id} not found in credentials database")
-                    
-                    # Navigate back to main page
-                    self.driver.get(tab_info['url'])
-                    
-                except Exception as e:
-                    self.log(f"  Error collecting info for {ap_id}: {str(e)}")
+            db = self.db
+            if db is None:
+                from services import get_database_manager
+                db = get_database_manager()
+            
+            connected_tabs = [tab_info for tab_info in self.ap_tabs if tab_info['status'] == 'connected']
+            with waiter.step("status.xml collection"):
+                records = []
+                if self.direct_status_collection:
+                    records, connected_tabs = self._collect_status_direct(connected_tabs, db)
+                    if connected_tabs:
+                        self.log(f"Reading {len(connected_tabs)} AP(s) in the browser instead")
+                records += self._collect_status_in_tabs(connected_tabs, waiter)
+                updated_count = db.bulk_update_ap_status([record.to_dict() for record in records])
             
             if updated_count > 0:
                 self.log(f"✓ Updated {updated_count} AP records in credentials database")
             
             self.progress(f"Connected to {success_count}/{total_aps} APs", 100)
             
+            if waiter.timings:
+                self.log(f"\n=== Slowest steps ===\n{waiter.timing_summary(limit=5)}")
+            
             # Switch back to first tab
             if self.ap_tabs:
                 self.driver.switch_to.window(self.ap_tabs[0]['handle'])
@@ -525,26 +408,75 @@ class BrowserManager:
             
             return {"status": "error", "message": error_msg}
     
-    def _extract_status_field(self, html_text, context):
-        """Extract Status field based on context (service or daemon).
-        Service status appears first, daemon status appears later.
+    def _log_status_record(self, ap_id, record):
+        self.log(f"  {ap_id}: AP ID {record.ap_id}, Type: {record.type}, Store: {record.store_id}")
+        self.log(f"    Serial: {record.serial_number}, SW: {record.software_version}, "
+                 f"FW: {record.firmware_version}")
+        self.log(f"    Service: {record.service_status}, Daemon: {record.communication_daemon_status}")
+    
+    def _collect_status_in_tabs(self, tabs, waiter):
+        """Read each tab's status.xml as Chrome renders it (through the AP's XSL).
+        
+        Args:
+            tabs: Connected ap_tabs entries
+            waiter: PageWaiter for self.driver
+            
+        Returns:
+            list: APStatusRecord for every page an AP ID was found on
+        """
+        records = []
+        for tab_info in tabs:
+            ap_id = tab_info['ap_id']
+            try:
+                self.driver.switch_to.window(tab_info['handle'])
+                status_url = f"{tab_info['url']}/service/status.xml"
+                self.log(f"Collecting info from {ap_id}: {status_url}")
+                
+                # Wait for the status table to render
+                with waiter.step(f"{ap_id} status.xml"):
+                    waiter.load(status_url, timeout=15)
+                    waiter.find_element(By.TAG_NAME, "th", timeout=5)
+                
+                record = parse_status_page(self.driver.page_source)
+                if record.ap_id:
+                    if not record.ip_address:
+                        record.ip_address = tab_info['ip_address']
+                    self._log_status_record(ap_id, record)
+                    records.append(record)
+                else:
+                    self.log(f"  Error collecting info for {ap_id}: Could not find AP ID in status page")
+                
+                # Navigate back to main page (no need to wait for it)
+                waiter.start_loading(tab_info['url'])
+                
+            except Exception as e:
+                self.log(f"  Error collecting info for {ap_id}: {str(e)}")
+        return records
+    
+    def _collect_status_direct(self, tabs, db):
+        """Fetch status.xml over HTTP without the browser (see direct_status_collection).
+        
+        Args:
+            tabs: Connected ap_tabs entries
+            db: DatabaseManager for the shared collector
+            
+        Returns:
+            tuple: (APStatusRecord list, tabs that could not be collected)
         """
-        import re
+        from status_collector import get_status_collector
         
-        if context == "service":
-            # Service status is the first Status field
-            pattern = r'<th>Status:</th>\s*<td[^>]*>([^<]*)</td>'
-            match = re.search(pattern, html_text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        elif context == "daemon":
-            # Daemon status is the second Status field
-            pattern = r'<th>Status:</th>\s*<td[^>]*>([^<]*)</td>'
-            matches = re.findall(pattern, html_text, re.IGNORECASE)
-            if len(matches) >= 2:
-                return matches[1].strip()
+        def on_status(ap_id, success, result):
+            if success:
+                self._log_status_record(ap_id, result)
+            else:
+                self.log(f"  Error collecting info for {ap_id} over HTTP: {result}")
         
-        return None
+        results = get_status_collector(db).collect([tab_info['ap_info'] for tab_info in tabs],
+                                                   on_result=on_status)
+        records = [result for success, result in results.values() if success]
+        failed = [tab_info for tab_info in tabs
+                  if not results.get(tab_info['ap_info'].get('ap_id'), (False,))[0]]
+        return records, failed
     
     def collect_current_page_data(self, ap_id):
         """Collect data from the current status.xml page and update database.
@@ -558,15 +490,12 @@ class BrowserManager:
         if not self.driver:
             return {'status': 'error', 'message': 'Browser not initialized'}
         
-        if not self.extract_xml_callback:
-            return {'status': 'error', 'message': 'Extract callback not configured'}
-        
         if not self.db:
             return {'status': 'error', 'message': 'Database not configured'}
         
         try:
-            from credential_manager_v2 import CredentialManager
-            creds_manager = CredentialManager()
+            from services import get_credential_manager
+            creds_manager = get_credential_manager()
             
             page_source = self.driver.page_source
             
@@ -574,63 +503,19 @@ class BrowserManager:
             if 'status.xml' not in self.driver.current_url:
                 return {'status': 'error', 'message': 'Not on status.xml page'}
             
-            # Extract all fields
-            extracted_ap_id = self.extract_xml_callback(page_source, "AP ID")
-            transmitter = self.extract_xml_callback(page_source, "Transmitter")
-            store_id = self.extract_xml_callback(page_source, "Store ID")
-            ip_address = self.extract_xml_callback(page_source, "IP Address")
-            serial_number = self.extract_xml_callback(page_source, "Serial Number")
-            software_version = self.extract_xml_callback(page_source, "Software Version")
-            firmware_version = self.extract_xml_callback(page_source, "Firmware Version")
-            hardware_revision = self.extract_xml_callback(page_source, "Hardware Revision")
-            build = self.extract_xml_callback(page_source, "Build")
-            configuration_mode = self.extract_xml_callback(page_source, "Configuration mode")
-            uptime = self.extract_xml_callback(page_source, "Uptime")
-            mac_address = self.extract_xml_callback(page_source, "MAC Address")
-            
-            # Extract status fields
-            service_status = self._extract_status_field(page_source, "service")
-            communication_daemon_status = self._extract_status_field(page_source, "daemon")
-            
-            # Extract connectivity status
-            connectivity_internet = self.extract_xml_callback(page_source, "Internet")
-            connectivity_provisioning = self.extract_xml_callback(page_source, "Provisioning")
-            connectivity_ntp_server = self.extract_xml_callback(page_source, "NTP Server")
-            connectivity_apc_address = self.extract_xml_callback(page_source, "APC Address")
-            
-            self.log(f"Collected data - AP ID: {extracted_ap_id}, Type: {transmitter}, Store: {store_id}")
-            self.log(f"  Serial: {serial_number}, SW: {software_version}, FW: {firmware_version}")
-            self.log(f"  Service: {service_status}, Daemon: {communication_daemon_status}")
+            # Parse every field in one pass over the page
+            record = parse_status_page(page_source)
+            extracted_ap_id = record.ap_id
+            
+            self.log(f"Collected data - AP ID: {extracted_ap_id}, Type: {record.type}, Store: {record.store_id}")
+            self.log(f"  Serial: {record.serial_number}, SW: {record.software_version}, FW: {record.firmware_version}")
+            self.log(f"  Service: {record.service_status}, Daemon: {record.communication_daemon_status}")
             
             if extracted_ap_id:
                 existing_ap = creds_manager.find_by_ap_id(extracted_ap_id)
                 
                 if existing_ap:
-                    # Prepare update data
-                    update_data = {}
-                    fields_to_update = [
-                        ('ip_address', ip_address),
-                        ('store_id', store_id),
-                        ('type', transmitter),
-                        ('serial_number', serial_number),
-                        ('software_version', software_version),
-                        ('firmware_version', firmware_version),
-                        ('hardware_revision', hardware_revision),
-                        ('build', build),
-                        ('configuration_mode', configuration_mode),
-                        ('service_status', service_status),
-                        ('uptime', uptime),
-                        ('communication_daemon_status', communication_daemon_status),
-                        ('mac_address', mac_address),
-                        ('connectivity_internet', connectivity_internet),
-                        ('connectivity_provisioning', connectivity_provisioning),
-                        ('connectivity_ntp_server', connectivity_ntp_server),
-                        ('connectivity_apc_address', connectivity_apc_address)
-                    ]
-                    
-                    for field_name, new_value in fields_to_update:
-                        if new_value and existing_ap.get(field_name) != new_value:
-                            update_data[field_name] = new_value
+                    update_data = record.changes_from(existing_ap)
                     
                     if update_data:
                         success, msg = creds_manager.update_credential(
@@ -659,11 +544,12 @@ class BrowserManager:
             return {'status': 'error', 'message': error_msg}
     
     def close(self):
-        """Close the browser"""
+        """Return the browser to the shared pool (it is reset and kept warm)"""
         if self.driver:
             try:
-                self.driver.quit()
+                get_webdriver_pool().release(self.driver)
                 self.driver = None
+                self.waiter = None
                 self.ap_tabs = []
                 self.log("Browser closed")
             except Exception as e:
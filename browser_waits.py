@@ -0,0 +1,239 @@
+"""
+Browser Waits - Explicit-wait helpers for Selenium flows
+Waits on concrete page conditions (document ready, elements, URL changes, page
+reloads, network idle) instead of fixed sleeps, and records how long each step took.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Tuple
+
+from selenium.common.exceptions import (StaleElementReferenceException, TimeoutException,
+                                        WebDriverException)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# Resource count + readyState, used to detect network idle without a CDP event stream
+_NETWORK_STATE_JS = (
+    "return [document.readyState, "
+    "(window.performance && performance.getEntriesByType) ? "
+    "performance.getEntriesByType('resource').length : 0];"
+)
+
+
+class PageWaiter:
+    """
+    Explicit waits for one WebDriver.
+
+    All waits poll a condition with WebDriverWait and return as soon as it
+    holds, so a fast AP is not slowed down by a sleep sized for the slowest
+    one. Implicit waits are switched off while a wait runs, otherwise every
+    failed lookup inside the poll loop would block for the implicit timeout.
+
+    Use step() to time named stages:
+
+        waiter = PageWaiter(driver, log_callback=self.log)
+        with waiter.step("load status.xml"):
+            driver.get(url)
+            waiter.wait_for_element(By.TAG_NAME, "th")
+        print(waiter.timing_summary())
+    """
+
+    def __init__(self, driver, timeout: float = 15.0, poll_frequency: float = 0.1,
+                 log_callback: Callable[[str], None] = None):
+        """
+        Initialize the waiter.
+
+        Args:
+            driver: Selenium WebDriver
+            timeout: Default timeout for waits in seconds
+            poll_frequency: Seconds between condition checks
+            log_callback: Optional function for step timing messages
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.log_callback = log_callback
+        self.timings: List[Tuple[str, float]] = []
+
+    # ==================== Timing ====================
+
+    @contextmanager
+    def step(self, name: str):
+        """Time a named step; the duration is kept in timings and logged."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings.append((name, elapsed))
+            if self.log_callback:
+                self.log_callback(f"  ⏱ {name}: {elapsed * 1000:.0f} ms")
+
+    def timing_summary(self, limit: int = None) -> str:
+        """One line per recorded step, slowest first."""
+        slowest = sorted(self.timings, key=lambda t: t[1], reverse=True)[:limit]
+        lines = [f"{name}: {seconds * 1000:.0f} ms" for name, seconds in slowest]
+        return "\n".join(lines)
+
+    # ==================== Generic ====================
+
+    @contextmanager
+    def _no_implicit_wait(self):
+        try:
+            previous = self.driver.timeouts.implicit_wait
+        except Exception:
+            previous = 0
+        if previous:
+            self.driver.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            if previous:
+                self.driver.implicitly_wait(previous)
+
+    def until(self, condition: Callable, timeout: float = None, message: str = ''):
+        """
+        Wait until condition(driver) returns a truthy value and return it.
+
+        Raises:
+            TimeoutException: If the condition does not hold in time
+        """
+        wait = WebDriverWait(self.driver, self.timeout if timeout is None else timeout,
+                             poll_frequency=self.poll_frequency,
+                             ignored_exceptions=(StaleElementReferenceException,))
+        with self._no_implicit_wait():
+            return wait.until(condition, message)
+
+    def try_until(self, condition: Callable, timeout: float = None):
+        """Like until() but returns None instead of raising on timeout."""
+        try:
+            return self.until(condition, timeout)
+        except TimeoutException:
+            return None
+
+    # ==================== Page state ====================
+
+    def wait_for_ready(self, timeout: float = None, state: str = 'complete') -> bool:
+        """Wait for document.readyState ('interactive' or 'complete') on a real page."""
+        accepted = ('interactive', 'complete') if state == 'interactive' else ('complete',)
+
+        def ready(driver):
+            try:
+                # A new tab's placeholder page is 'complete' before navigation starts
+                url = driver.current_url
+                if url.startswith('about:blank') or url == 'data:,':
+                    return False
+                return driver.execute_script("return document.readyState") in accepted
+            except WebDriverException:
+                return False
+
+        return self.try_until(ready, timeout) is not None
+
+    def load(self, url: str, timeout: float = None) -> bool:
+        """Navigate to url (tolerating page load timeouts) and wait for it to finish loading."""
+        try:
+            self.driver.get(url)
+        except TimeoutException:
+            pass
+        return self.wait_for_ready(timeout)
+
+    def start_loading(self, url: str):
+        """Start navigating the current tab to url without waiting for the page to load."""
+        self.driver.execute_script("window.location.href = arguments[0];", url)
+
+    def wait_for_reload(self, old_html, timeout: float = None) -> bool:
+        """
+        Wait for the page that contained old_html to be replaced and the new one to load.
+
+        Args:
+            old_html: The <html> element captured before the action (see current_document())
+        """
+        if old_html is None:
+            return self.wait_for_ready(timeout)
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        if self.try_until(EC.staleness_of(old_html), timeout) is None:
+            return False
+        return self.wait_for_ready(max(0.1, deadline - time.monotonic()))
+
+    def current_document(self):
+        """The current <html> element, for wait_for_reload() after a click or submit."""
+        try:
+            with self._no_implicit_wait():
+                return self.driver.find_element(By.TAG_NAME, 'html')
+        except WebDriverException:
+            return None
+
+    def wait_for_url_change(self, old_url: str, timeout: float = None) -> bool:
+        return self.try_until(EC.url_changes(old_url), timeout) is not None
+
+    def wait_for_url_contains(self, fragment: str, timeout: float = None) -> bool:
+        return self.try_until(EC.url_contains(fragment), timeout) is not None
+
+    def wait_for_network_idle(self, idle_time: float = 0.5, timeout: float = None) -> bool:
+        """
+        Wait until the page is loaded and no new resources were fetched for idle_time seconds.
+
+        Uses the Resource Timing API, so it also covers XHR/fetch traffic started
+        by scripts after the load event.
+        """
+        state = {'count': -1, 'since': time.monotonic()}
+
+        def idle(driver):
+            try:
+                ready_state, count = driver.execute_script(_NETWORK_STATE_JS)
+            except WebDriverException:
+                return False
+            now = time.monotonic()
+            if ready_state != 'complete' or count != state['count']:
+                state['count'] = count
+                state['since'] = now
+                return False
+            return now - state['since'] >= idle_time
+
+        return self.try_until(idle, timeout) is not None
+
+    # ==================== Elements ====================
+
+    def wait_for_element(self, by: str, value: str, timeout: float = None,
+                         clickable: bool = False, visible: bool = False):
+        """
+        Wait for an element and return it.
+
+        Raises:
+            TimeoutException: If the element does not appear in time
+        """
+        if clickable:
+            condition = EC.element_to_be_clickable((by, value))
+        elif visible:
+            condition = EC.visibility_of_element_located((by, value))
+        else:
+            condition = EC.presence_of_element_located((by, value))
+        return self.until(condition, timeout, f"Element not found: {value}")
+
+    def find_element(self, by: str, value: str, timeout: float = None):
+        """Wait for an element and return it, or None if it does not appear."""
+        try:
+            return self.wait_for_element(by, value, timeout)
+        except TimeoutException:
+            return None
+
+    def click(self, element):
+        """Click an element, falling back to a JavaScript click if it is covered."""
+        try:
+            element.click()
+        except WebDriverException:
+            self.driver.execute_script("arguments[0].click();", element)
+
+    def click_and_wait_for_reload(self, element, timeout: float = None) -> bool:
+        """Click a link or submit button and wait for the resulting page load."""
+        old_html = self.current_document()
+        self.click(element)
+        return self.wait_for_reload(old_html, timeout)
+
+    def wait_for_selected(self, element, selected: bool, timeout: float = None) -> bool:
+        """Wait for a checkbox to reach the given state (after a click)."""
+        return self.try_until(EC.element_selection_state_to_be(element, selected), timeout) is not None
+
@@ -396,112 +396,74 @@ class ConnectionStatusDialog:
         self.dialog.update_idletasks()
     
     def _on_export(self):
-        """Export the status data to Excel."""
+        """Export the status data to Excel (or CSV if openpyxl is not installed)."""
         try:
+            import importlib.util
             from tkinter import filedialog, messagebox
             from datetime import datetime
+            from ap_export import is_csv, write_table
             
-            # Try to import openpyxl for Excel export
-            try:
-                from openpyxl import Workbook
-                from openpyxl.styles import Font, Alignment, PatternFill
-                use_excel = True
-            except ImportError:
-                use_excel = False
+            use_excel = importlib.util.find_spec('openpyxl') is not None
             
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             if use_excel:
-                # Export to Excel (.xlsx)
-                default_filename = f"ap_status_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
                 filepath = filedialog.asksaveasfilename(
                     parent=self.dialog,
                     title="Export to Excel",
                     defaultextension=".xlsx",
-                    filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-                    initialfile=default_filename
+                    filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"), ("All files", "*.*")],
+                    initialfile=f"ap_status_{timestamp}.xlsx"
                 )
-                
-                if not filepath:
-                    return
-                
-                # Create workbook and worksheet
-                wb = Workbook()
-                ws = wb.active
-                ws.title = "AP Status"
-                
-                # Write header with styling
-                headers = ["Store ID", "AP ID", "IP Address", "Enabled/Disabled", "Status", "Message"]
-                ws.append(headers)
-                
-                # Style header row
-                header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-                header_font = Font(bold=True, color="FFFFFF")
-                for cell in ws[1]:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-                
-                # Write data rows
-                for item in self.tree.get_children():
-                    values = self.tree.item(item, "values")
-                    
-                    store_id = values[0] if len(values) > 0 else ""
-                    ap_id = values[1] if len(values) > 1 else ""
-                    ip_address = values[2] if len(values) > 2 else ""
-                    result = values[3] if len(values) > 3 else ""
-                    status = values[4] if len(values) > 4 else ""
-                    full_msg = self.full_messages.get(item, values[5] if len(values) > 5 else "")
-                    
-                    ws.append([store_id, ap_id, ip_address, result, status, full_msg])
-                
-                # Auto-adjust column widths
-                ws.column_dimensions['A'].width = 20  # Store ID
-                ws.column_dimensions['B'].width = 15  # AP ID
-                ws.column_dimensions['C'].width = 18  # IP Address
-                ws.column_dimensions['D'].width = 12  # Enabled/Disabled
-                ws.column_dimensions['E'].width = 15  # Status
-                ws.column_dimensions['F'].width = 60  # Message
-                
-                # Save workbook
-                wb.save(filepath)
-                messagebox.showinfo("Export Successful", f"Data exported to:\n{filepath}", parent=self.dialog)
-                
             else:
-                # Fallback to CSV if openpyxl not available
-                import csv
-                default_filename = f"ap_status_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
                 filepath = filedialog.asksaveasfilename(
                     parent=self.dialog,
                     title="Export to CSV",
                     defaultextension=".csv",
                     filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                    initialfile=default_filename
+                    initialfile=f"ap_status_{timestamp}.csv"
                 )
-                
-                if not filepath:
-                    return
-                
-                with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
-                    writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-                    writer.writerow(["Store ID", "AP ID", "IP Address", "Enabled/Disabled", "Status", "Message"])
-                    
-                    for item in self.tree.get_children():
-                        values = self.tree.item(item, "values")
-                        store_id = values[0] if len(values) > 0 else ""
-                        ap_id = values[1] if len(values) > 1 else ""
-                        ip_address = values[2] if len(values) > 2 else ""
-                        result = values[3] if len(values) > 3 else ""
-                        status = values[4] if len(values) > 4 else ""
-                        full_msg = self.full_messages.get(item, values[5] if len(values) > 5 else "")
-                        clean_msg = full_msg.replace('\n', ' ').replace('\r', ' ').strip()
-                        clean_msg = ' '.join(clean_msg.split())
-                        writer.writerow([store_id, ap_id, ip_address, result, status, clean_msg])
-                
-                messagebox.showinfo("Export Successful", f"Data exported to:\n{filepath}\n\nNote: Install 'openpyxl' for native Excel format export.", parent=self.dialog)
+            
+            if not filepath:
+                return
+            
+            if not use_excel and not is_csv(filepath):
+                filepath += ".csv"
+            
+            headers = ["Store ID", "AP ID", "IP Address", "Enabled/Disabled", "Status", "Message"]
+            write_table(
+                filepath,
+                headers,
+                self._iter_export_rows(single_line=is_csv(filepath)),
+                sheet_title="AP Status",
+                column_widths={'A': 20, 'B': 15, 'C': 18, 'D': 12, 'E': 15, 'F': 60}
+            )
+            
+            message = f"Data exported to:\n{filepath}"
+            if not use_excel:
+                message += "\n\nNote: Install 'openpyxl' for native Excel format export."
+            messagebox.showinfo("Export Successful", message, parent=self.dialog)
             
         except Exception as e:
             from tkinter import messagebox
             messagebox.showerror("Export Failed", f"Failed to export data:\n{str(e)}", parent=self.dialog)
     
+    def _iter_export_rows(self, single_line=False):
+        """Yield one export row per AP (read from the tree as the file is written).
+        
+        Args:
+            single_line: Collapse line breaks in messages (for CSV)
+        """
+        for item in self.tree.get_children():
+            # Column 0 is the selection checkbox
+            values = list(self.tree.item(item, "values"))[1:7]
+            values += [""] * (6 - len(values))
+            store_id, ap_id, ip_address, result, status, message = values
+            full_msg = self.full_messages.get(item, message)
+            if single_line:
+                full_msg = ' '.join(full_msg.split())
+            
+            yield [store_id, ap_id, ip_address, result, status, full_msg]
+    
     def _on_close(self):
         """Hide the dialog (don't destroy it so we can show it again)."""
         self.dialog.withdraw()
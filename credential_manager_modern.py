@@ -7,6 +7,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from pathlib import Path
 from credential_manager_v2 import CredentialManager
+from services import get_credential_manager
 from datetime import datetime
 import re
 
@@ -42,7 +43,10 @@ class ModernCredentialManager:
         self.root.configure(bg="#F5F5F5")
         
         # Initialize credential manager
-        self.credential_manager = CredentialManager()
+        if db_manager is not None:
+            self.credential_manager = CredentialManager(db_manager=db_manager)
+        else:
+            self.credential_manager = get_credential_manager()
         self.selected_credential = None
         self.sort_reverse = {}
         self.search_timer = None
@@ -574,7 +578,7 @@ class ModernCredentialManager:
         filename = filedialog.asksaveasfilename(
             title="Save Excel File",
             defaultextension=".xlsx",
-            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+            filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"), ("All files", "*.*")],
             parent=self.root
         )
         
@@ -8,6 +8,8 @@ the new SQLite database backend for better performance and concurrent access.
 
 from typing import List, Dict, Optional
 from database_manager import DatabaseManager
+from ap_catalog import get_ap_catalog
+from ap_export import CREDENTIAL_COLUMNS, export_access_points
 from pathlib import Path
 import pandas as pd
 from datetime import datetime
@@ -18,17 +20,23 @@ class CredentialManager:
     Maintains API compatibility with the old JSON-based version.
     """
     
-    def __init__(self, db_file: str = None):
-        self.db = DatabaseManager(db_file)
+    def __init__(self, db_file: str = None, db_manager: DatabaseManager = None):
+        """
+        Args:
+            db_file: Database file (default: ~/.vera_database.db)
+            db_manager: Existing DatabaseManager to use instead of opening db_file
+        """
+        self.db = db_manager if db_manager is not None else DatabaseManager(db_file)
+        # Shared per database file, so new CredentialManager instances start warm
+        self.catalog = get_ap_catalog(self.db)
         self._auto_migrate()
     
     def _auto_migrate(self):
         """Automatically migrate from JSON if it exists and database is empty."""
-        stats = self.db.get_database_stats()
-        if stats['total_aps'] == 0:
-            # Check for old JSON file
-            old_json = Path.home() / ".esl_ap_credentials.json"
-            if old_json.exists():
+        # Check for old JSON file first - counting rows is the expensive part
+        old_json = Path.home() / ".esl_ap_credentials.json"
+        if old_json.exists():
+            if self.db.get_database_stats()['total_aps'] == 0:
                 print("Detected old JSON credentials file. Migrating to SQLite...")
                 success, message = self.db.migrate_from_json(str(old_json))
                 if success:
@@ -48,10 +56,19 @@ class CredentialManager:
         """Save credentials (no-op for backward compatibility)."""
         return True
     
+    # Excel template column -> access_points column
+    EXCEL_COLUMNS = dict(CREDENTIAL_COLUMNS)
+    
     def import_from_excel(self, excel_file: str) -> tuple:
-        """Import credentials from Excel file."""
+        """Import credentials from Excel file.
+        
+        All rows are validated and written in one transaction
+        (DatabaseManager.bulk_upsert_access_points). Rows that fail validation
+        are skipped and listed in the message with their Excel row number.
+        """
         try:
-            df = pd.read_excel(excel_file)
+            # Read everything as text so AP IDs like 201265 don't become 201265.0
+            df = pd.read_excel(excel_file, dtype=str)
             
             required_columns = [
                 'Retail Chain', 'Store ID', 'Store Alias', 'AP ID', 'Type',
@@ -63,71 +80,58 @@ class CredentialManager:
             if missing_columns:
                 return False, f"Missing columns: {', '.join(missing_columns)}"
             
-            imported_count = 0
-            updated_count = 0
+            columns = [col for col in self.EXCEL_COLUMNS if col in df.columns]
+            df = df[columns].fillna('').rename(columns=self.EXCEL_COLUMNS)
             
-            for _, row in df.iterrows():
-                if pd.isna(row['AP ID']) or pd.isna(row['Password Web UI']) or pd.isna(row['Password SSH']):
+            # Excel row number = DataFrame index + 2 (header row, 1-based)
+            rows, excel_rows, skipped = [], [], []
+            for index, row in zip(df.index, df.to_dict('records')):
+                if not row['ap_id'].strip() or not row['password_webui'] or not row['password_ssh']:
+                    skipped.append(index + 2)
                     continue
-                
-                ap_data = {
-                    'retail_chain': str(row['Retail Chain']) if not pd.isna(row['Retail Chain']) else '',
-                    'store_id': str(row['Store ID']),
-                    'store_alias': str(row['Store Alias']) if not pd.isna(row['Store Alias']) else '',
-                    'ap_id': str(row['AP ID']),
-                    'ip_address': str(row['IP Address']) if 'IP Address' in df.columns and not pd.isna(row['IP Address']) else '',
-                    'type': str(row['Type']) if not pd.isna(row['Type']) else '',
-                    'username_webui': str(row['Username Web UI']) if not pd.isna(row['Username Web UI']) else '',
-                    'password_webui': str(row['Password Web UI']) if not pd.isna(row['Password Web UI']) else '',
-                    'username_ssh': str(row['Username SSH']) if not pd.isna(row['Username SSH']) else '',
-                    'password_ssh': str(row['Password SSH']) if not pd.isna(row['Password SSH']) else '',
-                    'su_password': str(row['SU Password']) if not pd.isna(row['SU Password']) else '',
-                    'notes': str(row['Notes']) if not pd.isna(row['Notes']) else '',
-                }
-                
-                existing = self.find_by_ap_id(ap_data['ap_id'])
-                if existing:
-                    success, msg = self.db.update_access_point(ap_data['ap_id'], ap_data)
-                    if success:
-                        updated_count += 1
-                else:
-                    success, msg = self.db.add_access_point(ap_data)
-                    if success:
-                        imported_count += 1
+                rows.append(row)
+                excel_rows.append(index + 2)
+            
+            result = self.db.bulk_upsert_access_points(rows)
             
-            return True, f"Imported {imported_count} new, updated {updated_count} existing credentials"
+            message = (f"Imported {result['inserted']} new, updated {result['updated']} existing credentials "
+                       f"({result['rows_per_second']:.0f} rows/s)")
+            if skipped:
+                message += f"\nSkipped {len(skipped)} rows without AP ID or passwords"
+            if result['errors']:
+                message += f"\n{len(result['errors'])} rows failed:"
+                for index, ap_id, error in result['errors'][:10]:
+                    location = f"Row {excel_rows[index]}" if index is not None else "Import"
+                    message += f"\n  {location}{f' (AP {ap_id})' if ap_id else ''}: {error}"
+                if len(result['errors']) > 10:
+                    message += f"\n  ... and {len(result['errors']) - 10} more"
+            
+            return result['inserted'] + result['updated'] > 0 or not result['errors'], message
             
         except Exception as e:
             return False, f"Error importing Excel: {str(e)}"
     
-    def export_to_excel(self, excel_file: str) -> tuple:
-        """Export credentials to Excel file."""
+    def export_to_excel(self, excel_file: str, include_passwords: bool = True) -> tuple:
+        """Export credentials to an Excel (.xlsx) or CSV (.csv) file.
+        
+        Rows are streamed from the database, so memory use does not grow with
+        the number of access points.
+        
+        Args:
+            excel_file: Target file; the extension selects the format
+            include_passwords: Export (and decrypt) the password columns
+        """
         try:
-            aps = self.get_all()
-            if not aps:
+            if self.db.get_database_stats()['total_aps'] == 0:
                 return False, "No credentials to export"
             
-            df_data = []
-            for ap in aps:
-                df_data.append({
-                    'Retail Chain': ap.get('retail_chain', ''),
-                    'Store ID': ap.get('store_id', ''),
-                    'Store Alias': ap.get('store_alias', ''),
-                    'AP ID': ap.get('ap_id', ''),
-                    'IP Address': ap.get('ip_address', ''),
-                    'Type': ap.get('type', ''),
-                    'Username Web UI': ap.get('username_webui', ''),
-                    'Password Web UI': ap.get('password_webui', ''),
-                    'Username SSH': ap.get('username_ssh', ''),
-                    'Password SSH': ap.get('password_ssh', ''),
-                    'SU Password': ap.get('su_password', ''),
-                    'Notes': ap.get('notes', '')
-                })
-            
-            df = pd.DataFrame(df_data)
-            df.to_excel(excel_file, index=False, engine='openpyxl')
+            columns = CREDENTIAL_COLUMNS
+            if not include_passwords:
+                columns = [(header, column) for header, column in columns
+                           if column not in self.db.ENCRYPTED_FIELDS]
             
-            return True, f"Exported {len(aps)} credentials to {excel_file}"
+            count = export_access_points(self.db, excel_file, columns)
+            return True, f"Exported {count} credentials to {excel_file}"
             
         except Exception as e:
             return False, f"Error exporting Excel: {str(e)}"
@@ -146,27 +150,22 @@ class CredentialManager:
     
     def find_by_store_id(self, store_id: str) -> List[Dict]:
         """Find all credentials for a store."""
-        all_aps = self.get_all()
-        return [ap for ap in all_aps if ap.get('store_id', '').lower() == store_id.lower()]
+        return self.catalog.find_by_store(store_id)
     
     def find_by_ap_id(self, ap_id: str) -> Optional[Dict]:
         """Find credential by AP ID."""
-        return self.db.get_access_point(ap_id)
+        return self.catalog.get(ap_id)
     
     def find_by_store_and_ap(self, store_id: str, ap_id: str) -> Optional[Dict]:
         """Find credential by store ID and AP ID."""
-        ap = self.db.get_access_point(ap_id)
+        ap = self.catalog.get(ap_id)
         if ap and ap.get('store_id', '').lower() == store_id.lower():
             return ap
         return None
     
     def find_by_ip(self, ip_address: str) -> Optional[Dict]:
         """Find credential by IP address."""
-        all_aps = self.get_all()
-        for ap in all_aps:
-            if ap.get('ip_address', '').lower() == ip_address.lower():
-                return ap
-        return None
+        return self.catalog.find_by_ip(ip_address)
     
     def search(self, query: str) -> List[Dict]:
         """Search credentials by any field."""
@@ -174,8 +173,8 @@ class CredentialManager:
     
     def get_all(self) -> List[Dict]:
         """Get all credentials."""
-        return self.db.get_all_access_points()
+        return self.catalog.all()
     
     def count(self) -> int:
         """Get total number of credentials."""
-        return len(self.get_all())
+        return self.catalog.count()
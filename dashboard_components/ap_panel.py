@@ -283,61 +283,61 @@ class APPanel:
                     def fetch_jira_data():
                         from jira_integration import JiraIntegration
                         from jira_db_manager import JiraDBManager
-                        from credentials_manager import CredentialsManager
+                        from jira_ap_matcher import APIDMatcher
+                        from jira_sync import build_ap_jqls, get_jira_sync_service
+                        from services import get_credentials_manager
                         
                         jira_integration = JiraIntegration(self.db)
                         jira_db = JiraDBManager(self.db)
-                        credentials = CredentialsManager(self.db).get_credentials('jira')
+                        credentials = get_credentials_manager().get_credentials('jira')
                         jira_base_url = credentials.get('url', '').rstrip('/') if credentials else ''
                         
                         jira_counts = {}
                         
                         try:
-                            if jira_integration.is_configured():
-                                # Build a single JQL query for all AP IDs
-                                ap_ids = [ap['ap_id'] for ap in results]
-                                
-                                # Create OR conditions for all AP IDs
-                                search_terms = []
-                                for ap_id in ap_ids:
-                                    search_term_jira = f"{ap_id}*" if ap_id.isdigit() else ap_id
-                                    search_terms.append(f'text ~ "{search_term_jira}"')
-                                
-                                # Combine all search terms with OR (limit to reasonable JQL length)
-                                # If too many APs, batch them
-                                batch_size = 50
-                                all_issues = []
-                                
-                                for i in range(0, len(search_terms), batch_size):
-                                    batch_terms = search_terms[i:i+batch_size]
-                                    jql = f'({" OR ".join(batch_terms)})'
-                                    
-                                    success, result, message = jira_integration.search_issues(jql, max_results=1000)
+                            ap_ids = [ap['ap_id'] for ap in results]
+                            
+                            # Show cached counts right away
+                            jira_counts = jira_db.count_open_issues(ap_ids)
+                            self.parent.after(0, lambda c=jira_counts: self._update_jira_counts(c, final=False))
+                            
+                            # APs kept current by the background sync don't need a live query
+                            live_ap_ids = ap_ids
+                            if get_jira_sync_service(self.db).is_current():
+                                tracked = set(jira_db.get_tracked_aps(ap_ids))
+                                live_ap_ids = [ap_id for ap_id in ap_ids if ap_id not in tracked]
+                                # Shown from the cache, so keep them tracked
+                                jira_db.track_aps(list(tracked))
+                            
+                            if live_ap_ids and jira_integration.is_configured():
+                                # Batches of OR-terms run concurrently; store each page as it
+                                # arrives and show counts for the APs it touched right away
+                                jqls = build_ap_jqls(live_ap_ids)
+                                matcher = APIDMatcher(live_ap_ids)
+                                errors = []
+                                for _, page in jira_integration.iter_batch_pages(
+                                        jqls, fields=JiraDBManager.LINK_FIELDS, errors=errors):
+                                    # Find which AP(s) each issue belongs to, store them together
+                                    links = matcher.attribute(page.issues)
+                                    jira_db.store_issues(links, jira_base_url)
+                                    touched = {ap_id for ap_id, _ in links}
                                     
-                                    if success and result:
-                                        issues = result.get('issues', [])
-                                        all_issues.extend(issues)
+                                    if touched:
+                                        page_counts = jira_db.count_open_issues(list(touched))
+                                        self.parent.after(0, lambda c=page_counts: self._update_jira_counts(c, final=False))
                                 
-                                # Process all issues and match them to APs
-                                for issue in all_issues:
-                                    issue_text = f"{issue.get('key', '')} {issue.get('fields', {}).get('summary', '')} {issue.get('fields', {}).get('description', '')}"
-                                    
-                                    # Find which AP(s) this issue belongs to
-                                    for ap_id in ap_ids:
-                                        if ap_id.lower() in issue_text.lower():
-                                            jira_db.store_issue(ap_id, issue, jira_base_url)
+                                # The background sync keeps these APs current from now on
+                                if not errors:
+                                    jira_db.track_aps(live_ap_ids)
                                 
-                                # Count open issues for each AP
-                                for ap_id in ap_ids:
-                                    all_issues_for_ap = jira_db.get_issues_for_ap(ap_id)
-                                    open_issues = [i for i in all_issues_for_ap if i.get('status', '').strip().lower() not in ['resolved', 'closed', 'done']]
-                                    jira_counts[ap_id] = len(open_issues)
+                                # Count open issues for all APs in one query
+                                jira_counts = jira_db.count_open_issues(ap_ids)
                             
                         except Exception as e:
                             self._log(f"Error fetching Jira data: {str(e)}", "error")
                             # Set 0 for all APs on error
                             for ap in results:
-                                jira_counts[ap['ap_id']] = 0
+                                jira_counts.setdefault(ap['ap_id'], 0)
                         
                         # Update UI in main thread
                         self.parent.after(0, lambda: self._update_jira_counts(jira_counts))
@@ -369,8 +369,8 @@ class APPanel:
             messagebox.showerror("Search Error", f"Failed to search: {e}", parent=self.parent)
             self._log(f"Search error: {e}", "error")
     
-    def _update_jira_counts(self, jira_counts):
-        """Update Jira counts in search results after background fetch."""
+    def _update_jira_counts(self, jira_counts, final=True):
+        """Update Jira counts in search results during/after background fetch."""
         for item in self.search_results.get_children():
             tags = self.search_results.item(item, "tags")
             if tags:
@@ -380,7 +380,8 @@ class APPanel:
                     values[4] = str(jira_counts[ap_id])  # Index 4 is jira_count now
                     self.search_results.item(item, values=values)
         
-        self._log(f"Jira data loaded for {len(jira_counts)} APs")
+        if final:
+            self._log(f"Jira data loaded for {len(jira_counts)} APs")
     
     def _load_vusion_status_thread(self, aps):
         """Background thread to load Vusion status for all APs."""
@@ -402,8 +403,8 @@ class APPanel:
                     continue
                 
                 # Check if API key is configured for this country
-                from vusion_api_config import VusionAPIConfig
-                config = VusionAPIConfig()
+                from vusion_api_config import get_vusion_config
+                config = get_vusion_config()
                 api_key = config.get_api_key(country, 'vusion_pro')
                 
                 if not api_key:
@@ -1048,7 +1049,7 @@ class APPanel:
         def load_vusion():
             try:
                 from vusion_api_helper import VusionAPIHelper
-                from vusion_api_config import VusionAPIConfig
+                from vusion_api_config import get_vusion_config
                 
                 ap_id = ap_data.get('ap_id', '')
                 store_id = ap_data.get('store_id', '')
@@ -1062,7 +1063,7 @@ class APPanel:
                     return
                 
                 # Check if API key is configured
-                config = VusionAPIConfig()
+                config = get_vusion_config()
                 api_key = config.get_api_key(country, 'vusion_pro')
                 if not api_key:
                     return
@@ -1169,9 +1170,8 @@ class APPanel:
     def _save_vusion_data_to_db(self, ap_id, transmitter_data):
         """Save Vusion transmitter data to database."""
         try:
-            # Import database manager
-            from database_manager import DatabaseManager
-            db = DatabaseManager()
+            from services import get_database_manager
+            db = get_database_manager()
             
             # Update Vusion data in database
             success, message = db.update_vusion_data(ap_id, transmitter_data)
@@ -1665,9 +1665,9 @@ class APPanel:
         def perform_action():
             try:
                 from selenium.webdriver.common.by import By
-                import time
                 
                 driver = self.content_panel.browser_manager.driver
+                waiter = self.content_panel.browser_manager.waiter
                 ip = ap_data.get('ip_address', '').strip()
                 if ip.startswith('http'):
                     ip = ip.split('://')[1]
@@ -1680,16 +1680,11 @@ class APPanel:
                     self.parent.after(0, lambda: self._log(msg))
                 
                 log(f"Navigating to {url}")
-                driver.get(url)
-                time.sleep(2)
+                waiter.load(url)
                 
                 # Find the checkbox
-                checkboxes = driver.find_elements(By.NAME, "provisioningEnabled")
-                provisioning_checkbox = None
-                for cb in checkboxes:
-                    if cb.get_attribute("type") == "checkbox":
-                        provisioning_checkbox = cb
-                        break
+                provisioning_checkbox = waiter.find_element(
+                    By.CSS_SELECTOR, "input[type='checkbox'][name='provisioningEnabled']", timeout=10)
                 
                 if not provisioning_checkbox:
                     log("✗ Could not find provisioning checkbox")
@@ -1713,19 +1708,12 @@ class APPanel:
                         return
                     
                     log("Enabling provisioning...")
-                    try:
-                        provisioning_checkbox.click()
-                    except:
-                        driver.execute_script("arguments[0].click();", provisioning_checkbox)
-                    time.sleep(1)
+                    waiter.click(provisioning_checkbox)
+                    waiter.wait_for_selected(provisioning_checkbox, True, timeout=3)
                     
                     # Click save
                     save_button = driver.find_element(By.CSS_SELECTOR, "input[type='submit'][value='Save']")
-                    try:
-                        save_button.click()
-                    except:
-                        driver.execute_script("arguments[0].click();", save_button)
-                    time.sleep(2)
+                    waiter.click_and_wait_for_reload(save_button, timeout=15)
                     
                     log("✓ Provisioning enabled")
                     # Log activity
@@ -1742,19 +1730,12 @@ class APPanel:
                         return
                     
                     log("Disabling provisioning...")
-                    try:
-                        provisioning_checkbox.click()
-                    except:
-                        driver.execute_script("arguments[0].click();", provisioning_checkbox)
-                    time.sleep(1)
+                    waiter.click(provisioning_checkbox)
+                    waiter.wait_for_selected(provisioning_checkbox, False, timeout=3)
                     
                     # Click save
                     save_button = driver.find_element(By.CSS_SELECTOR, "input[type='submit'][value='Save']")
-                    try:
-                        save_button.click()
-                    except:
-                        driver.execute_script("arguments[0].click();", save_button)
-                    time.sleep(2)
+                    waiter.click_and_wait_for_reload(save_button, timeout=15)
                     
                     log("✓ Provisioning disabled")
                     # Log activity
@@ -1789,9 +1770,9 @@ class APPanel:
         def perform_action():
             try:
                 from selenium.webdriver.common.by import By
-                import time
                 
                 driver = self.content_panel.browser_manager.driver
+                waiter = self.content_panel.browser_manager.waiter
                 ip = ap_data.get('ip_address', '').strip()
                 if ip.startswith('http'):
                     ip = ip.split('://')[1]
@@ -1804,16 +1785,11 @@ class APPanel:
                     self.parent.after(0, lambda: self._log(msg))
                 
                 log(f"Navigating to {url}")
-                driver.get(url)
-                time.sleep(2)
+                waiter.load(url)
                 
                 # Find the SSH checkbox
-                ssh_checkboxes = driver.find_elements(By.NAME, "enabled")
-                ssh_checkbox = None
-                for cb in ssh_checkboxes:
-                    if cb.get_attribute("type") == "checkbox":
-                        ssh_checkbox = cb
-                        break
+                ssh_checkbox = waiter.find_element(
+                    By.CSS_SELECTOR, "input[type='checkbox'][name='enabled']", timeout=10)
                 
                 if not ssh_checkbox:
                     log("✗ Could not find SSH checkbox")
@@ -1848,60 +1824,36 @@ class APPanel:
                         
                         # Check provisioning status
                         prov_url = f"https://{ip}/service/config/provisioningEnabled.xml"
-                        driver.get(prov_url)
-                        time.sleep(2)
+                        waiter.load(prov_url)
                         
-                        prov_checkboxes = driver.find_elements(By.NAME, "provisioningEnabled")
-                        prov_checkbox = None
-                        for cb in prov_checkboxes:
-                            if cb.get_attribute("type") == "checkbox":
-                                prov_checkbox = cb
-                                break
+                        prov_checkbox = waiter.find_element(
+                            By.CSS_SELECTOR, "input[type='checkbox'][name='provisioningEnabled']", timeout=10)
                         
                         if prov_checkbox and prov_checkbox.is_selected():
                             provisioning_was_enabled = True
                             log("Provisioning is enabled - will be restored after SSH activation")
                             log("Disabling provisioning...")
-                            try:
-                                prov_checkbox.click()
-                            except:
-                                driver.execute_script("arguments[0].click();", prov_checkbox)
-                            time.sleep(1)
+                            waiter.click(prov_checkbox)
+                            waiter.wait_for_selected(prov_checkbox, False, timeout=3)
                             
                             save_btn = driver.find_element(By.CSS_SELECTOR, "input[type='submit'][value='Save']")
-                            try:
-                                save_btn.click()
-                            except:
-                                driver.execute_script("arguments[0].click();", save_btn)
-                            time.sleep(3)
+                            waiter.click_and_wait_for_reload(save_btn, timeout=15)
                             log("✓ Provisioning disabled")
                         
                         # Return to SSH page
-                        driver.get(url)
-                        time.sleep(2)
+                        waiter.load(url)
                         
                         # Find SSH checkbox again
-                        ssh_checkboxes = driver.find_elements(By.NAME, "enabled")
-                        ssh_checkbox = None
-                        for cb in ssh_checkboxes:
-                            if cb.get_attribute("type") == "checkbox":
-                                ssh_checkbox = cb
-                                break
+                        ssh_checkbox = waiter.find_element(
+                            By.CSS_SELECTOR, "input[type='checkbox'][name='enabled']", timeout=10)
                     
                     log("Enabling SSH...")
-                    try:
-                        ssh_checkbox.click()
-                    except:
-                        driver.execute_script("arguments[0].click();", ssh_checkbox)
-                    time.sleep(1)
+                    waiter.click(ssh_checkbox)
+                    waiter.wait_for_selected(ssh_checkbox, True, timeout=3)
                     
                     # Click save
                     save_button = driver.find_element(By.CSS_SELECTOR, "input[type='submit'][value='Save']")
-                    try:
-                        save_button.click()
-                    except:
-                        driver.execute_script("arguments[0].click();", save_button)
-                    time.sleep(2)
+                    waiter.click_and_wait_for_reload(save_button, timeout=15)
                     
                     log("✓ SSH enabled")
                     # Log activity
@@ -1913,29 +1865,17 @@ class APPanel:
                     if provisioning_was_enabled:
                         log("Re-enabling provisioning to restore original state...")
                         prov_url = f"https://{ip}/service/config/provisioningEnabled.xml"
-                        driver.get(prov_url)
-                        time.sleep(2)
+                        waiter.load(prov_url)
                         
-                        prov_checkboxes = driver.find_elements(By.NAME, "provisioningEnabled")
-                        prov_checkbox = None
-                        for cb in prov_checkboxes:
-                            if cb.get_attribute("type") == "checkbox":
-                                prov_checkbox = cb
-                                break
+                        prov_checkbox = waiter.find_element(
+                            By.CSS_SELECTOR, "input[type='checkbox'][name='provisioningEnabled']", timeout=10)
                         
                         if prov_checkbox and not prov_checkbox.is_selected():
-                            try:
-                                prov_checkbox.click()
-                            except:
-                                driver.execute_script("arguments[0].click();", prov_checkbox)
-                            time.sleep(1)
+                            waiter.click(prov_checkbox)
+                            waiter.wait_for_selected(prov_checkbox, True, timeout=3)
                             
                             save_btn = driver.find_element(By.CSS_SELECTOR, "input[type='submit'][value='Save']")
-                            try:
-                                save_btn.click()
-                            except:
-                                driver.execute_script("arguments[0].click();", save_btn)
-                            time.sleep(2)
+                            waiter.click_and_wait_for_reload(save_btn, timeout=15)
                             log("✓ Provisioning re-enabled")
                     
                     def show_success():
@@ -1951,19 +1891,12 @@ class APPanel:
                         return
                     
                     log("Disabling SSH...")
-                    try:
-                        ssh_checkbox.click()
-                    except:
-                        driver.execute_script("arguments[0].click();", ssh_checkbox)
-                    time.sleep(1)
+                    waiter.click(ssh_checkbox)
+                    waiter.wait_for_selected(ssh_checkbox, False, timeout=3)
                     
                     # Click save
                     save_button = driver.find_element(By.CSS_SELECTOR, "input[type='submit'][value='Save']")
-                    try:
-                        save_button.click()
-                    except:
-                        driver.execute_script("arguments[0].click();", save_button)
-                    time.sleep(2)
+                    waiter.click_and_wait_for_reload(save_button, timeout=15)
                     
                     log("✓ SSH disabled")
                     # Log activity
@@ -2036,6 +1969,9 @@ class APPanel:
                             terminal_tab = window.tabs[ap_id]
                             terminal_tab.is_reconnecting = True  # Flag to prevent "Connection closed" message
                             
+                            # Drop the old login so the new connection gets a fresh shell
+                            connection.disconnect(preserve_buffers=True, relogin=True)
+                            
                             # Create new connection
                             new_connection = SSHConnection(
                                 ap_id=ap_data.get('ap_id'),
@@ -5,7 +5,9 @@ Dynamic content area showing SSH terminal, browser status, Jira details, etc.
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
-from ssh_helper import SSHManager
+from ssh_helper import SSHManager, SSHConnection
+from ssh_pool import get_ssh_pool
+from ssh_reader import ChannelReader
 
 
 class ContentPanel:
@@ -319,7 +321,6 @@ class ContentPanel:
         def connect():
             try:
                 import paramiko
-                import time
                 
                 ap_data = session['ap_data']
                 terminal_text = session['terminal_text']
@@ -357,90 +358,48 @@ class ContentPanel:
                 
                 log_output(f"Connecting to {username}@{ip_address}...\n")
                 
-                # Create SSH client
-                ssh_client = paramiko.SSHClient()
-                ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                
-                # Connect with timeout
-                ssh_client.connect(
-                    hostname=ip_address,
-                    username=username,
-                    password=password,
-                    timeout=10,
-                    look_for_keys=False,
-                    allow_agent=False
-                )
+                # Lease a pooled connection (reuses an existing transport to this AP)
+                ssh_client = get_ssh_pool().acquire(ip_address, username, password, timeout=10)
                 
                 log_output(f"✓ Connected to AP {ap_id}\n\n")
                 
                 # Start interactive shell
                 shell_channel = ssh_client.invoke_shell(width=120, height=40)
-                shell_channel.settimeout(0.1)
                 
                 session['ssh_client'] = ssh_client
                 session['shell_channel'] = shell_channel
                 session['connected'] = True
                 
-                # Start output reading thread
-                def read_output():
-                    """Read SSH output continuously."""
-                    while session['connected']:
-                        try:
-                            if shell_channel.recv_ready():
-                                output = shell_channel.recv(4096).decode('utf-8', errors='replace')
-                                self.parent.after(0, lambda o=output: terminal_text.insert(tk.END, o))
-                                self.parent.after(0, lambda: terminal_text.see(tk.END))
-                            else:
-                                time.sleep(0.05)
-                        except Exception as e:
-                            if session['connected']:
-                                error_msg = f"\n✗ Output read error: {str(e)}\n"
-                                self.parent.after(0, lambda m=error_msg: terminal_text.insert(tk.END, m))
-                                self.parent.after(0, lambda: terminal_text.see(tk.END))
-                            break
+                # Read output in background; everything shown in the terminal is also
+                # kept in session['output_buffer'] for the automated command sequences
+                def on_read_closed(error):
+                    if error is not None and session['connected']:
+                        log_output(f"\n✗ Output read error: {str(error)}\n")
                 
-                output_thread = threading.Thread(target=read_output, daemon=True)
-                output_thread.start()
-                session['output_thread'] = output_thread
+                reader = ChannelReader(shell_channel, on_data=log_output, on_close=on_read_closed).start()
+                session['reader'] = reader
+                session['output_buffer'] = reader.buffer
+                output_buffer = reader.buffer
                 
                 # Enable command input
                 self.parent.after(0, lambda: session['command_entry'].config(state='normal'))
                 
                 # Check for service mode after connection
                 def check_service_mode():
-                    # Wait longer for initial output and prompt
-                    time.sleep(4)
-                    
-                    # Collect all available output
-                    collected_output = ""
-                    for _ in range(5):  # Try multiple times to get all output
-                        if shell_channel.recv_ready():
-                            try:
-                                output = shell_channel.recv(4096).decode('utf-8', errors='replace')
-                                collected_output += output
-                            except:
-                                pass
-                        time.sleep(0.5)
+                    # Wait for the first prompt
+                    index, collected_output = self._expect(
+                        output_buffer, [SSHConnection.SERVICE_MODE_PROMPT, SSHConnection.SHELL_PROMPT],
+                        timeout=10, start=0)
                     
                     # Check if we're in service mode by looking for the prompt (case-insensitive)
-                    if 'servicemode>' in collected_output.lower() or 'service mode' in collected_output.lower():
+                    if index == 0 or 'service mode' in collected_output.lower():
                         log_output("\n✓ Service Mode detected - running 'status' command...\n")
-                        time.sleep(0.5)
                         
-                        # Send status command
+                        # Send status command and wait for the prompt to come back
+                        mark = output_buffer.position
                         shell_channel.send('status\n')
-                        time.sleep(3)
-                        
-                        # Get status output
-                        status_output = ""
-                        for _ in range(10):  # Collect status output
-                            if shell_channel.recv_ready():
-                                try:
-                                    chunk = shell_channel.recv(4096).decode('utf-8', errors='replace')
-                                    status_output += chunk
-                                except:
-                                    pass
-                            time.sleep(0.3)
+                        _, status_output = self._expect(output_buffer, [SSHConnection.SERVICE_MODE_PROMPT],
+                                                        timeout=10, start=mark)
                         
                         if status_output:
                             # Parse Java Version
@@ -452,9 +411,8 @@ class ContentPanel:
                                 
                                 # Store in database
                                 try:
-                                    from database_manager import DatabaseManager
-                                    db = DatabaseManager()
-                                    db.update_access_point(ap_id, {'java_version': java_version})
+                                    from services import get_database_manager
+                                    get_database_manager().update_access_point(ap_id, {'java_version': java_version})
                                     log_output(f"✓ Java Version saved to database\n")
                                 except Exception as e:
                                     log_output(f"✗ Error saving Java Version: {str(e)}\n")
@@ -476,16 +434,46 @@ class ContentPanel:
         thread = threading.Thread(target=connect, daemon=True)
         thread.start()
     
-    def _disconnect_ssh(self, session):
-        """Disconnect SSH session."""
+    def _expect(self, output_buffer, patterns, timeout, start):
+        """
+        Wait for one of the regex patterns in a session's output.
+        
+        Returns:
+            tuple: (index of the matching pattern or -1 on timeout/closed channel,
+                    output received since start)
+        """
+        result = output_buffer.wait_for(patterns, timeout, start=start)
+        return (result[0] if result else -1), output_buffer.since(start)
+    
+    def _send_expect(self, session, command, patterns, timeout):
+        """Send a command on a session's shell and wait for one of the patterns."""
+        output_buffer = session['output_buffer']
+        mark = output_buffer.position
+        session['shell_channel'].send(command + '\n')
+        return self._expect(output_buffer, patterns, timeout, mark)
+    
+    def _disconnect_ssh(self, session, relogin=False):
+        """Disconnect SSH session.
+        
+        Args:
+            relogin: Drop the pooled connection so the next connect does a fresh login
+        """
         try:
             session['connected'] = False
             
+            if session.get('reader'):
+                session['reader'].stop()
+                session['reader'] = None
+            
             if session['shell_channel']:
                 session['shell_channel'].close()
             
             if session['ssh_client']:
-                session['ssh_client'].close()
+                if relogin:
+                    get_ssh_pool().discard(session['ssh_client'])
+                else:
+                    get_ssh_pool().release(session['ssh_client'])
+                session['ssh_client'] = None
             
             terminal_text = session['terminal_text']
             terminal_text.insert(tk.END, "\n\n✓ Disconnected from SSH\n")
@@ -592,7 +580,6 @@ class ContentPanel:
         
         def download():
             try:
-                import paramiko
                 import os
                 
                 terminal_text = session['terminal_text']
@@ -603,8 +590,8 @@ class ContentPanel:
                 
                 log_output("\n=== Downloading Log Files ===\n")
                 
-                # Create SCP client using existing SSH connection
-                scp_client = paramiko.SFTPClient.from_transport(session['ssh_client'].get_transport())
+                # Open SFTP on the session's pooled transport (no new handshake)
+                scp_client = session['ssh_client'].open_sftp()
                 
                 # Get list of files matching pattern
                 remote_path = "/opt/esl/accesspoint"
@@ -675,7 +662,6 @@ class ContentPanel:
         def exit_sequence():
             try:
                 terminal_text = session['terminal_text']
-                shell_channel = session['shell_channel']
                 
                 def log_output(msg):
                     self.parent.after(0, lambda m=msg: terminal_text.insert(tk.END, m))
@@ -685,47 +671,18 @@ class ContentPanel:
                 log_output("Exiting Service Mode\n")
                 log_output("="*60 + "\n")
                 
-                # Command sequence with proper delays for responses
-                commands = [
-                    ("extended matex2010", 2),
-                    ("enableshell true", 2),
-                    ("exit", 1.5),
-                    ("exit", 2)
-                ]
-                
-                for cmd, delay in commands:
+                # Each step waits for the next prompt; the final exit returns as soon
+                # as the AP closes the session. Responses are shown by the output reader.
+                for cmd in ("extended matex2010", "enableshell true", "exit", "exit"):
                     log_output(f"$ {cmd}\n")
-                    shell_channel.send(cmd + '\n')
-                    
-                    # Wait and collect all response data
-                    time.sleep(delay)
-                    
-                    # Drain the receive buffer completely
-                    response_parts = []
-                    attempts = 0
-                    while attempts < 10:
-                        try:
-                            if shell_channel.recv_ready():
-                                chunk = shell_channel.recv(8192).decode('utf-8', errors='replace')
-                                response_parts.append(chunk)
-                                attempts = 0  # Reset if we got data
-                            else:
-                                attempts += 1
-                                time.sleep(0.2)
-                        except:
-                            break
-                    
-                    if response_parts:
-                        log_output(''.join(response_parts))
+                    self._send_expect(session, cmd, [SSHConnection.ANY_PROMPT], timeout=5)
                 
                 log_output("\n✓ Service mode exit sequence complete\n")
                 log_output("⟳ Reconnecting to establish bash access...\n\n")
                 
-                # Disconnect and reconnect
-                self.parent.after(0, lambda: self._disconnect_ssh(session))
-                time.sleep(2)
-                
-                # Reconnect
+                # Disconnect and reconnect (fresh login so the new shell setting applies);
+                # after() callbacks run in order, so the reconnect follows the disconnect
+                self.parent.after(0, lambda: self._disconnect_ssh(session, relogin=True))
                 self.parent.after(0, lambda: self._connect_ssh(session))
                 
             except Exception as e:
@@ -763,7 +720,6 @@ class ContentPanel:
         def check_dns():
             try:
                 terminal_text = session['terminal_text']
-                shell_channel = session['shell_channel']
                 
                 def log_output(msg):
                     self.parent.after(0, lambda m=msg: terminal_text.insert(tk.END, m))
@@ -773,44 +729,21 @@ class ContentPanel:
                 log_output("Checking DNS Settings\n")
                 log_output("="*60 + "\n")
                 
-                # Check if in service mode
-                time.sleep(0.5)
-                shell_channel.send('\n')
-                time.sleep(0.5)
+                # Check if in service mode (responses are shown by the session's output reader)
+                index, _ = self._send_expect(session, '', [SSHConnection.SERVICE_MODE_PROMPT,
+                                                           SSHConnection.SHELL_PROMPT], timeout=5)
                 
-                if shell_channel.recv_ready():
-                    prompt = shell_channel.recv(1024).decode('utf-8', errors='replace')
+                if index == 0:
+                    log_output("⚠ Currently in Service Mode - exiting first...\n\n")
                     
-                    if 'ServiceMode>' in prompt or 'servicemode>' in prompt.lower():
-                        log_output("⚠ Currently in Service Mode - exiting first...\n\n")
-                        
-                        # Exit service mode sequence
-                        commands = [
-                            ("extended matex2010", 1),
-                            ("enableshell true", 1),
-                            ("exit", 1),
-                            ("exit", 2)
-                        ]
-                        
-                        for cmd, delay in commands:
-                            log_output(f"$ {cmd}\n")
-                            shell_channel.send(cmd + '\n')
-                            time.sleep(delay)
-                            
-                            if shell_channel.recv_ready():
-                                response = shell_channel.recv(4096).decode('utf-8', errors='replace')
-                                log_output(response)
-                        
-                        time.sleep(2)
+                    # Exit service mode sequence
+                    for cmd in ("extended matex2010", "enableshell true", "exit", "exit"):
+                        log_output(f"$ {cmd}\n")
+                        self._send_expect(session, cmd, [SSHConnection.ANY_PROMPT], timeout=5)
                 
                 # Now check DNS
                 log_output("\n$ cat /etc/resolv.conf\n")
-                shell_channel.send('cat /etc/resolv.conf\n')
-                time.sleep(1.5)
-                
-                if shell_channel.recv_ready():
-                    dns_output = shell_channel.recv(4096).decode('utf-8', errors='replace')
-                    log_output(dns_output)
+                self._send_expect(session, 'cat /etc/resolv.conf', [SSHConnection.SHELL_PROMPT], timeout=5)
                 
                 log_output("\n✓ DNS check complete\n")
                 
@@ -1222,9 +1155,8 @@ class ContentPanel:
                 bg="#FFFFFF", fg="#0066CC").pack(side=tk.LEFT)
         
         # Link icon to open in browser
-        from credentials_manager import CredentialsManager
-        creds_manager = CredentialsManager(self.db)
-        jira_creds = creds_manager.get_credentials('jira')
+        from services import get_credentials_manager
+        jira_creds = get_credentials_manager().get_credentials('jira')
         jira_url = jira_creds.get('url', '')
         
         if jira_url:
@@ -2237,18 +2169,6 @@ class ContentPanel:
             tk.Label(inner_content, text="No replies yet",
                     font=('Segoe UI', 9, 'italic'), bg="#FFFFFF", fg="#6C757D").pack(pady=10)
     
-    def _extract_xml_value(self, html_text, field_name):
-        """Extract value from HTML table row. The data is in format:
-        <tr><th>Field Name:</th><td>Value</td></tr>
-        """
-        import re
-        # Create pattern to match the table row with the field name
-        pattern = f"<th>{field_name}:</th>\\s*<td>([^<]*)</td>"
-        match = re.search(pattern, html_text, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        return None
-    
     def start_browser(self):
         """Start the browser manager."""
         try:
@@ -2265,7 +2185,6 @@ class ContentPanel:
             self.browser_manager = BrowserManager(
                 log_callback=self._log,
                 progress_callback=lambda msg, pct: self._log(f"Browser: {msg} ({pct}%)"),
-                extract_xml_callback=self._extract_xml_value,
                 handle_cato_callback=self._handle_cato_warning
             )
             
@@ -3,13 +3,27 @@ Context Panel - Upper Right
 Shows contextual lists based on active AP (Jira tickets, Vusion data)
 """
 
+import threading
+import time
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import ttk, messagebox, scrolledtext
 
 
 class ContextPanel:
     """Upper right panel - Contextual lists (Jira, Vusion) for active AP."""
     
+    # Jira ticket loading: results per JQL are reused for JIRA_CACHE_TTL seconds
+    JIRA_CACHE_TTL = 300
+    JIRA_CACHE_SIZE = 50
+    JIRA_PAGE_SIZE = 50
+    JIRA_MAX_RESULTS = 200
+    # Cards and filters (summary, status, project), the details view and the
+    # sync cache (JiraDBManager.LINK_FIELDS plus comments)
+    JIRA_FIELDS = ['summary', 'status', 'project', 'issuetype', 'priority', 'resolution', 'created',
+                   'updated', 'resolutiondate', 'creator', 'reporter', 'assignee', 'description',
+                   'comment']
+    
     def __init__(self, parent, db, current_user=None, on_selection=None, log_callback=None):
         self.parent = parent
         self.db = db
@@ -19,6 +33,12 @@ class ContextPanel:
         
         self.active_ap = None
         self.active_ap_data = None
+        self._jira_live_requested = False  # Next load queries Jira instead of the caches
+        self._jira_request_id = 0  # Incremented per load; older loads are stale
+        self._jira_loading_label = None
+        self._jira_api = None
+        self._jira_lock = threading.Lock()
+        self._jira_results = OrderedDict()  # {jql: (loaded at, issues)}
         
         self._create_ui()
     
@@ -423,20 +443,21 @@ class ContextPanel:
     
     def _load_jira_tickets_background(self):
         """Load Jira tickets asynchronously to avoid UI freezing."""
-        # Show loading message immediately
-        for widget in self.jira_tickets_frame.winfo_children():
-            widget.destroy()
-        
-        loading_label = tk.Label(self.jira_tickets_frame, 
-                                text="🔄 Loading Jira tickets...",
-                                font=('Segoe UI', 10), bg="#FFFFFF", fg="#6C757D")
-        loading_label.pack(pady=20)
-        
-        # Use after() to run loading on main thread but yield to UI
-        self.parent.after(50, self._load_jira_tickets)
+        self._load_jira_tickets()
     
     def _load_jira_tickets(self):
-        """Load Jira tickets related to active AP with filters."""
+        """Load Jira tickets related to active AP with filters.
+        
+        Reads the Tk inputs here, then queries on a worker thread; pages are
+        rendered as they arrive. Starting a new load (e.g. selecting another
+        AP) makes any running one stale, and its results are dropped.
+        """
+        # Invalidate any load still running
+        self._jira_request_id += 1
+        request_id = self._jira_request_id
+        live_requested = self._jira_live_requested
+        self._jira_live_requested = False
+        
         if not self.active_ap:
             # Show placeholder
             self.jira_content_frame.pack_forget()
@@ -452,132 +473,231 @@ class ContextPanel:
             widget.destroy()
         self.jira_tickets = []
         
-        try:
-            from jira_api import JiraAPI
-            from credentials_manager import CredentialsManager
+        # Build JQL query - check if user specified a ticket ID first
+        ticket_id = self.jira_ticket_id.get().strip()
+        ticket_key = None
+        date_from = date_to = ''
+        if ticket_id and ticket_id != "e.g., FIXIT-1192609" and '-' in ticket_id:
+            # User specified a ticket ID - search for that specifically
+            # Don't apply date filters when searching by ticket ID
+            ticket_key = ticket_id.upper()
+            jql = f'key = "{ticket_key}"'
+            self._log(f"Searching for specific ticket: {ticket_key}")
+        else:
+            # Regular AP ID search - use multiple fields for better coverage
+            # Add wildcard to numeric AP IDs (like Jira does) to find variations
+            search_term = f"{self.active_ap}*" if self.active_ap.isdigit() else self.active_ap
+            jql = f'(text ~ "{search_term}" OR summary ~ "{search_term}" OR description ~ "{search_term}" OR comment ~ "{search_term}")'
             
-            # Initialize Jira API
-            credentials_manager = CredentialsManager(self.db)
-            jira_api = JiraAPI(credentials_manager)
+            # Get date filters (only for AP ID searches)
+            date_from = self.jira_date_from.get().strip()
+            date_to = self.jira_date_to.get().strip()
+            
+            # Add date range to JQL
+            if date_from:
+                jql += f' AND created >= "{date_from}"'
+            if date_to:
+                jql += f' AND created <= "{date_to} 23:59"'
+        
+        # Recently loaded results are shown without a query (Refresh bypasses this)
+        recent = None if live_requested else self._recent_jira_results(jql)
+        if recent is not None:
+            self._log(f"Showing {len(recent)} recently loaded Jira issues")
+            self._render_jira_page(request_id, recent)
+            self._finish_jira_load(request_id, len(recent), ticket_id)
+            return
+        
+        self._jira_loading_label = tk.Label(self.jira_tickets_frame,
+                                            text="🔄 Loading Jira tickets...",
+                                            font=('Segoe UI', 10), bg="#FFFFFF", fg="#6C757D")
+        self._jira_loading_label.pack(pady=20)
+        
+        # Plain AP searches are served from the background-synced cache;
+        # ticket IDs, date filters and Refresh query Jira live
+        use_sync_cache = ticket_key is None and not date_from and not date_to
+        self._log(f"Jira JQL query: {jql}")
+        threading.Thread(target=self._jira_load_worker,
+                         args=(request_id, self.active_ap, jql, ticket_key, ticket_id,
+                               use_sync_cache, live_requested),
+                         name='jira-tickets', daemon=True).start()
+    
+    def _jira_load_worker(self, request_id, ap_id, jql, ticket_key, ticket_id, use_sync_cache, live_requested):
+        """Worker thread: fetch issues page by page and hand them to the UI thread."""
+        from jira_api import JiraSearchError
+        
+        def post(callback, *args):
+            self.parent.after(0, lambda: callback(*args))
+        
+        def stale():
+            return request_id != self._jira_request_id
+        
+        try:
+            if use_sync_cache and not live_requested:
+                cached_issues = self._get_cached_jira_issues(ap_id)
+                if cached_issues is not None:
+                    post(self._log, f"Showing {len(cached_issues)} cached Jira issues (synced in background)")
+                    self._remember_jira_results(jql, cached_issues)
+                    post(self._render_jira_page, request_id, cached_issues)
+                    post(self._finish_jira_load, request_id, len(cached_issues), ticket_id)
+                    return
             
+            jira_api = self._get_jira_api()
             if not jira_api.is_configured():
-                tk.Label(self.jira_tickets_frame, text="Jira not configured. Go to Admin Settings.",
-                        font=('Segoe UI', 10), bg="#FFFFFF", fg="#DC3545").pack(pady=20)
-                self._log("Jira not configured", "warning")
+                post(self._finish_jira_load, request_id, 0, ticket_id,
+                     "Jira not configured. Go to Admin Settings.")
                 return
             
-            # Build JQL query - check if user specified a ticket ID first
-            ticket_id = self.jira_ticket_id.get().strip()
-            if ticket_id and ticket_id != "e.g., FIXIT-1192609" and '-' in ticket_id:
-                # User specified a ticket ID - search for that specifically
-                # Don't apply date filters when searching by ticket ID
-                jql = f'key = "{ticket_id.upper()}"'
-                self._log(f"Searching for specific ticket: {ticket_id.upper()}")
-            else:
-                # Regular AP ID search - use multiple fields for better coverage
-                # Add wildcard to numeric AP IDs (like Jira does) to find variations
-                search_term = f"{self.active_ap}*" if self.active_ap.isdigit() else self.active_ap
-                jql = f'(text ~ "{search_term}" OR summary ~ "{search_term}" OR description ~ "{search_term}" OR comment ~ "{search_term}")'
-                
-                # Get date filters (only for AP ID searches)
-                date_from = self.jira_date_from.get().strip()
-                date_to = self.jira_date_to.get().strip()
-                
-                # Add date range to JQL
-                if date_from:
-                    jql += f' AND created >= "{date_from}"'
-                if date_to:
-                    jql += f' AND created <= "{date_to} 23:59"'
+            issues = []
+            for page in jira_api.iter_search_pages(jql, fields=self.JIRA_FIELDS,
+                                                   page_size=self.JIRA_PAGE_SIZE,
+                                                   max_results=self.JIRA_MAX_RESULTS):
+                if stale():
+                    return
+                issues.extend(page.issues)
+                post(self._render_jira_page, request_id, page.issues)
             
-            self._log(f"Jira JQL query: {jql}")
-            success, result, message = jira_api.search_issues(jql, max_results=200)
-            self._log(f"Jira search result - success: {success}, message: {message}")
+            # If searching by ticket ID and not found, try a direct API call
+            if ticket_key and not issues:
+                post(self._log, f"Ticket {ticket_key} not found via JQL search")
+                success_direct, issue_data, msg = jira_api.get_issue(ticket_key)
+                if success_direct and issue_data:
+                    post(self._log, f"Ticket {ticket_key} found via direct API but not via search")
+                    issues = [issue_data]
+                    post(self._render_jira_page, request_id, issues)
+                else:
+                    post(self._log, f"Ticket {ticket_key} not found via direct API either: {msg}")
             
-            # If searching by ticket ID and not found, provide detailed feedback
-            if ticket_id and ticket_id != "e.g., FIXIT-1192609" and '-' in ticket_id:
-                if not success or not result.get('issues'):
-                    self._log(f"Ticket {ticket_id.upper()} not found via JQL search")
-                    # Try direct API call
-                    try:
-                        success_direct, issue_data, msg = jira_api.get_issue(ticket_id.upper())
-                        if success_direct and issue_data:
-                            self._log(f"Ticket {ticket_id.upper()} found via direct API but not via search")
-                            # Wrap in expected format
-                            result = {'issues': [issue_data], 'total': 1}
-                            success = True
-                        else:
-                            self._log(f"Ticket {ticket_id.upper()} not found via direct API either: {msg}")
-                    except Exception as e:
-                        self._log(f"Error trying direct API: {str(e)}")
+            if stale():
+                return
+            self._remember_jira_results(jql, issues)
+            if use_sync_cache:
+                self._cache_jira_issues(ap_id, issues)
+            post(self._finish_jira_load, request_id, len(issues), ticket_id)
+        
+        except JiraSearchError as e:
+            post(self._finish_jira_load, request_id, 0, ticket_id, f"Error: {str(e)}")
+        except Exception as e:
+            post(self._finish_jira_load, request_id, 0, ticket_id, f"Jira error: {str(e)}")
+    
+    def _render_jira_page(self, request_id, issues):
+        """Add cards for a page of issues (UI thread); ignored if the load is stale."""
+        if request_id != self._jira_request_id:
+            return
+        if self._jira_loading_label is not None:
+            self._jira_loading_label.destroy()
+            self._jira_loading_label = None
+        
+        # Update project and status checkboxes based on ALL found issues
+        self._update_project_filters(issues)
+        self._update_status_filters(issues)
+        
+        # Apply client-side filters
+        enabled_projects = [proj for proj, var in self.jira_projects.items() if var.get()]
+        enabled_statuses = [status for status, var in self.jira_statuses.items() if var.get()]
+        
+        for issue in issues:
+            fields = issue.get('fields', {})
             
-            # Also try without date filter to see if we get any results
-            if ticket_id and ticket_id != "e.g., FIXIT-1192609" and '-' in ticket_id:
-                simple_jql = f'key = "{ticket_id.upper()}"'
-            else:
-                search_term = f"{self.active_ap}*" if self.active_ap.isdigit() else self.active_ap
-                simple_jql = f'(text ~ "{search_term}" OR summary ~ "{search_term}" OR description ~ "{search_term}" OR comment ~ "{search_term}")'
-            success2, result2, message2 = jira_api.search_issues(simple_jql, max_results=200)
-            self._log(f"Jira search WITHOUT date filter - success: {success2}, message: {message2}")
-            if success2 and isinstance(result2, dict):
-                issues2 = result2.get('issues', [])
-                self._log(f"Found {len(issues2)} issues without date filter")
+            # Check project filter
+            project = fields.get('project', {})
+            project_key = project.get('key', '') if isinstance(project, dict) else ''
+            if enabled_projects and project_key not in enabled_projects:
+                continue
             
-            if success and isinstance(result, dict):
-                issues = result.get('issues', [])
-                self._log(f"Found {len(issues)} Jira issues (with date filter)")
-                
-                # Update project and status checkboxes based on ALL found issues
-                self._update_project_filters(issues)
-                self._update_status_filters(issues)
-                
-                # Apply client-side filters
-                filtered_issues = []
-                enabled_projects = [proj for proj, var in self.jira_projects.items() if var.get()]
-                enabled_statuses = [status for status, var in self.jira_statuses.items() if var.get()]
-                
-                for issue in issues:
-                    fields = issue.get('fields', {})
-                    
-                    # Check project filter
-                    project = fields.get('project', {})
-                    project_key = project.get('key', '') if isinstance(project, dict) else ''
-                    if enabled_projects and project_key not in enabled_projects:
-                        continue
-                    
-                    # Check status filter
-                    status = fields.get('status', {})
-                    status_name = status.get('name', '') if isinstance(status, dict) else ''
-                    if enabled_statuses and status_name not in enabled_statuses:
-                        continue
-                    
-                    filtered_issues.append(issue)
-                
-                # Display tickets
-                if filtered_issues:
-                    for issue in filtered_issues:
-                        self._create_jira_ticket_card(issue)
-                        self.jira_tickets.append(issue)
-                    self._log(f"Loaded {len(filtered_issues)} Jira tickets (filtered from {len(issues)} total)")
-                else:
-                    # Show appropriate message based on search type
-                    if ticket_id and ticket_id != "e.g., FIXIT-1192609":
-                        msg = f"Ticket '{ticket_id.upper()}' not found.\n\nPlease verify:\n• Ticket exists\n• You have access to it\n• Ticket ID is correct"
-                    else:
-                        msg = f"No Jira tickets found matching filters for '{self.active_ap}'"
-                    
-                    tk.Label(self.jira_tickets_frame, text=msg,
-                            font=('Segoe UI', 10), bg="#FFFFFF", fg="#6C757D",
-                            justify=tk.LEFT).pack(pady=20)
-                    self._log("No Jira tickets found")
+            # Check status filter
+            status = fields.get('status', {})
+            status_name = status.get('name', '') if isinstance(status, dict) else ''
+            if enabled_statuses and status_name not in enabled_statuses:
+                continue
+            
+            self._create_jira_ticket_card(issue)
+            self.jira_tickets.append(issue)
+    
+    def _finish_jira_load(self, request_id, total, ticket_id, error=None):
+        """Show the final state of a load (UI thread); ignored if the load is stale."""
+        if request_id != self._jira_request_id:
+            return
+        if self._jira_loading_label is not None:
+            self._jira_loading_label.destroy()
+            self._jira_loading_label = None
+        
+        if error:
+            for widget in self.jira_tickets_frame.winfo_children():
+                widget.destroy()
+            self.jira_tickets = []
+            tk.Label(self.jira_tickets_frame, text=error,
+                    font=('Segoe UI', 10), bg="#FFFFFF", fg="#DC3545").pack(pady=20)
+            self._log(f"Jira search error: {error}", "error")
+        elif self.jira_tickets:
+            self._log(f"Loaded {len(self.jira_tickets)} Jira tickets (filtered from {total} total)")
+        else:
+            # Show appropriate message based on search type
+            if ticket_id and ticket_id != "e.g., FIXIT-1192609":
+                msg = f"Ticket '{ticket_id.upper()}' not found.\n\nPlease verify:\n• Ticket exists\n• You have access to it\n• Ticket ID is correct"
             else:
-                tk.Label(self.jira_tickets_frame, text=f"Error: {message}",
-                        font=('Segoe UI', 10), bg="#FFFFFF", fg="#DC3545").pack(pady=20)
-                self._log(f"Jira search error: {message}", "error")
-                
+                msg = f"No Jira tickets found matching filters for '{self.active_ap}'"
+            
+            tk.Label(self.jira_tickets_frame, text=msg,
+                    font=('Segoe UI', 10), bg="#FFFFFF", fg="#6C757D",
+                    justify=tk.LEFT).pack(pady=20)
+            self._log("No Jira tickets found")
+    
+    def _get_jira_api(self):
+        """Jira client shared by all loads (rebuilt until Jira is configured)."""
+        with self._jira_lock:
+            if self._jira_api is None or not self._jira_api.is_configured():
+                from jira_api import JiraAPI
+                from services import get_credentials_manager
+                self._jira_api = JiraAPI(get_credentials_manager())
+            return self._jira_api
+    
+    def _recent_jira_results(self, jql):
+        """Issues loaded for jql less than JIRA_CACHE_TTL seconds ago, or None."""
+        with self._jira_lock:
+            cached = self._jira_results.get(jql)
+            if cached is None or time.monotonic() - cached[0] >= self.JIRA_CACHE_TTL:
+                return None
+            self._jira_results.move_to_end(jql)
+            return cached[1]
+    
+    def _remember_jira_results(self, jql, issues):
+        """Keep results for JIRA_CACHE_TTL seconds (least recently used entries are dropped)."""
+        with self._jira_lock:
+            self._jira_results[jql] = (time.monotonic(), issues)
+            self._jira_results.move_to_end(jql)
+            while len(self._jira_results) > self.JIRA_CACHE_SIZE:
+                self._jira_results.popitem(last=False)
+    
+    def _get_cached_jira_issues(self, ap_id):
+        """Cached issues of an AP, or None if they aren't kept current by the sync."""
+        from jira_db_manager import JiraDBManager
+        from jira_sync import get_jira_sync_service
+        
+        try:
+            jira_db = JiraDBManager(self.db)
+            if not get_jira_sync_service(self.db).is_current() or not jira_db.get_tracked_aps([ap_id]):
+                return None
+            # Shown from the cache, so keep it tracked
+            jira_db.track_aps([ap_id])
+            return jira_db.get_cached_issues(ap_id)
         except Exception as e:
-            tk.Label(self.jira_tickets_frame, text=f"Jira error: {str(e)}",
-                    font=('Segoe UI', 10), bg="#FFFFFF", fg="#DC3545").pack(pady=20)
-            self._log(f"Jira error: {str(e)}", "error")
+            print(f"Jira cache unavailable: {e}")
+            return None
+    
+    def _cache_jira_issues(self, ap_id, issues):
+        """Store live results for an AP and let the background sync track it."""
+        from jira_db_manager import JiraDBManager
+        from services import get_credentials_manager
+        
+        try:
+            credentials = get_credentials_manager().get_credentials('jira')
+            jira_base_url = credentials.get('url', '').rstrip('/') if credentials else ''
+            jira_db = JiraDBManager(self.db)
+            jira_db.store_issues([(ap_id, issue) for issue in issues], jira_base_url,
+                                 with_comments=True)
+            jira_db.track_aps([ap_id])
+        except Exception as e:
+            print(f"Failed to cache Jira issues: {e}")
     
     def _create_custom_checkbox(self, parent, text, variable):
         """Create a custom styled checkbox."""
@@ -880,7 +1000,7 @@ class ContextPanel:
         """Background thread to load Vusion events."""
         try:
             from vusion_api_helper import VusionAPIHelper
-            from vusion_api_config import VusionAPIConfig
+            from vusion_api_config import get_vusion_config
             
             store_id = self.active_ap_data.get('store_id', '')
             if not store_id:
@@ -894,7 +1014,7 @@ class ContextPanel:
                 return
             
             # Check if API key is configured
-            config = VusionAPIConfig()
+            config = get_vusion_config()
             api_key = config.get_api_key(country, 'vusion_pro')
             if not api_key:
                 self.parent.after(0, lambda: self._show_vusion_error("Vusion API not configured for this country"))
@@ -1305,8 +1425,9 @@ class ContextPanel:
             messagebox.showerror("Export Failed", f"Failed to export to Excel:\n{str(e)}")
     
     def _refresh_jira(self):
-        """Refresh Jira ticket list."""
+        """Refresh Jira ticket list (always queries Jira live)."""
         self._log("Refreshing Jira tickets...")
+        self._jira_live_requested = True
         self._load_jira_tickets_background()
     
     def _show_placeholder(self):
@@ -8,7 +8,9 @@ from tkinter import ttk, messagebox, scrolledtext
 from datetime import datetime
 import json
 import os
+import threading
 from database_manager import DatabaseManager
+from services import register_database_manager
 from dashboard_components import APPanel, ContextPanel, ActivityLogPanel, ContentPanel
 from custom_notebook import CustomNotebook
 
@@ -80,6 +82,12 @@ class DashboardMain:
         # Start session timeout checker (every 60 seconds)
         self.root.after(60000, self._check_session_timeout)
         
+        # Archive old history/log rows in the background (at most once a day)
+        self.root.after(120000, self._start_database_retention)
+        
+        # Keep cached Jira issues of tracked APs current in the background
+        self.root.after(30000, self._start_jira_sync)
+        
         # Track user activity to reset session timeout
         self._bind_activity_tracking()
     
@@ -117,7 +125,8 @@ class DashboardMain:
                 ("Change Password", self._change_password),
                 None,
                 ("Admin Settings", self._open_admin_settings),
-                ("Audit Log", self._open_audit_log)
+                ("Audit Log", self._open_audit_log),
+                ("Compact Database", self._compact_database)
             ])
         else:
             # Regular users only see limited options
@@ -513,6 +522,47 @@ class DashboardMain:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open Audit Log: {e}")
     
+    def _compact_database(self):
+        """Switch the database to incremental vacuum with one full VACUUM (admin action)."""
+        if not self.db.is_admin(self.username):
+            messagebox.showerror("Access Denied", "This feature is only available to administrators.")
+            return
+        try:
+            if not self.db.needs_full_vacuum():
+                messagebox.showinfo("Compact Database",
+                                    "The database already releases free space automatically.",
+                                    parent=self.root)
+                return
+            size_mb = self.db.db_file.stat().st_size / 1048576
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to check database: {e}")
+            return
+        
+        if not messagebox.askyesno("Compact Database",
+                                   f"The database ({size_mb:.1f} MB) will be rewritten once so free space "
+                                   f"can be released automatically from now on.\n\n"
+                                   f"Other actions that save data will wait until this finishes. Continue?",
+                                   parent=self.root):
+            return
+        
+        self.activity_log.log_message("Database", "Compacting database...", "info")
+        
+        def worker():
+            try:
+                result = self.db.enable_incremental_vacuum()
+                message = (f"Database compacted: {result['size_before'] / 1048576:.1f} MB -> "
+                           f"{result['size_after'] / 1048576:.1f} MB ({result['seconds']:.1f}s)")
+                level, success, details = "info", True, result
+            except Exception as e:
+                message, level = f"Failed to compact database: {e}", "error"
+                success, details = False, {'error': str(e)}
+            # Audit once the outcome is known
+            self.db.log_user_activity(self.username, 'compact_database', message,
+                                      success=success, details=details)
+            self.root.after(0, lambda: self.activity_log.log_message("Database", message, level))
+        
+        threading.Thread(target=worker, name='db-compact', daemon=True).start()
+    
     def _show_documentation(self):
         """Show documentation."""
         messagebox.showinfo("Documentation", 
@@ -991,6 +1041,39 @@ class DashboardMain:
                            "For now, use the database management tools.",
                            parent=self.root)
     
+    def _start_database_retention(self):
+        """Archive old history and log rows and compact the database in the background."""
+        def on_done(result):
+            archived = sum(result['archived'].values())
+            if archived or result['pages_freed']:
+                message = (f"Archived {archived} old history/log entries, "
+                           f"freed {result['pages_freed']} pages ({result['seconds']:.1f}s)")
+                self.root.after(0, lambda: self.activity_log.log_message("Database", message, "info"))
+            if result['needs_full_vacuum']:
+                message = (f"Database is {result['size_bytes'] / 1048576:.1f} MB and can't release free space "
+                           f"until an admin runs Admin > Compact Database once")
+                self.root.after(0, lambda: self.activity_log.log_message("Database", message, "warning"))
+        
+        try:
+            self.db.start_retention(on_done=on_done)
+        except Exception as e:
+            print(f"Error starting database retention: {e}")
+    
+    def _start_jira_sync(self):
+        """Start the background Jira sync (panels then read tracked APs from the cache)."""
+        def on_synced(result):
+            if result['issues'] or result['failed_batches']:
+                level = "info" if result['success'] else "warning"
+                self.root.after(0, lambda: self.activity_log.log_message("Jira Sync", result['message'], level))
+        
+        try:
+            from jira_sync import get_jira_sync_service
+            sync = get_jira_sync_service(self.db)
+            sync.on_synced = on_synced
+            sync.start()
+        except Exception as e:
+            print(f"Error starting Jira sync: {e}")
+    
     def _auto_refresh_credentials(self):
         """Auto-refresh AP data from database every minute."""
         try:
@@ -1002,10 +1085,9 @@ class DashboardMain:
             if self.active_ap and 'ap_id' in self.active_ap:
                 ap_id = self.active_ap['ap_id']
                 
-                # Reload AP from database
-                from credential_manager_v2 import CredentialManager
-                creds_manager = CredentialManager()
-                updated_ap = creds_manager.find_by_ap_id(ap_id)
+                # Shared catalog only re-reads rows that changed since the last refresh
+                from ap_catalog import get_ap_catalog
+                updated_ap = get_ap_catalog(self.db).get(ap_id)
                 
                 if updated_ap:
                     # Update active AP data
@@ -1222,6 +1304,8 @@ def main():
     
     splash.update_progress(50, "Initializing database...")
     db = DatabaseManager()
+    # Every subsystem reuses this instance instead of opening its own
+    register_database_manager(db)
     
     splash.update_progress(70, "Loading user interface...")
     root = tk.Tk()
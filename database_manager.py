@@ -6,22 +6,376 @@ Replaces JSON-based credential storage with concurrent-safe SQLite database
 import sqlite3
 import json
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Iterator
 from datetime import datetime
 from contextlib import contextmanager
 import threading
+import queue
+import time
+from collections import OrderedDict
 from cryptography.fernet import Fernet
 import base64
 import hashlib
 import bcrypt
 from input_validator import InputValidator
 
+class _WriteBehindQueue:
+    """Single writer thread that batches status, history and metrics writes.
+    
+    Producers enqueue writes and return immediately. The writer collects up to
+    batch_size writes (or whatever arrives within flush_interval_ms of the first
+    one), coalesces repeated status updates for the same AP and commits the
+    whole batch in one transaction. A commit that fails because the database
+    is locked is retried with backoff; a batch that still fails is counted as
+    dropped and makes flush() return False.
+    """
+    
+    _FLUSH = object()
+    _STOP = object()
+    
+    # Attempts per batch while SQLite reports "database is locked"/"busy"
+    LOCK_RETRIES = 5
+    LOCK_BACKOFF = 0.05  # seconds, doubled after every attempt
+    
+    def __init__(self, db: 'DatabaseManager', batch_size: int = 500, flush_interval_ms: int = 200):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'queued': 0,
+            'written': 0,
+            'commits': 0,
+            'errors': 0,
+            'retries': 0,
+            'dropped': 0,
+            'last_error': None,
+            'last_commit_ms': 0.0,
+            'max_commit_ms': 0.0,
+            'total_commit_ms': 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, name='vera-db-writer', daemon=True)
+        self._thread.start()
+    
+    def put(self, kind: str, payload):
+        """Queue a write ('status', 'history' or 'metrics')."""
+        with self._stats_lock:
+            self._stats['queued'] += 1
+        self._queue.put((kind, payload))
+    
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every write queued so far has been committed.
+        
+        Returns:
+            False on timeout or if a batch was dropped while waiting
+        """
+        if not self._thread.is_alive():
+            return self._queue.empty()
+        with self._stats_lock:
+            dropped = self._stats['dropped']
+        request = _FlushRequest()
+        self._queue.put((self._FLUSH, request))
+        if not request.done.wait(timeout):
+            return False
+        return request.dropped == dropped
+    
+    def close(self, timeout: float = None):
+        """Commit outstanding writes and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put((self._STOP, None))
+            self._thread.join(timeout)
+    
+    @property
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+    
+    def stats(self) -> Dict:
+        """Queue depth and commit latency counters."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        total_ms = stats.pop('total_commit_ms')
+        stats['queue_depth'] = self._queue.qsize()
+        stats['avg_commit_ms'] = total_ms / stats['commits'] if stats['commits'] else 0.0
+        return stats
+    
+    def _run(self):
+        running = True
+        while running:
+            kind, payload = self._queue.get()
+            batch = []
+            waiters = []
+            
+            if kind is self._STOP:
+                running = False
+            elif kind is self._FLUSH:
+                waiters.append(payload)
+            else:
+                batch.append((kind, payload))
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        kind, payload = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if kind is self._STOP:
+                        running = False
+                        break
+                    if kind is self._FLUSH:
+                        waiters.append(payload)
+                        break
+                    batch.append((kind, payload))
+            
+            if not running:
+                # Drain anything queued behind the stop marker
+                while True:
+                    try:
+                        kind, payload = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if kind is self._FLUSH:
+                        waiters.append(payload)
+                    elif kind is not self._STOP:
+                        batch.append((kind, payload))
+            
+            if batch:
+                self._commit(batch)
+            for request in waiters:
+                with self._stats_lock:
+                    request.dropped = self._stats['dropped']
+                request.done.set()
+        
+        # Close the writer's own thread-local connection
+        conn = getattr(self.db._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            del self.db._local.conn
+    
+    def _commit(self, batch: List[Tuple[str, object]]):
+        """Coalesce a batch and write it in one transaction."""
+        statuses = {}  # ap_id -> (status, ping_time); the latest update wins
+        history = []
+        metrics = []
+        for kind, payload in batch:
+            if kind == 'status':
+                ap_id, status, ping_time = payload
+                previous = statuses.get(ap_id)
+                if ping_time is None and previous is not None:
+                    ping_time = previous[1]
+                statuses[ap_id] = (status, ping_time)
+            elif kind == 'history':
+                history.append(payload)
+            elif kind == 'metrics':
+                metrics.extend(payload)
+        
+        for attempt in range(self.LOCK_RETRIES):
+            try:
+                self._write(statuses, history, metrics, len(batch))
+                return
+            except sqlite3.OperationalError as e:
+                if not self._is_lock_error(e) or attempt == self.LOCK_RETRIES - 1:
+                    self._record_failure(e, len(batch))
+                    return
+                with self._stats_lock:
+                    self._stats['retries'] += 1
+                time.sleep(self.LOCK_BACKOFF * (2 ** attempt))
+            except Exception as e:
+                self._record_failure(e, len(batch))
+                return
+    
+    @staticmethod
+    def _is_lock_error(error: sqlite3.OperationalError) -> bool:
+        message = str(error).lower()
+        return 'locked' in message or 'busy' in message
+    
+    def _record_failure(self, error: Exception, count: int):
+        with self._stats_lock:
+            self._stats['errors'] += 1
+            self._stats['dropped'] += count
+            self._stats['last_error'] = str(error)
+        print(f"Error committing queued writes ({count} rows dropped): {error}")
+    
+    def _write(self, statuses: Dict, history: List, metrics: List, count: int):
+        """Write one coalesced batch in a single transaction."""
+        start = time.perf_counter()
+        with self.db._get_connection() as conn:
+            cursor = conn.cursor()
+            if statuses:
+                cursor.executemany('''
+                    UPDATE access_points
+                    SET status = ?, last_seen = CURRENT_TIMESTAMP,
+                        last_ping_time = COALESCE(?, last_ping_time)
+                    WHERE ap_id = ?
+                ''', [(status, ping_time, ap_id) for ap_id, (status, ping_time) in statuses.items()])
+            if history:
+                cursor.executemany('''
+                    INSERT INTO ap_history (ap_id, event_type, description, user, success, details)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', history)
+            if metrics:
+                cursor.executemany(self.db.AP_METRICS_UPSERT_SQL, metrics)
+            conn.commit()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            self._stats['written'] += count
+            self._stats['commits'] += 1
+            self._stats['last_commit_ms'] = elapsed_ms
+            self._stats['max_commit_ms'] = max(self._stats['max_commit_ms'], elapsed_ms)
+            self._stats['total_commit_ms'] += elapsed_ms
+
+
+class _FlushRequest:
+    """Flush marker: set once every earlier write is committed or dropped."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.dropped = 0  # Writer's dropped count when the marker was reached
+
+
+# Decrypted secret values by Fernet token, shared by all DatabaseManager instances.
+# Tokens carry a random IV, so a token maps to exactly one plaintext.
+DECRYPT_CACHE_SIZE = 4096
+_decrypted_values: 'OrderedDict[str, str]' = OrderedDict()
+_decrypted_lock = threading.Lock()
+
+
+class APRow(dict):
+    """An access_points row whose encrypted fields are decrypted on first access.
+    
+    Behaves like the plain dict the query methods used to return, but listing
+    or searching the fleet no longer pays for three Fernet decryptions per row
+    that only the connect/SSH paths ever read. Reading a secret field (via
+    [], get(), items(), values(), copy(), dict(row), json, ...) decrypts it
+    once and stores the plaintext in the row.
+    """
+    
+    __slots__ = ('_pending', '_decrypt')
+    
+    def __init__(self, row, encrypted_fields: List[str], decrypt):
+        super().__init__(row)
+        self._decrypt = decrypt
+        self._pending = {field for field in encrypted_fields if dict.get(self, field)}
+    
+    def _resolve(self, key):
+        if key in self._pending:
+            self._pending.discard(key)
+            super().__setitem__(key, self._decrypt(super().__getitem__(key)))
+    
+    def _resolve_all(self):
+        for key in list(self._pending):
+            self._resolve(key)
+    
+    def __getitem__(self, key):
+        self._resolve(key)
+        return super().__getitem__(key)
+    
+    def get(self, key, default=None):
+        self._resolve(key)
+        return super().get(key, default)
+    
+    def __setitem__(self, key, value):
+        self._pending.discard(key)
+        super().__setitem__(key, value)
+    
+    def __delitem__(self, key):
+        self._pending.discard(key)
+        super().__delitem__(key)
+    
+    def __iter__(self):
+        # Overriding __iter__ makes dict(row) / {**row} copy through __getitem__
+        return super().__iter__()
+    
+    def pop(self, key, *default):
+        self._resolve(key)
+        return super().pop(key, *default)
+    
+    def setdefault(self, key, default=None):
+        self._resolve(key)
+        return super().setdefault(key, default)
+    
+    def update(self, *args, **kwargs):
+        updates = dict(*args, **kwargs)
+        self._pending.difference_update(updates)
+        super().update(updates)
+    
+    def items(self):
+        self._resolve_all()
+        return super().items()
+    
+    def values(self):
+        self._resolve_all()
+        return super().values()
+    
+    def copy(self) -> Dict:
+        self._resolve_all()
+        return dict(super().items())
+    
+    def __copy__(self) -> 'APRow':
+        """Shallow copy that keeps pending fields encrypted (used by APCatalog)."""
+        clone = APRow.__new__(APRow)
+        dict.update(clone, self)
+        clone._decrypt = self._decrypt
+        clone._pending = set(self._pending)
+        return clone
+    
+    def __eq__(self, other):
+        self._resolve_all()
+        return super().__eq__(other)
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        self._resolve_all()
+        return super().__repr__()
+
+
 class DatabaseManager:
     """Manages VERA database with encryption for sensitive fields."""
     
     # Fields that should be encrypted
     ENCRYPTED_FIELDS = ['password_webui', 'password_ssh', 'su_password']
     
+    # Entries kept in ap_change_log (older ones force APCatalog to reload fully)
+    CHANGE_LOG_SIZE = 20000
+    
+    # Columns covered by the access_points_fts trigram search index
+    AP_SEARCH_COLUMNS = ['ap_id', 'store_id', 'store_alias', 'retail_chain', 'ip_address',
+                         'mac_address', 'serial_number', 'type', 'notes']
+    
+    # Merges a daily ping rollup into ap_metrics (named parameters, see upsert_ap_metrics)
+    AP_METRICS_UPSERT_SQL = '''
+        INSERT INTO ap_metrics (
+            ap_id, date, ping_count, successful_pings,
+            avg_response_time, min_response_time, max_response_time, uptime_percentage
+        )
+        SELECT :ap_id, :date, :ping_count, :successful_pings,
+               :avg_response_time, :min_response_time, :max_response_time,
+               CASE WHEN :ping_count > 0
+                    THEN 100.0 * :successful_pings / :ping_count END
+        WHERE EXISTS (SELECT 1 FROM access_points WHERE ap_id = :ap_id)
+        ON CONFLICT(ap_id, date) DO UPDATE SET
+            ping_count = ping_count + excluded.ping_count,
+            successful_pings = successful_pings + excluded.successful_pings,
+            avg_response_time = CASE
+                WHEN successful_pings + excluded.successful_pings > 0 THEN
+                    (COALESCE(avg_response_time, 0) * successful_pings
+                     + COALESCE(excluded.avg_response_time, 0) * excluded.successful_pings)
+                    / (successful_pings + excluded.successful_pings)
+                END,
+            min_response_time = COALESCE(MIN(min_response_time, excluded.min_response_time),
+                                         min_response_time, excluded.min_response_time),
+            max_response_time = COALESCE(MAX(max_response_time, excluded.max_response_time),
+                                         max_response_time, excluded.max_response_time),
+            uptime_percentage = CASE
+                WHEN ping_count + excluded.ping_count > 0 THEN
+                    100.0 * (successful_pings + excluded.successful_pings)
+                    / (ping_count + excluded.ping_count)
+                END
+    '''
+    
     def __init__(self, db_file: str = None):
         if db_file is None:
             db_file = Path.home() / ".vera_database.db"
@@ -29,6 +383,9 @@ class DatabaseManager:
         self.key_file = Path.home() / ".vera_encryption_key"
         self._cipher = self._get_cipher()
         self._local = threading.local()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._search_index = None  # access_points_fts available (checked on first search)
         self._init_database()
     
     def _get_cipher(self):
@@ -70,7 +427,24 @@ class DatabaseManager:
         return self._cipher.encrypt(value.encode()).decode()
     
     def _decrypt(self, encrypted: str) -> str:
-        """Decrypt a value."""
+        """Decrypt a value (recently decrypted values come from a process-wide LRU)."""
+        if not encrypted:
+            return ''
+        with _decrypted_lock:
+            if encrypted in _decrypted_values:
+                _decrypted_values.move_to_end(encrypted)
+                return _decrypted_values[encrypted]
+        value = self._decrypt_uncached(encrypted)
+        if value is encrypted:
+            return encrypted
+        with _decrypted_lock:
+            _decrypted_values[encrypted] = value
+            if len(_decrypted_values) > DECRYPT_CACHE_SIZE:
+                _decrypted_values.popitem(last=False)
+        return value
+    
+    def _decrypt_uncached(self, encrypted: str) -> str:
+        """Decrypt without touching the LRU (for one-off bulk reads such as exports)."""
         if not encrypted:
             return ''
         try:
@@ -79,6 +453,11 @@ class DatabaseManager:
             # If decryption fails, return as-is (for backward compatibility)
             return encrypted
     
+    def _ap_row(self, row) -> APRow:
+        """Wrap an access_points row so secret fields are decrypted only when read."""
+        # zip() avoids sqlite3.Row's by-name lookups, which scan every column
+        return APRow(zip(row.keys(), row), self.ENCRYPTED_FIELDS, self._decrypt)
+    
     @contextmanager
     def _get_connection(self):
         """Get a thread-safe database connection with proper locking."""
@@ -90,8 +469,14 @@ class DatabaseManager:
                 check_same_thread=False
             )
             self._local.conn.row_factory = sqlite3.Row
-            # Enable Write-Ahead Logging for better concurrent access
-            self._local.conn.execute('PRAGMA journal_mode=WAL')
+            # auto_vacuum and journal_mode are stored in the file, so only new or
+            # pre-versioning databases need them (each costs a schema load)
+            if self._local.conn.execute('PRAGMA user_version').fetchone()[0] == 0:
+                # New databases free pages incrementally (see run_retention); must precede
+                # the first write, and is a no-op for existing files
+                self._local.conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+                # Enable Write-Ahead Logging for better concurrent access
+                self._local.conn.execute('PRAGMA journal_mode=WAL')
             self._local.conn.execute('PRAGMA foreign_keys=ON')
         
         try:
@@ -100,311 +485,440 @@ class DatabaseManager:
             self._local.conn.rollback()
             raise
     
+    # ==================== Schema Migrations ====================
+    
     def _init_database(self):
-        """Initialize database schema."""
+        """Bring the schema up to date (no DDL at all when it already is)."""
         with self._get_connection() as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version < self.SCHEMA_VERSION:
+                self._migrate(conn)
+            elif version > self.SCHEMA_VERSION:
+                print(f"Database schema version {version} is newer than this application "
+                      f"({self.SCHEMA_VERSION}); some features may not work")
+    
+    def _migrate(self, conn):
+        """Apply pending migrations in one transaction and record the new user_version."""
+        started = time.perf_counter()
+        # IMMEDIATE: a second process starting at the same time waits, then sees the new version
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
             cursor = conn.cursor()
-            
-            # Access Points table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS access_points (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ap_id TEXT NOT NULL UNIQUE,
-                    store_id TEXT NOT NULL,
-                    store_alias TEXT,
-                    retail_chain TEXT,
-                    ip_address TEXT,
-                    type TEXT,
-                    username_webui TEXT,
-                    password_webui TEXT,  -- Encrypted
-                    username_ssh TEXT,
-                    password_ssh TEXT,    -- Encrypted
-                    su_password TEXT,     -- Encrypted
-                    notes TEXT,
-                    status TEXT DEFAULT 'unknown',  -- online, offline, unknown
-                    last_seen TIMESTAMP,
-                    last_ping_time REAL,
-                    serial_number TEXT,
-                    software_version TEXT,
-                    firmware_version TEXT,
-                    hardware_revision TEXT,
-                    build TEXT,
-                    configuration_mode TEXT,
-                    service_status TEXT,
-                    uptime TEXT,
-                    communication_daemon_status TEXT,
-                    mac_address TEXT,
-                    connectivity_internet TEXT,
-                    connectivity_provisioning TEXT,
-                    connectivity_ntp_server TEXT,
-                    connectivity_apc_address TEXT,
-                    vusion_display_name TEXT,
-                    vusion_creation_date TIMESTAMP,
-                    vusion_modification_date TIMESTAMP,
-                    vusion_last_offline_date TIMESTAMP,
-                    vusion_last_online_date TIMESTAMP,
-                    vusion_comment TEXT,
-                    vusion_information TEXT,
-                    vusion_status TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Add new Vusion columns if they don't exist (for existing databases)
-            vusion_columns = [
-                ('vusion_display_name', 'TEXT'),
-                ('vusion_creation_date', 'TIMESTAMP'),
-                ('vusion_modification_date', 'TIMESTAMP'),
-                ('vusion_last_offline_date', 'TIMESTAMP'),
-                ('vusion_last_online_date', 'TIMESTAMP'),
-                ('vusion_comment', 'TEXT'),
-                ('vusion_information', 'TEXT'),
-                ('vusion_status', 'TEXT')
-            ]
-            
-            for column_name, column_type in vusion_columns:
-                try:
-                    cursor.execute(f'ALTER TABLE access_points ADD COLUMN {column_name} {column_type}')
-                    conn.commit()
-                except sqlite3.OperationalError:
-                    # Column already exists
-                    pass
-            
-            # History/Events table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS ap_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ap_id TEXT NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    event_type TEXT NOT NULL,  -- ping, connect, provision, ssh, etc.
-                    description TEXT,
-                    user TEXT,
-                    success BOOLEAN,
-                    details TEXT,  -- JSON for additional data
-                    FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Add new columns to existing access_points table if they don't exist
-            # (for database migration)
-            new_columns = [
-                ('serial_number', 'TEXT'),
-                ('software_version', 'TEXT'),
-                ('firmware_version', 'TEXT'),
-                ('hardware_revision', 'TEXT'),
-                ('build', 'TEXT'),
-                ('configuration_mode', 'TEXT'),
-                ('service_status', 'TEXT'),
-                ('uptime', 'TEXT'),
-                ('communication_daemon_status', 'TEXT'),
-                ('mac_address', 'TEXT'),
-                ('connectivity_internet', 'TEXT'),
-                ('connectivity_provisioning', 'TEXT'),
-                ('connectivity_ntp_server', 'TEXT'),
-                ('connectivity_apc_address', 'TEXT'),
-                ('java_version', 'TEXT')
-            ]
-            
-            for col_name, col_type in new_columns:
-                try:
-                    cursor.execute(f'ALTER TABLE access_points ADD COLUMN {col_name} {col_type}')
-                except sqlite3.OperationalError:
-                    # Column already exists, skip
-                    pass
-            
-            # Jira Tickets table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS jira_tickets (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ticket_key TEXT NOT NULL UNIQUE,
-                    ap_id TEXT,
-                    summary TEXT,
-                    description TEXT,
-                    status TEXT,
-                    priority TEXT,
-                    issue_type TEXT,
-                    created TIMESTAMP,
-                    updated TIMESTAMP,
-                    resolved TIMESTAMP,
-                    assignee TEXT,
-                    reporter TEXT,
-                    last_synced TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE SET NULL
-                )
-            ''')
-            
-            # Comments table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS comments (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ap_id TEXT NOT NULL,
-                    user TEXT NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    comment TEXT NOT NULL,
-                    ticket_key TEXT,
-                    FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE CASCADE,
-                    FOREIGN KEY (ticket_key) REFERENCES jira_tickets(ticket_key) ON DELETE SET NULL
-                )
-            ''')
-            
-            # Support Notes table (for AP support system)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS support_notes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ap_id TEXT NOT NULL,
-                    user TEXT NOT NULL,
-                    headline TEXT NOT NULL,
-                    note TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_by TEXT,
-                    is_deleted BOOLEAN DEFAULT 0,
-                    FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Support Note Replies table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS support_note_replies (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    note_id INTEGER NOT NULL,
-                    user TEXT NOT NULL,
-                    reply_text TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    is_deleted BOOLEAN DEFAULT 0,
-                    FOREIGN KEY (note_id) REFERENCES support_notes(id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Add support_status column to access_points if it doesn't exist
+            for number, migration in enumerate(self.MIGRATIONS[version:], start=version + 1):
+                migration(self, cursor)
+                cursor.execute(f'PRAGMA user_version = {number}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        if version < self.SCHEMA_VERSION:
+            print(f"Database schema migrated from version {version} to {self.SCHEMA_VERSION} "
+                  f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+    
+    def _migration_1_baseline(self, cursor):
+        """Full schema as of version 1; also upgrades databases created before versioning."""
+        # Access Points table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS access_points (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ap_id TEXT NOT NULL UNIQUE,
+                store_id TEXT NOT NULL,
+                store_alias TEXT,
+                retail_chain TEXT,
+                ip_address TEXT,
+                type TEXT,
+                username_webui TEXT,
+                password_webui TEXT,  -- Encrypted
+                username_ssh TEXT,
+                password_ssh TEXT,    -- Encrypted
+                su_password TEXT,     -- Encrypted
+                notes TEXT,
+                status TEXT DEFAULT 'unknown',  -- online, offline, unknown
+                last_seen TIMESTAMP,
+                last_ping_time REAL,
+                serial_number TEXT,
+                software_version TEXT,
+                firmware_version TEXT,
+                hardware_revision TEXT,
+                build TEXT,
+                configuration_mode TEXT,
+                service_status TEXT,
+                uptime TEXT,
+                communication_daemon_status TEXT,
+                mac_address TEXT,
+                connectivity_internet TEXT,
+                connectivity_provisioning TEXT,
+                connectivity_ntp_server TEXT,
+                connectivity_apc_address TEXT,
+                vusion_display_name TEXT,
+                vusion_creation_date TIMESTAMP,
+                vusion_modification_date TIMESTAMP,
+                vusion_last_offline_date TIMESTAMP,
+                vusion_last_online_date TIMESTAMP,
+                vusion_comment TEXT,
+                vusion_information TEXT,
+                vusion_status TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Add new Vusion columns if they don't exist (for existing databases)
+        vusion_columns = [
+            ('vusion_display_name', 'TEXT'),
+            ('vusion_creation_date', 'TIMESTAMP'),
+            ('vusion_modification_date', 'TIMESTAMP'),
+            ('vusion_last_offline_date', 'TIMESTAMP'),
+            ('vusion_last_online_date', 'TIMESTAMP'),
+            ('vusion_comment', 'TEXT'),
+            ('vusion_information', 'TEXT'),
+            ('vusion_status', 'TEXT')
+        ]
+        
+        for column_name, column_type in vusion_columns:
             try:
-                cursor.execute('ALTER TABLE access_points ADD COLUMN support_status TEXT DEFAULT "active"')
+                cursor.execute(f'ALTER TABLE access_points ADD COLUMN {column_name} {column_type}')
             except sqlite3.OperationalError:
-                pass  # Column already exists
-            
-            # Performance metrics table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS ap_metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ap_id TEXT NOT NULL,
-                    date DATE NOT NULL,
-                    ping_count INTEGER DEFAULT 0,
-                    successful_pings INTEGER DEFAULT 0,
-                    avg_response_time REAL,
-                    min_response_time REAL,
-                    max_response_time REAL,
-                    uptime_percentage REAL,
-                    issues_count INTEGER DEFAULT 0,
-                    FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE CASCADE,
-                    UNIQUE(ap_id, date)
-                )
-            ''')
-            
-            # Users table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT NOT NULL UNIQUE COLLATE NOCASE,
-                    full_name TEXT NOT NULL,
-                    password TEXT NOT NULL,  -- Encrypted
-                    role TEXT NOT NULL,  -- Admin or User
-                    email TEXT,  -- User email address
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    created_by TEXT,  -- Username who created this user
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_by TEXT,  -- Username who last modified this user
-                    last_login TIMESTAMP,
-                    is_active BOOLEAN DEFAULT 1
-                )
-            ''')
-            
-            # Add email column if it doesn't exist (migration)
+                # Column already exists
+                pass
+        
+        # History/Events table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ap_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ap_id TEXT NOT NULL,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                event_type TEXT NOT NULL,  -- ping, connect, provision, ssh, etc.
+                description TEXT,
+                user TEXT,
+                success BOOLEAN,
+                details TEXT,  -- JSON for additional data
+                FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE CASCADE
+            )
+        ''')
+        
+        # Add new columns to existing access_points table if they don't exist
+        # (for database migration)
+        new_columns = [
+            ('serial_number', 'TEXT'),
+            ('software_version', 'TEXT'),
+            ('firmware_version', 'TEXT'),
+            ('hardware_revision', 'TEXT'),
+            ('build', 'TEXT'),
+            ('configuration_mode', 'TEXT'),
+            ('service_status', 'TEXT'),
+            ('uptime', 'TEXT'),
+            ('communication_daemon_status', 'TEXT'),
+            ('mac_address', 'TEXT'),
+            ('connectivity_internet', 'TEXT'),
+            ('connectivity_provisioning', 'TEXT'),
+            ('connectivity_ntp_server', 'TEXT'),
+            ('connectivity_apc_address', 'TEXT'),
+            ('java_version', 'TEXT')
+        ]
+        
+        for col_name, col_type in new_columns:
             try:
-                cursor.execute("SELECT email FROM users LIMIT 1")
-            except:
-                cursor.execute("ALTER TABLE users ADD COLUMN email TEXT")
-            
-            
-            # User audit log - tracks user management actions
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_audit_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    actor_username TEXT NOT NULL,  -- Who performed the action
-                    action TEXT NOT NULL,  -- create_user, delete_user, change_password, change_role, etc.
-                    target_username TEXT NOT NULL,  -- User affected by the action
-                    details TEXT,  -- JSON for additional info (e.g., old role -> new role)
-                    ip_address TEXT,
-                    success BOOLEAN DEFAULT 1
-                )
-            ''')
-            
-            # User activity log - tracks user operations in the system
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_activity_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    username TEXT NOT NULL,
-                    activity_type TEXT NOT NULL,  -- login, logout, ap_connect, provision, etc.
-                    description TEXT,
-                    ap_id TEXT,  -- Optional: related AP
-                    ip_address TEXT,
-                    session_id TEXT,  -- For tracking sessions
-                    success BOOLEAN DEFAULT 1,
-                    details TEXT  -- JSON for additional data
-                )
-            ''')
-            
-            # System configuration - for storing encryption keys and system settings
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS system_config (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    config_key TEXT UNIQUE NOT NULL,
-                    config_value TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # API credentials - encrypted storage for external API credentials
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS api_credentials (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    service_name TEXT UNIQUE NOT NULL,  -- jira, vusion_cloud, etc.
-                    encrypted_data TEXT NOT NULL,  -- JSON encrypted with Fernet
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    created_by TEXT,  -- Admin who created it
-                    last_used TIMESTAMP  -- Last time credentials were used
-                )
-            ''')
-            
-            # Create indexes for performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ap_store ON access_points(store_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ap_ip ON access_points(ip_address)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ap_status ON access_points(status)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_ap ON ap_history(ap_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_timestamp ON ap_history(timestamp)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_type ON ap_history(event_type)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tickets_ap ON jira_tickets(ap_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tickets_status ON jira_tickets(status)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_comments_ap ON comments(ap_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_metrics_ap_date ON ap_metrics(ap_id, date)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_audit_timestamp ON user_audit_log(timestamp)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_audit_actor ON user_audit_log(actor_username)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_audit_target ON user_audit_log(target_username)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_activity_timestamp ON user_activity_log(timestamp)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_activity_user ON user_activity_log(username)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_activity_type ON user_activity_log(activity_type)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_support_notes_ap ON support_notes(ap_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_support_notes_created ON support_notes(created_at)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ap_support_status ON access_points(support_status)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_system_config_key ON system_config(config_key)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_api_credentials_service ON api_credentials(service_name)')
-            
-            conn.commit()
+                cursor.execute(f'ALTER TABLE access_points ADD COLUMN {col_name} {col_type}')
+            except sqlite3.OperationalError:
+                # Column already exists, skip
+                pass
+        
+        # Jira Tickets table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jira_tickets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticket_key TEXT NOT NULL UNIQUE,
+                ap_id TEXT,
+                summary TEXT,
+                description TEXT,
+                status TEXT,
+                priority TEXT,
+                issue_type TEXT,
+                created TIMESTAMP,
+                updated TIMESTAMP,
+                resolved TIMESTAMP,
+                assignee TEXT,
+                reporter TEXT,
+                last_synced TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE SET NULL
+            )
+        ''')
+        
+        # Comments table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS comments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ap_id TEXT NOT NULL,
+                user TEXT NOT NULL,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                comment TEXT NOT NULL,
+                ticket_key TEXT,
+                FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE CASCADE,
+                FOREIGN KEY (ticket_key) REFERENCES jira_tickets(ticket_key) ON DELETE SET NULL
+            )
+        ''')
+        
+        # Support Notes table (for AP support system)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS support_notes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ap_id TEXT NOT NULL,
+                user TEXT NOT NULL,
+                headline TEXT NOT NULL,
+                note TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_by TEXT,
+                is_deleted BOOLEAN DEFAULT 0,
+                FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE CASCADE
+            )
+        ''')
+        
+        # Support Note Replies table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS support_note_replies (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                note_id INTEGER NOT NULL,
+                user TEXT NOT NULL,
+                reply_text TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                is_deleted BOOLEAN DEFAULT 0,
+                FOREIGN KEY (note_id) REFERENCES support_notes(id) ON DELETE CASCADE
+            )
+        ''')
+        
+        # Add support_status column to access_points if it doesn't exist
+        try:
+            cursor.execute('ALTER TABLE access_points ADD COLUMN support_status TEXT DEFAULT "active"')
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+        
+        # Performance metrics table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ap_metrics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ap_id TEXT NOT NULL,
+                date DATE NOT NULL,
+                ping_count INTEGER DEFAULT 0,
+                successful_pings INTEGER DEFAULT 0,
+                avg_response_time REAL,
+                min_response_time REAL,
+                max_response_time REAL,
+                uptime_percentage REAL,
+                issues_count INTEGER DEFAULT 0,
+                FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE CASCADE,
+                UNIQUE(ap_id, date)
+            )
+        ''')
+        
+        # Users table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL UNIQUE COLLATE NOCASE,
+                full_name TEXT NOT NULL,
+                password TEXT NOT NULL,  -- Encrypted
+                role TEXT NOT NULL,  -- Admin or User
+                email TEXT,  -- User email address
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_by TEXT,  -- Username who created this user
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_by TEXT,  -- Username who last modified this user
+                last_login TIMESTAMP,
+                is_active BOOLEAN DEFAULT 1
+            )
+        ''')
+        
+        # Add email column if it doesn't exist (migration)
+        try:
+            cursor.execute("SELECT email FROM users LIMIT 1")
+        except:
+            cursor.execute("ALTER TABLE users ADD COLUMN email TEXT")
+        
+        
+        # User audit log - tracks user management actions
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_audit_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                actor_username TEXT NOT NULL,  -- Who performed the action
+                action TEXT NOT NULL,  -- create_user, delete_user, change_password, change_role, etc.
+                target_username TEXT NOT NULL,  -- User affected by the action
+                details TEXT,  -- JSON for additional info (e.g., old role -> new role)
+                ip_address TEXT,
+                success BOOLEAN DEFAULT 1
+            )
+        ''')
+        
+        # User activity log - tracks user operations in the system
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_activity_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                username TEXT NOT NULL,
+                activity_type TEXT NOT NULL,  -- login, logout, ap_connect, provision, etc.
+                description TEXT,
+                ap_id TEXT,  -- Optional: related AP
+                ip_address TEXT,
+                session_id TEXT,  -- For tracking sessions
+                success BOOLEAN DEFAULT 1,
+                details TEXT  -- JSON for additional data
+            )
+        ''')
+        
+        # System configuration - for storing encryption keys and system settings
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS system_config (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                config_key TEXT UNIQUE NOT NULL,
+                config_value TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # API credentials - encrypted storage for external API credentials
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS api_credentials (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                service_name TEXT UNIQUE NOT NULL,  -- jira, vusion_cloud, etc.
+                encrypted_data TEXT NOT NULL,  -- JSON encrypted with Fernet
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_by TEXT,  -- Admin who created it
+                last_used TIMESTAMP  -- Last time credentials were used
+            )
+        ''')
+        
+        # Create indexes for performance
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ap_store ON access_points(store_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ap_ip ON access_points(ip_address)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ap_status ON access_points(status)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_ap ON ap_history(ap_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_timestamp ON ap_history(timestamp)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_type ON ap_history(event_type)')
+        # Filter + (timestamp, id) order for keyset paging of the log tables
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_ap_time ON ap_history(ap_id, timestamp)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_audit_actor_time ON user_audit_log(actor_username, timestamp)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_audit_target_time ON user_audit_log(target_username, timestamp)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_activity_user_time ON user_activity_log(username, timestamp)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_activity_type_time ON user_activity_log(activity_type, timestamp)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tickets_ap ON jira_tickets(ap_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tickets_status ON jira_tickets(status)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_comments_ap ON comments(ap_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_metrics_ap_date ON ap_metrics(ap_id, date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_audit_timestamp ON user_audit_log(timestamp)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_audit_actor ON user_audit_log(actor_username)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_audit_target ON user_audit_log(target_username)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_activity_timestamp ON user_activity_log(timestamp)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_activity_user ON user_activity_log(username)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_activity_type ON user_activity_log(activity_type)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_support_notes_ap ON support_notes(ap_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_support_notes_created ON support_notes(created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ap_support_status ON access_points(support_status)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_system_config_key ON system_config(config_key)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_api_credentials_service ON api_credentials(service_name)')
+        
+        # Substring search index (replaces LIKE '%term%' full scans)
+        self._init_search_index(cursor)
+        
+        # Row-level change log for access_points, read by the in-memory AP catalog
+        self._init_change_log(cursor)
+        
+    def _migration_2_jira_tables(self, cursor):
+        """Jira issue links and comments (previously created by every JiraDBManager)."""
+        # Jira AP Links table - main issue tracking
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jira_ap_links (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ap_id TEXT NOT NULL,
+                jira_key TEXT NOT NULL,
+                jira_id TEXT NOT NULL,
+                jira_url TEXT NOT NULL,
+                summary TEXT,
+                issue_type TEXT,
+                status TEXT,
+                priority TEXT,
+                resolution TEXT,
+                created_date TEXT,
+                updated_date TEXT,
+                resolved_date TEXT,
+                creator TEXT,
+                reporter TEXT,
+                assignee TEXT,
+                description_preview TEXT,
+                comment_count INTEGER DEFAULT 0,
+                last_synced TEXT DEFAULT CURRENT_TIMESTAMP,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(ap_id, jira_key)
+            )
+        ''')
+        
+        # Jira Comments table - internal notes and customer replies
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jira_comments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                jira_link_id INTEGER NOT NULL,
+                jira_comment_id TEXT NOT NULL UNIQUE,
+                author TEXT,
+                author_email TEXT,
+                comment_text TEXT,
+                is_internal BOOLEAN DEFAULT 0,
+                created_date TEXT,
+                updated_date TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (jira_link_id) REFERENCES jira_ap_links(id) ON DELETE CASCADE
+            )
+        ''')
+        
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jira_ap_links_ap_id ON jira_ap_links(ap_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jira_ap_links_jira_key ON jira_ap_links(jira_key)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jira_ap_links_status ON jira_ap_links(status)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jira_ap_links_updated ON jira_ap_links(updated_date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jira_comments_link_id ON jira_comments(jira_link_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jira_comments_jira_id ON jira_comments(jira_comment_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jira_comments_internal ON jira_comments(is_internal)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jira_comments_created ON jira_comments(created_date)')
+    
+    def _migration_3_ticket_status_indexes(self, cursor):
+        """(ap_id, status) indexes so open-ticket counts for many APs are index-only scans."""
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tickets_ap_status ON jira_tickets(ap_id, status)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jira_ap_links_ap_status ON jira_ap_links(ap_id, status)')
+    
+    def _migration_4_jira_tracked_aps(self, cursor):
+        """APs kept up to date by the background Jira sync (seeded with every linked AP)."""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jira_tracked_aps (
+                ap_id TEXT PRIMARY KEY,
+                tracked_since TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('INSERT OR IGNORE INTO jira_tracked_aps (ap_id) SELECT DISTINCT ap_id FROM jira_ap_links')
+    
+    def _migration_5_jira_full_description(self, cursor):
+        """Full plain-text description, so cached issues show what the live view shows."""
+        cursor.execute('ALTER TABLE jira_ap_links ADD COLUMN description TEXT')
+    
+    def _migration_6_jira_tracked_last_viewed(self, cursor):
+        """When each tracked AP was last viewed, so the sync can stop tracking stale ones."""
+        cursor.execute('ALTER TABLE jira_tracked_aps ADD COLUMN last_viewed TEXT')
+        cursor.execute('UPDATE jira_tracked_aps SET last_viewed = COALESCE(tracked_since, CURRENT_TIMESTAMP)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jira_tracked_aps_last_viewed ON jira_tracked_aps(last_viewed)')
+    
+    # Migration n upgrades user_version n-1 to n. Append new migrations, never edit applied ones.
+    MIGRATIONS = [
+        _migration_1_baseline,
+        _migration_2_jira_tables,
+        _migration_3_ticket_status_indexes,
+        _migration_4_jira_tracked_aps,
+        _migration_5_jira_full_description,
+        _migration_6_jira_tracked_last_viewed,
+    ]
+    SCHEMA_VERSION = len(MIGRATIONS)
     
     def migrate_from_json(self, json_file: str) -> Tuple[bool, str]:
         """Migrate existing JSON credentials to SQLite database."""
@@ -566,37 +1080,64 @@ class DatabaseManager:
             return False, f"Error adding AP: {str(e)}"
     
     def get_access_point(self, ap_id: str) -> Optional[Dict]:
-        """Get access point by AP ID with decrypted passwords."""
+        """Get access point by AP ID (passwords are decrypted when first read)."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM access_points WHERE ap_id = ?', (ap_id,))
             row = cursor.fetchone()
             
             if row:
-                ap_dict = dict(row)
-                # Decrypt sensitive fields
-                for field in self.ENCRYPTED_FIELDS:
-                    if field in ap_dict and ap_dict[field]:
-                        ap_dict[field] = self._decrypt(ap_dict[field])
-                return ap_dict
+                return self._ap_row(row)
             return None
     
     def get_all_access_points(self) -> List[Dict]:
-        """Get all access points with decrypted passwords."""
+        """Get all access points (passwords are decrypted when first read)."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM access_points ORDER BY store_id, ap_id')
-            rows = cursor.fetchall()
-            
-            result = []
-            for row in rows:
-                ap_dict = dict(row)
-                # Decrypt sensitive fields
-                for field in self.ENCRYPTED_FIELDS:
-                    if field in ap_dict and ap_dict[field]:
-                        ap_dict[field] = self._decrypt(ap_dict[field])
-                result.append(ap_dict)
-            return result
+            return [self._ap_row(row) for row in cursor.fetchall()]
+    
+    def iter_access_points(self, columns: List[str], chunk_size: int = 500) -> Iterator[tuple]:
+        """Stream access points as tuples of the requested columns.
+        
+        Rows are fetched chunk_size at a time on a dedicated connection, so
+        memory stays flat regardless of fleet size. Secret columns are
+        decrypted only if they are requested.
+        
+        Args:
+            columns: access_points column names, in output order
+            chunk_size: Rows fetched per round trip
+            
+        Yields:
+            tuple: One value per column, ordered by store_id, ap_id
+        """
+        with self._get_connection() as conn:
+            known = {row[1] for row in conn.execute('PRAGMA table_info(access_points)')}
+        unknown = [column for column in columns if column not in known]
+        if unknown:
+            raise ValueError(f"Unknown access point columns: {', '.join(unknown)}")
+        
+        secret = [i for i, column in enumerate(columns) if column in self.ENCRYPTED_FIELDS]
+        decrypt = self._decrypt_uncached
+        
+        # Own connection: a long read must not share a cursor with other callers
+        conn = sqlite3.connect(self.db_file, timeout=30.0)
+        try:
+            cursor = conn.execute(
+                f"SELECT {', '.join(columns)} FROM access_points ORDER BY store_id, ap_id")
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                for row in chunk:
+                    if secret:
+                        row = list(row)
+                        for i in secret:
+                            row[i] = decrypt(row[i])
+                        row = tuple(row)
+                    yield row
+        finally:
+            conn.close()
     
     def update_access_point(self, ap_id: str, updates: Dict) -> Tuple[bool, str]:
         """Update access point fields."""
@@ -667,48 +1208,291 @@ class DatabaseManager:
         except Exception as e:
             return False, f"Error deleting AP: {str(e)}"
     
+    # Columns written by bulk_upsert_access_points (import template columns)
+    AP_IMPORT_COLUMNS = [
+        'ap_id', 'store_id', 'store_alias', 'retail_chain', 'ip_address', 'type',
+        'username_webui', 'password_webui', 'username_ssh', 'password_ssh',
+        'su_password', 'notes'
+    ]
+    
+    # Columns whose surrounding whitespace is trimmed, as add_access_point()
+    # does; credentials are stored exactly as given
+    AP_STRIPPED_COLUMNS = {'ap_id', 'store_id', 'store_alias', 'ip_address', 'notes'}
+    
+    def bulk_upsert_access_points(self, rows: List[Dict]) -> Dict:
+        """Insert or update many access points in a single transaction.
+        
+        Validation runs column by column (each distinct value is validated
+        once), existing AP IDs are fetched with one query, secrets are
+        encrypted in one pass, and all valid rows are written with a single
+        INSERT ... ON CONFLICT(ap_id) DO UPDATE executemany. Invalid rows are
+        skipped and reported; they don't abort the import.
+        
+        Args:
+            rows: Dicts keyed by AP_IMPORT_COLUMNS (missing keys are stored as '')
+            
+        Returns:
+            dict: {'inserted', 'updated', 'errors': [(row_index, ap_id, message)],
+                   'seconds', 'rows_per_second'}
+        """
+        start = time.perf_counter()
+        columns = self.AP_IMPORT_COLUMNS
+        records = []
+        for row in rows:
+            record = {c: str(row.get(c) or '') for c in columns}
+            for c in self.AP_STRIPPED_COLUMNS:
+                record[c] = record[c].strip()
+            records.append(record)
+        errors: Dict[int, str] = {}
+        
+        # (column, label, validator, required)
+        checks = [
+            ('ap_id', 'AP ID', InputValidator.ap_id, True),
+            ('store_id', 'Store ID', InputValidator.store_id, True),
+            ('ip_address', 'IP address', InputValidator.ip_address, False),
+            ('store_alias', 'Store Alias', InputValidator.store_alias, False),
+            ('notes', 'Notes', lambda value: InputValidator.comment(value, max_length=5000), False),
+        ]
+        for column, label, validator, required in checks:
+            results = {}
+            for index, record in enumerate(records):
+                value = record[column]
+                if index in errors or (not value and not required):
+                    continue
+                if value not in results:
+                    results[value] = validator(value)
+                valid, error_msg = results[value]
+                if not valid:
+                    errors[index] = f"Invalid {label}: {error_msg}"
+        
+        valid_records = [record for index, record in enumerate(records) if index not in errors]
+        error_list = [(index, records[index]['ap_id'], message) for index, message in sorted(errors.items())]
+        
+        try:
+            with self._get_connection() as conn:
+                existing = {row[0] for row in conn.execute('SELECT ap_id FROM access_points')}
+                
+                seen = set()
+                inserted = updated = 0
+                for record in valid_records:
+                    if record['ap_id'] in existing or record['ap_id'] in seen:
+                        updated += 1
+                    else:
+                        inserted += 1
+                    seen.add(record['ap_id'])
+                    for field in self.ENCRYPTED_FIELDS:
+                        record[field] = self._encrypt(record[field])
+                
+                placeholders = ', '.join(f':{c}' for c in columns)
+                assignments = ', '.join(f'{c} = excluded.{c}' for c in columns if c != 'ap_id')
+                conn.executemany(f'''
+                    INSERT INTO access_points ({', '.join(columns)})
+                    VALUES ({placeholders})
+                    ON CONFLICT(ap_id) DO UPDATE SET {assignments}, updated_at = CURRENT_TIMESTAMP
+                ''', valid_records)
+                conn.commit()
+        except Exception as e:
+            print(f"Error importing access points: {e}")
+            error_list.append((None, '', f"Import failed, nothing was saved: {str(e)}"))
+            return {'inserted': 0, 'updated': 0, 'errors': error_list,
+                    'seconds': time.perf_counter() - start, 'rows_per_second': 0.0}
+        
+        seconds = time.perf_counter() - start
+        return {
+            'inserted': inserted,
+            'updated': updated,
+            'errors': error_list,
+            'seconds': seconds,
+            'rows_per_second': len(valid_records) / seconds if seconds > 0 else 0.0,
+        }
+    
     def search_access_points(self, query: str, fields: List[str] = None) -> List[Dict]:
         """Search access points by specific fields or all text fields.
         
+        Uses the trigram search index, so only matching rows are read and
+        decrypted; results are ranked best match first. Queries shorter than
+        3 characters fall back to LIKE (ordered by store_id, ap_id).
+        
         Args:
             query: Search term
             fields: Optional list of fields to search in ['ap_id', 'store_id', 'ip_address']
                    If None, searches all fields.
         """
-        query_pattern = f"%{query}%"
+        if not query:
+            return self.get_all_access_points()
+        fields = fields or ['ap_id', 'store_id', 'store_alias', 'retail_chain', 'ip_address', 'type', 'notes']
+        return self.get_access_points_by_rowids(self.search_ap_rowids(query, fields))
+    
+    # ==================== Search Index ====================
+    
+    def _init_search_index(self, cursor) -> bool:
+        """
+        Create the FTS5 trigram index over AP_SEARCH_COLUMNS and its sync triggers.
+        
+        The index is an external-content table (it stores only the trigrams and
+        reads column values from access_points), so it stays small. It is built
+        from the existing rows the first time it is created.
+        
+        Returns:
+            bool: False if this SQLite build lacks FTS5 or the trigram tokenizer
+        """
+        columns = ', '.join(self.AP_SEARCH_COLUMNS)
+        new_values = ', '.join(f'new.{col}' for col in self.AP_SEARCH_COLUMNS)
+        old_values = ', '.join(f'old.{col}' for col in self.AP_SEARCH_COLUMNS)
+        changed = ' OR '.join(f'old.{col} IS NOT new.{col}' for col in self.AP_SEARCH_COLUMNS)
+        
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'access_points_fts'")
+        exists = cursor.fetchone() is not None
+        
+        try:
+            cursor.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS access_points_fts USING fts5(
+                    {columns},
+                    content='access_points', content_rowid='id', tokenize='trigram'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            print(f"AP search index unavailable, using LIKE search: {e}")
+            return False
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS access_points_fts_insert AFTER INSERT ON access_points BEGIN
+                INSERT INTO access_points_fts(rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS access_points_fts_delete AFTER DELETE ON access_points BEGIN
+                INSERT INTO access_points_fts(access_points_fts, rowid, {columns})
+                VALUES ('delete', old.id, {old_values});
+            END
+        ''')
+        # Status/ping updates don't touch indexed columns, so only re-index on a real change
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS access_points_fts_update AFTER UPDATE OF {columns} ON access_points
+            WHEN {changed} BEGIN
+                INSERT INTO access_points_fts(access_points_fts, rowid, {columns})
+                VALUES ('delete', old.id, {old_values});
+                INSERT INTO access_points_fts(rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        ''')
+        
+        if not exists:
+            cursor.execute("INSERT INTO access_points_fts(access_points_fts) VALUES ('rebuild')")
+        return True
+    
+    def _init_change_log(self, cursor):
+        """
+        Log the row id of every inserted, updated or deleted access point.
+        
+        APCatalog (ap_catalog.py) reads entries newer than the last one it saw,
+        so it can refresh just the changed rows, including rows written by
+        other processes. The log trims itself to the last CHANGE_LOG_SIZE entries.
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ap_change_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                ap_rowid INTEGER NOT NULL
+            )
+        ''')
+        for event, row in (('INSERT', 'new'), ('UPDATE', 'new'), ('DELETE', 'old')):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS access_points_change_{event.lower()}
+                AFTER {event} ON access_points BEGIN
+                    INSERT INTO ap_change_log(ap_rowid) VALUES ({row}.id);
+                END
+            ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS ap_change_log_trim AFTER INSERT ON ap_change_log
+            WHEN new.seq % 1000 = 0 BEGIN
+                DELETE FROM ap_change_log WHERE seq <= new.seq - {self.CHANGE_LOG_SIZE};
+            END
+        ''')
+    
+    def _has_search_index(self) -> bool:
+        """Whether access_points_fts exists (it is skipped if SQLite lacks FTS5)."""
+        if self._search_index is None:
+            with self._get_connection() as conn:
+                self._search_index = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'access_points_fts'").fetchone() is not None
+        return self._search_index
+    
+    def _search_match_expression(self, term: str, columns: List[str]) -> Optional[str]:
+        """
+        FTS5 MATCH expression for a substring search in columns.
+        
+        Returns None when the index can't answer the query: trigram matching
+        needs at least 3 characters, and only AP_SEARCH_COLUMNS are indexed.
+        Callers then fall back to LIKE.
+        """
+        if len(term) < 3 or not self._has_search_index():
+            return None
+        if not set(columns) <= set(self.AP_SEARCH_COLUMNS):
+            return None
+        # A quoted phrase of trigrams matches the term as a substring (case-insensitive)
+        phrase = '"' + term.replace('"', '""') + '"'
+        return '{' + ' '.join(columns) + '}: ' + phrase
+    
+    def search_ap_rowids(self, query: str, fields: List[str] = None, limit: int = None) -> List[int]:
+        """
+        Find access_points row ids whose fields contain query, best matches first.
+        
+        Args:
+            query: Search term (substring)
+            fields: Columns to search (default: all AP_SEARCH_COLUMNS)
+            limit: Optional maximum number of ids
+            
+        Returns:
+            list: access_points.id values ranked by bm25 (LIKE fallback: store_id, ap_id order)
+        """
+        fields = fields or self.AP_SEARCH_COLUMNS
+        match = self._search_match_expression(query, fields)
+        limit_sql = ' LIMIT ?' if limit else ''
+        
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            
-            if fields:
-                # Build WHERE clause for specific fields
-                where_clauses = [f"{field} LIKE ?" for field in fields]
-                where_sql = " OR ".join(where_clauses)
-                sql = f'''
-                    SELECT * FROM access_points 
-                    WHERE {where_sql}
-                    ORDER BY store_id, ap_id
-                '''
-                cursor.execute(sql, (query_pattern,) * len(fields))
+            if match:
+                params = [match] + ([limit] if limit else [])
+                cursor.execute(f'''
+                    SELECT rowid FROM access_points_fts
+                    WHERE access_points_fts MATCH ?
+                    ORDER BY rank{limit_sql}
+                ''', params)
             else:
-                # Search all fields
-                cursor.execute('''
-                    SELECT * FROM access_points 
-                    WHERE ap_id LIKE ? OR store_id LIKE ? OR store_alias LIKE ? 
-                       OR retail_chain LIKE ? OR ip_address LIKE ? OR type LIKE ? OR notes LIKE ?
-                    ORDER BY store_id, ap_id
-                ''', (query_pattern,) * 7)
-            
-            rows = cursor.fetchall()
-            
-            result = []
-            for row in rows:
-                ap_dict = dict(row)
-                # Decrypt sensitive fields
-                for field in self.ENCRYPTED_FIELDS:
-                    if field in ap_dict and ap_dict[field]:
-                        ap_dict[field] = self._decrypt(ap_dict[field])
-                result.append(ap_dict)
-            return result
+                where_sql = ' OR '.join(f'{field} LIKE ?' for field in fields)
+                params = [f'%{query}%'] * len(fields) + ([limit] if limit else [])
+                cursor.execute(f'''
+                    SELECT id FROM access_points
+                    WHERE {where_sql}
+                    ORDER BY store_id, ap_id{limit_sql}
+                ''', params)
+            return [row[0] for row in cursor.fetchall()]
+    
+    def get_access_points_by_rowids(self, rowids: List[int]) -> List[Dict]:
+        """Load access points by row id, keeping the order of rowids."""
+        if not rowids:
+            return []
+        
+        rows = {}
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            # Stay below SQLite's host parameter limit
+            for i in range(0, len(rowids), 900):
+                chunk = rowids[i:i + 900]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f'SELECT * FROM access_points WHERE id IN ({placeholders})', chunk)
+                for row in cursor.fetchall():
+                    rows[row['id']] = row
+        
+        return [self._ap_row(rows[rowid]) for rowid in rowids if rowid in rows]
+    
+    def rebuild_search_index(self) -> bool:
+        """Rebuild the AP search index from access_points (e.g. after a bulk import with triggers off)."""
+        if not self._has_search_index():
+            return False
+        with self._get_connection() as conn:
+            conn.execute("INSERT INTO access_points_fts(access_points_fts) VALUES ('rebuild')")
+            conn.commit()
+        return True
     
     def add_history_event(self, ap_id: str, event_type: str, description: str, 
                          user: str = None, success: bool = True, details: Dict = None) -> bool:
@@ -726,22 +1510,16 @@ class DatabaseManager:
             print(f"Error adding history event: {e}")
             return False
     
-    def get_history(self, ap_id: str = None, limit: int = 100) -> List[Dict]:
-        """Get history events, optionally filtered by AP ID."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            if ap_id:
-                cursor.execute('''
-                    SELECT * FROM ap_history WHERE ap_id = ? 
-                    ORDER BY timestamp DESC LIMIT ?
-                ''', (ap_id, limit))
-            else:
-                cursor.execute('''
-                    SELECT * FROM ap_history 
-                    ORDER BY timestamp DESC LIMIT ?
-                ''', (limit,))
-            
-            return [dict(row) for row in cursor.fetchall()]
+    def get_history(self, ap_id: str = None, limit: int = 100, before: Tuple[str, int] = None,
+                    event_type: str = None) -> List[Dict]:
+        """Get history events, optionally filtered by AP ID and event type.
+        
+        Args:
+            before: Keyset cursor from log_cursor() of the last row of the
+                previous page; returns the next (older) page
+        """
+        return self._query_log_page('ap_history', {'ap_id': ap_id, 'event_type': event_type},
+                                    limit, before)
     
     def update_ap_status(self, ap_id: str, status: str, ping_time: float = None):
         """Update AP online/offline status and last seen."""
@@ -764,6 +1542,112 @@ class DatabaseManager:
         except Exception as e:
             print(f"Error updating AP status: {e}")
     
+    # Hardware/software/connectivity columns read from an AP's status page
+    AP_STATUS_COLUMNS = [
+        'type', 'store_id', 'ip_address', 'serial_number', 'software_version',
+        'firmware_version', 'hardware_revision', 'build', 'configuration_mode',
+        'service_status', 'uptime', 'communication_daemon_status', 'mac_address',
+        'connectivity_internet', 'connectivity_provisioning', 'connectivity_ntp_server',
+        'connectivity_apc_address'
+    ]
+    
+    def bulk_update_ap_status(self, records: List[Dict]) -> int:
+        """Write status-page fields for many APs in a single transaction.
+        
+        Empty values never overwrite existing data, and rows whose values are
+        unchanged are not touched (updated_at only moves when something changed).
+        Store IDs and IP addresses that fail InputValidator are skipped, as in
+        update_access_point.
+        
+        Args:
+            records: Dicts keyed by ap_id and AP_STATUS_COLUMNS (missing keys = no change)
+            
+        Returns:
+            int: Number of access_points rows updated
+        """
+        if not records:
+            return 0
+        
+        columns = self.AP_STATUS_COLUMNS
+        set_clause = ', '.join(f"{c} = COALESCE(:{c}, {c})" for c in columns)
+        changed = ' OR '.join(f"(:{c} IS NOT NULL AND :{c} IS NOT {c})" for c in columns)
+        sql = f'''
+            UPDATE access_points
+            SET {set_clause}, updated_at = CURRENT_TIMESTAMP
+            WHERE ap_id = :ap_id AND ({changed})
+        '''
+        params = [{c: (record.get(c) or None) for c in ['ap_id'] + columns}
+                  for record in records if record.get('ap_id')]
+        
+        checks = [('store_id', 'Store ID', InputValidator.store_id),
+                  ('ip_address', 'IP address', InputValidator.ip_address)]
+        for column, label, validator in checks:
+            for row in params:
+                value = row[column].strip() if row[column] else None
+                if value:
+                    valid, error_msg = validator(value)
+                    if not valid:
+                        print(f"Skipping invalid {label} for AP {row['ap_id']}: {error_msg}")
+                        value = None
+                row[column] = value
+        
+        try:
+            with self._get_connection() as conn:
+                # rowcount, not total_changes: the FTS and change-log triggers write rows too
+                cursor = conn.executemany(sql, params)
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            print(f"Error bulk updating AP status fields: {e}")
+            return 0
+    
+    def upsert_ap_metrics(self, rows: List[Dict]) -> bool:
+        """Merge daily ping rollups into ap_metrics in a single transaction.
+        
+        Args:
+            rows: Dicts with ap_id, date, ping_count, successful_pings,
+                  avg_response_time, min_response_time, max_response_time.
+                  Counts are added to any existing row for the same (ap_id, date)
+                  and the average is re-weighted by successful pings.
+        """
+        if not rows:
+            return True
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(self.AP_METRICS_UPSERT_SQL, rows)
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error saving AP metrics: {e}")
+            return False
+    
+    def get_ap_metrics(self, ap_id: str = None, start_date: str = None,
+                       end_date: str = None) -> List[Dict]:
+        """Get daily ping rollups, optionally filtered by AP and date range (YYYY-MM-DD)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            query = 'SELECT * FROM ap_metrics WHERE 1=1'
+            params = []
+            
+            if ap_id:
+                query += ' AND ap_id = ?'
+                params.append(ap_id)
+            
+            if start_date:
+                query += ' AND date >= ?'
+                params.append(start_date)
+            
+            if end_date:
+                query += ' AND date <= ?'
+                params.append(end_date)
+            
+            query += ' ORDER BY ap_id, date'
+            
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+    
     def update_vusion_data(self, ap_id: str, vusion_data: Dict) -> Tuple[bool, str]:
         """Update Vusion Manager Pro data for an AP."""
         try:
@@ -889,11 +1773,294 @@ class DatabaseManager:
                 return None
     
     def close(self):
-        """Close database connection."""
+        """Commit queued writes, stop the background writer and close the connection."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
         if hasattr(self._local, 'conn'):
             self._local.conn.close()
             delattr(self._local, 'conn')
     
+    # ==================== Write-Behind Queue ====================
+    
+    def start_write_behind(self, batch_size: int = 500, flush_interval_ms: int = 200):
+        """Start the background writer used by the queue_* methods.
+        
+        Args:
+            batch_size: Commit once this many writes are collected
+            flush_interval_ms: Commit at most this long after the first queued write
+        """
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive:
+                self._writer = _WriteBehindQueue(self, batch_size, flush_interval_ms)
+            return self._writer
+    
+    def _get_writer(self) -> _WriteBehindQueue:
+        writer = self._writer
+        if writer is None or not writer.is_alive:
+            writer = self.start_write_behind()
+        return writer
+    
+    def queue_ap_status(self, ap_id: str, status: str, ping_time: float = None):
+        """Queue an AP status update (see update_ap_status) for the background writer."""
+        self._get_writer().put('status', (ap_id, status, ping_time))
+    
+    def queue_history_event(self, ap_id: str, event_type: str, description: str,
+                            user: str = None, success: bool = True, details: Dict = None):
+        """Queue a history event (see add_history_event) for the background writer."""
+        self._get_writer().put('history', (ap_id, event_type, description, user, success,
+                                           json.dumps(details) if details else None))
+    
+    def queue_ap_metrics(self, rows: List[Dict]):
+        """Queue daily ping rollups (see upsert_ap_metrics) for the background writer."""
+        if rows:
+            self._get_writer().put('metrics', list(rows))
+    
+    def flush_writes(self, timeout: float = None) -> bool:
+        """Block until all queued writes are committed.
+        
+        Returns:
+            True if the queue was flushed within the timeout and no queued
+            write was dropped (see get_write_queue_stats()['last_error'])
+        """
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+    
+    def get_write_queue_stats(self) -> Dict:
+        """Get queue depth and commit latency counters for the background writer."""
+        if self._writer is None:
+            return {'queued': 0, 'written': 0, 'commits': 0, 'errors': 0, 'retries': 0,
+                    'dropped': 0, 'last_error': None, 'queue_depth': 0,
+                    'last_commit_ms': 0.0, 'max_commit_ms': 0.0, 'avg_commit_ms': 0.0}
+        return self._writer.stats()
+    
+    # ==================== Retention ====================
+    
+    # Days kept in the live database before rows move to the archive database
+    RETENTION_DAYS = {'ap_history': 90, 'user_activity_log': 180, 'user_audit_log': 365}
+    
+    # Failed ap_history events are counted into ap_metrics.issues_count before archiving
+    AP_HISTORY_ROLLUP_SQL = '''
+        INSERT INTO ap_metrics (ap_id, date, issues_count)
+        SELECT ap_id, date(timestamp), SUM(CASE WHEN success THEN 0 ELSE 1 END)
+        FROM main.ap_history
+        WHERE timestamp < ? AND id <= ?
+          AND ap_id IN (SELECT ap_id FROM access_points)
+        GROUP BY ap_id, date(timestamp)
+        ON CONFLICT(ap_id, date) DO UPDATE SET
+            issues_count = COALESCE(issues_count, 0) + excluded.issues_count
+    '''
+    
+    def get_system_config(self, key: str, default: str = None) -> Optional[str]:
+        """Read a value from system_config."""
+        with self._get_connection() as conn:
+            row = conn.execute('SELECT config_value FROM system_config WHERE config_key = ?',
+                               (key,)).fetchone()
+            return row[0] if row else default
+    
+    def set_system_config(self, key: str, value: str):
+        """Insert or update a value in system_config."""
+        with self._get_connection() as conn:
+            conn.execute('''
+                INSERT INTO system_config (config_key, config_value) VALUES (?, ?)
+                ON CONFLICT(config_key) DO UPDATE SET
+                    config_value = excluded.config_value, updated_at = CURRENT_TIMESTAMP
+            ''', (key, value))
+            conn.commit()
+    
+    def get_archive_file(self) -> Path:
+        """Archive database next to the live one (e.g. .vera_database_archive.db)."""
+        return self.db_file.with_name(f"{self.db_file.stem}_archive{self.db_file.suffix or '.db'}")
+    
+    def run_retention(self, retention_days: Dict[str, int] = None, batch_size: int = 5000,
+                      progress_callback=None) -> Dict:
+        """Archive old history/log rows, then compact the live database.
+        
+        Rows older than the retention period are copied into the archive
+        database (attached as 'archive') and deleted from the live one in
+        batches of batch_size, each in its own short transaction, so other
+        writers are never blocked for long. ap_history rows are rolled up into
+        ap_metrics first. Freed pages are then returned to the file system with
+        incremental vacuum and the WAL is checkpointed and truncated.
+        
+        Args:
+            retention_days: {table: days} overriding RETENTION_DAYS
+            batch_size: Rows moved per transaction
+            progress_callback: Called as callback(stage, done, total), where
+                stage is a table name, 'vacuum' or 'checkpoint'
+            
+        Returns:
+            Dict: {'archived': {table: rows}, 'pages_freed', 'seconds',
+                   'needs_full_vacuum' (pages can't be freed until enable_incremental_vacuum()),
+                   'size_bytes'}
+        """
+        started = time.perf_counter()
+        days = dict(self.RETENTION_DAYS)
+        days.update(retention_days or {})
+        report = progress_callback or (lambda stage, done, total: None)
+        result = {'archived': {}, 'pages_freed': 0, 'seconds': 0.0,
+                  'needs_full_vacuum': False, 'size_bytes': 0}
+        
+        # Own connection: ATTACH and long maintenance must not leak into shared connections
+        conn = sqlite3.connect(self.db_file, timeout=30.0, isolation_level=None)
+        try:
+            conn.execute('ATTACH DATABASE ? AS archive', (str(self.get_archive_file()),))
+            for table, keep_days in days.items():
+                result['archived'][table] = self._archive_table(
+                    conn, table, keep_days, batch_size, report)
+            result['pages_freed'] = self._compact(conn, report)
+            result['needs_full_vacuum'] = conn.execute('PRAGMA main.auto_vacuum').fetchone()[0] != 2
+        finally:
+            conn.close()
+        
+        result['seconds'] = time.perf_counter() - started
+        result['size_bytes'] = self.db_file.stat().st_size
+        self.set_system_config('retention_last_run', datetime.now().isoformat(timespec='seconds'))
+        return result
+    
+    def start_retention(self, min_interval_hours: float = 24, **kwargs) -> Optional[threading.Thread]:
+        """Run run_retention() in a background thread if it hasn't run recently.
+        
+        Args:
+            min_interval_hours: Skip if the last run finished less than this long ago
+            **kwargs: Passed to run_retention(); on_done(result) is called when finished
+            
+        Returns:
+            The started thread, or None if retention is not due
+        """
+        last_run = self.get_system_config('retention_last_run')
+        if last_run:
+            try:
+                hours = (datetime.now() - datetime.fromisoformat(last_run)).total_seconds() / 3600
+                if hours < min_interval_hours:
+                    return None
+            except ValueError:
+                pass
+        
+        on_done = kwargs.pop('on_done', None)
+        
+        def worker():
+            try:
+                result = self.run_retention(**kwargs)
+            except Exception as e:
+                print(f"Error running database retention: {e}")
+                return
+            if on_done:
+                on_done(result)
+        
+        thread = threading.Thread(target=worker, name='db-retention', daemon=True)
+        thread.start()
+        return thread
+    
+    def _archive_table(self, conn, table: str, keep_days: int, batch_size: int, report) -> int:
+        """Move rows older than keep_days from main.table to archive.table."""
+        # Same columns, no constraints: ap_history's foreign key can't resolve in the archive
+        conn.execute(f'CREATE TABLE IF NOT EXISTS archive.{table} AS SELECT * FROM main.{table} WHERE 0')
+        conn.execute(f'CREATE INDEX IF NOT EXISTS archive.idx_{table}_timestamp ON {table}(timestamp)')
+        
+        # Columns added to the live table by later migrations are added to the archive too
+        main_columns = [(row[1], row[2]) for row in conn.execute(f'PRAGMA main.table_info({table})')]
+        archive_columns = {row[1] for row in conn.execute(f'PRAGMA archive.table_info({table})')}
+        for name, column_type in main_columns:
+            if name not in archive_columns:
+                conn.execute(f'ALTER TABLE archive.{table} ADD COLUMN "{name}" {column_type}')
+        column_list = ', '.join(f'"{name}"' for name, _ in main_columns)
+        
+        cutoff = conn.execute("SELECT datetime('now', ?)", (f'-{int(keep_days)} days',)).fetchone()[0]
+        total = conn.execute(f'SELECT COUNT(*) FROM main.{table} WHERE timestamp < ?',
+                             (cutoff,)).fetchone()[0]
+        moved = 0
+        report(table, 0, total)
+        while moved < total:
+            # Upper id of the next batch; ids grow with timestamp, so batches stay contiguous
+            last_id = conn.execute(f'''
+                SELECT MAX(id) FROM (
+                    SELECT id FROM main.{table} WHERE timestamp < ? ORDER BY id LIMIT ?
+                )
+            ''', (cutoff, batch_size)).fetchone()[0]
+            if last_id is None:
+                break
+            
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if table == 'ap_history':
+                    conn.execute(self.AP_HISTORY_ROLLUP_SQL, (cutoff, last_id))
+                conn.execute(f'''
+                    INSERT INTO archive.{table} ({column_list})
+                    SELECT {column_list} FROM main.{table} WHERE timestamp < ? AND id <= ?
+                ''', (cutoff, last_id))
+                deleted = conn.execute(f'DELETE FROM main.{table} WHERE timestamp < ? AND id <= ?',
+                                       (cutoff, last_id)).rowcount
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            
+            moved += deleted
+            report(table, moved, total)
+        return moved
+    
+    def needs_full_vacuum(self) -> bool:
+        """Whether the database predates incremental vacuum (see enable_incremental_vacuum)."""
+        # Own connection: open connections keep reporting the mode they were opened with
+        conn = sqlite3.connect(self.db_file, timeout=30.0)
+        try:
+            return conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2
+        finally:
+            conn.close()
+    
+    def enable_incremental_vacuum(self) -> Dict:
+        """Switch an existing database to incremental vacuum with one full VACUUM.
+        
+        The VACUUM rewrites the whole file and holds the write lock until it
+        finishes, so this is an explicit maintenance action, never part of the
+        scheduled retention run.
+        
+        Returns:
+            Dict: {'size_before', 'size_after' (bytes), 'seconds'}
+        """
+        started = time.perf_counter()
+        size_before = self.db_file.stat().st_size
+        conn = sqlite3.connect(self.db_file, timeout=30.0, isolation_level=None)
+        try:
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            conn.execute('VACUUM')
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchall()
+        finally:
+            conn.close()
+        return {'size_before': size_before, 'size_after': self.db_file.stat().st_size,
+                'seconds': time.perf_counter() - started}
+    
+    def _compact(self, conn, report) -> int:
+        """Release free pages with incremental vacuum and truncate the WAL.
+        
+        Databases not yet in incremental mode are left alone (see
+        enable_incremental_vacuum); only the WAL is truncated.
+        
+        Returns:
+            int: Pages returned to the file system
+        """
+        total = 0
+        if conn.execute('PRAGMA main.auto_vacuum').fetchone()[0] == 2:
+            total = conn.execute('PRAGMA main.freelist_count').fetchone()[0]
+        free = total
+        report('vacuum', 0, total)
+        while free:
+            # Small steps keep each write lock short
+            conn.execute('PRAGMA main.incremental_vacuum(2000)').fetchall()
+            remaining = conn.execute('PRAGMA main.freelist_count').fetchone()[0]
+            if remaining >= free:
+                break
+            free = remaining
+            report('vacuum', total - free, total)
+        
+        report('checkpoint', 0, 1)
+        conn.execute('PRAGMA main.wal_checkpoint(TRUNCATE)').fetchall()
+        report('checkpoint', 1, 1)
+        return total - free
+    
     # ==================== USER MANAGEMENT METHODS ====================
     
     def add_user(self, username: str, full_name: str, password: str, role: str, 
@@ -1205,51 +2372,99 @@ class DatabaseManager:
             print(f"Error logging user activity: {e}")
     
     def get_user_audit_log(self, target_username: str = None, actor_username: str = None,
-                          limit: int = 100) -> List[Dict]:
-        """Get user audit log, optionally filtered by target or actor."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            query = 'SELECT * FROM user_audit_log WHERE 1=1'
-            params = []
-            
-            if target_username:
-                query += ' AND target_username = ?'
-                params.append(target_username)
-            
-            if actor_username:
-                query += ' AND actor_username = ?'
-                params.append(actor_username)
-            
-            query += ' ORDER BY timestamp DESC LIMIT ?'
-            params.append(limit)
-            
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+                          limit: int = 100, before: Tuple[str, int] = None) -> List[Dict]:
+        """Get user audit log, optionally filtered by target or actor.
+        
+        Args:
+            before: Keyset cursor from log_cursor() of the last row of the
+                previous page; returns the next (older) page
+        """
+        return self._query_log_page('user_audit_log', {
+            'target_username': target_username,
+            'actor_username': actor_username,
+        }, limit, before)
     
     def get_user_activity_log(self, username: str = None, activity_type: str = None,
-                             limit: int = 100) -> List[Dict]:
-        """Get user activity log, optionally filtered by username or activity type."""
+                             limit: int = 100, before: Tuple[str, int] = None) -> List[Dict]:
+        """Get user activity log, optionally filtered by username or activity type.
+        
+        Args:
+            before: Keyset cursor from log_cursor() of the last row of the
+                previous page; returns the next (older) page
+        """
+        return self._query_log_page('user_activity_log', {
+            'username': username,
+            'activity_type': activity_type,
+        }, limit, before)
+    
+    # ==================== Log Paging ====================
+    
+    # Filter columns accepted per log table (filter values are pushed into the WHERE clause)
+    LOG_FILTER_COLUMNS = {
+        'ap_history': ('ap_id', 'event_type'),
+        'user_audit_log': ('target_username', 'actor_username'),
+        'user_activity_log': ('username', 'activity_type'),
+    }
+    
+    @staticmethod
+    def log_cursor(row: Dict) -> Tuple[str, int]:
+        """Keyset cursor for the page after row (pass as before=...)."""
+        return (row['timestamp'], row['id'])
+    
+    def _log_where(self, table: str, filters: Dict) -> Tuple[str, List]:
+        allowed = self.LOG_FILTER_COLUMNS[table]
+        clauses, params = [], []
+        for column, value in filters.items():
+            if column not in allowed:
+                raise ValueError(f"Cannot filter {table} by {column}")
+            if value:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        return (' AND '.join(clauses) or '1=1'), params
+    
+    def _query_log_page(self, table: str, filters: Dict, limit: int,
+                        before: Tuple[str, int] = None) -> List[Dict]:
+        """Newest-first page of a log table, keyset-paginated on (timestamp, id).
+        
+        Each page is an index range scan starting at the cursor, so reading
+        page 100 costs the same as reading page 1 (unlike OFFSET).
+        """
+        where, params = self._log_where(table, filters)
+        if before is not None:
+            where += ' AND (timestamp, id) < (?, ?)'
+            params.extend(before)
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            
-            query = 'SELECT * FROM user_activity_log WHERE 1=1'
-            params = []
-            
-            if username:
-                query += ' AND username = ?'
-                params.append(username)
-            
-            if activity_type:
-                query += ' AND activity_type = ?'
-                params.append(activity_type)
-            
-            query += ' ORDER BY timestamp DESC LIMIT ?'
-            params.append(limit)
-            
-            cursor.execute(query, params)
+            cursor.execute(f'''
+                SELECT * FROM {table} WHERE {where}
+                ORDER BY timestamp DESC, id DESC LIMIT ?
+            ''', params + [limit])
             return [dict(row) for row in cursor.fetchall()]
     
+    def count_log_entries(self, table: str, filters: Dict = None, cap: int = 10000) -> Tuple[int, bool]:
+        """Count rows of a log table, stopping early on large results.
+        
+        Args:
+            table: 'ap_history', 'user_audit_log' or 'user_activity_log'
+            filters: Same filters as the page query
+            cap: Stop counting after this many matches
+            
+        Returns:
+            Tuple[int, bool]: (count, exact); count is an estimate when exact is False
+        """
+        where, params = self._log_where(table, filters or {})
+        with self._get_connection() as conn:
+            if not params:
+                # Unfiltered: ids are sequential and retention only trims the oldest rows
+                low, high = conn.execute(f'SELECT MIN(id), MAX(id) FROM {table}').fetchone()
+                estimate = high - low + 1 if high is not None else 0
+                if estimate > cap:
+                    return estimate, False
+            count = conn.execute(
+                f'SELECT COUNT(*) FROM (SELECT 1 FROM {table} WHERE {where} LIMIT ?)',
+                params + [cap + 1]).fetchone()[0]
+            return min(count, cap), count <= cap
+    
     def ensure_default_admin(self):
         """Ensure default admin user exists."""
         user = self.get_user("MasterBlaster")
@@ -1473,6 +2688,41 @@ class DatabaseManager:
         except Exception as e:
             return False, f"Error updating support status: {str(e)}"
     
+    # Ticket/issue statuses that don't count as open, compared trimmed and
+    # case-insensitively; a ticket without a status is open. jira_tickets
+    # (count_open_tickets, search_aps_for_support) and jira_ap_links
+    # (JiraDBManager.count_open_issues) use the same rule.
+    CLOSED_TICKET_STATUSES = ('closed', 'resolved', 'done')
+    
+    @classmethod
+    def open_ticket_condition(cls, column: str = 'status') -> str:
+        """SQL condition that is true when a status column holds an open status."""
+        closed = ', '.join(f"'{status}'" for status in cls.CLOSED_TICKET_STATUSES)
+        return f"LOWER(TRIM(COALESCE({column}, ''))) NOT IN ({closed})"
+    
+    def count_open_tickets(self, ap_ids: List[str]) -> Dict[str, int]:
+        """Count open jira_tickets for many APs with one GROUP BY per 900 ids.
+        
+        Args:
+            ap_ids: AP IDs to count for
+            
+        Returns:
+            Dict: {ap_id: open ticket count}; APs without open tickets map to 0
+        """
+        counts = {ap_id: 0 for ap_id in ap_ids}
+        ids = list(counts)
+        is_open = self.open_ticket_condition('status')
+        with self._get_connection() as conn:
+            for start in range(0, len(ids), 900):
+                chunk = ids[start:start + 900]
+                cursor = conn.execute(f'''
+                    SELECT ap_id, COUNT(*) FROM jira_tickets
+                    WHERE ap_id IN ({', '.join('?' * len(chunk))}) AND {is_open}
+                    GROUP BY ap_id
+                ''', chunk)
+                counts.update(cursor.fetchall())
+        return counts
+    
     def search_aps_for_support(self, search_term: str = None, store_id: str = None, 
                                support_status: str = None, has_open_tickets: bool = None) -> List[Dict]:
         """Search for APs in the support system with various filters."""
@@ -1482,50 +2732,44 @@ class DatabaseManager:
             query = 'SELECT * FROM access_points WHERE 1=1'
             params = []
             
+            # Text filters go through the search index when it can answer them
+            match_terms = []
             if search_term:
-                query += ''' AND (ap_id LIKE ? OR ip_address LIKE ? OR mac_address LIKE ? 
-                            OR serial_number LIKE ? OR store_id LIKE ? OR store_alias LIKE ?
-                            OR retail_chain LIKE ?)'''
-                search_pattern = f'%{search_term}%'
-                params.extend([search_pattern, search_pattern, search_pattern, 
-                              search_pattern, search_pattern, search_pattern, search_pattern])
+                columns = ['ap_id', 'ip_address', 'mac_address', 'serial_number',
+                           'store_id', 'store_alias', 'retail_chain']
+                match = self._search_match_expression(search_term, columns)
+                if match:
+                    match_terms.append(match)
+                else:
+                    query += ' AND (' + ' OR '.join(f'{col} LIKE ?' for col in columns) + ')'
+                    params.extend([f'%{search_term}%'] * len(columns))
             
             if store_id:
-                query += ' AND (store_id LIKE ? OR store_alias LIKE ?)'
-                search_pattern = f'%{store_id}%'
-                params.extend([search_pattern, search_pattern])
+                match = self._search_match_expression(store_id, ['store_id', 'store_alias'])
+                if match:
+                    match_terms.append(match)
+                else:
+                    query += ' AND (store_id LIKE ? OR store_alias LIKE ?)'
+                    search_pattern = f'%{store_id}%'
+                    params.extend([search_pattern, search_pattern])
+            
+            if match_terms:
+                query += ' AND id IN (SELECT rowid FROM access_points_fts WHERE access_points_fts MATCH ?)'
+                params.append(' AND '.join(f'({term})' for term in match_terms))
             
             if support_status:
                 query += ' AND support_status = ?'
                 params.append(support_status)
             
             if has_open_tickets is not None:
-                if has_open_tickets:
-                    query += ''' AND EXISTS (
-                        SELECT 1 FROM jira_tickets 
-                        WHERE jira_tickets.ap_id = access_points.ap_id 
-                        AND jira_tickets.status NOT IN ('Closed', 'Resolved', 'Done')
-                    )'''
-                else:
-                    query += ''' AND NOT EXISTS (
-                        SELECT 1 FROM jira_tickets 
-                        WHERE jira_tickets.ap_id = access_points.ap_id 
-                        AND jira_tickets.status NOT IN ('Closed', 'Resolved', 'Done')
-                    )'''
+                query += f''' AND {'' if has_open_tickets else 'NOT '}EXISTS (
+                    SELECT 1 FROM jira_tickets 
+                    WHERE jira_tickets.ap_id = access_points.ap_id 
+                    AND {self.open_ticket_condition('jira_tickets.status')}
+                )'''
             
             query += ' ORDER BY ap_id'
             
             cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            # Decrypt sensitive fields
-            result = []
-            for row in rows:
-                ap_dict = dict(row)
-                for field in self.ENCRYPTED_FIELDS:
-                    if field in ap_dict and ap_dict[field]:
-                        ap_dict[field] = self._decrypt(ap_dict[field])
-                result.append(ap_dict)
-            
-            return result
+            return [self._ap_row(row) for row in cursor.fetchall()]
 
@@ -14,6 +14,7 @@ from pathlib import Path
 
 # Import database and authentication
 from database_manager import DatabaseManager
+from services import register_database_manager
 from login_dialog import LoginDialog
 from dashboard_main import DashboardMain
 from splash_screen import show_splash_with_loading
@@ -49,6 +50,7 @@ class APHelperV3:
         # Initialize database
         try:
             self.db = DatabaseManager()
+            register_database_manager(self.db)
         except Exception as e:
             messagebox.showerror("Database Error", 
                                f"Failed to initialize database:\n{e}\n\n"
@@ -0,0 +1,284 @@
+"""
+ICMP Sweep Engine - Ping many hosts over a single raw socket
+Multiplexes thousands of in-flight echo requests and matches replies by ID and sequence
+"""
+
+import os
+import select
+import socket
+import struct
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+
+
+def icmp_checksum(data: bytes) -> int:
+    """Calculate the RFC 1071 internet checksum (network byte order)."""
+    if len(data) % 2:
+        data += b'\x00'
+
+    total = 0
+    for (word,) in struct.iter_unpack('!H', data):
+        total += word
+
+    total = (total >> 16) + (total & 0xFFFF)
+    total += (total >> 16)
+
+    return ~total & 0xFFFF
+
+
+def build_echo_request(identifier: int, sequence: int, payload: bytes = b'') -> bytes:
+    """Build an ICMP echo request packet with a valid checksum."""
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, identifier, sequence)
+    checksum = icmp_checksum(header + payload)
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum, identifier, sequence)
+    return header + payload
+
+
+def parse_echo_reply(packet: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Parse an echo reply received on a raw socket.
+
+    Raw ICMP sockets deliver the IP header as well, so its length is read
+    from the IHL field instead of assuming 20 bytes.
+
+    Returns:
+        tuple: (identifier, sequence) or None if this is not an echo reply
+    """
+    if len(packet) < 20:
+        return None
+
+    ip_header_len = (packet[0] & 0x0F) * 4
+    icmp_header = packet[ip_header_len:ip_header_len + 8]
+    if len(icmp_header) < 8:
+        return None
+
+    icmp_type, code, checksum, identifier, sequence = struct.unpack('!BBHHH', icmp_header)
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+
+    return identifier, sequence
+
+
+class RawIcmpTransport:
+    """Single raw ICMP socket shared by every echo in a sweep."""
+
+    def __init__(self):
+        """
+        Open the raw socket.
+
+        Raises:
+            PermissionError/OSError: If raw sockets are not available (no admin/root)
+        """
+        icmp = socket.getprotobyname("icmp")
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, icmp)
+        self.sock.setblocking(False)
+        # Large receive buffer so replies from a full fleet are not dropped
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        except OSError:
+            pass
+
+    def send(self, packet: bytes, address: str):
+        """Send a packet to an IPv4 address."""
+        try:
+            self.sock.sendto(packet, (address, 0))
+        except BlockingIOError:
+            # Send buffer full - wait until writable and retry once
+            select.select([], [self.sock], [], 0.1)
+            self.sock.sendto(packet, (address, 0))
+
+    def receive(self, timeout: float) -> List[Tuple[bytes, str]]:
+        """
+        Wait up to timeout seconds and drain every packet that is ready.
+
+        Returns:
+            list: (packet, source_address) tuples, empty on timeout
+        """
+        ready, _, _ = select.select([self.sock], [], [], max(0.0, timeout))
+        if not ready:
+            return []
+
+        packets = []
+        while True:
+            try:
+                packet, addr = self.sock.recvfrom(1024)
+            except (BlockingIOError, InterruptedError):
+                break
+            packets.append((packet, addr[0]))
+        return packets
+
+    def close(self):
+        """Close the raw socket."""
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class PingStats:
+    """Accumulated echo results for one sweep target."""
+
+    def __init__(self, key: str, address: str):
+        self.key = key
+        self.address = address
+        self.sent = 0
+        self.received = 0
+        self.rtts: List[float] = []
+
+    @property
+    def lost(self) -> int:
+        return self.sent - self.received
+
+    @property
+    def loss_percent(self) -> int:
+        return int((self.lost / self.sent) * 100) if self.sent else 0
+
+    @property
+    def avg_rtt(self) -> float:
+        return sum(self.rtts) / len(self.rtts) if self.rtts else 0.0
+
+
+class IcmpSweeper:
+    """
+    Sweep a set of hosts with ICMP echoes over one socket.
+
+    Every round sends one echo to every target, rounds are `interval` seconds
+    apart, and a single loop waits for whichever comes first: a reply, an echo
+    timeout or the next round. A fleet sweep therefore takes roughly
+    ping_count * interval + timeout seconds regardless of fleet size.
+    """
+
+    def __init__(self, transport=None, identifier: int = None,
+                 interval: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the sweeper.
+
+        Args:
+            transport: Object with send(packet, address), receive(timeout) and close().
+                       Defaults to a RawIcmpTransport (requires admin/root).
+            identifier: ICMP identifier for this sweep (defaults to PID)
+            interval: Seconds between echo rounds
+            clock: Monotonic clock, injectable for tests
+        """
+        self.transport = transport if transport is not None else RawIcmpTransport()
+        self.identifier = (identifier if identifier is not None else os.getpid()) & 0xFFFF
+        self.interval = interval
+        self.clock = clock
+        self._next_sequence = 0
+
+    def close(self):
+        """Release the underlying transport."""
+        self.transport.close()
+
+    def _allocate_sequence(self) -> int:
+        sequence = self._next_sequence
+        self._next_sequence = (self._next_sequence + 1) & 0xFFFF
+        return sequence
+
+    def sweep(self, targets: Dict[str, str], count: int = 4, timeout: float = 2.0,
+              on_echo: Callable = None, on_complete: Callable = None,
+              should_stop: Callable[[], bool] = None) -> Dict[str, PingStats]:
+        """
+        Ping every target `count` times.
+
+        Args:
+            targets: Mapping of key (e.g. AP ID) -> IPv4 address
+            count: Echoes per target
+            timeout: Seconds to wait for each reply
+            on_echo: Called as on_echo(stats, success, rtt_ms) after every echo resolves
+            on_complete: Called as on_complete(stats) once a target has resolved all echoes
+            should_stop: Polled between events; returning True aborts the sweep
+
+        Returns:
+            dict: key -> PingStats
+        """
+        results = {key: PingStats(key, address) for key, address in targets.items()}
+        if not results or count <= 0:
+            return results
+
+        # sequence -> (stats, send_time); sequence numbers are unique across the
+        # sweep as long as fewer than 65536 echoes are in flight at once
+        in_flight: Dict[int, Tuple[PingStats, float]] = {}
+        # Echoes in send order, so expiry only ever looks at the oldest ones
+        send_order = deque()
+        pending_per_target = {key: count for key in results}
+
+        start = self.clock()
+        rounds_sent = 0
+
+        def resolve(stats: PingStats, success: bool, rtt: float):
+            if success:
+                stats.received += 1
+                stats.rtts.append(rtt)
+            if on_echo:
+                on_echo(stats, success, rtt)
+            pending_per_target[stats.key] -= 1
+            if pending_per_target[stats.key] == 0 and on_complete:
+                on_complete(stats)
+
+        while rounds_sent < count or in_flight:
+            if should_stop and should_stop():
+                break
+
+            now = self.clock()
+
+            # Send the next round when it is due
+            if rounds_sent < count and now >= start + rounds_sent * self.interval:
+                for stats in results.values():
+                    sequence = self._allocate_sequence()
+                    payload = struct.pack('!d', time.time())
+                    packet = build_echo_request(self.identifier, sequence, payload)
+                    try:
+                        self.transport.send(packet, stats.address)
+                    except OSError:
+                        stats.sent += 1
+                        resolve(stats, False, 0.0)
+                        continue
+                    stats.sent += 1
+                    sent_at = self.clock()
+                    in_flight[sequence] = (stats, sent_at)
+                    send_order.append((sent_at, sequence))
+                rounds_sent += 1
+                continue
+
+            # Expire echoes that have waited longer than the timeout
+            while send_order and (send_order[0][1] not in in_flight
+                                  or now - send_order[0][0] >= timeout):
+                sent_at, sequence = send_order.popleft()
+                entry = in_flight.get(sequence)
+                if entry and entry[1] == sent_at:
+                    del in_flight[sequence]
+                    resolve(entry[0], False, 0.0)
+
+            if rounds_sent >= count and not in_flight:
+                break
+
+            # Sleep until the next reply, timeout or round - whichever is first
+            deadlines = []
+            if rounds_sent < count:
+                deadlines.append(start + rounds_sent * self.interval)
+            if send_order:
+                deadlines.append(send_order[0][0] + timeout)
+            wait = max(0.0, min(deadlines) - now)
+            if should_stop:
+                wait = min(wait, 0.25)
+
+            for packet, source in self.transport.receive(wait):
+                parsed = parse_echo_reply(packet)
+                if not parsed:
+                    continue
+                identifier, sequence = parsed
+                if identifier != self.identifier or sequence not in in_flight:
+                    continue
+                stats, sent_at = in_flight[sequence]
+                if source != stats.address:
+                    continue
+                del in_flight[sequence]
+                resolve(stats, True, (self.clock() - sent_at) * 1000)
+
+        return results
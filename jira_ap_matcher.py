@@ -0,0 +1,112 @@
+"""
+Jira AP Matcher - Attributes Jira issues to the AP IDs mentioned in them
+Builds one case-insensitive regular expression from a prefix tree of the AP
+IDs, so each issue's text is scanned once instead of once per AP ID and the
+work per character depends on ID length, not on how many IDs there are.
+Matches follow the same rule as a plain substring test: an ID counts wherever
+it appears, also inside a longer word or a longer ID.
+"""
+
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class APIDMatcher:
+    """
+    Finds which of a fixed set of AP IDs occur in a text.
+
+        matcher = APIDMatcher(['201265', '2012', 'elkjop_se_lab.lab5'])
+        matcher.match('AP 201265 offline')   # {'201265', '2012'}
+    """
+
+    def __init__(self, ap_ids: Iterable[str]):
+        """
+        Build the matcher (once per search; matching is then a single pass per text).
+
+        Args:
+            ap_ids: AP IDs to look for (empty values are ignored)
+        """
+        self._by_lower: Dict[str, List[str]] = {}
+        for ap_id in ap_ids:
+            ap_id = str(ap_id).strip()
+            if ap_id:
+                ids = self._by_lower.setdefault(ap_id.lower(), [])
+                if ap_id not in ids:
+                    ids.append(ap_id)
+
+        # The lookahead reports one ID per start position - the longest, because
+        # the trie's optional tails are greedy. Every shorter ID inside it is
+        # added from _contained, so overlapping IDs are all found.
+        self._contained: Dict[str, List[str]] = {}
+        for key in self._by_lower:
+            self._contained[key] = sorted({key[i:j]
+                                           for i in range(len(key))
+                                           for j in range(i + 1, len(key) + 1)
+                                           if key[i:j] in self._by_lower})
+
+        if self._by_lower:
+            trie: Dict = {}
+            for key in self._by_lower:
+                node = trie
+                for char in key:
+                    node = node.setdefault(char, {})
+                node[''] = {}
+            self._pattern = re.compile(f'(?=({_trie_pattern(trie)}))', re.IGNORECASE)
+        else:
+            self._pattern = None
+
+    def __len__(self) -> int:
+        return len(self._by_lower)
+
+    def match(self, text: str) -> Set[str]:
+        """
+        AP IDs that occur in text (case-insensitive).
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of matching AP IDs, as they were passed to the constructor
+        """
+        if self._pattern is None or not text:
+            return set()
+        keys = set()
+        for found in self._pattern.finditer(text):
+            keys.update(self._contained[found.group(1).lower()])
+        return {ap_id for key in keys for ap_id in self._by_lower[key]}
+
+    def match_issue(self, issue: Dict) -> Set[str]:
+        """
+        AP IDs mentioned in a Jira issue's key, summary or description.
+
+        Args:
+            issue: Issue data from the Jira API
+
+        Returns:
+            Set of matching AP IDs
+        """
+        fields = issue.get('fields') or {}
+        return self.match(f"{issue.get('key', '')} {fields.get('summary', '')} {fields.get('description', '')}")
+
+    def attribute(self, issues: Iterable[Dict]) -> List[Tuple[str, Dict]]:
+        """
+        Pair every issue with each AP ID it mentions.
+
+        Args:
+            issues: Issues from the Jira API
+
+        Returns:
+            List of (ap_id, issue) pairs, ready for JiraDBManager.store_issues()
+        """
+        return [(ap_id, issue) for issue in issues for ap_id in sorted(self.match_issue(issue))]
+
+
+def _trie_pattern(node: Dict) -> str:
+    """Regular expression for a prefix tree ('' marks the end of an ID)."""
+    branches = [re.escape(char) + _trie_pattern(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    # An ID ends here: the rest is optional, and greedy so the longest ID wins
+    return f'(?:{pattern})?' if '' in node else pattern
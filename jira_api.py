@@ -6,14 +6,47 @@ Provides methods to fetch issues, update issues, add comments, etc.
 import requests
 from requests.auth import HTTPBasicAuth
 import json
-from typing import Optional, List, Dict, Tuple
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Tuple, Iterator, NamedTuple
 from certificate_manager import CertificateManager
 from error_sanitizer import ErrorSanitizer
 
 
+class JiraSearchError(Exception):
+    """A Jira search request failed (message is safe to show to the user)."""
+
+
+class SearchPage(NamedTuple):
+    """One page of JQL search results (is_last: Jira has no further results)."""
+    issues: List[Dict]
+    is_last: bool
+
+
 class JiraAPI:
     """Handles Jira API interactions with authentication."""
     
+    # Fields returned when a search doesn't ask for specific ones (the new API returns
+    # only IDs without a field list); includes comment for internal notes and replies
+    DEFAULT_SEARCH_FIELDS = ['key', 'summary', 'status', 'issuetype', 'priority', 'created',
+                             'updated', 'resolutiondate', 'creator', 'reporter', 'assignee',
+                             'description', 'resolution', 'comment']
+    
+    # Issues requested per page by iter_search_pages()
+    SEARCH_PAGE_SIZE = 100
+    
+    # Concurrent searches run by iter_batch_pages()
+    SEARCH_WORKERS = 4
+    
+    # Rate limiting (HTTP 429 / 503): retries per request, and the delay used
+    # when Jira sends no Retry-After (doubled per attempt, jittered)
+    MAX_RATE_LIMIT_RETRIES = 5
+    RATE_LIMIT_BASE_DELAY = 1.0
+    RATE_LIMIT_MAX_DELAY = 60.0
+    
     def __init__(self, credentials_manager):
         """
         Initialize Jira API client.
@@ -27,6 +60,8 @@ class JiraAPI:
         self._session = None
         self._cert_manager = CertificateManager()
         self._security_warnings = []  # Track security warnings to show to user
+        self._throttle_lock = threading.Lock()
+        self._throttled_until = 0.0  # monotonic time before which no request is sent
         self._initialize_connection()
     
     def _initialize_connection(self):
@@ -156,10 +191,13 @@ class JiraAPI:
         """
         Search for issues using JQL.
         
+        Follows nextPageToken until max_results issues are collected; use
+        iter_search_pages() to process large result sets page by page.
+        
         Args:
             jql: JQL query string
             max_results: Maximum number of results to return
-            fields: List of fields to return (None = all fields)
+            fields: List of fields to return (None = DEFAULT_SEARCH_FIELDS)
             
         Returns:
             Tuple of (success: bool, issues: List[Dict], message: str)
@@ -168,49 +206,223 @@ class JiraAPI:
             return False, [], "Jira not configured"
         
         try:
-            # The /rest/api/3/search/jql endpoint uses GET with query parameters
-            params = {
-                'jql': jql,
-                'maxResults': max_results
-            }
+            issues = []
+            is_last = True
+            for page in self.iter_search_pages(jql, fields, max_results=max_results):
+                issues.extend(page.issues)
+                is_last = page.is_last
             
-            if fields:
-                params['fields'] = ','.join(fields)
-            else:
-                # Request common fields by default (new API returns only IDs without this)
-                # Include comment for internal notes and customer replies
-                params['fields'] = 'key,summary,status,issuetype,priority,created,updated,resolutiondate,creator,reporter,assignee,description,resolution,comment'
+            issue_count = len(issues)
             
-            # Use GET to /rest/api/3/search/jql endpoint
-            url = f"{self._base_url}/rest/api/3/search/jql"
-            
-            response = self._session.get(
-                url,
-                params=params,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                issues = data.get('issues', [])
-                is_last = data.get('isLast', True)
-                issue_count = len(issues)
-                
-                # Return the issues with a proper structure
-                result = {
-                    'issues': issues,
-                    'total': issue_count,  # We don't get total from API, just the count
-                    'isLast': is_last
-                }
-                return True, result, f"Found {issue_count} issue(s)"
-            else:
-                return False, {}, f"Search failed: HTTP {response.status_code}"
+            # Return the issues with a proper structure
+            result = {
+                'issues': issues,
+                'total': issue_count,  # We don't get total from API, just the count
+                'isLast': is_last
+            }
+            return True, result, f"Found {issue_count} issue(s)"
                 
+        except JiraSearchError as e:
+            return False, {}, str(e)
         except Exception as e:
             ErrorSanitizer.log_full_error(e, "searching Jira")
             safe_msg = ErrorSanitizer.get_safe_error_message(e, "searching Jira")
             return False, [], safe_msg
     
+    def iter_search_pages(self, jql: str, fields: Optional[List[str]] = None,
+                          page_size: int = SEARCH_PAGE_SIZE, max_results: Optional[int] = None,
+                          prefetch: bool = True) -> Iterator['SearchPage']:
+        """
+        Search for issues using JQL, yielding one page at a time as it arrives.
+        
+        While the caller processes a page, the next one is already being
+        fetched in the background (prefetch), so only about two pages are in
+        memory however large the result set is. Stop iterating (or close the
+        generator) to abandon the rest of the search.
+        
+        Args:
+            jql: JQL query string
+            fields: Fields to return (None = DEFAULT_SEARCH_FIELDS); ask only for what you read
+            page_size: Issues per request (Jira caps this, typically at 100)
+            max_results: Stop after this many issues (None = all)
+            prefetch: Request the next page before yielding the current one
+            
+        Yields:
+            SearchPage: issues of one page and whether Jira has more after it
+            
+        Raises:
+            JiraSearchError: If Jira is not configured or a page request fails
+        """
+        if not self.is_configured():
+            raise JiraSearchError("Jira not configured")
+        
+        field_list = ','.join(fields or self.DEFAULT_SEARCH_FIELDS)
+        remaining = max_results
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jira-prefetch') if prefetch else None
+        pending = None
+        try:
+            token = None
+            while remaining is None or remaining > 0:
+                size = page_size if remaining is None else min(page_size, remaining)
+                if pending is not None:
+                    data = pending.result()
+                    pending = None
+                else:
+                    data = self._fetch_search_page(jql, field_list, size, token)
+                
+                issues = data.get('issues', [])
+                if remaining is not None:
+                    issues = issues[:remaining]
+                    remaining -= len(issues)
+                token = data.get('nextPageToken')
+                is_last = data.get('isLast', True) or not token or not issues
+                more = not is_last and (remaining is None or remaining > 0)
+                
+                if more and executor is not None:
+                    next_size = page_size if remaining is None else min(page_size, remaining)
+                    pending = executor.submit(self._fetch_search_page, jql, field_list, next_size, token)
+                
+                yield SearchPage(issues, is_last)
+                if not more:
+                    break
+        finally:
+            if pending is not None:
+                pending.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+    
+    def iter_issues(self, jql: str, fields: Optional[List[str]] = None, **kwargs) -> Iterator[Dict]:
+        """Issues of iter_search_pages() one at a time (same arguments)."""
+        for page in self.iter_search_pages(jql, fields, **kwargs):
+            yield from page.issues
+    
+    def iter_batch_pages(self, jqls: List[str], fields: Optional[List[str]] = None,
+                         max_workers: int = SEARCH_WORKERS,
+                         errors: Optional[List[Tuple[int, Exception]]] = None) -> Iterator[Tuple[int, 'SearchPage']]:
+        """
+        Run several JQL searches concurrently, yielding pages as they complete.
+        
+        Each search is paged like iter_search_pages(); up to max_workers run at
+        once on the shared session, so the total time tracks the slowest search
+        rather than the sum. At most two pages per worker wait for the caller;
+        workers pause while it is busy, so memory stays bounded. Rate limiting
+        (429) pauses all workers for the Retry-After period. A search that
+        fails is reported and skipped.
+        
+        Args:
+            jqls: JQL query strings
+            fields: Fields to return (None = DEFAULT_SEARCH_FIELDS)
+            max_workers: Searches running at the same time
+            errors: Optional list that collects (index, exception) of failed searches
+            
+        Yields:
+            Tuple of (index of the query in jqls, SearchPage) in completion order
+            
+        Raises:
+            JiraSearchError: If Jira is not configured
+        """
+        if not self.is_configured():
+            raise JiraSearchError("Jira not configured")
+        if not jqls:
+            return
+        
+        workers = min(max_workers, len(jqls))
+        # Bounded, so workers wait for the consumer instead of piling up pages
+        results = queue.Queue(maxsize=2 * workers)
+        cancelled = threading.Event()
+        done = object()
+        
+        def put(item) -> bool:
+            """Queue an item; gives up once the consumer has stopped."""
+            while not cancelled.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def run(index, jql):
+            try:
+                for page in self.iter_search_pages(jql, fields, prefetch=False):
+                    if not put((index, page)):
+                        break
+            except Exception as e:
+                print(f"Jira search batch {index + 1}/{len(jqls)} failed: {e}")
+                if errors is not None:
+                    errors.append((index, e))
+            finally:
+                put((index, done))
+        
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='jira-search')
+        try:
+            for index, jql in enumerate(jqls):
+                executor.submit(run, index, jql)
+            
+            running = len(jqls)
+            while running:
+                index, page = results.get()
+                if page is done:
+                    running -= 1
+                else:
+                    yield index, page
+        finally:
+            cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _fetch_search_page(self, jql: str, fields: str, max_results: int,
+                           next_page_token: Optional[str]) -> Dict:
+        """GET one page from /rest/api/3/search/jql."""
+        params = {
+            'jql': jql,
+            'maxResults': max_results,
+            'fields': fields
+        }
+        if next_page_token:
+            params['nextPageToken'] = next_page_token
+        
+        response = self._get_with_backoff(
+            f"{self._base_url}/rest/api/3/search/jql",
+            params=params,
+            timeout=30
+        )
+        if response.status_code != 200:
+            raise JiraSearchError(f"Search failed: HTTP {response.status_code}")
+        return response.json()
+    
+    def _get_with_backoff(self, url: str, **kwargs) -> 'requests.Response':
+        """
+        GET url, retrying while Jira rate-limits the request (HTTP 429 or 503).
+        
+        Waits for Retry-After when Jira sends it, otherwise backs off
+        exponentially; a random jitter keeps concurrent workers from retrying
+        in lockstep. The wait applies to every request of this client.
+        """
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            with self._throttle_lock:
+                wait = self._throttled_until - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            
+            response = self._session.get(url, **kwargs)
+            if response.status_code not in (429, 503) or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                return response
+            
+            delay = self._retry_after(response)
+            if delay is None:
+                delay = self.RATE_LIMIT_BASE_DELAY * (2 ** attempt)
+            delay = min(delay, self.RATE_LIMIT_MAX_DELAY) + random.uniform(0, self.RATE_LIMIT_BASE_DELAY)
+            with self._throttle_lock:
+                self._throttled_until = max(self._throttled_until, time.monotonic() + delay)
+    
+    @staticmethod
+    def _retry_after(response) -> Optional[float]:
+        """Seconds from a Retry-After header (None if missing or an HTTP date)."""
+        try:
+            return max(0.0, float(response.headers.get('Retry-After')))
+        except (TypeError, ValueError):
+            return None
+    
     def get_issue(self, issue_key: str, fields: Optional[List[str]] = None) -> tuple[bool, Optional[Dict], str]:
         """
         Get a specific issue by key.
@@ -67,103 +67,23 @@ def extract_text_from_adf(adf_content) -> str:
 class JiraDBManager:
     """Manages Jira-specific database operations."""
     
+    # Jira search fields store_issues() reads (key and id are always returned);
+    # add 'comment' when storing with comments
+    LINK_FIELDS = ['summary', 'issuetype', 'status', 'priority', 'resolution', 'created',
+                   'updated', 'resolutiondate', 'creator', 'reporter', 'assignee', 'description']
+    
+    # The background sync stops searching for APs not viewed for this long,
+    # and never searches for more than this many
+    TRACKED_AP_MAX_AGE_DAYS = 30
+    MAX_TRACKED_APS = 2000
+    
     def __init__(self, db_manager: DatabaseManager):
-        """Initialize with existing DatabaseManager instance."""
+        """Initialize with existing DatabaseManager instance.
+        
+        The jira_ap_links and jira_comments tables are created by the
+        DatabaseManager schema migrations.
+        """
         self.db = db_manager
-        self._init_jira_tables()
-    
-    def _init_jira_tables(self):
-        """Initialize Jira-specific tables."""
-        with self.db._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Jira AP Links table - main issue tracking
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS jira_ap_links (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ap_id TEXT NOT NULL,
-                    jira_key TEXT NOT NULL,
-                    jira_id TEXT NOT NULL,
-                    jira_url TEXT NOT NULL,
-                    summary TEXT,
-                    issue_type TEXT,
-                    status TEXT,
-                    priority TEXT,
-                    resolution TEXT,
-                    created_date TEXT,
-                    updated_date TEXT,
-                    resolved_date TEXT,
-                    creator TEXT,
-                    reporter TEXT,
-                    assignee TEXT,
-                    description_preview TEXT,
-                    comment_count INTEGER DEFAULT 0,
-                    last_synced TEXT DEFAULT CURRENT_TIMESTAMP,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(ap_id, jira_key)
-                )
-            ''')
-            
-            # Jira Comments table - internal notes and customer replies
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS jira_comments (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    jira_link_id INTEGER NOT NULL,
-                    jira_comment_id TEXT NOT NULL UNIQUE,
-                    author TEXT,
-                    author_email TEXT,
-                    comment_text TEXT,
-                    is_internal BOOLEAN DEFAULT 0,
-                    created_date TEXT,
-                    updated_date TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (jira_link_id) REFERENCES jira_ap_links(id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Create indexes for better query performance
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_jira_ap_links_ap_id 
-                ON jira_ap_links(ap_id)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_jira_ap_links_jira_key 
-                ON jira_ap_links(jira_key)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_jira_ap_links_status 
-                ON jira_ap_links(status)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_jira_ap_links_updated 
-                ON jira_ap_links(updated_date)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_jira_comments_link_id 
-                ON jira_comments(jira_link_id)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_jira_comments_jira_id 
-                ON jira_comments(jira_comment_id)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_jira_comments_internal 
-                ON jira_comments(is_internal)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_jira_comments_created 
-                ON jira_comments(created_date)
-            ''')
-            
-            conn.commit()
     
     def store_issue(self, ap_id: str, issue: Dict, jira_base_url: str) -> int:
         """
@@ -177,6 +97,76 @@ class JiraDBManager:
         Returns:
             Database ID of the stored issue
         """
+        link_ids = self.store_issues([(ap_id, issue)], jira_base_url)
+        return link_ids[(ap_id, issue.get('key', ''))]
+    
+    def store_issues(self, links: List[Tuple[str, Dict]], jira_base_url: str,
+                     with_comments: bool = False) -> Dict[Tuple[str, str], int]:
+        """
+        Store or update many issue/AP links in one transaction.
+        
+        Args:
+            links: (ap_id, issue) pairs, e.g. from APIDMatcher.attribute()
+            jira_base_url: Base URL for constructing issue URLs
+            with_comments: Also store the issues' comments (on each issue's first link)
+            
+        Returns:
+            Dict of {(ap_id, jira_key): database ID}
+        """
+        rows = [self._link_row(ap_id, issue, jira_base_url) for ap_id, issue in links]
+        link_ids = {}
+        if not rows:
+            return link_ids
+        
+        with self.db._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            for row in rows:
+                # Update in place: REPLACE would delete the row and cascade to its comments
+                cursor.execute('''
+                    INSERT INTO jira_ap_links (
+                        ap_id, jira_key, jira_id, jira_url, summary, issue_type,
+                        status, priority, resolution, created_date, updated_date,
+                        resolved_date, creator, reporter, assignee, description_preview,
+                        description, comment_count, last_synced, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                             CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                    ON CONFLICT(ap_id, jira_key) DO UPDATE SET
+                        jira_id = excluded.jira_id, jira_url = excluded.jira_url,
+                        summary = excluded.summary, issue_type = excluded.issue_type,
+                        status = excluded.status, priority = excluded.priority,
+                        resolution = excluded.resolution, created_date = excluded.created_date,
+                        updated_date = excluded.updated_date, resolved_date = excluded.resolved_date,
+                        creator = excluded.creator, reporter = excluded.reporter,
+                        assignee = excluded.assignee, description_preview = excluded.description_preview,
+                        description = excluded.description,
+                        comment_count = COALESCE(excluded.comment_count, jira_ap_links.comment_count),
+                        last_synced = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                ''', row)
+                
+                # lastrowid isn't set when the conflicting row was updated
+                cursor.execute('''
+                    SELECT id FROM jira_ap_links WHERE ap_id = ? AND jira_key = ?
+                ''', (row[0], row[1]))
+                link_ids[(row[0], row[1])] = cursor.fetchone()[0]
+            
+            if with_comments:
+                stored_keys = set()
+                for ap_id, issue in links:
+                    jira_key = issue.get('key', '')
+                    if jira_key in stored_keys:
+                        continue
+                    stored_keys.add(jira_key)
+                    comment_data = issue.get('fields', {}).get('comment', {})
+                    comments = comment_data.get('comments', []) if isinstance(comment_data, dict) else []
+                    self._insert_comments(cursor, link_ids[(ap_id, jira_key)], comments)
+            
+            conn.commit()
+            return link_ids
+    
+    @staticmethod
+    def _link_row(ap_id: str, issue: Dict, jira_base_url: str) -> Tuple:
+        """jira_ap_links column values (up to comment_count) for one issue."""
         fields = issue.get('fields', {})
         
         # Extract basic info
@@ -203,42 +193,19 @@ class JiraDBManager:
         assignee = assignee_obj.get('displayName', '') if assignee_obj else None
         
         # Description
-        description = fields.get('description')
-        description_preview = extract_text_from_adf(description)[:500] if description else ''
+        description = extract_text_from_adf(fields['description']) if fields.get('description') else ''
+        description_preview = description[:500]
         
-        # Comment count
-        comment_data = fields.get('comment', {})
-        comment_count = comment_data.get('total', 0) if isinstance(comment_data, dict) else 0
+        # Comment count (None when searched without the comment field: keep the stored count)
+        comment_data = fields.get('comment')
+        comment_count = comment_data.get('total', 0) if isinstance(comment_data, dict) else None
         
-        with self.db._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Insert or replace
-            cursor.execute('''
-                INSERT OR REPLACE INTO jira_ap_links (
-                    ap_id, jira_key, jira_id, jira_url, summary, issue_type,
-                    status, priority, resolution, created_date, updated_date,
-                    resolved_date, creator, reporter, assignee, description_preview,
-                    comment_count, last_synced, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 
-                         CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-            ''', (
-                ap_id, jira_key, jira_id, jira_url, summary, issue_type,
-                status, priority, resolution, created_date, updated_date,
-                resolved_date, creator, reporter, assignee, description_preview,
-                comment_count
-            ))
-            
-            # Get the ID
-            cursor.execute('''
-                SELECT id FROM jira_ap_links WHERE ap_id = ? AND jira_key = ?
-            ''', (ap_id, jira_key))
-            
-            row = cursor.fetchone()
-            link_id = row[0] if row else cursor.lastrowid
-            
-            conn.commit()
-            return link_id
+        return (
+            ap_id, jira_key, jira_id, jira_url, summary, issue_type,
+            status, priority, resolution, created_date, updated_date,
+            resolved_date, creator, reporter, assignee, description_preview,
+            description, comment_count
+        )
     
     def store_comments(self, jira_link_id: int, comments: List[Dict]):
         """
@@ -249,34 +216,36 @@ class JiraDBManager:
             comments: List of comment data from Jira API
         """
         with self.db._get_connection() as conn:
-            cursor = conn.cursor()
+            self._insert_comments(conn.cursor(), jira_link_id, comments)
+            conn.commit()
+    
+    @staticmethod
+    def _insert_comments(cursor, jira_link_id: int, comments: List[Dict]):
+        """Insert or replace comments of one jira_ap_links record (no commit)."""
+        for comment in comments:
+            jira_comment_id = comment.get('id', '')
+            author = comment.get('author', {}).get('displayName', '')
+            author_email = comment.get('author', {}).get('emailAddress', '')
             
-            for comment in comments:
-                jira_comment_id = comment.get('id', '')
-                author = comment.get('author', {}).get('displayName', '')
-                author_email = comment.get('author', {}).get('emailAddress', '')
-                
-                # Extract text from ADF body
-                body = comment.get('body')
-                comment_text = extract_text_from_adf(body)
-                
-                # Check if internal (jsdPublic: false means internal only)
-                is_internal = not comment.get('jsdPublic', True)
-                
-                created_date = comment.get('created', '')
-                updated_date = comment.get('updated', '')
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO jira_comments (
-                        jira_link_id, jira_comment_id, author, author_email,
-                        comment_text, is_internal, created_date, updated_date
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+            # Extract text from ADF body
+            body = comment.get('body')
+            comment_text = extract_text_from_adf(body)
+            
+            # Check if internal (jsdPublic: false means internal only)
+            is_internal = not comment.get('jsdPublic', True)
+            
+            created_date = comment.get('created', '')
+            updated_date = comment.get('updated', '')
+            
+            cursor.execute('''
+                INSERT OR REPLACE INTO jira_comments (
                     jira_link_id, jira_comment_id, author, author_email,
                     comment_text, is_internal, created_date, updated_date
-                ))
-            
-            conn.commit()
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                jira_link_id, jira_comment_id, author, author_email,
+                comment_text, is_internal, created_date, updated_date
+            ))
     
     def get_issues_for_ap(self, ap_id: str) -> List[Dict]:
         """
@@ -305,6 +274,187 @@ class JiraDBManager:
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
     
+    def get_cached_issues(self, ap_id: str) -> List[Dict]:
+        """
+        Cached issues for an AP in the Jira API's issue format (with comments).
+        
+        Lets panels that render API results show the local cache without a
+        live query. The description is stored as plain text (links cached
+        before it was stored fall back to the 500-character preview).
+        
+        Args:
+            ap_id: AP ID to get issues for
+            
+        Returns:
+            List of issue dictionaries, most recently updated first
+        """
+        links = self.get_issues_for_ap(ap_id)
+        comments_by_key: Dict[str, List[Dict]] = {}
+        keys = [link['jira_key'] for link in links]
+        with self.db._get_connection() as conn:
+            for start in range(0, len(keys), 900):
+                chunk = keys[start:start + 900]
+                rows = conn.execute(f'''
+                    SELECT l.jira_key, c.* FROM jira_comments c
+                    JOIN jira_ap_links l ON l.id = c.jira_link_id
+                    WHERE l.jira_key IN ({', '.join('?' * len(chunk))})
+                    ORDER BY c.created_date
+                ''', chunk).fetchall()
+                for row in rows:
+                    comments_by_key.setdefault(row['jira_key'], []).append({
+                        'id': row['jira_comment_id'],
+                        'author': {'displayName': row['author'], 'emailAddress': row['author_email']},
+                        'body': row['comment_text'],
+                        'jsdPublic': not row['is_internal'],
+                        'created': row['created_date'],
+                        'updated': row['updated_date'],
+                    })
+        
+        def named(value, key='name'):
+            return {key: value} if value else None
+        
+        issues = []
+        for link in links:
+            comments = comments_by_key.get(link['jira_key'], [])
+            issues.append({
+                'id': link['jira_id'],
+                'key': link['jira_key'],
+                'fields': {
+                    'summary': link['summary'],
+                    'project': {'key': link['jira_key'].split('-')[0]},
+                    'issuetype': named(link['issue_type']) or {},
+                    'status': named(link['status']) or {},
+                    'priority': named(link['priority']) or {},
+                    'resolution': named(link['resolution']),
+                    'created': link['created_date'],
+                    'updated': link['updated_date'],
+                    'resolutiondate': link['resolved_date'],
+                    'creator': named(link['creator'], 'displayName') or {},
+                    'reporter': named(link['reporter'], 'displayName') or {},
+                    'assignee': named(link['assignee'], 'displayName'),
+                    'description': link['description'] or link['description_preview'],
+                    'comment': {'total': max(link['comment_count'] or 0, len(comments)),
+                                'comments': comments},
+                },
+            })
+        return issues
+    
+    def count_open_issues(self, ap_ids: List[str]) -> Dict[str, int]:
+        """
+        Count open (not resolved/closed/done) issues for many APs in one query.
+        
+        Args:
+            ap_ids: AP IDs to count for
+            
+        Returns:
+            Dict of {ap_id: open issue count}; APs without open issues map to 0
+        """
+        counts = {ap_id: 0 for ap_id in ap_ids}
+        ids = list(counts)
+        is_open = DatabaseManager.open_ticket_condition('status')
+        with self.db._get_connection() as conn:
+            cursor = conn.cursor()
+            # (ap_id, jira_key) is unique, so each row is one issue
+            for start in range(0, len(ids), 900):
+                chunk = ids[start:start + 900]
+                cursor.execute(f'''
+                    SELECT ap_id, COUNT(*) FROM jira_ap_links
+                    WHERE ap_id IN ({', '.join('?' * len(chunk))}) AND {is_open}
+                    GROUP BY ap_id
+                ''', chunk)
+                counts.update(cursor.fetchall())
+        return counts
+    
+    def track_aps(self, ap_ids: List[str]):
+        """
+        Keep these APs up to date with the background Jira sync.
+        
+        Also marks already tracked APs as just viewed, which keeps
+        expire_tracked_aps() from dropping them.
+        
+        Args:
+            ap_ids: AP IDs whose issues were just fetched from Jira or shown from the cache
+        """
+        with self.db._get_connection() as conn:
+            conn.executemany('''
+                INSERT INTO jira_tracked_aps (ap_id, last_viewed) VALUES (?, CURRENT_TIMESTAMP)
+                ON CONFLICT(ap_id) DO UPDATE SET last_viewed = CURRENT_TIMESTAMP
+            ''', [(ap_id,) for ap_id in ap_ids])
+            conn.commit()
+    
+    def expire_tracked_aps(self, max_age_days: float = None, max_count: int = None) -> int:
+        """
+        Stop tracking APs nobody has viewed lately.
+        
+        Their cached issues stay in jira_ap_links; panels query Jira live
+        again (and re-track the AP) the next time it is viewed.
+        
+        Args:
+            max_age_days: Untrack APs not viewed for this many days
+                (default TRACKED_AP_MAX_AGE_DAYS)
+            max_count: Then keep at most this many, most recently viewed first
+                (default MAX_TRACKED_APS)
+        
+        Returns:
+            int: Number of APs untracked
+        """
+        if max_age_days is None:
+            max_age_days = self.TRACKED_AP_MAX_AGE_DAYS
+        if max_count is None:
+            max_count = self.MAX_TRACKED_APS
+        with self.db._get_connection() as conn:
+            removed = conn.execute(
+                "DELETE FROM jira_tracked_aps WHERE last_viewed < datetime('now', ?)",
+                (f'-{max_age_days} days',)).rowcount
+            removed += conn.execute('''
+                DELETE FROM jira_tracked_aps WHERE ap_id NOT IN (
+                    SELECT ap_id FROM jira_tracked_aps ORDER BY last_viewed DESC, ap_id LIMIT ?
+                )
+            ''', (max_count,)).rowcount
+            conn.commit()
+        return removed
+    
+    def get_tracked_aps(self, ap_ids: Optional[List[str]] = None) -> List[str]:
+        """
+        APs kept up to date by the background Jira sync.
+        
+        Args:
+            ap_ids: Only return these (None = all tracked APs)
+            
+        Returns:
+            List of tracked AP IDs
+        """
+        with self.db._get_connection() as conn:
+            if ap_ids is None:
+                return [row[0] for row in conn.execute('SELECT ap_id FROM jira_tracked_aps ORDER BY ap_id')]
+            tracked = []
+            for start in range(0, len(ap_ids), 900):
+                chunk = ap_ids[start:start + 900]
+                tracked.extend(row[0] for row in conn.execute(
+                    f'SELECT ap_id FROM jira_tracked_aps WHERE ap_id IN ({", ".join("?" * len(chunk))})',
+                    chunk))
+            return tracked
+    
+    def get_linked_aps(self, jira_keys: List[str]) -> Dict[str, List[str]]:
+        """
+        APs each issue is already cached under.
+        
+        Args:
+            jira_keys: Issue keys to look up
+            
+        Returns:
+            Dict: {jira_key: [ap_id, ...]} for keys with at least one link
+        """
+        linked: Dict[str, List[str]] = {}
+        with self.db._get_connection() as conn:
+            for start in range(0, len(jira_keys), 900):
+                chunk = jira_keys[start:start + 900]
+                for jira_key, ap_id in conn.execute(
+                        f'SELECT jira_key, ap_id FROM jira_ap_links '
+                        f'WHERE jira_key IN ({", ".join("?" * len(chunk))}) ORDER BY ap_id', chunk):
+                    linked.setdefault(jira_key, []).append(ap_id)
+        return linked
+    
     def get_comments_for_issue(self, jira_link_id: int, include_internal: bool = True) -> List[Dict]:
         """
         Get comments for a Jira issue.
@@ -4,8 +4,8 @@ High-level interface for Jira operations used throughout the application.
 Provides common queries and result handling for various use cases.
 """
 
-from typing import Dict, List, Optional, Tuple
-from jira_api import JiraAPI
+from typing import Dict, Iterator, List, Optional, Tuple
+from jira_api import JiraAPI, JiraSearchError, SearchPage
 from credentials_manager import CredentialsManager
 from database_manager import DatabaseManager
 
@@ -97,6 +97,46 @@ class JiraIntegration:
         except Exception as e:
             return False, None, f"Search failed: {str(e)}"
     
+    def iter_search_pages(self, jql: str, fields: Optional[List[str]] = None,
+                          max_results: Optional[int] = None) -> Iterator[SearchPage]:
+        """Search for Jira issues page by page as results arrive.
+        
+        Args:
+            jql: JQL query string
+            fields: Optional list of fields to return
+            max_results: Stop after this many issues (None = all)
+        
+        Yields:
+            SearchPage: issues of one page and whether Jira has more after it
+        
+        Raises:
+            JiraSearchError: If Jira is not configured or a page request fails
+        """
+        success, message = self._ensure_initialized()
+        if not success:
+            raise JiraSearchError(message)
+        yield from self.jira_api.iter_search_pages(jql, fields, max_results=max_results)
+    
+    def iter_batch_pages(self, jqls: List[str], fields: Optional[List[str]] = None,
+                         errors: Optional[List] = None) -> Iterator[Tuple[int, SearchPage]]:
+        """Run several JQL searches concurrently, yielding pages as they complete.
+        
+        Args:
+            jqls: JQL query strings
+            fields: Optional list of fields to return
+            errors: Optional list that collects (index, exception) of failed searches
+        
+        Yields:
+            Tuple of (index of the query in jqls, SearchPage)
+        
+        Raises:
+            JiraSearchError: If Jira is not configured
+        """
+        success, message = self._ensure_initialized()
+        if not success:
+            raise JiraSearchError(message)
+        yield from self.jira_api.iter_batch_pages(jqls, fields, errors=errors)
+    
     def get_issue(self, issue_key: str, 
                   fields: Optional[List[str]] = None) -> Tuple[bool, Optional[Dict], str]:
         """Get a specific Jira issue by key.
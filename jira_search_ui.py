@@ -282,29 +282,19 @@ class JiraSearchWindow:
         credentials = self.jira.credentials_manager.get_credentials('jira')
         jira_base_url = credentials.get('url', '').rstrip('/') if credentials else ''
         
-        # Store results in database - link to all search terms
+        # Store results in database - link to all search terms (in one transaction)
         issues = results.get('issues', [])
         stored_count = 0
         failed_issues = []
+        links = [(term, issue) for issue in issues for term in search_terms]
         
-        for issue in issues:
-            issue_key = issue.get('key', 'unknown')
-            try:
-                # Store issue for each search term so it shows up for any of them
-                for term in search_terms:
-                    link_id = self.jira_db.store_issue(term, issue, jira_base_url)
-                    
-                    # Store comments if available (only once per issue)
-                    if term == search_terms[0]:  # Only store comments once
-                        comment_data = issue.get('fields', {}).get('comment', {})
-                        comments = comment_data.get('comments', []) if isinstance(comment_data, dict) else []
-                        if comments:
-                            self.jira_db.store_comments(link_id, comments)
-                
-                stored_count += 1
-            except Exception as e:
-                failed_issues.append(issue_key)
-                safe_msg, _ = handle_and_log_error(e, f"storing issue {issue_key}")
+        try:
+            # Comments go on each issue's first link, i.e. the first search term
+            self.jira_db.store_issues(links, jira_base_url, with_comments=True)
+            stored_count = len(issues)
+        except Exception as e:
+            failed_issues = [issue.get('key', 'unknown') for issue in issues]
+            safe_msg, _ = handle_and_log_error(e, "storing issues")
         
         status_msg = f"Found {len(issues)} issues, stored {stored_count} in database"
         if failed_issues:
@@ -423,7 +413,7 @@ class JiraSearchWindow:
             self.details_text.insert(tk.END, "\nDescription:\n", 'label')
             self.details_text.insert(tk.END, f"{issue['description_preview']}\n")
         
-        self.details_text.insert(tk.END, f"\n\nComments: {issue['comment_count']}\n", 'label')
+        self.details_text.insert(tk.END, f"\n\nComments: {issue['comment_count'] or 0}\n", 'label')
         self.details_text.insert(tk.END, f"Last Synced: {issue['last_synced']}\n", 'date')
         
         self.details_text.config(state='disabled')
@@ -515,7 +505,7 @@ class JiraSearchWindow:
         # Test 2: Text search
         results_text += f"Test 2: Text search (text ~ \"{search_input}\")\n"
         jql = f'text ~ "{search_input}"'
-        success, result, message = self.jira.search_issues(jql, max_results=10)
+        success, result, message = self.jira.search_issues(jql, max_results=10, fields=['summary'])
         if success and result:
             issues = result.get('issues', [])
             results_text += f"✓ Found {len(issues)} issues\n"
@@ -530,7 +520,7 @@ class JiraSearchWindow:
         # Test 3: Summary/Description search
         results_text += f"Test 3: Summary/Description search\n"
         jql = f'(summary ~ "{search_input}" OR description ~ "{search_input}")'
-        success, result, message = self.jira.search_issues(jql, max_results=10)
+        success, result, message = self.jira.search_issues(jql, max_results=10, fields=['summary'])
         if success and result:
             issues = result.get('issues', [])
             results_text += f"✓ Found {len(issues)} issues\n"
@@ -0,0 +1,237 @@
+"""
+Jira Sync - Background incremental sync of Jira issues into jira_ap_links
+Periodically asks Jira only for issues updated since the last successful sync
+(the watermark, persisted in system_config) that mention a tracked AP, and
+upserts them with their comments. Panels read the local cache instantly and
+query Jira live only on demand or for APs that aren't tracked yet.
+"""
+
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from jira_ap_matcher import APIDMatcher
+from jira_db_manager import JiraDBManager
+
+
+def build_ap_jqls(ap_ids: List[str], batch_size: int = 50, condition: str = None) -> List[str]:
+    """
+    JQL text searches for AP IDs, batch_size OR-terms per query.
+
+    Args:
+        ap_ids: AP IDs to search for (numeric IDs get a wildcard, like Jira's own search)
+        batch_size: Terms per query (keeps the JQL a reasonable length)
+        condition: Optional JQL ANDed to every query, e.g. 'updated >= -15m'
+
+    Returns:
+        List of JQL strings
+    """
+    terms = [f'text ~ "{ap_id}*"' if ap_id.isdigit() else f'text ~ "{ap_id}"' for ap_id in ap_ids]
+    jqls = []
+    for i in range(0, len(terms), batch_size):
+        jql = f'({" OR ".join(terms[i:i + batch_size])})'
+        jqls.append(f'{condition} AND {jql}' if condition else jql)
+    return jqls
+
+
+class JiraSyncService:
+    """
+    Keeps cached Jira issues of tracked APs current.
+
+    APs become tracked when their issues are fetched live (JiraDBManager.track_aps)
+    and are untracked again once nobody has viewed them for a while
+    (JiraDBManager.expire_tracked_aps, run before each sync).
+    Each sync runs `updated >= <watermark>` searches for them concurrently and
+    only advances the watermark when every search succeeded, so a failed
+    sync is retried from the same point.
+
+        sync = get_jira_sync_service(db)
+        sync.start()
+        if sync.is_current():
+            issues = JiraDBManager(db).get_cached_issues(ap_id)
+    """
+
+    WATERMARK_KEY = 'jira_sync_watermark'
+
+    # Searches reach back this much further than the watermark: Jira compares
+    # 'updated' at minute precision and an issue may be saved during a sync
+    OVERLAP_MINUTES = 5
+
+    # First sync without a watermark or cached issues
+    INITIAL_LOOKBACK = timedelta(days=1)
+
+    def __init__(self, db_manager, interval_minutes: float = 15,
+                 on_synced: Optional[Callable[[Dict], None]] = None):
+        """
+        Initialize the service (call start() to begin syncing).
+
+        Args:
+            db_manager: DatabaseManager holding the Jira tables
+            interval_minutes: Time between syncs
+            on_synced: Called from the sync thread with each sync's result
+        """
+        self.db = db_manager
+        self.jira_db = JiraDBManager(db_manager)
+        self.interval_minutes = interval_minutes
+        self.on_synced = on_synced
+        self._sync_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ==================== Control ====================
+
+    def start(self) -> bool:
+        """
+        Start the background sync thread (syncs immediately, then every interval).
+
+        Returns:
+            bool: False if it was already running
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='jira-sync', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop the background thread after the current sync."""
+        self._stopping.set()
+        self._wake.set()
+
+    def request_sync(self):
+        """Sync as soon as possible instead of waiting for the interval."""
+        self._wake.set()
+
+    # ==================== Watermark ====================
+
+    def get_watermark(self) -> Optional[datetime]:
+        """Start time (UTC) of the last successful sync."""
+        value = self.db.get_system_config(self.WATERMARK_KEY)
+        try:
+            return datetime.fromisoformat(value) if value else None
+        except ValueError:
+            return None
+
+    def is_current(self, max_age_minutes: float = None) -> bool:
+        """
+        Whether the cache was synced recently enough to be shown without a live query.
+
+        Args:
+            max_age_minutes: Maximum watermark age (default: twice the interval)
+        """
+        watermark = self.get_watermark()
+        if watermark is None:
+            return False
+        max_age = timedelta(minutes=max_age_minutes if max_age_minutes is not None
+                            else 2 * self.interval_minutes)
+        return datetime.utcnow() - watermark <= max_age
+
+    # ==================== Sync ====================
+
+    def sync_now(self) -> Dict:
+        """
+        Fetch issues of tracked APs updated since the watermark and store them.
+
+        Returns:
+            Dict: {'success', 'aps', 'untracked', 'issues', 'links', 'failed_batches', 'message'}
+        """
+        from jira_integration import JiraIntegration
+
+        result = {'success': False, 'aps': 0, 'untracked': 0, 'issues': 0, 'links': 0,
+                  'failed_batches': 0, 'message': ''}
+        with self._sync_lock:
+            started = datetime.utcnow()
+            jira = JiraIntegration(self.db)
+            if not jira.is_configured():
+                result['message'] = "Jira not configured"
+                return result
+
+            result['untracked'] = self.jira_db.expire_tracked_aps()
+            ap_ids = self.jira_db.get_tracked_aps()
+            result['aps'] = len(ap_ids)
+            if ap_ids:
+                since = self._sync_start(started)
+                minutes = math.ceil((started - since).total_seconds() / 60) + self.OVERLAP_MINUTES
+                jqls = build_ap_jqls(ap_ids, condition=f'updated >= -{minutes}m')
+
+                credentials = jira.credentials_manager.get_credentials('jira')
+                jira_base_url = credentials.get('url', '').rstrip('/') if credentials else ''
+                matcher = APIDMatcher(ap_ids)
+                errors = []
+                fields = JiraDBManager.LINK_FIELDS + ['comment']
+                for _, page in jira.iter_batch_pages(jqls, fields=fields, errors=errors):
+                    links = self._attribute(matcher, page.issues)
+                    self.jira_db.store_issues(links, jira_base_url, with_comments=True)
+                    result['issues'] += len(page.issues)
+                    result['links'] += len(links)
+
+                if errors:
+                    result['failed_batches'] = len(errors)
+                    result['message'] = f"{len(errors)} of {len(jqls)} Jira searches failed; will retry"
+                    return result
+
+            self.db.set_system_config(self.WATERMARK_KEY, started.isoformat(timespec='seconds'))
+            result['success'] = True
+            result['message'] = (f"Synced {result['issues']} updated issue(s) "
+                                 f"for {result['aps']} tracked AP(s)")
+            return result
+
+    def _attribute(self, matcher: APIDMatcher, issues: List[Dict]) -> List[Tuple[str, Dict]]:
+        """
+        Pair issues with the APs they mention and the APs they are already cached under.
+
+        The search matches comment text too (e.g. issues ContextPanel found with
+        comment ~ "<ap>"), which the matcher doesn't scan; those issues still
+        have to be refreshed under the AP they were stored for.
+        """
+        links = matcher.attribute(issues)
+        seen = {(ap_id, issue['key']) for ap_id, issue in links}
+        linked = self.jira_db.get_linked_aps([issue['key'] for issue in issues])
+        for issue in issues:
+            for ap_id in linked.get(issue['key'], []):
+                if (ap_id, issue['key']) not in seen:
+                    seen.add((ap_id, issue['key']))
+                    links.append((ap_id, issue))
+        return links
+
+    def _sync_start(self, now: datetime) -> datetime:
+        """Watermark, or the oldest cached issue's sync time on the first run."""
+        watermark = self.get_watermark()
+        if watermark is not None:
+            return watermark
+        with self.db._get_connection() as conn:
+            oldest = conn.execute('SELECT MIN(last_synced) FROM jira_ap_links').fetchone()[0]
+        try:
+            # last_synced is SQLite CURRENT_TIMESTAMP, i.e. UTC
+            return datetime.fromisoformat(oldest) if oldest else now - self.INITIAL_LOOKBACK
+        except ValueError:
+            return now - self.INITIAL_LOOKBACK
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                result = self.sync_now()
+                if self.on_synced:
+                    self.on_synced(result)
+            except Exception as e:
+                print(f"Error syncing Jira issues: {e}")
+            self._wake.wait(self.interval_minutes * 60)
+            self._wake.clear()
+
+
+_services: Dict[str, JiraSyncService] = {}
+_services_lock = threading.Lock()
+
+
+def get_jira_sync_service(db_manager) -> JiraSyncService:
+    """Get the process-wide sync service for db_manager's database file."""
+    key = str(db_manager.db_file)
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = JiraSyncService(db_manager)
+            _services[key] = service
+        return service
@@ -0,0 +1,98 @@
+"""
+Ping Metrics Aggregator - Rolls per-echo ping results up into daily ap_metrics rows
+Buffers results in memory and flushes them through the database write-behind queue
+"""
+
+import threading
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+
+class PingMetricsAggregator:
+    """Collects ping results per (ap_id, day) and writes them as ap_metrics UPSERTs."""
+
+    def __init__(self, db_manager, flush_threshold: int = 5000):
+        """
+        Initialize the aggregator.
+
+        Args:
+            db_manager: DatabaseManager instance (uses queue_ap_metrics)
+            flush_threshold: Flush automatically once this many echoes are buffered
+        """
+        self.db = db_manager
+        self.flush_threshold = flush_threshold
+        self._lock = threading.Lock()
+        # (ap_id, day) -> [ping_count, successful_pings, rtt_sum, rtt_min, rtt_max]
+        self._buckets: Dict[Tuple[str, str], list] = {}
+        self._pending = 0
+
+    def record(self, ap_id: str, success: bool, rtt_ms: Optional[float] = None, day: str = None):
+        """
+        Record the outcome of a single echo.
+
+        Args:
+            ap_id: AP identifier
+            success: True if a reply was received
+            rtt_ms: Round trip time in milliseconds (successful echoes only)
+            day: ISO date to attribute the echo to (defaults to today)
+        """
+        key = (ap_id, day or date.today().isoformat())
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [0, 0, 0.0, None, None]
+                self._buckets[key] = bucket
+
+            bucket[0] += 1
+            if success:
+                bucket[1] += 1
+                if rtt_ms is not None:
+                    bucket[2] += rtt_ms
+                    bucket[3] = rtt_ms if bucket[3] is None else min(bucket[3], rtt_ms)
+                    bucket[4] = rtt_ms if bucket[4] is None else max(bucket[4], rtt_ms)
+
+            self._pending += 1
+            should_flush = self._pending >= self.flush_threshold
+
+        if should_flush:
+            self.flush()
+
+    def _drain(self) -> List[Dict]:
+        """Take all buffered buckets as ap_metrics rows."""
+        with self._lock:
+            buckets, self._buckets = self._buckets, {}
+            self._pending = 0
+
+        rows = []
+        for (ap_id, day), (count, successful, rtt_sum, rtt_min, rtt_max) in buckets.items():
+            rows.append({
+                'ap_id': ap_id,
+                'date': day,
+                'ping_count': count,
+                'successful_pings': successful,
+                'avg_response_time': rtt_sum / successful if successful else None,
+                'min_response_time': rtt_min,
+                'max_response_time': rtt_max,
+            })
+        return rows
+
+    def flush(self) -> int:
+        """
+        Hand all buffered results to the database writer queue.
+
+        The rows are committed by the DatabaseManager write-behind thread in
+        the same batched transactions as status and history writes; call
+        db.flush_writes() to wait for them.
+
+        Returns:
+            int: Number of ap_metrics rows queued
+        """
+        rows = self._drain()
+        if rows:
+            self.db.queue_ap_metrics(rows)
+        return len(rows)
+
+    @property
+    def pending(self) -> int:
+        """Number of echoes buffered since the last flush."""
+        return self._pending
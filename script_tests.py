@@ -0,0 +1,22 @@
+"""
+Script Tests - Runs a test module's test_* functions when it is run directly
+The test_*.py modules are collected by pytest as well; this keeps
+`python test_x.py` working without pytest installed.
+"""
+
+from typing import Dict
+
+
+def run_tests(namespace: Dict, label: str):
+    """
+    Call every test_* function of a module in definition order.
+
+    Args:
+        namespace: The module's globals()
+        label: Name used in the summary line, e.g. "ICMP sweep"
+    """
+    tests = [obj for name, obj in list(namespace.items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✅ {len(tests)} {label} tests passed")
@@ -0,0 +1,89 @@
+"""
+Services - Process-wide shared database and credential objects
+Hands every subsystem the same DatabaseManager, AP CredentialManager, API
+CredentialsManager and VusionAPIConfig, so each action reuses the same
+encryption key, cipher and per-thread connections instead of building its own.
+
+The application registers the DatabaseManager it opened at startup; anything
+asked for before that is built on the default database:
+
+    services.register_database_manager(db)
+    config = services.get_vusion_config()
+"""
+
+import threading
+
+_lock = threading.RLock()
+_database_manager = None
+_credential_manager = None
+_credentials_manager = None
+_vusion_config = None
+
+
+def register_database_manager(db_manager):
+    """
+    Make db_manager the shared DatabaseManager.
+
+    Services built on a previously registered database are dropped, so they
+    are rebuilt on the new one when next requested.
+    """
+    global _database_manager
+    with _lock:
+        if db_manager is not _database_manager:
+            _reset_dependents()
+        _database_manager = db_manager
+
+
+def get_database_manager():
+    """Get the shared DatabaseManager (opens the default database if none is registered)."""
+    global _database_manager
+    with _lock:
+        if _database_manager is None:
+            from database_manager import DatabaseManager
+            _database_manager = DatabaseManager()
+        return _database_manager
+
+
+def get_credential_manager():
+    """Get the shared AP CredentialManager (credential_manager_v2) on the shared database."""
+    global _credential_manager
+    with _lock:
+        if _credential_manager is None:
+            from credential_manager_v2 import CredentialManager
+            _credential_manager = CredentialManager(db_manager=get_database_manager())
+        return _credential_manager
+
+
+def get_credentials_manager():
+    """Get the shared API CredentialsManager (Jira, Vusion keys) on the shared database."""
+    global _credentials_manager
+    with _lock:
+        if _credentials_manager is None:
+            from credentials_manager import CredentialsManager
+            _credentials_manager = CredentialsManager(get_database_manager())
+        return _credentials_manager
+
+
+def get_vusion_config():
+    """Get the shared VusionAPIConfig, backed by the shared CredentialsManager."""
+    global _vusion_config
+    with _lock:
+        if _vusion_config is None:
+            from vusion_api_config import VusionAPIConfig
+            _vusion_config = VusionAPIConfig(get_credentials_manager())
+        return _vusion_config
+
+
+def reset_services():
+    """Forget every shared instance (the registered DatabaseManager is not closed)."""
+    global _database_manager
+    with _lock:
+        _reset_dependents()
+        _database_manager = None
+
+
+def _reset_dependents():
+    global _credential_manager, _credentials_manager, _vusion_config
+    _credential_manager = None
+    _credentials_manager = None
+    _vusion_config = None
@@ -8,9 +8,10 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import paramiko
 import threading
-import time
-from typing import Dict, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple, Union
 import re
+from ssh_pool import get_ssh_pool
+from ssh_reader import ChannelReader, OutputBuffer
 
 
 class SSHConnection:
@@ -19,6 +20,11 @@ class SSHConnection:
     # ANSI escape code pattern
     ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
     
+    # Prompt patterns for expect() - matched at the end of the output
+    SERVICE_MODE_PROMPT = r'(?i)servicemode>\s*$'
+    SHELL_PROMPT = r'[#$]\s*$'
+    ANY_PROMPT = r'[>#$]\s*$'
+    
     def __init__(self, ap_id: str, host: str, username: str, password: str, port: int = 22):
         self.ap_id = ap_id
         self.host = host
@@ -29,10 +35,11 @@ class SSHConnection:
         self.client: Optional[paramiko.SSHClient] = None
         self.shell: Optional[paramiko.Channel] = None
         self.connected = False
-        self.output_buffer = ""
-        self.automation_buffer = ""  # Separate buffer for automation that doesn't get cleared
-        self.read_thread: Optional[threading.Thread] = None
-        self.stop_reading = False
+        # Shell output: get_output() consumes it for the terminal, while automation
+        # reads the tail through get_automation_output() without consuming it
+        self.buffer = OutputBuffer()
+        self.reader: Optional[ChannelReader] = None
+        self.session_start = 0  # Buffer position where the current shell's output begins
     
     @staticmethod
     def strip_ansi_codes(text: str) -> str:
@@ -45,30 +52,19 @@ class SSHConnection:
         Returns: (success: bool, message: str)
         """
         try:
-            self.client = paramiko.SSHClient()
-            self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            # Connect with timeout
-            self.client.connect(
-                hostname=self.host,
-                port=self.port,
-                username=self.username,
-                password=self.password,
-                timeout=10,
-                look_for_keys=False,
-                allow_agent=False
-            )
+            # Lease a pooled connection (reuses an open transport to this AP)
+            self.client = get_ssh_pool().acquire(self.host, self.username, self.password,
+                                                 port=self.port, timeout=10)
             
             # Get interactive shell
             self.shell = self.client.invoke_shell(width=120, height=40)
-            self.shell.settimeout(0.1)  # Non-blocking reads
             
             self.connected = True
             
-            # Start reading output in background
-            self.stop_reading = False
-            self.read_thread = threading.Thread(target=self._read_output, daemon=True)
-            self.read_thread.start()
+            # Read output in background (blocks on the channel until data arrives)
+            self.buffer.reopen()
+            self.session_start = self.buffer.position
+            self.reader = ChannelReader(self.shell, self.buffer, transform=self.strip_ansi_codes).start()
             
             # Start service mode detection
             threading.Thread(target=self._check_service_mode, daemon=True).start()
@@ -78,46 +74,29 @@ class SSHConnection:
         except paramiko.AuthenticationException:
             return False, "Authentication failed - check username/password"
         except paramiko.SSHException as e:
+            self._discard_client()
             return False, f"SSH connection failed: {str(e)}"
         except Exception as e:
+            self._discard_client()
             return False, f"Connection error: {str(e)}"
     
-    def _read_output(self):
-        """Background thread to continuously read shell output."""
-        while not self.stop_reading and self.shell and self.connected:
-            try:
-                if self.shell.recv_ready():
-                    data = self.shell.recv(4096).decode('utf-8', errors='replace')
-                    # Strip ANSI color codes
-                    data = self.strip_ansi_codes(data)
-                    self.output_buffer += data
-                    self.automation_buffer += data  # Also add to automation buffer
-                    # Keep automation buffer reasonable size (last 5000 chars)
-                    if len(self.automation_buffer) > 5000:
-                        self.automation_buffer = self.automation_buffer[-5000:]
-            except:
-                time.sleep(0.05)
-            time.sleep(0.01)
+    def _discard_client(self):
+        """Drop a leased client whose shell could not be opened."""
+        if self.client:
+            get_ssh_pool().discard(self.client)
+            self.client = None
     
     def _check_service_mode(self):
         """Check if we're in service mode after connection and auto-run status."""
-        import re
-        
-        # Wait for initial connection output
-        time.sleep(4)
-        
-        # Check automation buffer for service mode prompt
-        output = self.get_automation_output(last_chars=1000)
+        # Wait for the first prompt of this shell
+        index, output = self.expect([self.SERVICE_MODE_PROMPT, self.SHELL_PROMPT],
+                                    timeout=10, start=self.session_start)
         
-        if 'servicemode>' in output.lower() or 'service mode' in output.lower():
+        if index == 0 or 'service mode' in output.lower():
             print(f"[SSH] Service mode detected for {self.host}, running status command...")
             
-            # Send status command
-            self.send_command("status")
-            time.sleep(3)
-            
-            # Get status output
-            status_output = self.get_automation_output(last_chars=2000)
+            # Send status command and wait for the prompt to come back
+            index, status_output = self.send_expect("status", [self.SERVICE_MODE_PROMPT], timeout=10)
             print(f"[SSH] Status output length: {len(status_output)} chars")
             print(f"[SSH] Status output preview: {status_output[:500]}")
             
@@ -129,15 +108,49 @@ class SSHConnection:
                 
                 # Try to save to database if we can access it
                 try:
-                    from database_manager import DatabaseManager
-                    db = DatabaseManager()
-                    db.update_access_point(self.ap_id, {'java_version': java_version})
+                    from services import get_database_manager
+                    get_database_manager().update_access_point(self.ap_id, {'java_version': java_version})
                     print(f"[SSH] Java Version saved to database for AP {self.ap_id}")
                 except Exception as e:
                     print(f"[SSH] Could not save Java Version: {str(e)}")
             else:
                 print(f"[SSH] Java Version not found in status output")
     
+    def mark(self) -> int:
+        """Current output position, for expect(start=...) after sending a command."""
+        return self.buffer.position
+    
+    def expect(self, patterns: Union[str, List[str]], timeout: float = 10.0,
+               start: int = None) -> Tuple[int, str]:
+        """
+        Wait until one of the patterns appears in the shell output.
+        
+        Returns as soon as the output matches instead of sleeping a fixed time.
+        
+        Args:
+            patterns: Regex or list of regexes (e.g. SERVICE_MODE_PROMPT, SHELL_PROMPT)
+            timeout: Maximum seconds to wait
+            start: Buffer position to search from (from mark()); defaults to new output only
+            
+        Returns:
+            tuple: (index of the matching pattern or -1 on timeout/closed channel,
+                    output received since start)
+        """
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        if start is None:
+            start = self.buffer.position
+        result = self.buffer.wait_for(patterns, timeout, start=start)
+        index = result[0] if result else -1
+        return index, self.buffer.since(start)
+    
+    def send_expect(self, command: str, patterns: Union[str, List[str]],
+                    timeout: float = 10.0) -> Tuple[int, str]:
+        """Send a command and expect() one of the patterns in its response."""
+        start = self.mark()
+        self.send_command(command)
+        return self.expect(patterns, timeout, start=start)
+    
     def send_command(self, command: str):
         """Send command to the shell."""
         if not self.connected or not self.shell:
@@ -152,26 +165,28 @@ class SSHConnection:
     
     def get_output(self) -> str:
         """Get and clear the output buffer."""
-        output = self.output_buffer
-        self.output_buffer = ""
-        return output
+        return self.buffer.read()
     
     def peek_output(self, last_chars: int = 500) -> str:
         """Peek at recent output without clearing the buffer."""
-        return self.output_buffer[-last_chars:] if len(self.output_buffer) > last_chars else self.output_buffer
+        return self.buffer.peek(last_chars)
     
     def get_automation_output(self, last_chars: int = 1000) -> str:
         """Get recent output from automation buffer (not cleared by terminal display)."""
-        return self.automation_buffer[-last_chars:] if len(self.automation_buffer) > last_chars else self.automation_buffer
+        return self.buffer.tail(last_chars)
     
-    def disconnect(self, preserve_buffers: bool = False):
+    def disconnect(self, preserve_buffers: bool = False, relogin: bool = False):
         """Close the SSH connection.
         
         Args:
             preserve_buffers: If True, keeps output buffers for reconnection
+            relogin: If True, drops the pooled transport so the next connect() logs in again
+                     (needed after leaving service mode)
         """
         self.connected = False
-        self.stop_reading = True
+        if self.reader:
+            self.reader.stop()
+            self.reader = None
         
         if self.shell:
             try:
@@ -182,15 +197,17 @@ class SSHConnection:
         
         if self.client:
             try:
-                self.client.close()
+                if relogin:
+                    get_ssh_pool().discard(self.client)
+                else:
+                    get_ssh_pool().release(self.client)
             except:
                 pass
             self.client = None
         
         # Clear buffers unless preserving for reconnect
         if not preserve_buffers:
-            self.output_buffer = ""
-            self.automation_buffer = ""
+            self.buffer.clear()
 
 
 class SSHTerminalTab:
@@ -0,0 +1,367 @@
+"""
+SSH Connection Pool - Reuses authenticated SSH transports across batch and dashboard actions
+Connections are keyed by (host, port, username, password fingerprint) and shared
+between leases, since one paramiko transport can carry several exec, shell and SFTP
+channels at the same time.
+"""
+
+import hashlib
+import hmac
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import paramiko
+
+
+# Errors that mean the pooled transport is no longer usable
+CONNECTION_ERRORS = (paramiko.SSHException, EOFError, socket.error)
+
+# (host, port, username, password fingerprint)
+PoolKey = Tuple[str, int, str, str]
+
+
+class _PooledConnection:
+    """An authenticated SSH client plus lease bookkeeping."""
+
+    def __init__(self, key: PoolKey, client: paramiko.SSHClient):
+        self.key = key
+        self.client = client
+        self.leases = 0
+        self.last_used = time.monotonic()
+        self.dead = False  # Dropped from the pool; closed when the last lease ends
+
+    def is_alive(self) -> bool:
+        """Check the transport is still connected (sends an SSH_MSG_IGNORE probe)."""
+        transport = self.client.get_transport()
+        if transport is None or not transport.is_active() or not transport.is_authenticated():
+            return False
+        try:
+            transport.send_ignore()
+        except Exception:
+            return False
+        return True
+
+    def close(self):
+        try:
+            self.client.close()
+        except Exception:
+            pass
+
+
+class _KeyLock:
+    """Serializes connection setup for one pool key."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0  # acquire() calls holding or waiting for the lock
+
+
+class SSHConnectionPool:
+    """
+    Keyed pool of authenticated SSH connections.
+
+    - One transport per (host, port, username, password), shared by concurrent
+      leases; a different password never reuses an authenticated transport
+    - A broken transport is dropped from the pool at once but only closed when
+      its last lease ends, so other leases' channels are not cut
+    - Idle connections are closed after idle_ttl seconds
+    - At most max_size connections are kept; the least recently used idle
+      connection is evicted to make room
+    - Transports send keepalives so dead peers are noticed, and every idle
+      connection is probed before it is handed out again
+    """
+
+    def __init__(self, max_size: int = 50, idle_ttl: float = 300.0, keepalive: int = 30,
+                 connect_timeout: float = 10.0):
+        """
+        Initialize the pool.
+
+        Args:
+            max_size: Maximum number of pooled connections
+            idle_ttl: Seconds an unused connection is kept open
+            keepalive: Transport keepalive interval in seconds
+            connect_timeout: TCP/handshake timeout for new connections
+        """
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.keepalive = keepalive
+        self.connect_timeout = connect_timeout
+
+        self._lock = threading.Lock()
+        self._connections: Dict[PoolKey, _PooledConnection] = {}
+        self._retired: Dict[int, _PooledConnection] = {}  # dead but still leased, by id(client)
+        # Dropped once a key has neither a pooled connection nor an acquire() in flight
+        self._key_locks: Dict[PoolKey, _KeyLock] = {}
+        # Keys hold a keyed hash of the password, never the password itself
+        self._secret = os.urandom(32)
+        self.stats = {'created': 0, 'reused': 0, 'discarded': 0, 'expired': 0}
+
+    # ==================== Leasing ====================
+
+    def acquire(self, host: str, username: str, password: str, port: int = 22,
+                timeout: float = None) -> paramiko.SSHClient:
+        """
+        Lease an authenticated client, connecting only if no live one is pooled.
+
+        Every acquire() must be paired with release() (or discard() on error).
+
+        Raises:
+            paramiko.AuthenticationException, paramiko.SSHException, socket.error
+        """
+        key = (host, port, username, self._fingerprint(password))
+        self.prune()
+
+        # Serialize connection setup per key so parallel callers share one handshake
+        with self._lock:
+            key_lock = self._key_locks.get(key)
+            if key_lock is None:
+                key_lock = self._key_locks[key] = _KeyLock()
+            key_lock.users += 1
+
+        try:
+            return self._acquire_locked(key, key_lock, host, username, password, port, timeout)
+        finally:
+            with self._lock:
+                key_lock.users -= 1
+                self._drop_key_lock(key)
+
+    def _acquire_locked(self, key: PoolKey, key_lock: _KeyLock, host: str, username: str,
+                        password: str, port: int, timeout: Optional[float]) -> paramiko.SSHClient:
+        """acquire() body, run under the key's setup lock."""
+        with key_lock.lock:
+            with self._lock:
+                conn = self._connections.get(key)
+                if conn is not None:
+                    conn.leases += 1
+
+            if conn is not None:
+                if conn.is_alive():
+                    with self._lock:
+                        conn.last_used = time.monotonic()
+                        self.stats['reused'] += 1
+                    return conn.client
+                # Dead transport - give back our lease and replace it
+                self._retire(conn, 'discarded')
+
+            client = self._connect(host, port, username, password,
+                                   timeout if timeout is not None else self.connect_timeout)
+            conn = _PooledConnection(key, client)
+            conn.leases = 1
+            with self._lock:
+                self._make_room()
+                self._connections[key] = conn
+                self.stats['created'] += 1
+            return client
+
+    def release(self, client: paramiko.SSHClient):
+        """Return a leased client to the pool."""
+        with self._lock:
+            conn = self._find(client)
+            if conn is not None and not conn.dead:
+                conn.leases = max(0, conn.leases - 1)
+                conn.last_used = time.monotonic()
+                return
+        if conn is not None:
+            self._retire(conn)
+            return
+        # Never pooled - just close it
+        try:
+            client.close()
+        except Exception:
+            pass
+
+    def discard(self, client: paramiko.SSHClient):
+        """
+        End a lease and drop its connection from the pool (after a connection error or re-login).
+
+        New leases get a fresh connection at once; the old transport is closed
+        when its last lease ends, so other callers' open channels keep working.
+        """
+        with self._lock:
+            conn = self._find(client)
+        if conn is not None:
+            self._retire(conn, 'discarded')
+        else:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    @contextmanager
+    def lease(self, host: str, username: str, password: str, port: int = 22,
+              timeout: float = None):
+        """
+        Context manager around acquire()/release().
+
+        The connection is discarded instead of returned if a connection-level
+        error escapes the block; a read timeout on a still-connected transport
+        only fails this caller.
+        """
+        client = self.acquire(host, username, password, port, timeout)
+        try:
+            yield client
+        except CONNECTION_ERRORS as e:
+            if not (isinstance(e, socket.timeout) and self._transport_active_client(client)):
+                self.discard(client)
+                client = None
+            raise
+        finally:
+            if client is not None:
+                self.release(client)
+
+    # ==================== Convenience ====================
+
+    def exec_command(self, host: str, username: str, password: str, command: str,
+                     port: int = 22, timeout: float = 30) -> Tuple[int, str, str]:
+        """
+        Run a command on a pooled connection.
+
+        Returns:
+            tuple: (exit_status, stdout, stderr)
+        """
+        with self.lease(host, username, password, port, timeout) as client:
+            stdin, stdout, stderr = client.exec_command(command, timeout=timeout)
+            output = stdout.read().decode('utf-8', errors='ignore').strip()
+            error = stderr.read().decode('utf-8', errors='ignore').strip()
+            exit_status = stdout.channel.recv_exit_status()
+            return exit_status, output, error
+
+    @contextmanager
+    def open_sftp(self, host: str, username: str, password: str, port: int = 22,
+                  timeout: float = None):
+        """Open an SFTP session on a pooled transport."""
+        with self.lease(host, username, password, port, timeout) as client:
+            sftp = client.open_sftp()
+            try:
+                yield sftp
+            finally:
+                sftp.close()
+
+    # ==================== Maintenance ====================
+
+    def prune(self):
+        """Close idle connections past their TTL and connections whose transport died."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [conn for conn in self._connections.values()
+                       if conn.leases == 0 and (now - conn.last_used > self.idle_ttl
+                                                or not self._transport_active(conn))]
+        for conn in expired:
+            self._remove(conn, 'expired')
+
+    def close_all(self):
+        """Close every pooled connection (including dead ones still leased)."""
+        with self._lock:
+            connections = list(self._connections.values()) + list(self._retired.values())
+            self._connections.clear()
+            self._retired.clear()
+            for key in list(self._key_locks):
+                self._drop_key_lock(key)
+        for conn in connections:
+            conn.close()
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._connections)
+
+    # ==================== Internals ====================
+
+    def _connect(self, host: str, port: int, username: str, password: str,
+                 timeout: float) -> paramiko.SSHClient:
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        try:
+            client.connect(
+                hostname=host,
+                port=port,
+                username=username,
+                password=password,
+                timeout=timeout,
+                allow_agent=False,
+                look_for_keys=False
+            )
+        except Exception:
+            client.close()
+            raise
+        transport = client.get_transport()
+        if transport is not None and self.keepalive:
+            transport.set_keepalive(self.keepalive)
+        return client
+
+    def _fingerprint(self, password: str) -> str:
+        return hmac.new(self._secret, (password or '').encode('utf-8'), hashlib.sha256).hexdigest()
+
+    def _find(self, client: paramiko.SSHClient) -> Optional[_PooledConnection]:
+        """Pooled or retired connection of a client (lock held)."""
+        for conn in self._connections.values():
+            if conn.client is client:
+                return conn
+        return self._retired.get(id(client))
+
+    def _make_room(self):
+        """Evict least recently used idle connections while the pool is full (lock held)."""
+        while len(self._connections) >= self.max_size:
+            idle = [conn for conn in self._connections.values() if conn.leases == 0]
+            if not idle:
+                break
+            oldest = min(idle, key=lambda conn: conn.last_used)
+            del self._connections[oldest.key]
+            self._drop_key_lock(oldest.key)
+            self.stats['expired'] += 1
+            oldest.close()
+
+    def _drop_key_lock(self, key: PoolKey):
+        """Forget a key's setup lock once nothing uses it (lock held)."""
+        key_lock = self._key_locks.get(key)
+        if key_lock is not None and not key_lock.users and key not in self._connections:
+            del self._key_locks[key]
+
+    def _remove(self, conn: _PooledConnection, reason: str):
+        with self._lock:
+            if self._connections.get(conn.key) is conn:
+                del self._connections[conn.key]
+                self._drop_key_lock(conn.key)
+                self.stats[reason] += 1
+        conn.close()
+
+    def _retire(self, conn: _PooledConnection, reason: str = None):
+        """Give up one lease on conn and mark it dead; close it once no lease is left."""
+        with self._lock:
+            if self._connections.get(conn.key) is conn:
+                del self._connections[conn.key]
+                self._drop_key_lock(conn.key)
+                if reason:
+                    self.stats[reason] += 1
+            conn.dead = True
+            conn.leases = max(0, conn.leases - 1)
+            if conn.leases:
+                self._retired[id(conn.client)] = conn
+                return
+            self._retired.pop(id(conn.client), None)
+        conn.close()
+
+    @staticmethod
+    def _transport_active(conn: _PooledConnection) -> bool:
+        return SSHConnectionPool._transport_active_client(conn.client)
+
+    @staticmethod
+    def _transport_active_client(client: paramiko.SSHClient) -> bool:
+        transport = client.get_transport()
+        return transport is not None and transport.is_active()
+
+
+_shared_pool: Optional[SSHConnectionPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_ssh_pool() -> SSHConnectionPool:
+    """Get the process-wide SSH connection pool."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = SSHConnectionPool()
+        return _shared_pool
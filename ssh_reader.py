@@ -0,0 +1,260 @@
+"""
+SSH Channel Reader - Event-driven reading of interactive SSH shell output
+Blocks on the channel (select on channel.fileno()) instead of polling recv_ready(),
+and keeps output in a bounded buffer that wakes up threads waiting for a prompt.
+"""
+
+import codecs
+import re
+import select
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional, Pattern, Tuple, Union
+
+
+class OutputBuffer:
+    """
+    Bounded text buffer for shell output.
+
+    Text is stored as a deque of chunks, so appending never copies the existing
+    output and the oldest chunks are dropped once `capacity` characters are
+    exceeded. Positions are absolute character offsets since the buffer was
+    created, which lets readers and waiters keep stable marks while old
+    output is trimmed away.
+    """
+
+    # Small chunks are merged so long sessions don't accumulate millions of fragments
+    MERGE_BELOW = 4096
+
+    def __init__(self, capacity: int = 1_000_000):
+        self.capacity = capacity
+        self._chunks = deque()
+        self._start = 0        # Absolute offset of the first retained character
+        self._end = 0          # Absolute offset after the last character
+        self._read_pos = 0     # Cursor for read()
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def position(self) -> int:
+        """Absolute offset of the end of the buffer (use as a mark for since()/wait_for())."""
+        with self._cond:
+            return self._end
+
+    @property
+    def closed(self) -> bool:
+        with self._cond:
+            return self._closed
+
+    def append(self, text: str):
+        """Add output and wake up any waiters."""
+        if not text:
+            return
+        with self._cond:
+            if self._chunks and len(self._chunks[-1]) < self.MERGE_BELOW:
+                self._chunks[-1] += text
+            else:
+                self._chunks.append(text)
+            self._end += len(text)
+
+            # Trim the oldest output beyond capacity
+            while self._end - self._start > self.capacity:
+                excess = self._end - self._start - self.capacity
+                first = self._chunks[0]
+                if len(first) <= excess:
+                    self._chunks.popleft()
+                    self._start += len(first)
+                else:
+                    self._chunks[0] = first[excess:]
+                    self._start += excess
+
+            self._cond.notify_all()
+
+    def close(self):
+        """Mark the stream as finished (EOF) and wake up waiters."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        """Accept output again after close() (keeps the existing content)."""
+        with self._cond:
+            self._closed = False
+
+    def clear(self):
+        """Drop all buffered output and reset the read cursor."""
+        with self._cond:
+            self._chunks.clear()
+            self._start = self._end
+            self._read_pos = self._end
+            self._closed = False
+
+    def _text_from(self, pos: int) -> str:
+        """Text from absolute offset pos to the end (lock held)."""
+        pos = max(pos, self._start)
+        needed = self._end - pos
+        if needed <= 0:
+            return ''
+        parts = []
+        collected = 0
+        for chunk in reversed(self._chunks):
+            parts.append(chunk)
+            collected += len(chunk)
+            if collected >= needed:
+                break
+        text = ''.join(reversed(parts))
+        return text[len(text) - needed:]
+
+    def read(self) -> str:
+        """Return output not yet returned by read() and advance the cursor."""
+        with self._cond:
+            text = self._text_from(self._read_pos)
+            self._read_pos = self._end
+            return text
+
+    def peek(self, last_chars: int = 500) -> str:
+        """Return the last characters of unread output without consuming it."""
+        with self._cond:
+            return self._text_from(max(self._read_pos, self._end - last_chars))
+
+    def tail(self, last_chars: int = 1000) -> str:
+        """Return the last characters of output regardless of the read cursor."""
+        with self._cond:
+            return self._text_from(self._end - last_chars)
+
+    def since(self, position: int) -> str:
+        """Return output appended after an absolute position mark."""
+        with self._cond:
+            return self._text_from(position)
+
+    def wait_for(self, patterns: List[Union[str, Pattern]], timeout: float,
+                 start: int = None) -> Optional[Tuple[int, 're.Match']]:
+        """
+        Block until one of the patterns appears in output after `start`.
+
+        Args:
+            patterns: Regex strings or compiled patterns
+            timeout: Seconds to wait
+            start: Absolute position to search from (defaults to the current end)
+
+        Returns:
+            tuple: (index of matching pattern, match object) or None on timeout/EOF
+        """
+        compiled = [re.compile(p) if isinstance(p, str) else p for p in patterns]
+        with self._cond:
+            if start is None:
+                start = self._end
+            scan_from = start
+            deadline = None
+            while True:
+                text = self._text_from(scan_from)
+                for index, pattern in enumerate(compiled):
+                    match = pattern.search(text)
+                    if match:
+                        return index, match
+                if self._closed:
+                    return None
+
+                # Only rescan the tail next time (prompts are short)
+                scan_from = max(start, self._end - self.MERGE_BELOW)
+
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + timeout
+                remaining = deadline - now
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+
+class ChannelReader:
+    """
+    Background reader for an interactive paramiko channel.
+
+    The thread sleeps in select() on the channel until data arrives, drains
+    everything that is ready in large chunks, decodes it incrementally (so
+    multi-byte characters split across packets survive) and appends it to an
+    OutputBuffer. An idle terminal therefore costs no CPU.
+    """
+
+    def __init__(self, channel, buffer: OutputBuffer = None,
+                 on_data: Callable[[str], None] = None,
+                 on_close: Callable[[Optional[Exception]], None] = None,
+                 transform: Callable[[str], str] = None,
+                 chunk_size: int = 32768, stop_check_interval: float = 1.0):
+        """
+        Initialize the reader.
+
+        Args:
+            channel: paramiko Channel (from invoke_shell)
+            buffer: OutputBuffer to append to (a new one is created if omitted)
+            on_data: Called with each decoded chunk (e.g. to forward to a UI)
+            on_close: Called once when the channel closes or reading fails
+            transform: Applied to each decoded chunk before buffering (e.g. ANSI stripping)
+            chunk_size: Maximum bytes per recv()
+            stop_check_interval: How often an idle reader checks for stop()
+        """
+        self.channel = channel
+        self.buffer = buffer if buffer is not None else OutputBuffer()
+        self.on_data = on_data
+        self.on_close = on_close
+        self.transform = transform
+        self.chunk_size = chunk_size
+        self.stop_check_interval = stop_check_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'ChannelReader':
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop reading (returns immediately; the thread exits within stop_check_interval)."""
+        self._stop.set()
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        error = None
+        try:
+            while not self._stop.is_set():
+                if not self.channel.recv_ready():
+                    if self.channel.closed or self.channel.eof_received:
+                        break
+                    readable, _, _ = select.select([self.channel], [], [], self.stop_check_interval)
+                    if not readable:
+                        continue
+                    if not self.channel.recv_ready():
+                        # Woken by EOF/close rather than data
+                        if self.channel.closed or self.channel.eof_received:
+                            break
+                        continue
+
+                data = self.channel.recv(self.chunk_size)
+                if not data:
+                    break
+
+                text = decoder.decode(data)
+                if self.transform:
+                    text = self.transform(text)
+                if text:
+                    self.buffer.append(text)
+                    if self.on_data:
+                        self.on_data(text)
+        except Exception as e:
+            error = e
+        finally:
+            # A reader stopped on purpose leaves the buffer open, since the
+            # buffer may be handed to a new reader after a reconnect
+            if not self._stop.is_set():
+                tail = decoder.decode(b'', final=True)
+                if tail:
+                    self.buffer.append(tail)
+                self.buffer.close()
+                if self.on_close:
+                    self.on_close(error)
@@ -2,9 +2,11 @@
 Flask-SocketIO server for xterm.js SSH terminal.
 Handles WebSocket connections and bridges to SSH via Paramiko.
 """
+import re
 import threading
-import time
 import paramiko
+from ssh_helper import SSHConnection
+from ssh_reader import ChannelReader
 from flask import Flask, render_template, request
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
@@ -17,6 +19,10 @@ socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
 # Store active SSH sessions
 active_sessions = {}
 
+# Prompts that end the output of a command
+SERVICE_MODE_PROMPT = SSHConnection.SERVICE_MODE_PROMPT
+SHELL_PROMPT = SSHConnection.SHELL_PROMPT
+
 
 class SSHSession:
     """Manages an SSH connection and shell channel."""
@@ -30,7 +36,7 @@ class SSHSession:
         self.ssh_client = None
         self.shell_channel = None
         self.connected = False
-        self.output_thread = None
+        self.reader = None
         
     def connect(self):
         """Establish SSH connection."""
@@ -54,13 +60,13 @@ class SSHSession:
                 width=120,
                 height=40
             )
-            self.shell_channel.settimeout(0.1)
             
             self.connected = True
             
-            # Start output reading thread
-            self.output_thread = threading.Thread(target=self._read_output, daemon=True)
-            self.output_thread.start()
+            # Forward output to the browser as it arrives; the reader also keeps
+            # it in a buffer so the service mode check sees the same stream
+            self.reader = ChannelReader(self.shell_channel, on_data=self._emit_output,
+                                        on_close=self._on_channel_closed).start()
             
             # Check for service mode and auto-run status
             threading.Thread(target=self._check_service_mode, daemon=True).start()
@@ -71,55 +77,37 @@ class SSHSession:
             socketio.emit('ssh_error', {'error': str(e)}, room=self.session_id)
             return False
     
-    def _read_output(self):
-        """Continuously read SSH output and send to client."""
-        while self.connected and self.shell_channel:
-            try:
-                if self.shell_channel.recv_ready():
-                    data = self.shell_channel.recv(8192).decode('utf-8', errors='replace')
-                    socketio.emit('ssh_output', {'data': data}, room=self.session_id)
-                else:
-                    time.sleep(0.05)
-            except Exception as e:
-                if self.connected:
-                    socketio.emit('ssh_error', {'error': f'Read error: {str(e)}'}, room=self.session_id)
-                break
+    def _emit_output(self, data):
+        """Send SSH output to the client."""
+        socketio.emit('ssh_output', {'data': data}, room=self.session_id)
+    
+    def _on_channel_closed(self, error):
+        """Report read errors (a clean EOF needs no message)."""
+        if error is not None and self.connected:
+            socketio.emit('ssh_error', {'error': f'Read error: {str(error)}'}, room=self.session_id)
     
     def _check_service_mode(self):
         """Check if we're in service mode and auto-run status command."""
-        time.sleep(4)  # Wait for initial output
+        if not self.reader:
+            return
+        buffer = self.reader.buffer
         
-        # Collect initial output to check for service mode
-        collected = ""
-        for _ in range(5):
-            if self.shell_channel.recv_ready():
-                try:
-                    chunk = self.shell_channel.recv(4096).decode('utf-8', errors='replace')
-                    collected += chunk
-                except:
-                    pass
-            time.sleep(0.5)
+        # Wait for the first prompt of this shell
+        found = buffer.wait_for([SERVICE_MODE_PROMPT, SHELL_PROMPT], timeout=10, start=0)
+        collected = buffer.tail(5000)
         
         # Check for service mode prompt (case-insensitive)
-        if 'servicemode>' in collected.lower() or 'service mode' in collected.lower():
-            # Send status command
+        if (found and found[0] == 0) or 'service mode' in collected.lower():
+            # Send status command and wait for the prompt to come back
+            mark = buffer.position
             self.send_input('status\n')
-            time.sleep(3)
+            buffer.wait_for([SERVICE_MODE_PROMPT], timeout=10, start=mark)
             
             # Collect status output
-            status_output = ""
-            for _ in range(10):
-                if self.shell_channel.recv_ready():
-                    try:
-                        chunk = self.shell_channel.recv(4096).decode('utf-8', errors='replace')
-                        status_output += chunk
-                    except:
-                        pass
-                time.sleep(0.3)
+            status_output = buffer.since(mark)
             
             # Parse Java Version
             if status_output:
-                import re
                 java_match = re.search(r'Java Version[:\s]+([^\n\r]+)', status_output, re.IGNORECASE)
                 if java_match:
                     java_version = java_match.group(1).strip()
@@ -144,6 +132,8 @@ class SSHSession:
     def disconnect(self):
         """Close SSH connection."""
         self.connected = False
+        if self.reader:
+            self.reader.stop()
         
         if self.shell_channel:
             try:
@@ -0,0 +1,177 @@
+"""
+Status Collector - Fetches /service/status.xml from APs over HTTP without a browser
+Requests run concurrently with Basic auth (the same web UI credentials the browser
+sends through CDP) over one keep-alive session per AP, and the parsed records are
+written to access_points in a single transaction.
+
+Over plain HTTP the AP returns status.xml untransformed, not the table Chrome
+renders through its XSL, so responses go through ap_status.parse_status_document.
+APs whose page yields no AP ID are reported as failed; BrowserManager reads
+those in their browser tab instead.
+"""
+
+import concurrent.futures
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from ap_status import APStatusRecord, parse_status_document
+
+
+class StatusCollector:
+    """Concurrent status.xml fetcher with per-AP connection reuse."""
+
+    STATUS_PATH = '/service/status.xml'
+
+    def __init__(self, db_manager=None, max_workers: int = 16, timeout: float = 10.0,
+                 verify_ssl: bool = False):
+        """
+        Initialize the collector.
+
+        Args:
+            db_manager: DatabaseManager used by update_database()
+            max_workers: Number of APs fetched in parallel
+            timeout: Connect/read timeout per request in seconds
+            verify_ssl: Verify AP certificates (APs use self-signed certificates,
+                        like the browser's --ignore-certificate-errors)
+        """
+        self.db = db_manager
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+
+        if not verify_ssl:
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    @staticmethod
+    def base_url(ip_address: str) -> str:
+        """Build the AP base URL the same way BrowserManager does (https unless http:// given)."""
+        ip_address = (ip_address or '').strip()
+        if ip_address.startswith('http://'):
+            protocol, ip_address = 'http', ip_address[7:]
+        elif ip_address.startswith('https://'):
+            protocol, ip_address = 'https', ip_address[8:]
+        else:
+            protocol = 'https'
+        if '@' in ip_address:
+            ip_address = ip_address.split('@')[1]
+        return f"{protocol}://{ip_address.rstrip('/')}"
+
+    def _get_session(self, base_url: str, username: str, password: str) -> requests.Session:
+        """Keep-alive session per AP so repeated refreshes reuse the TLS connection."""
+        with self._sessions_lock:
+            session = self._sessions.get(base_url)
+            if session is None:
+                session = requests.Session()
+                session.verify = self.verify_ssl
+                session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+                session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+                self._sessions[base_url] = session
+            session.auth = (username, password)
+            return session
+
+    def fetch(self, ap: Dict) -> Tuple[bool, object]:
+        """
+        Fetch and parse one AP's status page.
+
+        Args:
+            ap: access_points row (ip_address, username_webui, password_webui)
+
+        Returns:
+            tuple: (True, APStatusRecord) or (False, error message)
+        """
+        if not ap.get('ip_address'):
+            return False, "No IP address"
+
+        base_url = self.base_url(ap['ip_address'])
+        session = self._get_session(base_url, ap.get('username_webui', '') or '',
+                                    ap.get('password_webui', '') or '')
+        try:
+            response = session.get(base_url + self.STATUS_PATH, timeout=self.timeout)
+        except requests.exceptions.Timeout:
+            return False, "Timeout"
+        except requests.exceptions.ConnectionError as e:
+            return False, f"Connection failed: {str(e)[:80]}"
+        except requests.exceptions.RequestException as e:
+            return False, f"Request failed: {str(e)[:80]}"
+
+        if response.status_code == 401:
+            return False, "Authentication failed"
+        if response.status_code != 200:
+            return False, f"HTTP {response.status_code}"
+
+        record = parse_status_document(response.text)
+        if not record.ap_id:
+            return False, "Could not find AP ID in status page"
+        if not record.ip_address:
+            record.ip_address = base_url.split('://', 1)[1]
+        return True, record
+
+    def collect(self, aps: List[Dict],
+                on_result: Callable[[str, bool, object], None] = None) -> Dict[str, Tuple[bool, object]]:
+        """
+        Fetch status pages for many APs concurrently.
+
+        Args:
+            aps: access_points rows
+            on_result: Optional callback(ap_id, success, record_or_error) as each AP finishes
+
+        Returns:
+            dict: requested ap_id -> (success, APStatusRecord or error message)
+        """
+        results = {}
+        if not aps:
+            return results
+
+        workers = max(1, min(self.max_workers, len(aps)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.fetch, ap): ap.get('ap_id') for ap in aps}
+            for future in concurrent.futures.as_completed(futures):
+                ap_id = futures[future]
+                try:
+                    success, result = future.result()
+                except Exception as e:
+                    success, result = False, str(e)
+                results[ap_id] = (success, result)
+                if on_result:
+                    on_result(ap_id, success, result)
+        return results
+
+    def update_database(self, records: List[APStatusRecord]) -> int:
+        """
+        Write collected records to access_points in one transaction.
+
+        Returns:
+            int: Number of AP rows that changed
+        """
+        if not self.db or not records:
+            return 0
+        return self.db.bulk_update_ap_status([record.to_dict() for record in records])
+
+    def close(self):
+        """Close all pooled sessions."""
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_shared_collector: Optional[StatusCollector] = None
+_shared_collector_lock = threading.Lock()
+
+
+def get_status_collector(db_manager=None) -> StatusCollector:
+    """Get the process-wide collector (keeps AP sessions alive between refreshes)."""
+    global _shared_collector
+    with _shared_collector_lock:
+        if _shared_collector is None:
+            _shared_collector = StatusCollector(db_manager)
+        elif db_manager is not None and _shared_collector.db is None:
+            _shared_collector.db = db_manager
+        return _shared_collector
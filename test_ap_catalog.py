@@ -0,0 +1,108 @@
+"""
+Test script for the in-memory AP catalog (ap_catalog.py).
+Writes go through DatabaseManager on a temporary database file.
+"""
+
+import sys
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ap_catalog import APCatalog
+from database_manager import DatabaseManager
+
+
+@contextmanager
+def temp_catalog():
+    """A DatabaseManager on a fresh file plus an APCatalog over it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'test.db'))
+        catalog = APCatalog(db)
+        try:
+            yield db, catalog
+        finally:
+            catalog.close()
+            db.close()
+
+
+def add_ap(db, ap_id, store_id='lab5', ip_address=''):
+    success, message = db.add_access_point({'ap_id': ap_id, 'store_id': store_id, 'ip_address': ip_address,
+                                            'password_webui': 'pw', 'password_ssh': 'pw'})
+    assert success, message
+
+
+def store_ap_ids(catalog, store_id):
+    return [ap['ap_id'] for ap in catalog.find_by_store(store_id)]
+
+
+def test_incremental_refresh_from_change_log():
+    """Inserts and updates after the first load refresh only the changed rows."""
+    with temp_catalog() as (db, catalog):
+        add_ap(db, '201265', ip_address='10.1.2.3')
+        add_ap(db, '201266')
+        assert catalog.count() == 2 and catalog.stats['full_loads'] == 1
+
+        add_ap(db, '201267', store_id='Lab6', ip_address='10.1.2.7')
+        assert catalog.get('201267')['store_id'] == 'Lab6'
+        assert store_ap_ids(catalog, 'lab6') == ['201267']
+        assert catalog.find_by_ip('10.1.2.7')['ap_id'] == '201267'
+
+        assert db.update_access_point('201265', {'store_id': 'lab6', 'ip_address': '10.9.9.9'})[0]
+        assert store_ap_ids(catalog, 'lab5') == ['201266']
+        assert store_ap_ids(catalog, 'LAB6') == ['201265', '201267']
+        assert catalog.find_by_ip('10.1.2.3') is None
+        assert catalog.find_by_ip('10.9.9.9')['ap_id'] == '201265'
+
+        assert catalog.stats['full_loads'] == 1 and catalog.stats['rows_refreshed'] == 2
+        assert not catalog.sync()  # Nothing committed since
+
+
+def test_delete_removes_ap_from_every_index():
+    with temp_catalog() as (db, catalog):
+        add_ap(db, '201265', ip_address='10.1.2.3')
+        add_ap(db, '201266')
+        assert catalog.get('201265') is not None
+
+        assert db.delete_access_point('201265')[0]
+        assert catalog.get('201265') is None
+        assert catalog.find_by_ip('10.1.2.3') is None
+        assert store_ap_ids(catalog, 'lab5') == ['201266']
+        assert [ap['ap_id'] for ap in catalog.all()] == ['201266']
+
+
+def test_trimmed_change_log_forces_full_reload():
+    """If entries the catalog hasn't seen were trimmed, it reloads the whole table."""
+    with temp_catalog() as (db, catalog):
+        add_ap(db, '201265')
+        assert catalog.count() == 1
+
+        add_ap(db, '201266')
+        assert db.update_access_point('201265', {'store_id': 'lab6'})[0]
+        with db._get_connection() as conn:
+            # Drop the entries for both changes, as the trim trigger would
+            last_seq = conn.execute('SELECT MAX(seq) FROM ap_change_log').fetchone()[0]
+            conn.execute('DELETE FROM ap_change_log WHERE seq < ?', (last_seq,))
+            conn.commit()
+        add_ap(db, '201267')
+
+        assert catalog.sync()
+        assert catalog.stats['full_loads'] == 2
+        assert store_ap_ids(catalog, 'lab5') == ['201266', '201267']
+        assert store_ap_ids(catalog, 'lab6') == ['201265']
+
+
+def test_lookups_return_copies():
+    with temp_catalog() as (db, catalog):
+        add_ap(db, '201265')
+        ap = catalog.get('201265')
+        ap['store_id'] = 'changed'
+        assert catalog.get('201265')['store_id'] == 'lab5'
+        assert catalog.get('201265')['password_ssh'] == 'pw'
+
+
+if __name__ == '__main__':
+    from script_tests import run_tests
+    run_tests(globals(), "AP catalog")
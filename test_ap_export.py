@@ -0,0 +1,80 @@
+"""
+Test script for the streaming table exporter (ap_export.py).
+Writes CSV files to a temporary directory - no database or openpyxl needed.
+"""
+
+import csv
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ap_export import CREDENTIAL_COLUMNS, export_access_points, write_table
+
+
+class RecordingDatabase:
+    """Stands in for DatabaseManager.iter_access_points and records the requested columns."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.columns = None
+
+    def iter_access_points(self, columns, chunk_size=500):
+        self.columns = columns
+        for row in self.rows:
+            yield tuple(row.get(column) for column in columns)
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.reader(f))
+
+
+def test_write_table_csv_streams_generator():
+    consumed = []
+
+    def rows():
+        for i in range(1000):
+            consumed.append(i)
+            yield [f"store{i}", i, "línea"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'out.csv')
+        assert write_table(path, ["Store", "N", "Text"], rows()) == 1000
+        content = read_csv(path)
+    assert len(consumed) == 1000
+    assert content[0] == ["Store", "N", "Text"]
+    assert content[-1] == ["store999", "999", "línea"]
+
+
+def test_export_without_passwords_skips_secret_columns():
+    db = RecordingDatabase([
+        {'store_id': 's1', 'ap_id': '1', 'password_webui': 'secret', 'notes': None},
+    ])
+    columns = [(h, c) for h, c in CREDENTIAL_COLUMNS if not c.startswith(('password', 'su_'))]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'creds.csv')
+        assert export_access_points(db, path, columns) == 1
+        content = read_csv(path)
+    assert 'password_webui' not in db.columns and 'su_password' not in db.columns
+    assert content[0] == [h for h, _ in columns]
+    assert 'secret' not in content[1]
+    # NULL columns are exported as empty cells
+    assert content[1][[h for h, _ in columns].index('Notes')] == ''
+
+
+def test_export_default_columns():
+    db = RecordingDatabase([{'ap_id': '201265', 'password_ssh': 'pw'}])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'creds.csv')
+        export_access_points(db, path)
+        content = read_csv(path)
+    assert db.columns == [c for _, c in CREDENTIAL_COLUMNS]
+    assert content[1][db.columns.index('password_ssh')] == 'pw'
+
+
+if __name__ == '__main__':
+    from script_tests import run_tests
+    run_tests(globals(), "export")
@@ -0,0 +1,167 @@
+"""
+Test script for the status.xml parser (ap_status.py).
+Uses inline sample pages and a temporary database - no AP or network access needed.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ap_status import (APStatusRecord, parse_status_document, parse_status_page,
+                       parse_status_values, parse_status_xml)
+
+
+RENDERED_PAGE = """
+<html><body><div id="content"><h1>Status</h1>
+<table>
+<tr><th>AP ID:</th><td>201265</td></tr>
+<tr><th>Transmitter:</th><td>AP-2</td></tr>
+<tr><th>Store ID:</th><td>elkjop_se_lab.lab5</td></tr>
+<tr><th>IP Address:</th><td>10.1.2.3</td></tr>
+<tr><th>Serial Number:</th><td> SN123 </td></tr>
+<tr><th>Software Version:</th><td>4.2.1</td></tr>
+<tr><th>Firmware Version:</th><td>1.9</td></tr>
+<tr><th>Status:</th><td class="ok">Running</td></tr>
+<tr><th>MAC Address:</th><td>00:11:22:33:44:55</td></tr>
+</table>
+<h2>Communication Daemon</h2>
+<table><tr><th>Status:</th><td>Connected</td></tr></table>
+<h2>Connectivity</h2>
+<table>
+<tr><th>Internet:</th><td>OK</td></tr>
+<tr><th>NTP Server:</th><td>FAIL</td></tr>
+</table>
+</div></body></html>
+"""
+
+def test_rendered_page():
+    record = parse_status_page(RENDERED_PAGE)
+    assert record.ap_id == '201265'
+    assert record.type == 'AP-2'
+    assert record.store_id == 'elkjop_se_lab.lab5'
+    assert record.serial_number == 'SN123'
+    assert record.connectivity_internet == 'OK'
+    assert record.connectivity_ntp_server == 'FAIL'
+    assert record.build is None
+
+
+def test_duplicate_status_labels():
+    """The first Status row is the service, the second the communication daemon."""
+    record = parse_status_page(RENDERED_PAGE)
+    assert record.service_status == 'Running'
+    assert record.communication_daemon_status == 'Connected'
+    assert parse_status_values(RENDERED_PAGE)['status'] == ['Running', 'Connected']
+
+
+def test_changes_from_existing_row():
+    record = parse_status_page(RENDERED_PAGE)
+    existing = {'ap_id': '201265', 'serial_number': 'SN123', 'software_version': '4.2.0'}
+    changes = record.changes_from(existing)
+    assert 'serial_number' not in changes
+    assert changes['software_version'] == '4.2.1'
+    assert 'ap_id' not in changes and 'build' not in changes
+
+
+def test_bulk_update_counts_access_points_rows():
+    """Rows written by the FTS and change-log triggers aren't counted."""
+    from database_manager import DatabaseManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'test.db'))
+        try:
+            db.bulk_upsert_access_points([
+                {'ap_id': ap_id, 'store_id': 'lab5', 'password_webui': 'pw', 'password_ssh': 'pw'}
+                for ap_id in ('201265', '201266', '201267')])
+            records = [{'ap_id': '201265', 'serial_number': 'SN1'},
+                       {'ap_id': '201266', 'serial_number': 'SN2'}]
+            assert db.bulk_update_ap_status(records) == 2
+            # Unchanged values and unknown APs aren't updated
+            assert db.bulk_update_ap_status(records + [{'ap_id': '999999', 'serial_number': 'SN9'}]) == 0
+        finally:
+            db.close()
+
+
+def test_bulk_update_skips_invalid_store_and_ip():
+    """Store IDs and IP addresses from a status page are validated like manual edits."""
+    from database_manager import DatabaseManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'test.db'))
+        try:
+            db.bulk_upsert_access_points([{'ap_id': '201265', 'store_id': 'lab5', 'ip_address': '10.1.2.3',
+                                           'password_webui': 'pw', 'password_ssh': 'pw'}])
+            assert db.bulk_update_ap_status([{'ap_id': '201265', 'store_id': "lab5'; DROP TABLE x",
+                                              'ip_address': '10.1.2.999', 'serial_number': 'SN1'}]) == 1
+            row = db.get_access_point('201265')
+            assert row['store_id'] == 'lab5' and row['ip_address'] == '10.1.2.3'
+            assert row['serial_number'] == 'SN1'
+
+            assert db.bulk_update_ap_status([{'ap_id': '201265', 'store_id': ' lab6 ',
+                                              'ip_address': '10.1.2.4'}]) == 1
+            row = db.get_access_point('201265')
+            assert row['store_id'] == 'lab6' and row['ip_address'] == '10.1.2.4'
+        finally:
+            db.close()
+
+
+def test_raw_status_xml_matches_rendered_page():
+    """
+    The raw document HTTP returns parses to the same record as the rendered table.
+
+    raw_status.xml mirrors the sections and values of status_page.html.
+    """
+    from benchmark_status_parser import FIXTURE_DIR
+
+    with open(os.path.join(FIXTURE_DIR, 'raw_status.xml'), encoding='utf-8') as f:
+        raw = f.read()
+    with open(os.path.join(FIXTURE_DIR, 'status_page.html'), encoding='utf-8') as f:
+        rendered = f.read()
+
+    record = parse_status_xml(raw)
+    assert record.ap_id == '201265'
+    assert record.service_status == 'Running'
+    assert record.communication_daemon_status == 'Connected'
+    assert record.connectivity_apc_address == 'FAIL'
+    assert record == parse_status_page(rendered)
+    assert parse_status_document(raw) == record
+    assert parse_status_document(rendered) == record
+
+
+def test_raw_status_xml_section_names_win():
+    """<service>/<communicationDaemon> status elements are mapped by section, not order."""
+    raw = """<?xml version="1.0"?>
+<status>
+  <communicationDaemon><status>Disconnected</status></communicationDaemon>
+  <service><status>Running</status></service>
+  <ap_id>201266</ap_id>
+</status>"""
+    record = parse_status_xml(raw)
+    assert record.ap_id == '201266'
+    assert record.service_status == 'Running'
+    assert record.communication_daemon_status == 'Disconnected'
+
+
+def test_unparseable_page():
+    assert parse_status_page("<html><body>Login required</html>") == APStatusRecord()
+    assert parse_status_document("<html><body>Login required</html>") == APStatusRecord()
+    assert parse_status_xml("not xml <") == APStatusRecord()
+
+
+def test_saved_fixtures_match_legacy_extraction():
+    """The single-pass parser returns the same fields as the old per-field regexes."""
+    from benchmark_status_parser import legacy_parse, load_fixtures
+
+    fixtures = load_fixtures()
+    assert fixtures
+    for name, page in fixtures.items():
+        record = parse_status_page(page)
+        assert record == legacy_parse(page), name
+        assert record.ap_id and record.communication_daemon_status, name
+
+
+if __name__ == '__main__':
+    from script_tests import run_tests
+    run_tests(globals(), "status page parser")
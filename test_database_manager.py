@@ -0,0 +1,519 @@
+"""
+Test script for DatabaseManager (database_manager.py).
+Uses temporary database files - the application database is not touched.
+"""
+
+import json
+import sqlite3
+import sys
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database_manager import DatabaseManager
+
+
+@contextmanager
+def temp_database():
+    """A DatabaseManager on a fresh file in a temporary directory."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'test.db'))
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+def add_aps(db, *ap_ids, store_id='lab5'):
+    result = db.bulk_upsert_access_points([
+        {'ap_id': ap_id, 'store_id': store_id, 'password_webui': 'pw', 'password_ssh': 'pw'}
+        for ap_id in ap_ids])
+    assert not result['errors'], result['errors']
+
+
+
+# ==================== Schema migrations ====================
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_fixtures')
+
+
+def test_baseline_database_migrates_to_current_version():
+    """A database created before versioning (user_version 0) gets every migration."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'baseline.db')
+        conn = sqlite3.connect(path)
+        with open(os.path.join(FIXTURE_DIR, 'baseline_schema.sql'), encoding='utf-8') as f:
+            conn.executescript(f.read())
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == 0
+        conn.close()
+
+        db = DatabaseManager(path)
+        try:
+            with db._get_connection() as conn:
+                assert conn.execute('PRAGMA user_version').fetchone()[0] == db.SCHEMA_VERSION == 6
+                names = {row[0] for row in conn.execute('SELECT name FROM sqlite_master')}
+                assert {'access_points_fts', 'ap_change_log', 'jira_tracked_aps',
+                        'idx_tickets_ap_status', 'idx_jira_ap_links_ap_status'} <= names
+                link_columns = {row[1] for row in conn.execute('PRAGMA table_info(jira_ap_links)')}
+                assert 'description' in link_columns
+                assert [row[0] for row in conn.execute('SELECT ap_id FROM jira_tracked_aps')] == ['201265']
+                assert conn.execute('SELECT last_viewed FROM jira_tracked_aps').fetchone()[0] is not None
+            # Existing rows are kept and indexed
+            assert db.get_access_point('201265')['store_id'] == 'elkjop_se_lab.lab5'
+            assert [ap['ap_id'] for ap in db.search_access_points('lab5')] == ['201265']
+            assert len(db.get_history('201265')) == 1
+        finally:
+            db.close()
+
+
+class NoMigrationDatabase(DatabaseManager):
+    def _migrate(self, conn):
+        raise AssertionError("schema is current; nothing should migrate")
+
+
+def test_current_database_opens_without_ddl():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'test.db')
+        DatabaseManager(path).close()
+        conn = sqlite3.connect(path)
+        schema_version = conn.execute('PRAGMA schema_version').fetchone()[0]
+        conn.close()
+
+        db = NoMigrationDatabase(path)
+        db.close()
+        conn = sqlite3.connect(path)
+        try:
+            assert conn.execute('PRAGMA schema_version').fetchone()[0] == schema_version
+        finally:
+            conn.close()
+
+# ==================== Write-behind queue ====================
+
+def test_write_queue_coalesces_status_updates():
+    """Repeated status updates for one AP collapse to the latest; ping_time carries over."""
+    with temp_database() as db:
+        add_aps(db, '201265', '201266')
+        db.start_write_behind(flush_interval_ms=1000)
+        db.queue_ap_status('201265', 'online', 12.5)
+        db.queue_ap_status('201265', 'offline')
+        db.queue_ap_status('201266', 'online', 3.0)
+        db.queue_history_event('201265', 'ping', 'Batch ping', success=False)
+        assert db.flush_writes(timeout=5)
+
+        row = db.get_access_point('201265')
+        assert row['status'] == 'offline' and row['last_ping_time'] == 12.5
+        assert db.get_access_point('201266')['status'] == 'online'
+        assert len(db.get_history('201265')) == 1
+
+        stats = db.get_write_queue_stats()
+        assert stats['queued'] == 4 and stats['written'] == 4
+        assert stats['commits'] == 1 and stats['dropped'] == 0
+        assert stats['queue_depth'] == 0
+
+
+def test_write_queue_close_commits_pending_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'test.db')
+        db = DatabaseManager(path)
+        add_aps(db, '201265')
+        db.start_write_behind(flush_interval_ms=60000)
+        db.queue_ap_status('201265', 'online', 1.0)
+        db.close()
+
+        db = DatabaseManager(path)
+        try:
+            assert db.get_access_point('201265')['status'] == 'online'
+            assert db.flush_writes()  # No writer running
+        finally:
+            db.close()
+
+
+def test_write_queue_retries_locked_database():
+    """'database is locked' is retried with backoff and the batch still lands."""
+    with temp_database() as db:
+        add_aps(db, '201265')
+        writer = db.start_write_behind(flush_interval_ms=10)
+        writer.LOCK_BACKOFF = 0.001
+        write = writer._write
+        failures = []
+
+        def locked_twice(*args):
+            if len(failures) < 2:
+                failures.append(1)
+                raise sqlite3.OperationalError('database is locked')
+            return write(*args)
+
+        writer._write = locked_twice
+        db.queue_ap_status('201265', 'online')
+        assert db.flush_writes(timeout=5)
+        assert db.get_access_point('201265')['status'] == 'online'
+        stats = db.get_write_queue_stats()
+        assert stats['retries'] == 2 and stats['errors'] == 0 and stats['written'] == 1
+
+
+def test_write_queue_reports_dropped_batch():
+    """A batch that keeps failing is counted as dropped and flush() returns False."""
+    with temp_database() as db:
+        add_aps(db, '201265')
+        writer = db.start_write_behind(flush_interval_ms=10)
+        writer.LOCK_BACKOFF = 0.001
+
+        def always_locked(*args):
+            raise sqlite3.OperationalError('database is locked')
+
+        writer._write = always_locked
+        db.queue_ap_status('201265', 'online')
+        db.queue_history_event('201265', 'ping', 'Batch ping')
+        assert not db.flush_writes(timeout=5)
+        stats = db.get_write_queue_stats()
+        assert stats['dropped'] == 2 and stats['errors'] == 1
+        assert stats['retries'] == writer.LOCK_RETRIES - 1
+        assert 'locked' in stats['last_error']
+
+        # Later flushes only report their own losses
+        del writer._write
+        db.queue_ap_status('201265', 'online')
+        assert db.flush_writes(timeout=5)
+
+
+
+
+
+# ==================== Lazy secret decryption ====================
+
+def count_decryptions(db):
+    """Wrap db._decrypt_uncached and return the list its calls are recorded in."""
+    calls = []
+    decrypt = db._decrypt_uncached
+
+    def counting(encrypted):
+        calls.append(encrypted)
+        return decrypt(encrypted)
+
+    db._decrypt_uncached = counting
+    return calls
+
+
+def test_secrets_decrypted_only_when_read():
+    with temp_database() as db:
+        db.bulk_upsert_access_points([{'ap_id': f'20126{i}', 'store_id': 'lab5', 'password_webui': f'web{i}',
+                                       'password_ssh': f'ssh{i}', 'su_password': f'su{i}'}
+                                      for i in range(5)])
+        calls = count_decryptions(db)
+
+        rows = db.get_all_access_points()
+        assert [row['ap_id'] for row in rows] == [f'20126{i}' for i in range(5)]
+        assert calls == []
+        assert db.search_access_points('lab5') and calls == []
+
+        row = db.get_access_point('201262')
+        assert row['password_ssh'] == 'ssh2' and len(calls) == 1
+        assert row.get('password_ssh') == 'ssh2' and len(calls) == 1
+        # Plain-dict conversions see plaintext
+        assert dict(row)['password_webui'] == 'web2'
+        assert json.loads(json.dumps(row))['su_password'] == 'su2'
+        assert len(calls) == 3
+
+        # A fresh copy of the row is served from the shared LRU
+        assert db.get_access_point('201262')['password_ssh'] == 'ssh2' and len(calls) == 3
+
+
+def test_updated_secret_is_not_served_from_cache():
+    """The LRU is keyed by ciphertext, so a changed password is decrypted afresh."""
+    with temp_database() as db:
+        add_aps(db, '201265')
+        calls = count_decryptions(db)
+        assert db.get_access_point('201265')['password_ssh'] == 'pw'
+        old_token = calls[-1]
+
+        assert db.update_access_point('201265', {'password_ssh': 'changed'})[0]
+        row = db.get_access_point('201265')
+        assert row['password_ssh'] == 'changed'
+        assert calls[-1] != old_token
+        assert db.get_access_point('201265')['password_ssh'] == 'changed'
+
+
+# ==================== Bulk import ====================
+
+def test_bulk_upsert_inserts_updates_and_skips_invalid_rows():
+    with temp_database() as db:
+        result = db.bulk_upsert_access_points([
+            {'ap_id': ' 201265 ', 'store_id': 'lab5', 'ip_address': '10.1.2.3', 'notes': 'rack 2',
+             'password_webui': 'pw', 'password_ssh': 'pw'},
+            {'ap_id': '201266', 'store_id': 'lab5', 'password_webui': 'pw', 'password_ssh': 'pw'},
+        ])
+        assert (result['inserted'], result['updated'], result['errors']) == (2, 0, [])
+        db.update_ap_status('201265', 'online', 4.0)
+
+        result = db.bulk_upsert_access_points([
+            {'ap_id': '201265', 'store_id': 'lab6', 'password_webui': 'new', 'password_ssh': 'pw'},
+            {'ap_id': '201267', 'store_id': "bad store'", 'password_webui': 'pw'},
+            {'ap_id': '201268', 'store_id': 'lab6', 'ip_address': '10.1.2', 'password_webui': 'pw'},
+            {'ap_id': '201269', 'store_id': 'lab6', 'password_webui': 'first'},
+            {'ap_id': '201269', 'store_id': 'lab6', 'password_webui': 'second'},
+        ])
+        assert result['inserted'] == 1 and result['updated'] == 2
+        assert [(index, ap_id) for index, ap_id, message in result['errors']] == [(1, '201267'), (2, '201268')]
+        assert result['errors'][0][2].startswith('Invalid Store ID')
+
+        # Imported columns are overwritten (blank cells included); status columns are kept
+        row = db.get_access_point('201265')
+        assert row['store_id'] == 'lab6' and row['ip_address'] == '' and row['notes'] == ''
+        assert row['password_webui'] == 'new' and row['status'] == 'online'
+        assert db.get_access_point('201269')['password_webui'] == 'second'
+        assert db.get_access_point('201267') is None and db.get_access_point('201268') is None
+
+
+def test_bulk_upsert_keeps_password_whitespace():
+    """IDs and store fields are trimmed; credentials are stored exactly as given."""
+    with temp_database() as db:
+        db.bulk_upsert_access_points([{'ap_id': '201265 ', 'store_id': ' lab5', 'username_ssh': ' esl ',
+                                       'password_webui': ' web pw ', 'password_ssh': 'ssh\t',
+                                       'su_password': '  '}])
+        row = db.get_access_point('201265')
+        assert row['store_id'] == 'lab5'
+        assert row['password_webui'] == ' web pw ' and row['password_ssh'] == 'ssh\t'
+        assert row['su_password'] == '  ' and row['username_ssh'] == ' esl '
+
+
+def test_bulk_upsert_is_one_transaction():
+    """A database error part-way through saves nothing."""
+    with temp_database() as db:
+        with db._get_connection() as conn:
+            conn.execute("""
+                CREATE TEMP TRIGGER fail_import BEFORE INSERT ON access_points
+                WHEN new.ap_id = '201267' BEGIN SELECT RAISE(ABORT, 'disk full'); END
+            """)
+        result = db.bulk_upsert_access_points([
+            {'ap_id': ap_id, 'store_id': 'lab5', 'password_webui': 'pw'}
+            for ap_id in ('201265', '201266', '201267')])
+        assert result['inserted'] == 0 and result['errors'][-1][0] is None
+        assert 'nothing was saved' in result['errors'][-1][2]
+        assert db.get_all_access_points() == []
+
+# ==================== Search index ====================
+
+def search_ids(db, query, fields=None):
+    return sorted(ap['ap_id'] for ap in db.search_access_points(query, fields))
+
+
+def test_search_index_follows_insert_update_delete():
+    with temp_database() as db:
+        assert db._has_search_index()
+        assert db.add_access_point({'ap_id': '201265', 'store_id': 'elkjop_se_lab.lab5',
+                                    'ip_address': '10.20.30.41', 'password_webui': 'pw',
+                                    'password_ssh': 'pw'})[0]
+        add_aps(db, '198052', store_id='elkjop_no.oslo1')
+        assert db._search_match_expression('lab5', db.AP_SEARCH_COLUMNS) is not None
+
+        assert search_ids(db, 'LAB5') == ['201265']  # substring, case-insensitive
+        assert search_ids(db, '30.41') == ['201265']
+        assert search_ids(db, 'elkjop') == ['198052', '201265']
+
+        assert db.update_access_point('201265', {'ip_address': '10.99.0.7', 'store_id': 'elkjop_se.umea'})[0]
+        assert search_ids(db, '30.41') == [] and search_ids(db, 'lab5') == []
+        assert search_ids(db, '99.0.7') == ['201265'] and search_ids(db, 'umea') == ['201265']
+
+        # Status writes don't touch indexed columns
+        db.update_ap_status('201265', 'online', 5.0)
+        assert search_ids(db, 'umea') == ['201265']
+
+        assert db.delete_access_point('201265')[0]
+        assert search_ids(db, 'umea') == [] and search_ids(db, 'elkjop') == ['198052']
+        with db._get_connection() as conn:
+            conn.execute("INSERT INTO access_points_fts(access_points_fts) VALUES ('integrity-check')")
+
+
+def test_short_terms_fall_back_to_like():
+    """Trigrams need 3 characters; shorter terms and unindexed columns use LIKE."""
+    with temp_database() as db:
+        add_aps(db, '201265', store_id='s5')
+        add_aps(db, '198052', store_id='s6')
+        assert db._search_match_expression('s5', db.AP_SEARCH_COLUMNS) is None
+        assert search_ids(db, 's5') == ['201265']
+        assert search_ids(db, '52', ['ap_id']) == ['198052']
+        assert db._search_match_expression('2012', ['ap_id', 'username_webui']) is None
+        assert search_ids(db, '2012', ['ap_id', 'username_webui']) == ['201265']
+
+
+def test_search_index_at_fleet_size():
+    """At 50k rows a substring search reads the index, not every access_points row."""
+    with temp_database() as db:
+        with db._get_connection() as conn:
+            conn.executemany(
+                'INSERT INTO access_points (ap_id, store_id, ip_address) VALUES (?, ?, ?)',
+                [(f'{200000 + i}', f'elkjop_store.{i // 10:05d}', f'10.{i // 65536}.{i // 256 % 256}.{i % 256}')
+                 for i in range(50000)])
+            conn.commit()
+            match = db._search_match_expression('store.04321', db.AP_SEARCH_COLUMNS)
+            plan = [row[-1] for row in conn.execute(
+                'EXPLAIN QUERY PLAN SELECT rowid FROM access_points_fts '
+                'WHERE access_points_fts MATCH ? ORDER BY rank', [match])]
+            assert any('VIRTUAL TABLE INDEX' in step for step in plan)
+            assert all('access_points_fts' in step or 'ORDER BY' in step for step in plan), plan
+
+        start = time.perf_counter()
+        rowids = db.search_ap_rowids('store.04321')
+        indexed = time.perf_counter() - start
+        assert len(rowids) == 10
+
+        start = time.perf_counter()
+        assert len(db.search_ap_rowids('store.04321', ['ap_id', 'store_id', 'username_webui'])) == 10
+        scanned = time.perf_counter() - start
+        print(f"  50k rows: index {indexed * 1000:.1f} ms, LIKE scan {scanned * 1000:.1f} ms")
+        assert indexed < 0.5
+
+
+# ==================== Retention ====================
+
+def add_old_history(db):
+    """Old events (two days, some failed) followed by recent ones; returns all rows."""
+    events = [('201265', '-200 days', 0), ('201265', '-200 days', 1), ('201265', '-200 days', 0),
+              ('201266', '-200 days', 0), ('201265', '-150 days', 1),
+              ('201265', '-1 days', 0), ('201266', '-0 days', 1)]
+    with db._get_connection() as conn:
+        for ap_id, age, success in events:
+            conn.execute("""
+                INSERT INTO ap_history (ap_id, timestamp, event_type, description, success)
+                VALUES (?, datetime('now', ?), 'ping', 'Batch ping', ?)
+            """, (ap_id, age, success))
+        conn.execute("INSERT INTO user_activity_log (timestamp, username, activity_type) "
+                     "VALUES (datetime('now', '-400 days'), 'admin', 'login')")
+        # An existing rollup for the oldest day gets the failures added
+        conn.execute("INSERT INTO ap_metrics (ap_id, date, ping_count, issues_count) "
+                     "VALUES ('201265', date('now', '-200 days'), 10, 1)")
+        conn.commit()
+        return [tuple(row) for row in conn.execute('SELECT * FROM ap_history ORDER BY id')]
+
+
+def archived_rows(db, table='ap_history'):
+    conn = sqlite3.connect(db.get_archive_file())
+    try:
+        return [tuple(row) for row in conn.execute(f'SELECT * FROM {table} ORDER BY id')]
+    finally:
+        conn.close()
+
+
+def live_rows(db, table='ap_history'):
+    with db._get_connection() as conn:
+        return [tuple(row) for row in conn.execute(f'SELECT * FROM {table} ORDER BY id')]
+
+
+def issues_by_day(db):
+    with db._get_connection() as conn:
+        return {(row[0], row[1]): (row[2], row[3]) for row in conn.execute(
+            'SELECT ap_id, date, ping_count, issues_count FROM ap_metrics')}
+
+
+def test_retention_archives_rows_and_rolls_up_issues():
+    with temp_database() as db:
+        add_aps(db, '201265', '201266')
+        history = add_old_history(db)
+
+        result = db.run_retention(batch_size=2)
+        assert result['archived']['ap_history'] == 5
+        assert result['archived']['user_activity_log'] == 1
+        assert archived_rows(db) == history[:5]
+        assert live_rows(db) == history[5:]
+        assert len(archived_rows(db, 'user_activity_log')) == 1
+
+        days = issues_by_day(db)
+        old_day = history[0][2][:10]
+        assert days[('201265', old_day)] == (10, 3)  # 1 existing + 2 failed, split across batches
+        assert days[('201266', old_day)] == (0, 1)
+        assert days[('201265', history[4][2][:10])] == (0, 0)
+
+        # A second run has nothing left to move and doesn't count issues again
+        again = db.run_retention(batch_size=2)
+        assert again['archived'] == {'ap_history': 0, 'user_activity_log': 0, 'user_audit_log': 0}
+        assert archived_rows(db) == history[:5] and issues_by_day(db) == days
+        assert db.get_system_config('retention_last_run')
+
+
+def test_retention_failure_loses_no_rows():
+    """A batch that fails part-way is rolled back whole; a rerun finishes the job."""
+    with temp_database() as db:
+        add_aps(db, '201265', '201266')
+        history = add_old_history(db)
+        with db._get_connection() as conn:
+            conn.execute(f"""
+                CREATE TRIGGER fail_delete BEFORE DELETE ON ap_history
+                WHEN old.id = {history[2][0]} BEGIN SELECT RAISE(ABORT, 'disk I/O error'); END
+            """)
+            conn.commit()
+
+        try:
+            db.run_retention(batch_size=2)
+            assert False, "retention should have failed"
+        except sqlite3.DatabaseError:
+            pass
+        # The first batch moved, the failed one is still only in the live table
+        assert archived_rows(db) == history[:2]
+        assert live_rows(db) == history[2:]
+        old_day = history[0][2][:10]
+        assert issues_by_day(db)[('201265', old_day)] == (10, 2)
+
+        with db._get_connection() as conn:
+            conn.execute('DROP TRIGGER fail_delete')
+            conn.commit()
+        assert db.run_retention(batch_size=2)['archived']['ap_history'] == 3
+        assert archived_rows(db) == history[:5] and live_rows(db) == history[5:]
+        assert issues_by_day(db)[('201265', old_day)] == (10, 3)
+
+# ==================== Open ticket counts ====================
+
+def test_open_ticket_rule_shared_by_tickets_and_jira_links():
+    """'closed', 'Done ' and 'RESOLVED' are closed everywhere; no status is open."""
+    from jira_db_manager import JiraDBManager
+
+    statuses = {'T-1': 'Open', 'T-2': 'closed', 'T-3': 'Done ', 'T-4': ' RESOLVED', 'T-5': None,
+                'T-6': 'In Progress'}
+    with temp_database() as db:
+        add_aps(db, '201265', '201266')
+        with db._get_connection() as conn:
+            conn.executemany('INSERT INTO jira_tickets (ticket_key, ap_id, status) VALUES (?, ?, ?)',
+                             [(key, '201265', status) for key, status in statuses.items()])
+            conn.commit()
+        jira_db = JiraDBManager(db)
+        jira_db.store_issues([('201265', {'key': key, 'fields': {'status': {'name': status}}})
+                              for key, status in statuses.items()], 'https://jira.example.com')
+
+        expected = {'201265': 3, '201266': 0}
+        assert db.count_open_tickets(['201265', '201266']) == expected
+        assert jira_db.count_open_issues(['201265', '201266']) == expected
+        assert [ap['ap_id'] for ap in db.search_aps_for_support(has_open_tickets=True)] == ['201265']
+        assert [ap['ap_id'] for ap in db.search_aps_for_support(has_open_tickets=False)] == ['201266']
+
+
+
+# ==================== Jira tracked APs ====================
+
+def test_tracked_aps_expire_when_not_viewed():
+    """APs not viewed within the age limit are untracked, then the rest are capped."""
+    from jira_db_manager import JiraDBManager
+
+    with temp_database() as db:
+        jira_db = JiraDBManager(db)
+        jira_db.track_aps(['201265', '201266', '201267', '201268'])
+        with db._get_connection() as conn:
+            conn.executemany("UPDATE jira_tracked_aps SET last_viewed = datetime('now', ?) WHERE ap_id = ?",
+                             [('-40 days', '201265'), ('-20 days', '201266'), ('-10 days', '201267')])
+            conn.commit()
+
+        # Viewing a tracked AP again renews it
+        jira_db.track_aps(['201266'])
+        assert jira_db.expire_tracked_aps(max_age_days=30) == 1
+        assert jira_db.get_tracked_aps() == ['201266', '201267', '201268']
+
+        assert jira_db.expire_tracked_aps(max_age_days=30, max_count=2) == 1
+        assert jira_db.get_tracked_aps() == ['201266', '201268']
+        assert jira_db.expire_tracked_aps() == 0
+
+
+if __name__ == '__main__':
+    from script_tests import run_tests
+    run_tests(globals(), "database manager")
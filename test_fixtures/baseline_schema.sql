@@ -0,0 +1,257 @@
+-- Schema and sample rows of a database created by DatabaseManager and
+-- JiraDBManager before schema versioning (user_version 0). Secrets blanked.
+BEGIN TRANSACTION;
+CREATE TABLE access_points (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ap_id TEXT NOT NULL UNIQUE,
+                    store_id TEXT NOT NULL,
+                    store_alias TEXT,
+                    retail_chain TEXT,
+                    ip_address TEXT,
+                    type TEXT,
+                    username_webui TEXT,
+                    password_webui TEXT,  -- Encrypted
+                    username_ssh TEXT,
+                    password_ssh TEXT,    -- Encrypted
+                    su_password TEXT,     -- Encrypted
+                    notes TEXT,
+                    status TEXT DEFAULT 'unknown',  -- online, offline, unknown
+                    last_seen TIMESTAMP,
+                    last_ping_time REAL,
+                    serial_number TEXT,
+                    software_version TEXT,
+                    firmware_version TEXT,
+                    hardware_revision TEXT,
+                    build TEXT,
+                    configuration_mode TEXT,
+                    service_status TEXT,
+                    uptime TEXT,
+                    communication_daemon_status TEXT,
+                    mac_address TEXT,
+                    connectivity_internet TEXT,
+                    connectivity_provisioning TEXT,
+                    connectivity_ntp_server TEXT,
+                    connectivity_apc_address TEXT,
+                    vusion_display_name TEXT,
+                    vusion_creation_date TIMESTAMP,
+                    vusion_modification_date TIMESTAMP,
+                    vusion_last_offline_date TIMESTAMP,
+                    vusion_last_online_date TIMESTAMP,
+                    vusion_comment TEXT,
+                    vusion_information TEXT,
+                    vusion_status TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                , java_version TEXT, support_status TEXT DEFAULT "active");
+INSERT INTO "access_points" VALUES(1,'201265','elkjop_se_lab.lab5','','','10.20.30.41','','','','','','','','unknown',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2026-10-16 22:21:11','2026-10-16 22:21:11',NULL,'active');
+CREATE TABLE ap_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ap_id TEXT NOT NULL,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    event_type TEXT NOT NULL,  -- ping, connect, provision, ssh, etc.
+                    description TEXT,
+                    user TEXT,
+                    success BOOLEAN,
+                    details TEXT,  -- JSON for additional data
+                    FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE CASCADE
+                );
+INSERT INTO "ap_history" VALUES(1,'201265','2026-10-16 22:21:11','ping','Ping',NULL,0,NULL);
+CREATE TABLE ap_metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ap_id TEXT NOT NULL,
+                    date DATE NOT NULL,
+                    ping_count INTEGER DEFAULT 0,
+                    successful_pings INTEGER DEFAULT 0,
+                    avg_response_time REAL,
+                    min_response_time REAL,
+                    max_response_time REAL,
+                    uptime_percentage REAL,
+                    issues_count INTEGER DEFAULT 0,
+                    FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE CASCADE,
+                    UNIQUE(ap_id, date)
+                );
+CREATE TABLE api_credentials (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    service_name TEXT UNIQUE NOT NULL,  -- jira, vusion_cloud, etc.
+                    encrypted_data TEXT NOT NULL,  -- JSON encrypted with Fernet
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    created_by TEXT,  -- Admin who created it
+                    last_used TIMESTAMP  -- Last time credentials were used
+                );
+CREATE TABLE comments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ap_id TEXT NOT NULL,
+                    user TEXT NOT NULL,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    comment TEXT NOT NULL,
+                    ticket_key TEXT,
+                    FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE CASCADE,
+                    FOREIGN KEY (ticket_key) REFERENCES jira_tickets(ticket_key) ON DELETE SET NULL
+                );
+CREATE TABLE jira_ap_links (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ap_id TEXT NOT NULL,
+                    jira_key TEXT NOT NULL,
+                    jira_id TEXT NOT NULL,
+                    jira_url TEXT NOT NULL,
+                    summary TEXT,
+                    issue_type TEXT,
+                    status TEXT,
+                    priority TEXT,
+                    resolution TEXT,
+                    created_date TEXT,
+                    updated_date TEXT,
+                    resolved_date TEXT,
+                    creator TEXT,
+                    reporter TEXT,
+                    assignee TEXT,
+                    description_preview TEXT,
+                    comment_count INTEGER DEFAULT 0,
+                    last_synced TEXT DEFAULT CURRENT_TIMESTAMP,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(ap_id, jira_key)
+                );
+INSERT INTO "jira_ap_links" VALUES(1,'201265','FIXIT-1','1','https://jira.example.com/browse/FIXIT-1','AP offline','','Open','',NULL,'','',NULL,'','',NULL,'',0,'2026-10-16 22:21:11','2026-10-16 22:21:11','2026-10-16 22:21:11');
+CREATE TABLE jira_comments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    jira_link_id INTEGER NOT NULL,
+                    jira_comment_id TEXT NOT NULL UNIQUE,
+                    author TEXT,
+                    author_email TEXT,
+                    comment_text TEXT,
+                    is_internal BOOLEAN DEFAULT 0,
+                    created_date TEXT,
+                    updated_date TEXT,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (jira_link_id) REFERENCES jira_ap_links(id) ON DELETE CASCADE
+                );
+CREATE TABLE jira_tickets (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ticket_key TEXT NOT NULL UNIQUE,
+                    ap_id TEXT,
+                    summary TEXT,
+                    description TEXT,
+                    status TEXT,
+                    priority TEXT,
+                    issue_type TEXT,
+                    created TIMESTAMP,
+                    updated TIMESTAMP,
+                    resolved TIMESTAMP,
+                    assignee TEXT,
+                    reporter TEXT,
+                    last_synced TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE SET NULL
+                );
+CREATE TABLE support_note_replies (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    note_id INTEGER NOT NULL,
+                    user TEXT NOT NULL,
+                    reply_text TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    is_deleted BOOLEAN DEFAULT 0,
+                    FOREIGN KEY (note_id) REFERENCES support_notes(id) ON DELETE CASCADE
+                );
+CREATE TABLE support_notes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ap_id TEXT NOT NULL,
+                    user TEXT NOT NULL,
+                    headline TEXT NOT NULL,
+                    note TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_by TEXT,
+                    is_deleted BOOLEAN DEFAULT 0,
+                    FOREIGN KEY (ap_id) REFERENCES access_points(ap_id) ON DELETE CASCADE
+                );
+CREATE TABLE system_config (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    config_key TEXT UNIQUE NOT NULL,
+                    config_value TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+CREATE TABLE user_activity_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    username TEXT NOT NULL,
+                    activity_type TEXT NOT NULL,  -- login, logout, ap_connect, provision, etc.
+                    description TEXT,
+                    ap_id TEXT,  -- Optional: related AP
+                    ip_address TEXT,
+                    session_id TEXT,  -- For tracking sessions
+                    success BOOLEAN DEFAULT 1,
+                    details TEXT  -- JSON for additional data
+                );
+CREATE TABLE user_audit_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    actor_username TEXT NOT NULL,  -- Who performed the action
+                    action TEXT NOT NULL,  -- create_user, delete_user, change_password, change_role, etc.
+                    target_username TEXT NOT NULL,  -- User affected by the action
+                    details TEXT,  -- JSON for additional info (e.g., old role -> new role)
+                    ip_address TEXT,
+                    success BOOLEAN DEFAULT 1
+                );
+CREATE TABLE users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT NOT NULL UNIQUE COLLATE NOCASE,
+                    full_name TEXT NOT NULL,
+                    password TEXT NOT NULL,  -- Encrypted
+                    role TEXT NOT NULL,  -- Admin or User
+                    email TEXT,  -- User email address
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    created_by TEXT,  -- Username who created this user
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_by TEXT,  -- Username who last modified this user
+                    last_login TIMESTAMP,
+                    is_active BOOLEAN DEFAULT 1
+                );
+CREATE INDEX idx_ap_store ON access_points(store_id);
+CREATE INDEX idx_ap_ip ON access_points(ip_address);
+CREATE INDEX idx_ap_status ON access_points(status);
+CREATE INDEX idx_history_ap ON ap_history(ap_id);
+CREATE INDEX idx_history_timestamp ON ap_history(timestamp);
+CREATE INDEX idx_history_type ON ap_history(event_type);
+CREATE INDEX idx_tickets_ap ON jira_tickets(ap_id);
+CREATE INDEX idx_tickets_status ON jira_tickets(status);
+CREATE INDEX idx_comments_ap ON comments(ap_id);
+CREATE INDEX idx_metrics_ap_date ON ap_metrics(ap_id, date);
+CREATE INDEX idx_users_username ON users(username);
+CREATE INDEX idx_user_audit_timestamp ON user_audit_log(timestamp);
+CREATE INDEX idx_user_audit_actor ON user_audit_log(actor_username);
+CREATE INDEX idx_user_audit_target ON user_audit_log(target_username);
+CREATE INDEX idx_user_activity_timestamp ON user_activity_log(timestamp);
+CREATE INDEX idx_user_activity_user ON user_activity_log(username);
+CREATE INDEX idx_user_activity_type ON user_activity_log(activity_type);
+CREATE INDEX idx_support_notes_ap ON support_notes(ap_id);
+CREATE INDEX idx_support_notes_created ON support_notes(created_at);
+CREATE INDEX idx_ap_support_status ON access_points(support_status);
+CREATE INDEX idx_system_config_key ON system_config(config_key);
+CREATE INDEX idx_api_credentials_service ON api_credentials(service_name);
+CREATE INDEX idx_jira_ap_links_ap_id 
+                ON jira_ap_links(ap_id)
+            ;
+CREATE INDEX idx_jira_ap_links_jira_key 
+                ON jira_ap_links(jira_key)
+            ;
+CREATE INDEX idx_jira_ap_links_status 
+                ON jira_ap_links(status)
+            ;
+CREATE INDEX idx_jira_ap_links_updated 
+                ON jira_ap_links(updated_date)
+            ;
+CREATE INDEX idx_jira_comments_link_id 
+                ON jira_comments(jira_link_id)
+            ;
+CREATE INDEX idx_jira_comments_jira_id 
+                ON jira_comments(jira_comment_id)
+            ;
+CREATE INDEX idx_jira_comments_internal 
+                ON jira_comments(is_internal)
+            ;
+CREATE INDEX idx_jira_comments_created 
+                ON jira_comments(created_date)
+            ;
+COMMIT;
@@ -0,0 +1,153 @@
+"""
+Test script for the ICMP sweep engine using a stub transport.
+No raw sockets or network access needed - replies are simulated on a virtual clock.
+"""
+
+import struct
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from icmp_sweep import (IcmpSweeper, build_echo_request, icmp_checksum,
+                        parse_echo_reply, ICMP_ECHO_REPLY)
+
+
+class VirtualClock:
+    """Manually advanced clock so sweeps run instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class StubTransport:
+    """
+    In-memory ICMP transport.
+
+    Hosts in `latencies` answer every echo after the given delay (seconds);
+    any other address never answers.
+    """
+
+    def __init__(self, clock: VirtualClock, latencies: dict, drop_sequences: set = None):
+        self.clock = clock
+        self.latencies = latencies
+        self.drop_sequences = drop_sequences or set()
+        self.sent = []
+        self.scheduled = []  # (deliver_at, packet, source)
+        self.closed = False
+
+    def send(self, packet, address):
+        self.sent.append((packet, address))
+        if address not in self.latencies:
+            return
+        _, _, _, identifier, sequence = struct.unpack('!BBHHH', packet[:8])
+        if sequence in self.drop_sequences:
+            return
+        reply = struct.pack('!BBHHH', ICMP_ECHO_REPLY, 0, 0, identifier, sequence) + packet[8:]
+        ip_header = bytes([0x45]) + bytes(19)
+        self.scheduled.append((self.clock.now + self.latencies[address], ip_header + reply, address))
+
+    def receive(self, timeout):
+        deadline = self.clock.now + timeout
+        due_times = [at for at, _, _ in self.scheduled if at <= deadline]
+        if not due_times:
+            self.clock.now = deadline
+            return []
+        self.clock.now = max(self.clock.now, min(due_times))
+        ready = [(p, s) for at, p, s in self.scheduled if at <= self.clock.now]
+        self.scheduled = [item for item in self.scheduled if item[0] > self.clock.now]
+        return ready
+
+    def close(self):
+        self.closed = True
+
+
+def test_checksum_roundtrip():
+    """A packet including its checksum must sum to zero."""
+    packet = build_echo_request(0x1234, 7, b'payload!')
+    assert icmp_checksum(packet) == 0
+
+
+def test_parse_echo_reply_honours_ip_header_length():
+    """Replies with IP options (IHL > 5) are still parsed."""
+    reply = struct.pack('!BBHHH', ICMP_ECHO_REPLY, 0, 0, 42, 9)
+    packet = bytes([0x46]) + bytes(23) + reply
+    assert parse_echo_reply(packet) == (42, 9)
+    # Echo requests are not replies
+    request = bytes([0x45]) + bytes(19) + build_echo_request(42, 9)
+    assert parse_echo_reply(request) is None
+
+
+def test_sweep_online_and_offline():
+    """Reachable hosts report RTTs, unreachable hosts time out."""
+    clock = VirtualClock()
+    transport = StubTransport(clock, {'10.0.0.1': 0.005, '10.0.0.2': 0.020})
+    sweeper = IcmpSweeper(transport=transport, identifier=99, clock=clock)
+
+    results = sweeper.sweep({'AP1': '10.0.0.1', 'AP2': '10.0.0.2', 'AP3': '10.0.0.3'},
+                            count=3, timeout=2.0)
+
+    assert results['AP1'].received == 3 and results['AP1'].sent == 3
+    assert abs(results['AP1'].avg_rtt - 5.0) < 0.01
+    assert abs(results['AP2'].avg_rtt - 20.0) < 0.01
+    assert results['AP3'].received == 0 and results['AP3'].loss_percent == 100
+    # Three rounds one second apart plus the final timeout
+    assert clock.now <= 2 * 1.0 + 2.0 + 0.01
+
+
+def test_sweep_scales_with_ping_count_not_fleet_size():
+    """2,000 targets finish in about ping_count seconds on a single transport."""
+    clock = VirtualClock()
+    targets = {f'AP{i}': f'10.1.{i // 256}.{i % 256}' for i in range(2000)}
+    transport = StubTransport(clock, {ip: 0.010 for ip in targets.values()})
+    sweeper = IcmpSweeper(transport=transport, identifier=1, clock=clock)
+
+    completed = []
+    results = sweeper.sweep(targets, count=4, timeout=2.0,
+                            on_complete=lambda stats: completed.append(stats.key))
+
+    assert len(transport.sent) == 8000
+    assert len(completed) == 2000
+    assert all(stats.received == 4 for stats in results.values())
+    assert clock.now < 4.0
+
+
+def test_replies_matched_by_id_sequence_and_source():
+    """Foreign identifiers, unknown sequences and spoofed sources are ignored."""
+    clock = VirtualClock()
+    transport = StubTransport(clock, {'10.0.0.1': 0.005}, drop_sequences={1})
+    sweeper = IcmpSweeper(transport=transport, identifier=7, clock=clock)
+
+    foreign = bytes([0x45]) + bytes(19) + struct.pack('!BBHHH', ICMP_ECHO_REPLY, 0, 0, 8, 0)
+    spoofed = bytes([0x45]) + bytes(19) + struct.pack('!BBHHH', ICMP_ECHO_REPLY, 0, 0, 7, 1)
+    transport.scheduled.append((0.001, foreign, '10.0.0.1'))
+    transport.scheduled.append((0.002, spoofed, '10.9.9.9'))
+
+    echoes = []
+    results = sweeper.sweep({'AP1': '10.0.0.1'}, count=2, timeout=1.0,
+                            on_echo=lambda stats, ok, rtt: echoes.append(ok))
+
+    assert results['AP1'].sent == 2
+    assert results['AP1'].received == 1
+    assert sorted(echoes) == [False, True]
+
+
+def test_sweep_stops_when_requested():
+    """should_stop aborts the sweep without waiting for outstanding echoes."""
+    clock = VirtualClock()
+    transport = StubTransport(clock, {})
+    sweeper = IcmpSweeper(transport=transport, identifier=3, clock=clock)
+
+    results = sweeper.sweep({'AP1': '10.0.0.1'}, count=10, timeout=5.0,
+                            should_stop=lambda: clock.now > 1.5)
+
+    assert results['AP1'].sent < 10
+
+
+if __name__ == '__main__':
+    from script_tests import run_tests
+    run_tests(globals(), "ICMP sweep")
@@ -0,0 +1,52 @@
+"""
+Test script for the Jira AP-ID matcher (jira_ap_matcher.py).
+Compares the matcher against the plain per-AP substring test it replaces.
+"""
+
+import sys
+import os
+import random
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jira_ap_matcher import APIDMatcher
+
+
+def test_overlapping_and_case_insensitive_ids():
+    matcher = APIDMatcher(['201265', '2012', '1265', 'elkjop_se_lab.lab5', 'LAB5', ''])
+    assert matcher.match('AP 201265 offline at ELKJOP_SE_LAB.lab5') == {
+        '201265', '2012', '1265', 'elkjop_se_lab.lab5', 'LAB5'}
+    assert matcher.match('AP 2012 only') == {'2012'}
+    assert matcher.match('elkjop_se_labXlab5') == {'LAB5'}  # '.' is literal
+    assert matcher.match('') == set()
+    assert APIDMatcher([]).match('201265') == set()
+
+
+def test_matches_substring_rule():
+    rng = random.Random(7)
+    ap_ids = [str(rng.randint(1000, 99999)) for _ in range(300)] + ['AB12', 'ab123']
+    matcher = APIDMatcher(ap_ids)
+    for _ in range(200):
+        text = ' '.join(rng.choice(ap_ids + ['FIXIT-42', 'offline', 'ab1']) for _ in range(20))
+        expected = {ap_id for ap_id in ap_ids if ap_id.lower() in text.lower()}
+        assert matcher.match(text) == expected
+
+
+def test_attribute_issues():
+    matcher = APIDMatcher(['201265', '198052'])
+    issues = [
+        {'key': 'FIXIT-1', 'fields': {'summary': 'AP 201265 down', 'description': None}},
+        {'key': 'FIXIT-2', 'fields': {'summary': 'Two APs',
+                                      'description': {'type': 'doc', 'content': [
+                                          {'type': 'text', 'text': '198052 and 201265'}]}}},
+        {'key': 'FIXIT-3', 'fields': {'summary': 'unrelated'}},
+    ]
+    links = matcher.attribute(issues)
+    assert [(ap_id, issue['key']) for ap_id, issue in links] == [
+        ('201265', 'FIXIT-1'), ('198052', 'FIXIT-2'), ('201265', 'FIXIT-2')]
+
+
+if __name__ == '__main__':
+    from script_tests import run_tests
+    run_tests(globals(), "matcher")
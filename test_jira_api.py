@@ -0,0 +1,116 @@
+"""
+Test script for JiraAPI rate limiting and concurrent batch searches (jira_api.py).
+Uses a stand-in HTTP session - no Jira server needed.
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jira_api import JiraAPI
+
+
+class StubCredentials:
+    def get_credentials(self, service):
+        return None
+
+
+class StubResponse:
+    def __init__(self, status_code, headers=None, data=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._data = data or {}
+
+    def json(self):
+        return self._data
+
+
+class StubSession:
+    """Returns the queued responses in order, then `default` for every request."""
+
+    def __init__(self, responses=(), default=None):
+        self.responses = list(responses)
+        self.default = default
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        with self._lock:
+            self.calls += 1
+            return self.responses.pop(0) if self.responses else self.default
+
+
+def make_api(session):
+    api = JiraAPI(StubCredentials())
+    api._base_url = 'https://jira.example.com'
+    api._auth = ('user', 'token')
+    api._session = session
+    api.RATE_LIMIT_BASE_DELAY = 0.01  # keeps the jitter small
+    return api
+
+
+def test_retry_after_then_success():
+    session = StubSession([StubResponse(429, {'Retry-After': '0.2'}), StubResponse(200)])
+    api = make_api(session)
+    start = time.monotonic()
+    response = api._get_with_backoff('https://jira.example.com/rest/api/3/search/jql')
+    assert response.status_code == 200
+    assert session.calls == 2
+    assert time.monotonic() - start >= 0.2
+
+
+def test_retry_after_is_capped():
+    session = StubSession([StubResponse(429, {'Retry-After': '3600'}), StubResponse(200)])
+    api = make_api(session)
+    api.RATE_LIMIT_MAX_DELAY = 0.1
+    start = time.monotonic()
+    assert api._get_with_backoff('https://jira.example.com/x').status_code == 200
+    assert time.monotonic() - start < 1
+
+
+def test_throttle_is_shared_by_requests():
+    """A 429 seen by one worker delays the next request of any worker."""
+    session = StubSession([StubResponse(429, {'Retry-After': '0.3'}), StubResponse(200)],
+                          default=StubResponse(200))
+    api = make_api(session)
+    start = time.monotonic()
+    worker = threading.Thread(target=api._get_with_backoff, args=('https://jira.example.com/a',))
+    worker.start()
+    while session.calls == 0:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    api._get_with_backoff('https://jira.example.com/b')
+    assert time.monotonic() - start >= 0.3
+    worker.join()
+
+
+def test_retry_after_parsing():
+    assert JiraAPI._retry_after(StubResponse(429, {'Retry-After': '5'})) == 5.0
+    assert JiraAPI._retry_after(StubResponse(429, {'Retry-After': '-1'})) == 0.0
+    assert JiraAPI._retry_after(StubResponse(429, {'Retry-After': 'Wed, 21 Oct 2026 07:28:00 GMT'})) is None
+    assert JiraAPI._retry_after(StubResponse(429)) is None
+
+
+def test_batch_pages_wait_for_the_consumer():
+    """Workers stop fetching while queued pages aren't consumed."""
+    endless = StubResponse(200, data={'issues': [{'key': 'FIXIT-1'}], 'nextPageToken': 'next',
+                                      'isLast': False})
+    session = StubSession(default=endless)
+    api = make_api(session)
+    pages = api.iter_batch_pages(['text ~ "1"', 'text ~ "2"'], max_workers=2)
+    try:
+        next(pages)
+        time.sleep(0.5)
+        # Queue of 2 per worker, one page held by each blocked worker, one consumed
+        assert session.calls <= 2 * 2 + 2 + 1
+    finally:
+        pages.close()
+
+
+if __name__ == '__main__':
+    from script_tests import run_tests
+    run_tests(globals(), "Jira API")
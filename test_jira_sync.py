@@ -0,0 +1,157 @@
+"""
+Test script for the background Jira sync (jira_sync.py).
+Uses a temporary database and a stand-in for the Jira client - no Jira server needed.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import jira_integration
+from database_manager import DatabaseManager
+from jira_api import SearchPage
+from jira_db_manager import JiraDBManager
+from jira_sync import JiraSyncService, build_ap_jqls
+
+
+def make_issue(key, status, ap_id):
+    return {'key': key, 'id': key.split('-')[1],
+            'fields': {'summary': f'AP {ap_id} offline', 'status': {'name': status},
+                       'issuetype': {'name': 'Incident'}, 'priority': {}, 'creator': {}, 'reporter': {},
+                       'comment': {'total': 1, 'comments': [
+                           {'id': f'{key}-c1', 'author': {'displayName': 'Support'},
+                            'body': 'Rebooted', 'created': '2026-01-02T10:00:00.000+0000'}]}}}
+
+
+class StubCredentials:
+    def get_credentials(self, service):
+        return {'url': 'https://jira.example.com/'}
+
+
+class StubJira:
+    """Stands in for JiraIntegration; returns the pages set on the class."""
+    pages = []
+    failures = []
+    jqls = None
+
+    def __init__(self, db_manager):
+        self.credentials_manager = StubCredentials()
+
+    def is_configured(self):
+        return True
+
+    def iter_batch_pages(self, jqls, fields=None, errors=None):
+        StubJira.jqls = jqls
+        if errors is not None:
+            errors.extend(StubJira.failures)
+        for page in StubJira.pages:
+            yield 0, page
+
+
+def run_with_stub(test):
+    original = jira_integration.JiraIntegration
+    jira_integration.JiraIntegration = StubJira
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(os.path.join(tmp, 'test.db'))
+            try:
+                test(db, JiraDBManager(db))
+            finally:
+                db.close()
+    finally:
+        jira_integration.JiraIntegration = original
+        StubJira.pages, StubJira.failures = [], []
+
+
+def test_build_ap_jqls():
+    assert build_ap_jqls(['201265', 'lab5', '198052'], batch_size=2) == [
+        '(text ~ "201265*" OR text ~ "lab5")', '(text ~ "198052*")']
+    assert build_ap_jqls(['lab5'], condition='updated >= -20m') == ['updated >= -20m AND (text ~ "lab5")']
+
+
+def test_sync_upserts_tracked_aps_and_advances_watermark():
+    def test(db, jira_db):
+        jira_db.store_issues([('201265', make_issue('FIXIT-1', 'Open', '201265'))], 'https://jira.example.com')
+        jira_db.track_aps(['201265', '198052'])
+        StubJira.pages = [SearchPage([make_issue('FIXIT-1', 'Done', '201265'),
+                                      make_issue('FIXIT-2', 'Open', '198052')], True)]
+
+        sync = JiraSyncService(db)
+        assert not sync.is_current()
+        result = sync.sync_now()
+        assert result['success'] and result['links'] == 2
+        assert all(jql.startswith('updated >= -') for jql in StubJira.jqls)
+        assert sync.is_current()
+        assert jira_db.count_open_issues(['201265', '198052']) == {'201265': 0, '198052': 1}
+
+        cached = jira_db.get_cached_issues('198052')
+        assert [issue['key'] for issue in cached] == ['FIXIT-2']
+        assert cached[0]['fields']['comment']['comments'][0]['body'] == 'Rebooted'
+    run_with_stub(test)
+
+
+def test_sync_refreshes_issues_linked_through_comments():
+    """An issue that mentions the AP only in a comment stays attributed to it."""
+    def test(db, jira_db):
+        issue = make_issue('FIXIT-4', 'Open', '201265')
+        issue['fields']['summary'] = 'Store network down'
+        jira_db.store_issues([('201265', issue)], 'https://jira.example.com', with_comments=True)
+        jira_db.track_aps(['201265'])
+        updated = make_issue('FIXIT-4', 'Done', '201265')
+        updated['fields']['summary'] = 'Store network down'
+        StubJira.pages = [SearchPage([updated], True)]
+
+        result = JiraSyncService(db).sync_now()
+        assert result['success'] and result['links'] == 1
+        assert jira_db.count_open_issues(['201265']) == {'201265': 0}
+    run_with_stub(test)
+
+
+def test_failed_search_keeps_watermark():
+    def test(db, jira_db):
+        jira_db.track_aps(['201265'])
+        StubJira.failures = [(0, RuntimeError("HTTP 500"))]
+        sync = JiraSyncService(db)
+        result = sync.sync_now()
+        assert not result['success'] and result['failed_batches'] == 1
+        assert sync.get_watermark() is None
+    run_with_stub(test)
+
+
+def test_sync_skips_aps_not_viewed_recently():
+    def test(db, jira_db):
+        jira_db.track_aps(['201265', '198052'])
+        with db._get_connection() as conn:
+            conn.execute("UPDATE jira_tracked_aps SET last_viewed = datetime('now', '-60 days') "
+                         "WHERE ap_id = '198052'")
+            conn.commit()
+        result = JiraSyncService(db).sync_now()
+        assert result['success'] and result['untracked'] == 1 and result['aps'] == 1
+        assert all('198052' not in jql for jql in StubJira.jqls)
+        assert jira_db.get_tracked_aps() == ['201265']
+    run_with_stub(test)
+
+
+def test_storing_without_comments_keeps_cached_comments():
+    def test(db, jira_db):
+        issue = make_issue('FIXIT-3', 'Open', '201265')
+        issue['fields']['description'] = 'x' * 800
+        first = jira_db.store_issues([('201265', issue)], 'https://jira.example.com', with_comments=True)
+        # A live AP search (which doesn't request the comment field) stores it again
+        searched = {'key': issue['key'], 'id': issue['id'],
+                    'fields': {k: v for k, v in issue['fields'].items() if k != 'comment'}}
+        second = jira_db.store_issues([('201265', searched)], 'https://jira.example.com')
+        assert first == second
+        cached = jira_db.get_cached_issues('201265')
+        assert len(cached[0]['fields']['comment']['comments']) == 1
+        assert cached[0]['fields']['comment']['total'] == 1
+        assert len(cached[0]['fields']['description']) == 800
+    run_with_stub(test)
+
+
+if __name__ == '__main__':
+    from script_tests import run_tests
+    run_tests(globals(), "Jira sync")
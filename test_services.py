@@ -0,0 +1,61 @@
+"""
+Test script for the shared service registry (services.py).
+Registers a placeholder database object - no database file is opened.
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import services
+import vusion_api_config
+
+
+class PlaceholderDatabase:
+    """Stands in for the DatabaseManager the application registers at startup."""
+
+
+def test_services_share_registered_database():
+    db = PlaceholderDatabase()
+    services.register_database_manager(db)
+    try:
+        assert services.get_database_manager() is db
+        credentials = services.get_credentials_manager()
+        assert credentials.db is db
+        assert services.get_credentials_manager() is credentials
+        config = services.get_vusion_config()
+        assert config.credentials_manager is credentials
+    finally:
+        services.reset_services()
+
+
+def test_vusion_config_defaults_to_shared_instances():
+    services.register_database_manager(PlaceholderDatabase())
+    try:
+        assert vusion_api_config.get_vusion_config() is services.get_vusion_config()
+        config = vusion_api_config.VusionAPIConfig()
+        assert config.credentials_manager is services.get_credentials_manager()
+    finally:
+        services.reset_services()
+
+
+def test_registering_new_database_rebuilds_dependents():
+    services.register_database_manager(PlaceholderDatabase())
+    try:
+        credentials = services.get_credentials_manager()
+        services.register_database_manager(services.get_database_manager())
+        assert services.get_credentials_manager() is credentials
+
+        other = PlaceholderDatabase()
+        services.register_database_manager(other)
+        assert services.get_credentials_manager() is not credentials
+        assert services.get_credentials_manager().db is other
+    finally:
+        services.reset_services()
+
+
+if __name__ == '__main__':
+    from script_tests import run_tests
+    run_tests(globals(), "service registry")
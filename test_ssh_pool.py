@@ -0,0 +1,120 @@
+"""
+Test script for the keyed SSH connection pool.
+Uses stub clients and transports in place of paramiko - no SSH server needed.
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ssh_pool import SSHConnectionPool
+
+
+class StubTransport:
+    """Minimal stand-in for paramiko.Transport."""
+
+    def __init__(self):
+        self.active = True
+
+    def is_active(self):
+        return self.active
+
+    def is_authenticated(self):
+        return self.active
+
+    def send_ignore(self):
+        if not self.active:
+            raise EOFError()
+
+    def set_keepalive(self, interval):
+        pass
+
+
+class StubClient:
+    """Minimal stand-in for paramiko.SSHClient."""
+
+    def __init__(self):
+        self.transport = StubTransport()
+        self.closed = False
+
+    def get_transport(self):
+        return self.transport
+
+    def close(self):
+        self.closed = True
+        self.transport.active = False
+
+
+class StubPool(SSHConnectionPool):
+    """Pool that hands out stub clients instead of connecting."""
+
+    def _connect(self, host, port, username, password, timeout):
+        return StubClient()
+
+
+def test_release_then_acquire_reuses_connection():
+    """A released connection is leased again; a different password gets its own."""
+    pool = StubPool()
+    client = pool.acquire('10.0.0.1', 'esl', 'secret')
+    pool.release(client)
+    assert pool.acquire('10.0.0.1', 'esl', 'secret') is client
+    other = pool.acquire('10.0.0.1', 'esl', 'changed')
+    assert other is not client
+    assert pool.stats['created'] == 2 and pool.stats['reused'] == 1
+    assert pool.size() == 2
+
+
+def test_idle_connection_expires_after_ttl():
+    """prune() closes connections idle past idle_ttl and drops their key lock."""
+    pool = StubPool(idle_ttl=60)
+    client = pool.acquire('10.0.0.1', 'esl', 'secret')
+    pool.release(client)
+    for conn in pool._connections.values():
+        conn.last_used -= 61
+
+    pool.prune()
+    assert client.closed
+    assert pool.size() == 0 and pool.stats['expired'] == 1
+    assert not pool._key_locks
+    assert pool.acquire('10.0.0.1', 'esl', 'secret') is not client
+
+
+def test_max_size_evicts_least_recently_used_idle():
+    """A full pool evicts its oldest idle connection; leased ones are kept."""
+    pool = StubPool(max_size=2)
+    first = pool.acquire('10.0.0.1', 'esl', 'secret')
+    second = pool.acquire('10.0.0.2', 'esl', 'secret')
+    pool.release(first)
+    pool.release(second)
+    pool.acquire('10.0.0.1', 'esl', 'secret')  # first is now the most recently used
+
+    third = pool.acquire('10.0.0.3', 'esl', 'secret')
+    assert second.closed and not first.closed
+    assert pool.size() == 2
+    assert sorted(key[0] for key in pool._key_locks) == ['10.0.0.1', '10.0.0.3']
+    assert third is not second
+
+
+def test_discard_dead_transport():
+    """A discarded connection is replaced at once and closed after its last lease."""
+    pool = StubPool()
+    client = pool.acquire('10.0.0.1', 'esl', 'secret')
+    shared = pool.acquire('10.0.0.1', 'esl', 'secret')
+    assert shared is client
+
+    client.transport.active = False
+    pool.discard(client)
+    assert not client.closed  # still leased by the other caller
+    replacement = pool.acquire('10.0.0.1', 'esl', 'secret')
+    assert replacement is not client and pool.stats['discarded'] == 1
+
+    pool.release(client)
+    assert client.closed
+    assert not pool._retired
+
+
+if __name__ == '__main__':
+    from script_tests import run_tests
+    run_tests(globals(), "SSH pool")
@@ -0,0 +1,110 @@
+"""
+Test script for the SSH output buffer and channel reader.
+Uses a socket pair in place of a paramiko channel - no SSH server needed.
+"""
+
+import socket
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ssh_reader import ChannelReader, OutputBuffer
+
+
+class SocketChannel:
+    """Minimal stand-in for paramiko.Channel backed by one end of a socket pair."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.closed = False
+        self.eof_received = False
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def recv_ready(self):
+        self.sock.setblocking(False)
+        try:
+            if self.sock.recv(1, socket.MSG_PEEK):
+                return True
+            self.eof_received = True  # paramiko sets this when the peer closes
+            return False
+        except BlockingIOError:
+            return False
+        finally:
+            self.sock.setblocking(True)
+
+    def recv(self, size):
+        return self.sock.recv(size)
+
+
+def test_read_peek_and_tail():
+    """read() consumes, peek() sees only unread output, tail() ignores the cursor."""
+    buffer = OutputBuffer()
+    buffer.append("hello ")
+    assert buffer.read() == "hello "
+    buffer.append("world")
+    assert buffer.peek(3) == "rld"
+    assert buffer.peek(100) == "world"
+    assert buffer.tail(100) == "hello world"
+    assert buffer.read() == "world"
+    assert buffer.read() == ""
+
+
+def test_capacity_trims_oldest_output():
+    """Old output is dropped once capacity is exceeded; positions stay absolute."""
+    buffer = OutputBuffer(capacity=10)
+    for _ in range(5000):
+        buffer.append("abc")
+    assert buffer.position == 15000
+    assert buffer.tail(100) == ("abc" * 4)[-10:]
+    assert buffer.since(14997) == "abc"
+
+
+def test_wait_for_wakes_on_append():
+    """wait_for() returns as soon as a pattern arrives, not after the timeout."""
+    buffer = OutputBuffer()
+    mark = buffer.position
+    threading.Timer(0.05, lambda: buffer.append("login ok\nServiceMode> ")).start()
+
+    start = time.monotonic()
+    result = buffer.wait_for([r'\$ $', r'ServiceMode>'], timeout=5, start=mark)
+    assert result is not None and result[0] == 1
+    assert time.monotonic() - start < 1
+
+
+def test_wait_for_times_out():
+    buffer = OutputBuffer()
+    buffer.append("nothing useful")
+    assert buffer.wait_for(['never'], timeout=0.05, start=0) is None
+
+
+def test_reader_decodes_split_utf8_and_closes():
+    """Multi-byte characters split across packets decode intact; EOF closes the buffer."""
+    ours, theirs = socket.socketpair()
+    received = []
+    closed = threading.Event()
+    reader = ChannelReader(SocketChannel(ours), on_data=received.append,
+                           on_close=lambda error: closed.set(),
+                           stop_check_interval=0.05).start()
+
+    data = "Värnamo ✓\n".encode('utf-8')
+    theirs.sendall(data[:2])
+    time.sleep(0.05)
+    theirs.sendall(data[2:])
+    assert reader.buffer.wait_for(['✓'], timeout=2, start=0) is not None
+
+    theirs.close()
+    assert closed.wait(2)
+    assert reader.buffer.closed
+    assert ''.join(received) == "Värnamo ✓\n"
+    ours.close()
+
+
+if __name__ == '__main__':
+    from script_tests import run_tests
+    run_tests(globals(), "SSH reader")
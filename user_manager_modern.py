@@ -44,8 +44,8 @@ class ModernUserManager:
                 def count(self):
                     return len(self.db.get_all_users())
                 
-                def get_user_audit_log(self, target_username=None, actor_username=None, limit=100):
-                    return self.db.get_user_audit_log(target_username, actor_username, limit)
+                def get_user_audit_log(self, target_username=None, actor_username=None, limit=100, before=None):
+                    return self.db.get_user_audit_log(target_username, actor_username, limit, before)
             
             self.user_manager = UserManagerWrapper(db_manager)
         else:
@@ -1058,6 +1058,90 @@ class PasswordDialog:
         self.dialog.destroy()
 
 
+class LazyTreePager:
+    """Fills a Treeview one keyset page at a time as the user scrolls down.
+    
+    fetch_page(before, limit) returns the next page of rows (newest first);
+    before is the (timestamp, id) keyset cursor of the last row loaded.
+    """
+    
+    PAGE_SIZE = 200
+    
+    def __init__(self, tree, scrollbar, fetch_page, format_row, status_label=None, count=None):
+        """
+        Args:
+            tree: Treeview to fill
+            scrollbar: Vertical scrollbar attached to the tree
+            fetch_page: Callable(before, limit) -> List[Dict]
+            format_row: Callable(row) -> tuple of Treeview values
+            status_label: Optional label showing "N of M" loaded
+            count: Optional callable() -> (total, exact) for the status label
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.fetch_page = fetch_page
+        self.format_row = format_row
+        self.status_label = status_label
+        self.count = count
+        self.cursor = None
+        self.exhausted = False
+        self.loaded = 0
+        self.total_text = ""
+        self._scheduled = False
+        tree.configure(yscrollcommand=self._on_scroll)
+    
+    def reset(self, fetch_page=None, count=None):
+        """Clear the tree and load the first page (optionally with new filters)."""
+        if fetch_page is not None:
+            self.fetch_page = fetch_page
+            self.count = count
+        self.tree.delete(*self.tree.get_children())
+        self.cursor = None
+        self.exhausted = False
+        self.loaded = 0
+        self.total_text = ""
+        if self.count:
+            total, exact = self.count()
+            self.total_text = f"{total}" if exact else f"{total}+"
+        self.load_more()
+    
+    def load_more(self):
+        """Append the next page, if any."""
+        self._scheduled = False
+        if self.exhausted:
+            return
+        rows = self.fetch_page(self.cursor, self.PAGE_SIZE)
+        for row in rows:
+            self.tree.insert('', 'end', values=self.format_row(row))
+        self.loaded += len(rows)
+        if rows:
+            self.cursor = (rows[-1]['timestamp'], rows[-1]['id'])
+        self.exhausted = len(rows) < self.PAGE_SIZE
+        self._update_status()
+    
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        # Prefetch when the last tenth of the loaded rows comes into view
+        if float(last) > 0.9 and not self.exhausted and not self._scheduled:
+            self._scheduled = True
+            self.tree.after_idle(self._load_scheduled)
+    
+    def _load_scheduled(self):
+        try:
+            self.load_more()
+        except Exception as e:
+            print(f"Error loading log page: {e}")
+    
+    def _update_status(self):
+        if self.status_label is None:
+            return
+        if self.total_text:
+            text = f"Showing {self.loaded} of {self.total_text}"
+        else:
+            text = f"Showing {self.loaded}" + ("" if self.exhausted else "+")
+        self.status_label.config(text=text)
+
+
 class AuditLogViewer:
     """Viewer for audit logs and user activity tracking."""
     
@@ -1244,6 +1328,10 @@ class AuditLogViewer:
         )
         refresh_btn.pack(side="left")
         
+        self.audit_status_label = tk.Label(toolbar_inner, text="", font=("Segoe UI", 9),
+                                           bg="white", fg="#6C757D")
+        self.audit_status_label.pack(side="right")
+        
         # Audit log tree
         list_frame = tk.Frame(content, bg="white", relief="solid", bd=1)
         list_frame.pack(fill="both", expand=True)
@@ -1266,6 +1354,10 @@ class AuditLogViewer:
         self.audit_tree.column("Details", width=500)
         
         self.audit_tree.pack(fill="both", expand=True, padx=2, pady=2)
+        
+        # Rows are loaded page by page while scrolling
+        self.audit_pager = LazyTreePager(self.audit_tree, scrollbar, None, self._format_audit_row,
+                                         status_label=self.audit_status_label)
     
     def _build_activity_tab(self):
         """Build the activity tracking tab content."""
@@ -1366,6 +1458,10 @@ class AuditLogViewer:
         )
         refresh_btn.pack(side="left")
         
+        self.activity_status_label = tk.Label(toolbar_inner, text="", font=("Segoe UI", 9),
+                                              bg="white", fg="#6C757D")
+        self.activity_status_label.pack(side="right")
+        
         # Activity log tree
         list_frame = tk.Frame(content, bg="white", relief="solid", bd=1)
         list_frame.pack(fill="both", expand=True)
@@ -1390,6 +1486,10 @@ class AuditLogViewer:
         self.activity_tree.column("Details", width=200)
         
         self.activity_tree.pack(fill="both", expand=True, padx=2, pady=2)
+        
+        # Rows are loaded page by page while scrolling
+        self.activity_pager = LazyTreePager(self.activity_tree, scrollbar, None, self._format_activity_row,
+                                            status_label=self.activity_status_label)
     
     def _refresh_log(self):
         """Refresh both audit log and activity log."""
@@ -1398,67 +1498,58 @@ class AuditLogViewer:
     
     def _refresh_audit_log(self):
         """Refresh the audit log tab."""
+        # Filter by actor (who performed the action)
+        filters = {'actor_username': self.audit_filter_var.get().strip() or None}
+        
+        def fetch_page(before, limit):
+            return self.db_manager.get_user_audit_log(limit=limit, before=before, **filters)
+        
         try:
-            actor = self.audit_filter_var.get().strip() or None
-            
-            # Clear existing items
-            for item in self.audit_tree.get_children():
-                self.audit_tree.delete(item)
-            
-            # Get filtered logs - filter by actor (who performed the action)
-            logs = self.user_manager.get_user_audit_log(actor_username=actor, limit=500)
+            self.audit_pager.reset(
+                fetch_page, lambda: self.db_manager.count_log_entries('user_audit_log', filters))
         except Exception as e:
             messagebox.showerror("Error", f"Audit log refresh error: {e}")
-            return
-        
-        # Add logs
-        for log in logs:
-            values = (
-                log.get('timestamp', '')[:19],
-                log.get('actor_username', ''),
-                log.get('action', ''),
-                log.get('target_username', ''),
-                log.get('details', '')
-            )
-            self.audit_tree.insert('', 'end', values=values)
+    
+    def _format_audit_row(self, log):
+        return (
+            (log.get('timestamp') or '')[:19],
+            log.get('actor_username', ''),
+            log.get('action', ''),
+            log.get('target_username', ''),
+            log.get('details', '') or ''
+        )
     
     def _refresh_activity_log(self):
         """Refresh the activity tracking tab."""
+        # Get filter values
+        activity_type = self.activity_type_filter.get().strip()
+        if activity_type == "All" or not activity_type:
+            activity_type = None
+        filters = {
+            'username': self.activity_user_filter.get().strip() or None,
+            'activity_type': activity_type,
+        }
+        
+        def fetch_page(before, limit):
+            return self.db_manager.get_user_activity_log(limit=limit, before=before, **filters)
+        
         try:
-            # Get filter values
-            username = self.activity_user_filter.get().strip() or None
-            activity_type = self.activity_type_filter.get().strip()
-            
-            if activity_type == "All" or not activity_type:
-                activity_type = None
-            
-            # Clear existing items
-            for item in self.activity_tree.get_children():
-                self.activity_tree.delete(item)
-            
-            # Get filtered activity logs
-            logs = self.db_manager.get_user_activity_log(
-                username=username,
-                activity_type=activity_type,
-                limit=500
-            )
+            self.activity_pager.reset(
+                fetch_page, lambda: self.db_manager.count_log_entries('user_activity_log', filters))
         except Exception as e:
             messagebox.showerror("Error", f"Activity log refresh error: {e}")
-            return
-        
-        # Add logs
-        for log in logs:
-            success_text = "✓" if log.get('success', True) else "✗"
-            values = (
-                log.get('timestamp', '')[:19],
-                log.get('username', ''),
-                log.get('activity_type', ''),
-                log.get('description', ''),
-                log.get('ap_id', '') or '',
-                success_text,
-                log.get('details', '') or ''
-            )
-            self.activity_tree.insert('', 'end', values=values)
+    
+    def _format_activity_row(self, log):
+        success_text = "✓" if log.get('success', True) else "✗"
+        return (
+            (log.get('timestamp') or '')[:19],
+            log.get('username', ''),
+            log.get('activity_type', ''),
+            log.get('description', ''),
+            log.get('ap_id', '') or '',
+            success_text,
+            log.get('details', '') or ''
+        )
 
 
 def open_user_manager(current_user, parent=None, db_manager=None):
@@ -146,14 +146,14 @@ class UserManager:
         self.db.log_user_activity(username, activity_type, description, ap_id, success, details)
     
     def get_user_audit_log(self, target_username: str = None, actor_username: str = None,
-                          limit: int = 100) -> List[Dict]:
-        """Get user audit log (who created/modified which users)."""
-        return self.db.get_user_audit_log(target_username, actor_username, limit)
+                          limit: int = 100, before: tuple = None) -> List[Dict]:
+        """Get user audit log (who created/modified which users); see DatabaseManager for paging."""
+        return self.db.get_user_audit_log(target_username, actor_username, limit, before)
     
     def get_user_activity_log(self, username: str = None, activity_type: str = None,
-                             limit: int = 100) -> List[Dict]:
-        """Get user activity log (what users did in the system)."""
-        return self.db.get_user_activity_log(username, activity_type, limit)
+                             limit: int = 100, before: tuple = None) -> List[Dict]:
+        """Get user activity log (what users did in the system); see DatabaseManager for paging."""
+        return self.db.get_user_activity_log(username, activity_type, limit, before)
 
 
 if __name__ == "__main__":
@@ -76,15 +76,12 @@ class VusionAPIConfig:
         Initialize Vusion API Config with DPAPI-based credential storage.
         
         Args:
-            credentials_manager: CredentialsManager instance (will create if None)
+            credentials_manager: CredentialsManager instance (default: the shared one)
         """
         if credentials_manager is None:
-            from database_manager import DatabaseManager
-            from credentials_manager import CredentialsManager
-            db = DatabaseManager()
-            self.credentials_manager = CredentialsManager(db)
-        else:
-            self.credentials_manager = credentials_manager
+            from services import get_credentials_manager
+            credentials_manager = get_credentials_manager()
+        self.credentials_manager = credentials_manager
     
     def _get_service_key(self, country: str, service: str) -> str:
         """Generate credential service key for storage."""
@@ -276,14 +273,10 @@ class VusionAPIConfig:
 
 
 # Convenience function for quick access
-_global_config = None
-
 def get_vusion_config() -> VusionAPIConfig:
-    """Get or create global Vusion API configuration instance."""
-    global _global_config
-    if _global_config is None:
-        _global_config = VusionAPIConfig()
-    return _global_config
+    """Get the shared Vusion API configuration instance (see services.py)."""
+    from services import get_vusion_config as get_shared_config
+    return get_shared_config()
 
 
 if __name__ == '__main__':
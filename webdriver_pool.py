@@ -0,0 +1,330 @@
+"""
+WebDriver Pool - Keeps warm Chrome sessions for browser automation
+Resolving chromedriver and starting Chrome are the slowest part of a batch run,
+so the driver path is resolved once per process and idle browsers are kept
+running between leases. Browsers are health-checked and reset before reuse and
+recycled after a number of leases.
+"""
+
+import atexit
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+# Suppress webdriver_manager console output on Windows
+if sys.platform == 'win32':
+    os.environ['WDM_LOG_LEVEL'] = '0'
+    os.environ['WDM_PRINT_FIRST_LINE'] = 'False'
+    os.environ['WDM_PROGRESS_BAR'] = str(False)
+
+    import logging
+    logging.getLogger('WDM').setLevel(logging.NOTSET)
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+
+# Timeouts every pooled browser starts with (reset on release, callers may change them)
+PAGE_LOAD_TIMEOUT = 60
+IMPLICIT_WAIT = 15
+
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+
+def get_driver_path() -> str:
+    """Resolve chromedriver once per process (ChromeDriverManager checks versions on every call)."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+def chrome_options() -> Options:
+    """Chrome options used for AP web UIs (self-signed certificates, no console logging)."""
+    options = Options()
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--ignore-certificate-errors')
+    options.add_argument('--disable-web-security')
+    options.add_argument('--ignore-ssl-errors')
+    options.add_argument('--allow-insecure-localhost')
+    options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    options.set_capability('acceptInsecureCerts', True)
+    return options
+
+
+def create_driver(page_load_timeout: int = PAGE_LOAD_TIMEOUT,
+                  implicit_wait: int = IMPLICIT_WAIT) -> webdriver.Chrome:
+    """Start a new Chrome instance with a hidden chromedriver console window."""
+    creation_flags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+    service = Service(get_driver_path(), creationflags=creation_flags)
+    driver = webdriver.Chrome(service=service, options=chrome_options())
+    driver.set_page_load_timeout(page_load_timeout)
+    driver.implicitly_wait(implicit_wait)
+    try:
+        driver.minimize_window()
+    except WebDriverException:
+        pass
+    return driver
+
+
+class _PooledDriver:
+    """A Chrome session plus lease bookkeeping."""
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.uses = 0
+        self.created = time.monotonic()
+
+    def is_alive(self) -> bool:
+        """Check the browser still answers (it may have crashed or been closed by the user)."""
+        try:
+            return bool(self.driver.window_handles)
+        except Exception:
+            return False
+
+    def reset(self) -> bool:
+        """Close extra tabs and clear per-AP state so the next lease starts clean."""
+        try:
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+            self.driver.execute_cdp_cmd('Network.setExtraHTTPHeaders', {'headers': {}})
+            self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            self.driver.get('about:blank')
+            self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+            self.driver.implicitly_wait(IMPLICIT_WAIT)
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class WebDriverPool:
+    """
+    Pool of warm Chrome sessions.
+
+    - Up to max_total browsers exist at once; acquire() blocks while all are leased
+    - Up to size idle browsers are kept running between leases
+    - Each browser is health-checked before it is handed out and reset
+      (extra tabs closed, auth headers and cookies cleared) when returned
+    - A browser is quit after max_uses leases to bound Chrome's memory growth
+
+    A WebDriver is not thread-safe, so each thread should lease its own driver
+    instead of sharing one behind a lock.
+    """
+
+    def __init__(self, size: int = 2, max_total: int = 8, max_uses: int = 25):
+        """
+        Initialize the pool.
+
+        Args:
+            size: Idle browsers kept warm
+            max_total: Maximum number of browsers (leased + idle)
+            max_uses: Leases before a browser is recycled
+        """
+        self.size = size
+        self.max_total = max_total
+        self.max_uses = max_uses
+
+        self._condition = threading.Condition()
+        self._idle: List[_PooledDriver] = []
+        self._leased: Dict[int, _PooledDriver] = {}
+        self._starting = 0
+        self._closed = False
+        self.stats = {'created': 0, 'reused': 0, 'recycled': 0, 'discarded': 0}
+
+    # ==================== Leasing ====================
+
+    def acquire(self, timeout: float = None) -> webdriver.Chrome:
+        """
+        Lease a browser, starting a new one only if no healthy idle one exists.
+
+        Every acquire() must be paired with release() (or discard() on error).
+
+        Raises:
+            TimeoutError: If max_total browsers stay leased for timeout seconds
+            WebDriverException: If Chrome fails to start
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                while not self._idle and self._total() >= self.max_total:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"All {self.max_total} browsers are in use")
+                    self._condition.wait(remaining)
+
+                pooled = self._idle.pop() if self._idle else None
+                if pooled is None:
+                    self._starting += 1
+
+            if pooled is None:
+                return self._start(leased=True).driver
+
+            if pooled.is_alive():
+                with self._condition:
+                    pooled.uses += 1
+                    self._leased[id(pooled.driver)] = pooled
+                    self.stats['reused'] += 1
+                return pooled.driver
+
+            # Crashed or closed while idle - drop it and try again
+            pooled.quit()
+            with self._condition:
+                self.stats['discarded'] += 1
+                self._condition.notify()
+
+    def release(self, driver: webdriver.Chrome):
+        """Return a leased browser; it is reset and kept warm, or recycled when worn out."""
+        with self._condition:
+            pooled = self._leased.get(id(driver))
+        if pooled is None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            return
+
+        # Reset while still counted as leased so max_total holds
+        keep = (pooled.uses < self.max_uses and not self._closed and pooled.reset())
+        with self._condition:
+            self._leased.pop(id(driver), None)
+            if keep and len(self._idle) < self.size:
+                self._idle.append(pooled)
+                self._condition.notify()
+                return
+            self.stats['recycled' if pooled.uses >= self.max_uses else 'discarded'] += 1
+            self._condition.notify()
+        pooled.quit()
+        self.warm()
+
+    def discard(self, driver: webdriver.Chrome):
+        """Quit a leased browser instead of returning it (after a crash or a lost session)."""
+        with self._condition:
+            pooled = self._leased.pop(id(driver), None)
+            if pooled is not None:
+                self.stats['discarded'] += 1
+            self._condition.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def lease(self, timeout: float = None):
+        """
+        Context manager around acquire()/release().
+
+        The browser is discarded instead of returned if a WebDriverException
+        escapes the block.
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except WebDriverException:
+            self.discard(driver)
+            driver = None
+            raise
+        finally:
+            if driver is not None:
+                self.release(driver)
+
+    # ==================== Maintenance ====================
+
+    def warm(self, count: int = None):
+        """
+        Start idle browsers in the background until count (default: size) are ready.
+
+        Call this early (e.g. when a batch window opens) so the first lease
+        does not wait for Chrome to start.
+        """
+        target = self.size if count is None else min(count, self.max_total)
+        with self._condition:
+            needed = min(target - len(self._idle) - self._starting,
+                         self.max_total - self._total())
+            if self._closed or needed <= 0:
+                return
+            self._starting += needed
+        for _ in range(needed):
+            threading.Thread(target=self._warm_one, daemon=True).start()
+
+    def close_all(self):
+        """Quit every idle browser; leased browsers are quit when released."""
+        with self._condition:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+            self._condition.notify_all()
+        for pooled in idle:
+            pooled.quit()
+
+    def idle_count(self) -> int:
+        with self._condition:
+            return len(self._idle)
+
+    # ==================== Internals ====================
+
+    def _total(self) -> int:
+        """Browsers that exist or are starting (lock held)."""
+        return len(self._idle) + len(self._leased) + self._starting
+
+    def _start(self, leased: bool) -> _PooledDriver:
+        """Start a browser for a reserved slot (self._starting was incremented)."""
+        try:
+            pooled = _PooledDriver(create_driver())
+        except Exception:
+            with self._condition:
+                self._starting -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._starting -= 1
+            self.stats['created'] += 1
+            if leased:
+                pooled.uses = 1
+                self._leased[id(pooled.driver)] = pooled
+            elif not self._closed:
+                self._idle.append(pooled)
+            self._condition.notify()
+        if not leased and self._closed:
+            pooled.quit()
+        return pooled
+
+    def _warm_one(self):
+        try:
+            self._start(leased=False)
+        except Exception as e:
+            print(f"Failed to start pooled browser: {e}")
+
+
+_shared_pool: Optional[WebDriverPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_webdriver_pool() -> WebDriverPool:
+    """Get the process-wide WebDriver pool (idle browsers are quit at exit)."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = WebDriverPool()
+            atexit.register(_shared_pool.close_all)
+        return _shared_pool